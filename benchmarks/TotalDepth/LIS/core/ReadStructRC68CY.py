@@ -1,5 +1,7 @@
 import struct
 
+import numpy
+
 from TotalDepth.LIS.core import cRepCode
 
 from benchmarks.TotalDepth.LIS.core import check_binary_files, binary_path
@@ -40,3 +42,13 @@ class StructRepCode68:
                     break
                 for word in my_struct.unpack(b):
                     cRepCode.from68(word)
+
+    def time_array_68(self, arg):
+        """Reads the same blocks but converts each one with a single call to readBytesArray()."""
+        out = numpy.empty(arg // 4, dtype=numpy.float64)
+        with open(binary_path(20), 'rb') as f:
+            while 1:
+                b = f.read(arg)
+                if len(b) != arg:
+                    break
+                cRepCode.readBytesArray(68, b, arg // 4, 4, out)
@@ -1,5 +1,7 @@
 
 
+import numpy
+
 from TotalDepth.LIS.core import RepCode
 # Python reference methods
 from TotalDepth.LIS.core import pRepCode
@@ -46,6 +48,37 @@ class TimeRepCode68:
         RepCode.from68(0x444C8000)
 
 
+class TimeRepCode68Array:
+    """Converts arrays of Representation Code 68 values with a single call, compare with TimeRepCode68."""
+    params = [1, 16, 256, 4096, 65536]
+
+    def setup(self, arg):
+        self.values = numpy.full(arg, 153.0)
+        self.buffer = b'\x44\x4C\x80\x00' * arg
+        self.out = numpy.empty(arg, dtype=numpy.float64)
+        self.out_bytes = bytearray(4 * arg)
+
+    def time_pRepCode_readBytesArray(self, arg):
+        pRepCode.readBytesArray(68, self.buffer, arg, 4, self.out)
+
+    def time_cRepCode_readBytesArray(self, arg):
+        cRepCode.readBytesArray(68, self.buffer, arg, 4, self.out)
+
+    def time_RepCode_readBytes_loop(self, arg):
+        for i in range(arg):
+            self.out[i] = RepCode.readBytes68(self.buffer[i * 4:i * 4 + 4])
+
+    def time_pRepCode_writeBytesArray(self, arg):
+        pRepCode.writeBytesArray(68, self.values, arg, 4, self.out_bytes)
+
+    def time_cRepCode_writeBytesArray(self, arg):
+        cRepCode.writeBytesArray(68, self.values, arg, 4, self.out_bytes)
+
+    def time_RepCode_writeBytes_loop(self, arg):
+        for v in self.values:
+            RepCode.writeBytes68(v)
+
+
 # class MemSuite:
 #     def mem_list(self):
 #         return [0] * 256
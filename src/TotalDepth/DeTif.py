@@ -2,6 +2,8 @@
 Strip TIF markers from a file or scan a file and reporting errors in TIF markers.
 """
 import argparse
+import bisect
+import io
 import logging
 import os
 import struct
@@ -114,6 +116,114 @@ def tif_scan_file_object(fobj: typing.BinaryIO) -> typing.List[TifMarker]:
     return tifs
 
 
+class TifStream(io.BufferedIOBase):
+    """A read only, seekable, file like object that presents the content of a file with TIF markers as if the TIF
+    markers had been stripped. This gives the same data as strip_tif() without writing a copy of the file.
+
+    The TIF markers are scanned once with tif_scan_file_object() to make a map of logical (de-TIF'd) positions to
+    physical positions in the underlying file. read(), seek() and tell() are all in logical positions.
+
+    The underlying file object is not closed by this object."""
+    def __init__(self, fobj: typing.BinaryIO):
+        super().__init__()
+        self.file = fobj
+        self.tifs: typing.List[TifMarker] = tif_scan_file_object(fobj)
+        file_size = fobj.seek(0, io.SEEK_END)
+        # These three are the map of logical positions to physical positions, one entry for each non-empty block.
+        self._logical_starts: typing.List[int] = []
+        self._physical_starts: typing.List[int] = []
+        self._lengths: typing.List[int] = []
+        for tif in self.tifs:
+            if tif.read_len < 0:
+                raise DeTifExceptionRead(f'TIF marker suggests negative block size: {tif}')
+            physical_start = tif.tell + TIF_TRIPLET_NUM_BYTES
+            # As strip_tif() a block truncated by the end of file is used as far as it goes.
+            length = min(tif.read_len, file_size - physical_start)
+            if length > 0:
+                self._logical_starts.append(self.size)
+                self._physical_starts.append(physical_start)
+                self._lengths.append(length)
+        self.position = 0
+        # Index of the block that contains self.position, this saves a bisect for sequential reads.
+        self._block = 0
+
+    @property
+    def name(self) -> str:
+        """The name of the underlying file."""
+        return self.file.name
+
+    @property
+    def size(self) -> int:
+        """The logical size, this is the size of the file with the TIF markers stripped."""
+        if self._logical_starts:
+            return self._logical_starts[-1] + self._lengths[-1]
+        return 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Set the logical position, like a file it is permissible to seek beyond the end."""
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f'negative seek value {offset}')
+        self.position = offset
+        return self.position
+
+    def tell(self) -> int:
+        """The logical position."""
+        return self.position
+
+    def _block_index(self) -> int:
+        """Returns the index of the block that contains self.position which must be < self.size."""
+        if not (self._logical_starts[self._block] <= self.position
+                < self._logical_starts[self._block] + self._lengths[self._block]):
+            self._block = bisect.bisect_right(self._logical_starts, self.position) - 1
+        return self._block
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes from the logical position, all the remaining bytes if size < 0."""
+        if size is None or size < 0:
+            size = self.size - self.position
+        offset = self.position - self._logical_starts[self._block] if self._logical_starts else -1
+        if 0 <= offset and offset + size <= self._lengths[self._block]:
+            # Fast path, a read within the current block which is most of them.
+            self.file.seek(self._physical_starts[self._block] + offset)
+            by = self.file.read(size)
+            self.position += len(by)
+            return by
+        chunks: typing.List[bytes] = []
+        while size > 0 and self.position < self.size:
+            block = self._block_index()
+            offset = self.position - self._logical_starts[block]
+            length = min(size, self._lengths[block] - offset)
+            self.file.seek(self._physical_starts[block] + offset)
+            by = self.file.read(length)
+            chunks.append(by)
+            self.position += len(by)
+            if len(by) != length:
+                # The underlying file has been truncated.
+                break
+            size -= length
+        if len(chunks) == 1:
+            return chunks[0]
+        return b''.join(chunks)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer) -> int:
+        by = self.read(len(buffer))
+        buffer[:len(by)] = by
+        return len(by)
+
+
 def tif_scan_path(path: str) -> typing.List[TifMarker]:
     """Scan a file at path and return the list of TIF markers."""
     with open(path, 'rb') as fobj:
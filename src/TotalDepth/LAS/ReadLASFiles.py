@@ -39,13 +39,86 @@ import collections
 import pprint
 import re
 import traceback
+import typing
+
+import numpy
 
 from TotalDepth.LAS.core import LASRead
+from TotalDepth.common import schedule
+
+
+class LASFileSummary(typing.NamedTuple):
+    """A compact summary of a LAS file. This is what a worker process returns rather than the parsed file.
+    If error is non-empty the file could not be read and the remaining fields are empty."""
+    path: str
+    size: int
+    time: float
+    # Empty if OK
+    error: str
+    # True if the error was not a LASRead.ExceptionLASRead
+    critical: bool
+    # Section types in file order e.g. 'VWCA'
+    sectTypes: str
+    # ((sect_type, mnem, unit, desc), ...) for every data line in the header sections
+    sectLines: typing.Tuple[typing.Tuple[str, str, typing.Any, typing.Any], ...]
+    # ((mnem, unit), ...) from the curve section
+    curves: typing.Tuple[typing.Tuple[str, typing.Any], ...]
+    # -1 if the array section was not read
+    numFrames: int
+    numDataPoints: int
+    # First and last X axis values or None if there are no frames
+    xRange: typing.Union[typing.Tuple[float, float], None]
+    # Count of null values for each curve, empty if the array section was not read
+    nullCounts: typing.Tuple[int, ...]
+
+
+def summariseLASFile(fp, headerOnly=False):
+    """Reads a single LAS file and returns a LASFileSummary. If headerOnly is True reading stops at the array section.
+    This does not raise."""
+    rSize = os.path.getsize(fp)
+    clkStart = time.perf_counter()
+    try:
+        myLr = LASRead.LASRead(fp, headerOnly=headerOnly)
+        sectLines = []
+        for s in myLr.genSects():
+            for m in range(len(s)):
+                dat = s[m]
+                # s[m] is a SectLine or a line for arrays, other etc.
+                if isinstance(dat, LASRead.SectLine):
+                    sectLines.append((s.type, dat.mnem, dat.unit, dat.desc))
+        curves = ()
+        try:
+            curves = tuple(zip(myLr['C'].mnemS(), myLr['C'].unitS()))
+        except KeyError:
+            pass
+        numFrames = -1 if headerOnly else myLr.numFrames()
+        numDataPoints = -1 if headerOnly else myLr.numDataPoints()
+        xRange = None
+        nullCounts = ()
+        if numFrames > 0:
+            array = myLr['A'].array
+            xRange = (array[0, 0].item(), array[-1, 0].item())
+            nullCounts = tuple(numpy.count_nonzero(array == myLr.nullValue, axis=0).tolist())
+        return LASFileSummary(
+            fp, rSize, time.perf_counter() - clkStart, '', False, ''.join(s.type for s in myLr.genSects()),
+            tuple(sectLines), curves, numFrames, numDataPoints, xRange, nullCounts,
+        )
+    except LASRead.ExceptionLASRead as err:
+        logging.error('File: "{:s}", Error: {!r:s}'.format(fp, err))
+        return LASFileSummary(fp, rSize, time.perf_counter() - clkStart, repr(err), False, '', (), (), 0, 0, None, ())
+    except Exception as err:
+        logging.critical('File: "{:s}", Error [{!r:s}]: {!r:s}'.format(fp, type(err), err))
+        logging.critical(traceback.format_exc())
+        return LASFileSummary(fp, rSize, time.perf_counter() - clkStart, repr(err), True, '', (), (), 0, 0, None, ())
+
 
 class ReadLASFiles(object):
+    """Reads LAS files and accumulates statistics about them.
+    If jobs is < 0 files are read in this process, otherwise by a pool of that many processes, 0 is the number of
+    CPUs. Each file is reduced to a LASFileSummary so only the summaries are held in memory.
+    If headerOnly is True reading stops at the array section of each file so the frame counts are not known."""
     RE_DESC = re.compile(r'^\s*(\d+)\s*(.+)$')
-    """Class documentation."""
-    def __init__(self, path):
+    def __init__(self, path, jobs=-1, headerOnly=False):
         self._cntrs = collections.defaultdict(int)
         # All mnemonics
         # {mnem : {desc : count, ...}, ...}
@@ -60,84 +133,88 @@ class ReadLASFiles(object):
         self._wsdMnemCount = collections.defaultdict(int)
         # {bytes : [seconds, ...], ...}
         self._sizeTimeMap = {}
+        self._headerOnly = headerOnly
+        filePaths = []
         if os.path.isdir(path):
             for dirpath, dirnames, filenames in os.walk(path):
                 for aName in filenames:
                     if aName == '.DS_Store':
                         continue
-                    s, t = self._processFile(os.path.join(dirpath, aName))
-                    self._addSizeTime(s, t)
+                    filePaths.append(os.path.join(dirpath, aName))
         elif os.path.isfile(path):
-            s, t = self._processFile(path)
-            self._addSizeTime(s, t)
+            filePaths.append(path)
         else:
             logging.error('Unknown path: {:s}'.format(path))
-            
+        if jobs < 0:
+            for fp in filePaths:
+                self._addSummary(summariseLASFile(fp, headerOnly))
+        else:
+            # Header reads are small and similar so send them to the workers in batches
+            for taskResult in schedule.imap_tasks(
+                    summariseLASFile,
+                    [schedule.file_task(fp, headerOnly) for fp in filePaths],
+                    jobs,
+                    chunksize=64 if headerOnly else 1):
+                if taskResult.exception:
+                    fp = taskResult.task.args[0]
+                    logging.critical('File: "{:s}", Error: {:s}'.format(fp, taskResult.exception))
+                    self._addSummary(
+                        LASFileSummary(fp, taskResult.task.size, taskResult.time, taskResult.exception, True,
+                                       '', (), (), 0, 0, None, ())
+                    )
+                else:
+                    self._addSummary(taskResult.result)
+
     def _addSizeTime(self, s, t):
         try:
             self._sizeTimeMap[s].append(t)
         except KeyError:
             self._sizeTimeMap[s] = [t]
 
-    def _processFile(self, fp):
-        """Process a single file. Returns the size of the file and the time taken to process."""
-        rSize = os.path.getsize(fp)
-        clkStart = time.clock()
-        try:
-            myLr = LASRead.LASRead(fp)
-            self._cntrs['byte'] += rSize
-            self._cntrs['sect'] += len(myLr)
-            self._cntrs['fram'] += myLr.numFrames()
-            self._cntrs['data'] += myLr.numDataPoints()
-            self._procLAS(myLr)
-        except LASRead.ExceptionLASRead as err:
-            logging.error('File: "{:s}", Error: {!r:s}'.format(fp, err))
-            self._cntrs['erro'] += 1
-        except Exception as err:
-            logging.critical('File: "{:s}", Error [{!r:s}]: {!r:s}'.format(fp, type(err), err))
-            logging.critical(traceback.format_exc())
-            self._cntrs['crit'] += 1
+    def _addSummary(self, summary):
+        """Accumulate the results from the summary of a single file."""
+        if summary.error:
+            if summary.critical:
+                self._cntrs['crit'] += 1
+            else:
+                self._cntrs['erro'] += 1
+        else:
+            self._cntrs['byte'] += summary.size
+            self._cntrs['sect'] += len(summary.sectTypes)
+            self._cntrs['fram'] += max(0, summary.numFrames)
+            self._cntrs['data'] += max(0, summary.numDataPoints)
+            self._cntrs['null'] += sum(summary.nullCounts)
+            self._updateDescMaps(summary)
+            self._updateWsdHistogram(summary)
+            logging.info('File: "{:s}" sections: {:s} curves: {:d} frames: {:d} X range: {!r:s} nulls: {:d}'.format(
+                summary.path, summary.sectTypes, len(summary.curves), summary.numFrames, summary.xRange,
+                sum(summary.nullCounts),
+            ))
         self._cntrs['file'] += 1
-        return rSize, time.clock() - clkStart 
-    
-    def _procLAS(self, las):
-        self._updateDescMaps(las)
-        self._updateWsdHistogram(las)
-        
-    def _updateDescMaps(self, las):
-        for s in las.genSects():
-            self._updateMnemDescMapFromSect(s, self._mnemDescMap)
-            self._updateUnitDescMapFromSect(s, self._unitDescMap)
-            if s.type == 'C':
-#                print('TRACE: s.mnemS()', s.mnemS())
-                self._updateMnemDescMapFromSect(s, self._curveDescMap)
+        self._addSizeTime(summary.size, summary.time)
+
+    def _updateDescMaps(self, summary):
+        for sectType, mnem, unit, desc in summary.sectLines:
+            myDesc = self._normaliseDescription(desc)
+            self._updateMnemDescMap(mnem, myDesc, self._mnemDescMap)
+            self._updateUnitDescMap(unit, myDesc, self._unitDescMap)
+            if sectType == 'C':
+                self._updateMnemDescMap(mnem, myDesc, self._curveDescMap)
+
+    def _updateMnemDescMap(self, mnem, myDesc, descMap):
+        if mnem not in descMap:
+            descMap[mnem] = collections.defaultdict(int)
+        descMap[mnem][myDesc] += 1
+
+    def _updateUnitDescMap(self, unit, myDesc, descMap):
+        if unit is not None:
+            u = unit
+            if not isinstance(u, str):
+                u = str(u)
+            if u not in descMap:
+                descMap[u] = collections.defaultdict(int)
+            descMap[u][myDesc] += 1
 
-    def _updateMnemDescMapFromSect(self, s, descMap):
-        for m in range(len(s)):
-            dat = s[m]
-            # s[m] is a SectLine or a line for arrays, other etc.
-            if isinstance(dat, LASRead.SectLine):
-                myDesc = self._normaliseDescription(dat.desc)
-#                if isinstance(myDesc, str) and len(myDesc) > 0:
-                if dat.mnem not in descMap:
-                    descMap[dat.mnem] = collections.defaultdict(int)
-                descMap[dat.mnem][myDesc] += 1
-    
-    def _updateUnitDescMapFromSect(self, s, descMap):
-        for m in range(len(s)):
-            dat = s[m]
-            # s[m] is a SectLine or a line for arrays, other etc.
-            if isinstance(dat, LASRead.SectLine):
-                myDesc = self._normaliseDescription(dat.desc)
-#                if isinstance(myDesc, str) and len(myDesc) > 0:
-                if dat.unit is not None:
-                    u = dat.unit
-                    if not isinstance(u, str):
-                        u = str(u)
-                    if u not in descMap:
-                        descMap[u] = collections.defaultdict(int)
-                    descMap[u][myDesc] += 1
-    
     def _normaliseDescription(self, d):
         """Normalise description according to some rules."""
         # Strip leading integer
@@ -149,17 +226,11 @@ class ReadLASFiles(object):
             return d.title()
         return str(d)
 
-    def _updateWsdHistogram(self, las):
-        """Looks at the Parameter section and updates self._paramMnemCount."""
-        # self._paramMnemCount
+    def _updateWsdHistogram(self, summary):
+        """Looks at the Well and Parameter sections and updates self._wsdMnemCount."""
         for s in 'WP':
-            try:
-                sect = las[s]
-            except KeyError:
-                pass
-            else:
-                for m in sect.keys():
-                    self._wsdMnemCount[m] += 1
+            for m in set(mnem for sectType, mnem, _unit, _desc in summary.sectLines if sectType == s):
+                self._wsdMnemCount[m] += 1
     
     def _retMostPopularDescription(self, theMap, m):
         assert(m in theMap)
@@ -242,8 +313,13 @@ class ReadLASFiles(object):
         r.append('Files OK: {:10d}'.format(self._cntrs['file'] - self._cntrs['erro'] - self._cntrs['crit']))
         r.append('   Bytes: {:10d} ({:g} Mb)'.format(self._cntrs['byte'], self._cntrs['byte'] / 1024**2))
         r.append('Sections: {:10d}'.format(self._cntrs['sect']))
-        r.append('  Frames: {:10d}'.format(self._cntrs['fram']))
-        r.append('    Data: {:10d} ({:g} M)'.format(self._cntrs['data'], self._cntrs['data'] / 1024**2))
+        if self._headerOnly:
+            r.append('  Frames: {:>10s}'.format('N/A'))
+            r.append('    Data: {:>10s}'.format('N/A'))
+        else:
+            r.append('  Frames: {:10d}'.format(self._cntrs['fram']))
+            r.append('    Data: {:10d} ({:g} M)'.format(self._cntrs['data'], self._cntrs['data'] / 1024**2))
+            r.append('   Nulls: {:10d}'.format(self._cntrs['null']))
         return '\n'.join(r)
 
 def main():
@@ -256,15 +332,17 @@ Recursively reads LAS files in a directory reporting information about their con
 #                      help="Keep going as far as sensible. [default: %default]")
 #    optParser.add_option("-r", "--recursive", action="store_true", dest="recursive", default=False, 
 #                      help="Process input recursively. [default: %default]")
-#    optParser.add_option(
-#            "-j", "--jobs",
-#            type="int",
-#            dest="jobs",
-#            default=-1,
-#            help="Max processes when multiprocessing. Zero uses number of native CPUs [%d]. -1 disables multiprocessing." \
-#                    % multiprocessing.cpu_count() \
-#                    + " [default: %default]" 
-#        )      
+    optParser.add_option(
+            "-j", "--jobs",
+            type="int",
+            dest="jobs",
+            default=-1,
+            help="Max processes when multiprocessing. Zero uses number of native CPUs [%d]. -1 disables multiprocessing." \
+                    % multiprocessing.cpu_count() \
+                    + " [default: %default]" 
+        )      
+    optParser.add_option("--header-only", action="store_true", dest="headerOnly", default=False,
+                      help="Only read the header sections of each file, not the array section. [default: %default]")
     optParser.add_option(
             "-l", "--loglevel",
             type="int",
@@ -273,7 +351,7 @@ Recursively reads LAS files in a directory reporting information about their con
             help="Log Level (debug=10, info=20, warning=30, error=40, critical=50) [default: %default]"
         )      
     opts, args = optParser.parse_args()
-    clkStart = time.clock()
+    clkStart = time.process_time()
     timStart = time.time()
     # Initialise logging etc.
     logging.basicConfig(level=opts.loglevel,
@@ -285,7 +363,7 @@ Recursively reads LAS files in a directory reporting information about their con
         optParser.print_help()
         optParser.error("I need a directory to read from!")
         return 1
-    myReader = ReadLASFiles(args[0])
+    myReader = ReadLASFiles(args[0], opts.jobs, opts.headerOnly)
     myReader.pprintMnemDesc()
     myReader.pprintCurveDesc()
     myReader.pprintUnitDesc()
@@ -293,7 +371,7 @@ Recursively reads LAS files in a directory reporting information about their con
     myReader.pprintWsd()
     # myReader.pprintSizeTime()
     print(myReader.results())
-    print('  CPU time = %8.3f (S)' % (time.clock() - clkStart))
+    print('  CPU time = %8.3f (S)' % (time.process_time() - clkStart))
     print('Exec. time = %8.3f (S)' % (time.time() - timStart))
     print('Bye, bye!')
     return 0
@@ -32,6 +32,10 @@ import logging
 import os
 import re
 import collections
+import warnings
+
+import numpy
+
 from TotalDepth.LIS.core import EngVal
 
 from TotalDepth.LAS import ExceptionTotalDepthLAS
@@ -69,6 +73,9 @@ def hasLASExtension(fp):
 #: Regex to match a comment
 RE_COMMENT = re.compile(r'^\s*#(.*)$')
 
+#: Approximate number of characters of the array section that are read and parsed at a time
+ARRAY_READ_SIZE = 4 * 1024**2
+
 #: logging.debug call here can add about 50% of the processing time
 DEBUG_LINE_BY_LINE = False
 
@@ -91,6 +98,23 @@ def genLines(f):
                 yield None
                 yield n, l
 
+#: Bytes that str.split() treats as whitespace
+_WHITESPACE = numpy.zeros(256, dtype=bool)
+_WHITESPACE[[0x09, 0x0a, 0x0b, 0x0c, 0x0d, 0x1c, 0x1d, 0x1e, 0x1f, 0x20]] = True
+#: Bytes that can appear in array section text that numpy.fromstring() can parse
+_NUMERIC = _WHITESPACE.copy()
+_NUMERIC[[ord(c) for c in '0123456789.+-eE']] = True
+
+def _lineTokenCounts(b):
+    """Returns a numpy array of the number of whitespace separated tokens on each '\\n' separated line of the
+    numpy uint8 array of text b."""
+    isSpace = _WHITESPACE[b]
+    tokenStartS = numpy.flatnonzero(~isSpace & numpy.concatenate(([True], isSpace[:-1])))
+    newLineS = numpy.flatnonzero(b == 0x0a)
+    return numpy.bincount(
+        numpy.searchsorted(newLineS, tokenStartS), minlength=len(newLineS) + 1
+    ).astype(numpy.int64)
+
 #: All section identifiers
 SECT_TYPES                  = 'VWCPOA'
 #: Section with data lines
@@ -287,79 +311,159 @@ class LASSection():
         return -1
 
 class LASSectionArray(LASSection):
-    """Contains data on an array section."""
+    """Contains data on an array section.
+    Lines are parsed in bulk by addMemberLines() into a numpy float64 array of shape (frames, curves) that is
+    available after finalise() as ``array``.
+    Tokens that can not be converted to float are replaced by the null value and recorded in ``invalidTokens`` as a
+    list of (line_number, token)."""
     def __init__(self, sectType, wrap, curvSect, null=-999.25):
         assert(sectType == 'A')
         self._wrap = wrap
-        # Accumulation of array values when un-wrapping
-        self._unwrapBuf = []
         self._mnemUnitS = list(zip(curvSect.mnemS(), curvSect.unitS()))
 #        # Removed as we now support wrap when there is a single channel
 #        if self._wrap and len(self._mnemUnitS) <= 2:
 #            raise ExceptionLASReadSectionArray('Wrapped array section with a single curve makes no sense')
         super().__init__(sectType)
         self._null = null
+        # Parsed chunks of (values, token_counts, line_numbers) as numpy arrays, one entry per non-empty line
+        self._chunks = []
+        self._array = numpy.empty((0, len(self._mnemUnitS)), dtype=numpy.float64)
+        self.invalidTokens = []
 
-    def _addBuf(self, lineNum):
-        """Adds the temporary buffer to the array. This is associated with the given line number."""
-        if len(self._unwrapBuf) > 0:
-            if len(self._unwrapBuf) != len(self._mnemUnitS):
-                raise ExceptionLASReadSectionArray(
-                    'Line [{:d}] buffer length miss-match, frame length {:d} which should be length {:d}'.format(
-                        lineNum,
-                        len(self._unwrapBuf),
-                        len(self._mnemUnitS),
-                    )
-                )
-            self._members.append(self._unwrapBuf)
-            self._unwrapBuf = []
+    def __str__(self):
+        return 'LASSection: "{:s}" with {:d} frames'.format(self.type, len(self))
+
+    def __len__(self):
+        """Number of frames."""
+        return self._array.shape[0]
+
+    def __getitem__(self, key):
+        """Returns a frame as a numpy array, key is the frame ordinal."""
+        if isinstance(key, int):
+            return self._array[key]
+        raise TypeError('{:s} object is not subscriptable with {:s}'.format(type(self), type(key)))
+
+    @property
+    def array(self):
+        """The numpy array of shape (frames, curves)."""
+        return self._array
 
     def addMemberLine(self, i, l):
-        """Process a line in an array section."""
-        # Convert to float inserting null where that can not be done
-        valS = []
-        for v in l.strip().split():
+        """Process a line in an array section, i is the position of the line l in the file."""
+        self.addMemberLines(i, l)
+
+    def addMemberLines(self, i, text):
+        """Process a block of lines in an array section, i is the position of the first line of the text in the
+        file. Blank and comment lines are ignored."""
+        if '#' in text:
+            text = '\n'.join('' if RE_COMMENT.match(l) else l for l in text.split('\n'))
+        b = numpy.frombuffer(text.encode('utf-8', 'surrogateescape'), dtype=numpy.uint8)
+        countS = _lineTokenCounts(b)
+        valueS = None
+        if numpy.all(_NUMERIC[b]):
+            # Tokens such as '--5' or '1.2.3' stop the parse early, older numpy warns and newer numpy raises
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', DeprecationWarning)
+                try:
+                    valueS = numpy.fromstring(text, dtype=numpy.float64, sep=' ') if countS.sum() else numpy.empty(0)
+                except ValueError:
+                    valueS = None
+        if valueS is None or len(valueS) != countS.sum():
+            # Invalid tokens or unusual whitespace, parse token by token
+            countS = numpy.array([len(l.split()) for l in text.split('\n')], dtype=numpy.int64)
+            valueS = self._toFloat64(text.split(), countS, numpy.arange(i, i + len(countS), dtype=numpy.int64))
+        lineNumS = numpy.arange(i, i + len(countS), dtype=numpy.int64)
+        mask = countS > 0
+        self._chunks.append((valueS, countS[mask], lineNumS[mask]))
+
+    def _toFloat64(self, tokenS, countS, lineNumS):
+        """Converts the tokens to a numpy float64 array inserting null where that can not be done."""
+        try:
+            return numpy.array(tokenS, dtype=numpy.float64)
+        except ValueError:
+            pass
+        # Slow path to find and report the invalid tokens
+        tokenLineNumS = numpy.repeat(lineNumS, countS).tolist()
+        ret = numpy.empty(len(tokenS), dtype=numpy.float64)
+        for t, v in enumerate(tokenS):
             try:
-                valS.append(float(v))
+                ret[t] = float(v)
             except ValueError:
-                logging.warning('LASSectionArray.addMemberLine(): line [{:d}], can not convert "{:s}" to float.'.format(i, v))
-                valS.append(self._null)
-        # Add it to the members
-        if len(valS) > 0:
-            if not self._wrap:
-                self._members.append(valS)
-            else:
-                self._addMemberWithWrapMode(i, l, valS)
-                
-    def _addMemberWithWrapMode(self, i, l, valS):
-        """Addes a line in wrap mode."""
-        assert(self._wrap)
-        if len(self._unwrapBuf) == 0:
-            # Add the index, raise if there is more than one item on the line
-            # We add to the buffer until the length matches the len(self._mnemUnitS)
-            if len(valS) == 1:
-                self._unwrapBuf.append(valS[0])
-            else:
-                raise ExceptionLASReadSectionArray(
-                    'Line [{:d}] More than one [{:d}] index values, line is: {:s}'.format(
-                        i, len(valS), l.replace('\n', '\\n'),
-                ))
-        else:
-            # Add to buffer
-            self._unwrapBuf.extend(valS)
-            # Is buffer complete or has overflowed?
-            if len(self._unwrapBuf) == len(self._mnemUnitS):
-                self._addBuf(i)
-            elif len(self._unwrapBuf) > len(self._mnemUnitS):
+                logging.warning(
+                    'LASSectionArray.addMemberLines(): line [{:d}], can not convert "{:s}" to float.'.format(
+                        tokenLineNumS[t], v
+                    )
+                )
+                self.invalidTokens.append((tokenLineNumS[t], v))
+                ret[t] = self._null
+        return ret
+
+    def _unwrappedArray(self, valueS, countS, lineNumS):
+        """Returns the frame array where each line is a frame. Lines of the wrong length are padded with null or
+        truncated."""
+        frameSize = self.frameSize()
+        if numpy.all(countS == frameSize):
+            return valueS.reshape(len(countS), frameSize)
+        ret = numpy.full((len(countS), frameSize), self._null, dtype=numpy.float64)
+        startS = numpy.cumsum(countS) - countS
+        for f in range(len(countS)):
+            if countS[f] != frameSize:
+                logging.warning(
+                    'LASSectionArray.finalise(): line [{:d}] has {:d} values, frame length should be {:d}.'.format(
+                        lineNumS[f], countS[f], frameSize
+                    )
+                )
+            numValues = min(countS[f], frameSize)
+            ret[f, :numValues] = valueS[startS[f]:startS[f] + numValues]
+        return ret
+
+    def _wrappedArray(self, valueS, countS, lineNumS):
+        """Returns the frame array where each frame is an index value on its own line followed by one or more lines
+        of the remaining values.
+        On error this raises with the array set to the frames completed so far."""
+        frameSize = self.frameSize()
+        numFrames = 0
+        bufLen = 0
+        try:
+            for lineNum, count in zip(lineNumS.tolist(), countS.tolist()):
+                if bufLen == 0 and count != 1:
+                    raise ExceptionLASReadSectionArray(
+                        'Line [{:d}] More than one [{:d}] index values.'.format(lineNum, count)
+                    )
+                bufLen += count
+                if bufLen == frameSize:
+                    numFrames += 1
+                    bufLen = 0
+                elif bufLen > frameSize:
+                    raise ExceptionLASReadSectionArray(
+                        'Line [{:d}] array overflow; frame length {:d} which should be length {:d}'.format(
+                            lineNum, bufLen, frameSize,
+                    ))
+            if bufLen != 0:
                 raise ExceptionLASReadSectionArray(
-                    'Line [{:d}] array overflow; frame length {:d} which should be length {:d}'.format(
-                        i, len(self._unwrapBuf), len(self._mnemUnitS),
+                    'Line [{:d}] buffer length miss-match, frame length {:d} which should be length {:d}'.format(
+                        int(lineNumS[-1]), bufLen, frameSize,
                 ))
-                
+        finally:
+            self._array = valueS[:numFrames * frameSize].reshape(numFrames, frameSize)
+        return self._array
+
+    def _createIndex(self):
+        """Creates an index of {X axis value : frame ordinal, ...}, duplicate values index the first frame."""
+        xS = self._array[:, 0].tolist()
+        self._indexMap = dict(zip(reversed(xS), range(len(xS) - 1, -1, -1)))
+        if len(self._indexMap) != len(xS):
+            logging.warning('Ignoring {:d} duplicate index values.'.format(len(xS) - len(self._indexMap)))
+
     def finalise(self):
-        """Finalisation.
-        TODO: Make a numpy array and get rid of the members. Need to overload __getitem__."""
-        self._addBuf(-1)
+        """Finalisation, this creates the numpy array from the lines added."""
+        if len(self._chunks):
+            valueS, countS, lineNumS = (numpy.concatenate(a) for a in zip(*self._chunks))
+            self._chunks = []
+            if self._wrap:
+                self._array = self._wrappedArray(valueS, countS, lineNumS)
+            else:
+                self._array = self._unwrappedArray(valueS, countS, lineNumS)
         self._createIndex()
     
     def frameSize(self):
@@ -584,18 +688,28 @@ class LASBase(object):
         assert(self.hasOutpMnem(theMnem))
         arrayIndex = self._findCurveOrAltCurve(theMnem)
         assert(arrayIndex != -1)
-        sectArray = self['A']
-        numFrames = len(sectArray)
-        for f in range(numFrames):
-            yield sectArray[f][0], sectArray[f][arrayIndex]
+        sectArray = self['A'].array
+        yield from zip(sectArray[:, 0].tolist(), sectArray[:, arrayIndex].tolist())
+
+    def outpPointArrays(self, theMnem):
+        """Returns the (x, values) of genOutpPoints() as a pair of contiguous numpy arrays."""
+        assert(self.hasOutpMnem(theMnem))
+        arrayIndex = self._findCurveOrAltCurve(theMnem)
+        assert(arrayIndex != -1)
+        sectArray = self['A'].array
+        return (
+            numpy.ascontiguousarray(sectArray[:, 0]),
+            numpy.ascontiguousarray(sectArray[:, arrayIndex]),
+        )
         #--------------------------
         # End: Channel data access.
         #--------------------------
 
 class LASRead(LASBase):
     """Reads a LAS file."""
-    def __init__(self, theFp, theFileID=None):
-        """Reads a LAS file from theFp that is either a string (file path) or a file like object."""
+    def __init__(self, theFp, theFileID=None, headerOnly=False):
+        """Reads a LAS file from theFp that is either a string (file path) or a file like object.
+        If headerOnly is True reading stops at the array section which is present but has no frames."""
         self._sectDespatchMap = {
             'V' : self._procSectV,
             'W' : self._procSect,
@@ -612,14 +726,23 @@ class LASRead(LASBase):
         except AttributeError:
             pass
         super().__init__(myFileID)
+        self._headerOnly = headerOnly
+        # The array section is read directly from the file in blocks, these are only used while reading
+        self._fp = theFp
+        self._lineNum = 0
         self._procFile(genLines(theFp))
+        self._fp = None
         self._finalise()
         
     def _procFile(self, gen):
         for i, l in gen:
             m = RE_SECT_HEAD.match(l)
             if m is not None:
+                self._lineNum = i
                 self._sectDespatchMap[m.group(1)](m, gen)
+                if m.group(1) == 'A':
+                    # The array section is the last one
+                    break
             else:
 #                raise ExceptionLASRead('LASRead._procFile(): Line: {:d} Unknown line: "{:s}"'.format(i, l))
                 logging.warning('LASRead._procFile(): Line: {:d} Unknown line: "{:s}"'.format(i, l.replace('\n', '\\n')))
@@ -674,13 +797,24 @@ class LASRead(LASBase):
             curvIdx += 1
         if curvIdx > len(self._sects)-1:
             raise ExceptionLASRead('No curve section to describe array section.')
-        mySect = LASSectionArray(mtch.group(1), self._wrap, self._sects[curvIdx])
-        for i, l in gen:
-            # Bail out if start of new section
-            if l.startswith('~'):#RE_SECT_HEAD.match(l) is not None:
-                gen.send(l)
-                raise ExceptionLASRead('Line: {:d}. Found section header line "{:s}" after array section'.format(i, l))
-                #break
-            mySect.addMemberLine(i, l)
+        mySect = LASSectionArray(mtch.group(1), self._wrap, self._sects[curvIdx], self.nullValue)
+        # The array section is the last one so read the rest of the file in blocks of lines and parse each in bulk.
+        i = self._lineNum + 1
+        while not self._headerOnly:
+            # Read whole lines
+            text = self._fp.read(ARRAY_READ_SIZE)
+            if text == '':
+                break
+            if not text.endswith('\n'):
+                text += self._fp.readline()
+            if text.startswith('~') or '\n~' in text:
+                # Bail out if start of new section
+                lineS = text.split('\n')
+                j = [l.startswith('~') for l in lineS].index(True)
+                raise ExceptionLASRead(
+                    'Line: {:d}. Found section header line "{:s}" after array section'.format(i + j, lineS[j] + '\n')
+                )
+            mySect.addMemberLines(i, text)
+            i += text.count('\n')
         self._finaliseSectAndAdd(mySect)
         logging.debug('_procSectA(): End')
@@ -283,7 +283,7 @@ class PlotLogInfo(object):
     
 class PlotLogPasses(object):
     """Takes an input path, output path and generates SVG file(s) from LIS."""
-    def __init__(self, fpIn, fpOut, recursive=False, keepGoing=True, lgFormatS=None, apiHeader=False):
+    def __init__(self, fpIn, fpOut, recursive=False, keepGoing=True, lgFormatS=None, apiHeader=False, dpi=0):
         """Constructor.
 
         fpIn and fpOut are file or directory paths. fpOut will be created if necessary.
@@ -297,6 +297,8 @@ class PlotLogPasses(object):
 
         apiHeader is a flag to control whether a API header is extracted from CONS tables
             is to be plotted on the top of the log.
+
+        dpi if non-zero decimates the curves to the minimum/maximum in each pixel at this resolution.
         """
         self._fpIn = fpIn
         self._fpOut = fpOut
@@ -309,6 +311,7 @@ class PlotLogPasses(object):
 
         # FIXME: Use lgFormats
         self._apiHeader = apiHeader
+        self._dpi = dpi
         self.plotLogInfo = PlotLogInfo()
         self._processPath()
 
@@ -352,7 +355,7 @@ class PlotLogPasses(object):
             myLrPip = LogiRec.LrTableRead(theFi)
         else:
             myLrPip = None
-        myPlot = Plot.PlotReadLIS(myLrFilm, myLrPres, myLrArea, myLrPip)
+        myPlot = Plot.PlotReadLIS(myLrFilm, myLrPres, myLrArea, myLrPip, theDpi=self._dpi)
         return myPlot, thePrs.logPass, self._retCONSRecS(theFi, thePrs)
     
     def _retCONSRecS(self, theFi, thePrs):
@@ -424,7 +427,7 @@ class PlotLogPasses(object):
         assert(len(self._lgFormatS) > 0)
         assert(theUniqueId in self._lgFormatS)
         myFcfg = FILMCfgXML.FilmCfgXMLRead()
-        return Plot.PlotReadXML(myFcfg[theUniqueId]), theIdxLogPass.logPass
+        return Plot.PlotReadXML(myFcfg[theUniqueId], theDpi=self._dpi), theIdxLogPass.logPass
     
     def _plotUsingLgFormats(self, theFi, theLpIdx, thePrs, theFpOut):
         """Plots a LogPass from a LIS file using the LgFormat XML files
@@ -444,7 +447,7 @@ class PlotLogPasses(object):
             myRoot = myFilm.rootNode(aUniqueId)
             if myRoot is not None:
                 myPres = PRESCfgXML.PresCfgXMLRead(myFilm, aUniqueId)
-                myPlot = Plot.PlotReadXML(aUniqueId)
+                myPlot = Plot.PlotReadXML(aUniqueId, theDpi=self._dpi)
                 if myPlot.hasDataToPlotLIS(myLogPass, aUniqueId):
                     # Create output path and plot it
                     myOutFilePath = '{:s}_{:04d}_{:s}.svg'.format(theFpOut, theLpIdx, aUniqueId)
@@ -550,23 +553,23 @@ class PlotLogPasses(object):
 ################################
 # Section: Multiprocessing code.
 ################################
-def processFile(fpIn, fpOut, keepGoing, lgFormatS, apiHeader):
+def processFile(fpIn, fpOut, keepGoing, lgFormatS, apiHeader, dpi=0):
     if not os.path.exists(os.path.dirname(fpOut)):
         try:
             os.makedirs(os.path.dirname(fpOut))
         except OSError:
             pass
-    myPlp = PlotLogPasses(fpIn, fpOut, recursive=False, keepGoing=keepGoing, lgFormatS=lgFormatS, apiHeader=apiHeader)
+    myPlp = PlotLogPasses(fpIn, fpOut, recursive=False, keepGoing=keepGoing, lgFormatS=lgFormatS, apiHeader=apiHeader, dpi=dpi)
     return myPlp.plotLogInfo
 
-def plotLogPassesMP(dIn, dOut, fnMatch, recursive, keepGoing, lgFormatS, apiHeader, jobs):
+def plotLogPassesMP(dIn, dOut, fnMatch, recursive, keepGoing, lgFormatS, apiHeader, jobs, dpi=0):
     """Multiprocessing code to plot log passes. Returns a PlotLogInfo object."""
     if jobs < 1:
         jobs = multiprocessing.cpu_count()
     logging.info('plotLogPassesMP(): Setting multi-processing jobs to %d' % jobs)
     myPool = multiprocessing.Pool(processes=jobs)
     myTaskS = [
-        (t.filePathIn, t.filePathOut, keepGoing, lgFormatS, apiHeader) \
+        (t.filePathIn, t.filePathOut, keepGoing, lgFormatS, apiHeader, dpi) \
             for t in DirWalk.dirWalk(dIn, dOut, fnMatch, recursive, bigFirst=True)
     ]
     retResult = PlotLogInfo()
@@ -613,6 +616,13 @@ Generates plot(s) from input LIS file or directory to an output destination."""
         )
     optParser.add_option("-x", "--xml", action="append", dest="LgFormat", default=[],
                       help="Add an XML LgFormat to use for plotting. Value is the UniqueId. Use -x? to see what LgFormats are available. [default: %default]")
+    optParser.add_option(
+            "-d", "--dpi",
+            type="int",
+            dest="dpi",
+            default=0,
+            help="Decimate curves to the minimum/maximum in each pixel at this resolution in dots per inch, 0 plots every sample. [default: %default]"
+        )
     opts, args = optParser.parse_args()
     clkStart = time.clock()
     timStart = time.time()
@@ -635,10 +645,10 @@ Generates plot(s) from input LIS file or directory to an output destination."""
         optParser.error("I can't do much without an input path to LIS file(s) and an output path.")
         return 1
     if opts.jobs == -1:
-        myPlp = PlotLogPasses(args[0], args[1], opts.recursive, opts.keepGoing, opts.LgFormat, opts.apiHeader)
+        myPlp = PlotLogPasses(args[0], args[1], opts.recursive, opts.keepGoing, opts.LgFormat, opts.apiHeader, opts.dpi)
         myResult = myPlp.plotLogInfo
     else:
-        myResult = plotLogPassesMP(args[0], args[1], None, opts.recursive, opts.keepGoing, opts.LgFormat, opts.apiHeader, opts.jobs)
+        myResult = plotLogPassesMP(args[0], args[1], None, opts.recursive, opts.keepGoing, opts.LgFormat, opts.apiHeader, opts.jobs, opts.dpi)
     myResult.writeHTML(os.path.join(args[1], 'index.html'), args[0])
     print('plotLogInfo', str(myResult))
     print('  CPU time = %8.3f (S)' % (time.clock() - clkStart))
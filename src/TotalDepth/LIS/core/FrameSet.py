@@ -715,9 +715,8 @@ class FrameSet(object):
             for chExt in range(chFrom, chTo+1):
                 #assert(arrayPos == self.valueIdxStartExtCh(chExt))
                 myCat = self._catS[chInt]
-                # TODO: Possible optimisation here, treat multi-sampled channels
-                # (or all channels) as we do reading dipmeter channels i.e.
-                # RepCode.readBytes() reads all values and returns a list
+                # NOTE: setFrameBytesBulk() converts whole channels for a run
+                # of frames and is much faster where it can be used.
                 for i in range(myCat.numValues):
 #                    # For the moment be a bit clunky and treat dipmeter codes
 #                    # separately.
@@ -753,6 +752,62 @@ class FrameSet(object):
         if byOfs != len(by):
             raise ExceptionFrameSet('FrameSet.setFrameBytes() length missmatch byOfs={:d} len(by)={:d}'.format(byOfs, len(by)))
 
+    @property
+    def canSetFrameBytesBulk(self):
+        """True if every channel has a Rep Code that can be converted in bulk by setFrameBytesBulk()."""
+        return all([RepCode.hasArrayConverter(c.repCode) for c in self._catS])
+
+    def setFrameBytesBulk(self, by, fr, numFrames, chFrom, chTo, stride=None):
+        """Given bytes for a run of consecutive frames, convert from Rep Codes to 'float64' and populate the
+        internal frames fr to fr+numFrames-1 for external channels chFrom to chTo inclusive.
+        
+        The data for frame i is at by[i*stride:i*stride+size] where size is the LIS size of the channels.
+        stride defaults to size i.e. the frames are contiguous, a larger stride allows the caller to read a
+        run of frames that has other channels between them.
+        
+        This converts each value of each channel for all frames with a single call to RepCode.readBytesArray()
+        rather than a call per value as setFrameBytes() does. The indirect X axis is not handled, use
+        setFrameBytes() for that.
+        """
+        if chFrom is None or chTo is None:
+            raise ExceptionFrameSet('FrameSet.setFrameBytesBulk() chFrom and chTo can not be None')
+        assert(chFrom <= chTo)
+        if fr + numFrames > len(self._frames):
+            raise ExceptionFrameSet('FrameSet.setFrameBytesBulk() frames {:d} to {:d} out of range {:d}'.format(
+                fr, fr + numFrames, len(self._frames))
+            )
+        chInt = self.internalChIdx(chFrom)
+        myCatS = self._catS[chInt:chInt + chTo - chFrom + 1]
+        frameSize = sum([c.lisSize for c in myCatS])
+        if stride is None:
+            stride = frameSize
+        if numFrames > 0:
+            lenExpected = (numFrames - 1) * stride + frameSize
+        else:
+            lenExpected = 0
+        if len(by) != lenExpected:
+            raise ExceptionFrameSet('FrameSet.setFrameBytesBulk() length missmatch expected={:d} len(by)={:d}'.format(lenExpected, len(by)))
+        if numFrames == 0:
+            return
+        myView = memoryview(by)
+        arrayPos = self.valueIdxStartExtCh(chFrom)
+        byOfs = 0
+        for myCat in myCatS:
+            for i in range(myCat.numValues):
+                # Decode this value for every frame straight into the column of the frame array
+                try:
+                    RepCode.readBytesArray(
+                        myCat.repCode,
+                        myView[byOfs:],
+                        numFrames,
+                        stride,
+                        self._frames[fr:fr + numFrames, arrayPos],
+                    )
+                except RepCode.ExceptionRepCode as err:
+                    raise ExceptionFrameSet('FrameSet.setFrameBytesBulk() {:s}'.format(str(err)))
+                arrayPos += 1
+                byOfs += myCat.wordLength
+
     def setIndirectX(self, fr, val):
         """Sets an indirect X axis value directly, for example with an EXTRAPOLATE event."""
         assert(self._indrXVector is not None)
@@ -1054,6 +1109,34 @@ class FrameSet(object):
                     for p in self._genChScPointsSingle(frOfs):
                         yield p
 
+    def chScPointArrays(self, ch, sc=0, chIsExt=True):
+        """Returns a pair of numpy arrays (xAxis, values) that are the same as
+        the values that genChScPoints() generates, or None if the channel and
+        sub-channel has multiple values per frame and so can not be expressed
+        as columns of the frame set. The arrays may be views on the frame set.
+        sc is ignored unless the channel has > 1 sub-channels.
+        If chIsExt is True then ch is the external channel index otherwise
+        it is the internal index."""
+        if self.numFrames == 0:
+            return numpy.empty((0,), self.NUMPY_DATA_TYPE), numpy.empty((0,), self.NUMPY_DATA_TYPE)
+        if chIsExt:
+            ch = self.internalChIdx(ch)
+        myCat = self._catS[ch]
+        if sc != 0:
+            sc = chkIdx(sc, myCat.numSubChannels, 'FrameSet.chScPointArrays(): sub-channel {:d} not in array length {:d}')
+        if myCat.numValues == 1:
+            frOfs = self._intChValIdxS[ch]
+        elif myCat.numSubChannels > 1 and sc >= RepCode.DIPMETER_NUM_FAST_CHANNELS:
+            # Slow dipmeter channel, as genChScPoints()
+            frOfs = self._intChValIdxS[ch] \
+                    + RepCode.DIPMETER_SIZE_FAST_CHANNELS \
+                    + (sc - RepCode.DIPMETER_NUM_FAST_CHANNELS)
+        else:
+            return None
+        if self.isIndirectX:
+            return self._indrXVector, self._frames[:, frOfs]
+        return self._frames[:, self._xAxisFrOffs], self._frames[:, frOfs]
+
     def _checkShapes(self, theIntChScS):
         """Checks a non-empty list of (ch,sc) and returns the tuple of
         shape (samples, bursts).
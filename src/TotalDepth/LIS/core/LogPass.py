@@ -122,6 +122,8 @@ class LogPass(object):
         self._unitMap = self._retUnitMap()
         # Populated by setFrameSet() when the time comes
         self._frameSet = None
+        # The frame slice of a fully loaded FrameSet, see hasFrameSetChX()
+        self._frameSetSlice = None
         # Set up RLE object
         if self.isIndirectX:
             self._rle = Rle.RLEType01(self._dfsr.ebs.depthUnits)
@@ -534,6 +536,19 @@ class LogPass(object):
         # Populate the FrameSet
         return self.setFrameSet(theFi, theFrSl=myFrSl, theChList=myChIdxS)
     
+    def hasFrameSetChX(self, theChS, Xstart, Xstop, frStep=1):
+        """Returns True if the current FrameSet holds everything that
+        setFrameSetChX() would load with these arguments so the load can be
+        avoided. The FrameSet may hold more channels than theChS."""
+        if self._frameSet is None or self._frameSetSlice is None:
+            return False
+        if slice(self.frameFromX(Xstart), self.frameFromX(Xstop), frStep) != self._frameSetSlice:
+            return False
+        myExtChIdxS = set(self._frameSet.genExtChIndexes())
+        if theChS is None:
+            return myExtChIdxS.issuperset(range(len(self._dfsr.dsbBlocks)))
+        return myExtChIdxS.issuperset(self.retExtChIndexList(theChS))
+    
     def setFrameSet(self, theFile, theFrSl=None, theChList=None):
         """Populates the frames set.
         
@@ -557,6 +572,7 @@ class LogPass(object):
         # Create a new FrameSet
         # TODO: Resize rather than brute force delete?
         del self._frameSet
+        self._frameSetSlice = None
         self._frameSet = FrameSet.FrameSet(
             self._dfsr,
             myFrSl,
@@ -564,13 +580,17 @@ class LogPass(object):
             self._xAxisIndex,
         )
         if self._frameSet.numFrames == 0:
+            self._frameSetSlice = myFrSl
             return
         # Iterate through frame plane for this LR
         xVal = None
         #print('setFrameSet.setFrameSet():')
         # Note: We take the list of channel indexes from the frameSet as the
         # frameSet is free to add mandatory channels such as the X axis
-        for ty, siz, frInt, chFrom, chTo in self._genFrameSetEvents(myFrSl, list(self._frameSet.genExtChIndexes())):
+        myEvents = self._genFrameSetEvents(myFrSl, list(self._frameSet.genExtChIndexes()))
+        if self._frameSet.canSetFrameBytesBulk:
+            myEvents = self._genBatchedFrameSetEvents(theFile, myEvents)
+        for ty, siz, frInt, chFrom, chTo in myEvents:
             #print('LogPass.setFrameSet(): type={:s} siz={:s} frInt={:s} chFrom={:s} chTo={:s}'.format(ty, str(siz), str(frInt), str(chFrom), str(chTo)))
             #print('LogPass.setFrameSet(): type={:s} frInt={:s}'.format(ty, str(frInt)))
             # Note: fr is frame number in this LR
@@ -599,10 +619,62 @@ class LogPass(object):
             else:
                 assert(ty == EVENT_READ)
                 self._frameSet.setFrameBytes(theFile.readLrBytes(siz), frInt, chFrom, chTo)
-
-    def _rangeFromSlice(self, theSl):
-        """Given a slice object this returns an iterable range object."""
-        return range(theSl.start or 0, theSl.stop, theSl.step or 1)
+        self._frameSetSlice = myFrSl
+
+    def _genBatchedFrameSetEvents(self, theFile, theEvents):
+        """Takes the events from _genFrameSetEvents() and handles runs of EVENT_READ
+        events in the same Logical Record for consecutive frames and the same
+        channels by reading all the bytes at once and calling
+        FrameSet.setFrameBytesBulk(). Each read may be followed by a single
+        EVENT_SKIP of the same size each time, for example when a contiguous
+        subset of channels is read.
+        EVENT_EXTRAPOLATE events only change the indirect X axis so do not
+        interrupt a run.
+        All other events are yielded unchanged."""
+        # The current run, a list of [siz, frInt, numFrames, chFrom, chTo, skip]
+        # skip is None until the second read establishes it.
+        myRun = None
+        # A skip that follows the last read of the run
+        mySkip = None
+        for ty, siz, frInt, chFrom, chTo in theEvents:
+            if ty == EVENT_READ and chFrom is not None and chTo is not None:
+                if myRun is not None \
+                and myRun[0] == siz and myRun[3] == chFrom and myRun[4] == chTo \
+                and myRun[1] + myRun[2] == frInt \
+                and (myRun[5] is None or myRun[5] == (mySkip or 0)):
+                    myRun[5] = mySkip or 0
+                    myRun[2] += 1
+                    mySkip = None
+                    continue
+                self._flushBatchedRead(theFile, myRun, mySkip)
+                myRun = [siz, frInt, 1, chFrom, chTo, None]
+                mySkip = None
+            elif ty == EVENT_SKIP and myRun is not None and mySkip is None:
+                mySkip = siz
+            elif ty == EVENT_EXTRAPOLATE:
+                # This only changes the indirect X axis so does not interrupt the run.
+                yield ty, siz, frInt, chFrom, chTo
+            else:
+                self._flushBatchedRead(theFile, myRun, mySkip)
+                myRun = None
+                mySkip = None
+                yield ty, siz, frInt, chFrom, chTo
+        self._flushBatchedRead(theFile, myRun, mySkip)
+
+    def _flushBatchedRead(self, theFile, theRun, theSkip):
+        """Reads a run of frames accumulated by _genBatchedFrameSetEvents() into the FrameSet."""
+        if theRun is None:
+            return
+        siz, frInt, numFrames, chFrom, chTo, skip = theRun
+        if numFrames == 1:
+            self._frameSet.setFrameBytes(theFile.readLrBytes(siz), frInt, chFrom, chTo)
+        else:
+            myStride = siz + skip
+            self._frameSet.setFrameBytesBulk(
+                theFile.readLrBytes(numFrames * myStride - skip), frInt, numFrames, chFrom, chTo, myStride
+            )
+        if theSkip:
+            theFile.skipLrBytes(theSkip)
 
     def _sliceFromList(self, theL):
         """Returns a slice object from a list of integers. Only the length of
@@ -619,16 +691,8 @@ class LogPass(object):
         return retVal
 
     def _retFrameSetMap(self, theFrSl):
-        """Returns a map {seek : slice, ...}."""
-        rMap = {}
-        myFrSl = theFrSl or slice(0, self._rle.totalFrames(), 1)
-        for fNum in self._rangeFromSlice(myFrSl):
-            lrSeek, fOffs = self._rle.tellLrForFrame(fNum)
-            try:
-                rMap[lrSeek].append(fOffs)
-            except KeyError:
-                rMap[lrSeek] = [fOffs,]
-        return rMap
+        """Returns a map {seek : numpy array of frame offsets, ...}."""
+        return self._rle.tellLrForFrames(theFrSl)
     
     def _genFrameSetEvents(self, theFrSl, theChList):
         """Generate events that iterate through a frame slice and channel list.
@@ -656,6 +720,12 @@ class LogPass(object):
         fsCh, fsSc = self._mnemToChSc(theMnem)
         return self._frameSet.genChScPoints(fsCh, fsSc, chIsExt=True)
 
+    def outpPointArrays(self, theMnem):
+        """Returns the (x, values) of genOutpPoints() as a pair of numpy arrays
+        or None if the output has multiple values per frame."""
+        fsCh, fsSc = self._mnemToChSc(theMnem)
+        return self._frameSet.chScPointArrays(fsCh, fsSc, chIsExt=True)
+
     def jsonObject(self):
         """Return an Python object that can be JSON encoded."""
         d = {
@@ -32,6 +32,8 @@ __date__    = '2010-08-02'
 __version__ = '0.1.0'
 __rights__  = 'Copyright (c) Paul Ross'
 
+import numpy
+
 # Import the Python reference methods
 from TotalDepth.LIS.core.pRepCode import *
 # Now overlay with any implemented in Cython
@@ -292,9 +294,16 @@ def readBytes(theRc, theB, theLen=None):
 
 def writeBytes(v, r):
     """Takes a value v and a Representation Code r and converts this to a
-    bytes() object."""
+    bytes() object.
+    If v is a numpy array then all the values are encoded contiguously with
+    writeBytesArray()."""
     if r == RC_TYPE_TEXT:
         return v
+    if isinstance(v, numpy.ndarray):
+        v = numpy.ascontiguousarray(v, dtype=numpy.float64).reshape(-1)
+        by = bytearray(len(v) * lisSize(r))
+        writeBytesArray(r, v, len(v), lisSize(r), by)
+        return bytes(by)
     try:
         return WRITE_BYTES_DESPATCH_MAP[r](v)
     except struct.error as err:
@@ -46,6 +46,10 @@ API Reference
 ===============
 
 """
+import bisect
+
+import numpy
+
 from TotalDepth.common.Rle import RLEItem, RLE
 
 __author__  = 'Paul Ross'
@@ -137,6 +141,9 @@ class RLEType01(RLE):
     def __init__(self, theXUnits, *args):
         super().__init__(*args)
         self._xUnits = theXUnits
+        # The frame number of the first frame in each entry in rle_items,
+        # this is maintained by add() and allows tellLrForFrame() to bisect.
+        self._frameStarts = []
         #logging.debug('RLEType01.__init__({:s}) {:s}'.format(theXUnits, repr(self)))
         
     def __str__(self):
@@ -166,25 +173,67 @@ class RLEType01(RLE):
         if len(self.rle_items) == 0 \
         or not self.rle_items[-1].add(tellLrPos, numFrameS, xAxisValue):
             #logging.debug('RLEType01.add(...) new RLEItemType01')
+            self._frameStarts.append(self.totalFrames())
             self.rle_items.append(RLEItemType01(tellLrPos, numFrameS, xAxisValue))
             #logging.debug('RLEType01.add(...) self._rleS now={:s}'.format(self))
 
     def tellLrForFrame(self, fNum):
         """Returns the (lr_seek, frame_offset) i.e. the Logical Record position
-        that contains the integer frame number and the number of excess frames."""
+        that contains the integer frame number and the number of excess frames.
+        This bisects the start frame of each entry so is O(log(len(self)))."""
         #logging.debug('RLEType01.tellLrForFrame({:d})'.format(fNum))
         if fNum < 0:
             raise IndexError('list index out of range')
-        for r in self.rle_items:
-            fNum, v = r.tellLrForFrame(fNum)
-            if v is not None:
-                return v[0], fNum
-        raise IndexError('list index out of range')
+        i = bisect.bisect_right(self._frameStarts, fNum) - 1
+        if i < 0:
+            raise IndexError('list index out of range')
+        r = self.rle_items[i]
+        fNum -= self._frameStarts[i]
+        if fNum >= r.totalFrames():
+            raise IndexError('list index out of range')
+        lrIdx, fOffs = divmod(fNum, r.numFrames)
+        return r.datum + lrIdx * r.stride, fOffs
+
+    def tellLrForFrames(self, theFrSl=None):
+        """Returns a map of {lr_seek : numpy array of frame offsets, ...} for
+        the frames in the slice, or all frames if theFrSl is None. This is
+        the same as calling tellLrForFrame() for each frame and grouping the
+        results but is done with numpy operations.
+        May raise IndexError if any frame is out of range."""
+        totalFrames = self.totalFrames()
+        if theFrSl is None:
+            theFrSl = slice(0, totalFrames, 1)
+        myFrames = numpy.arange(
+            theFrSl.start or 0,
+            totalFrames if theFrSl.stop is None else theFrSl.stop,
+            theFrSl.step or 1,
+            dtype=numpy.int64,
+        )
+        if len(myFrames) == 0:
+            return {}
+        if myFrames.min() < 0 or myFrames.max() >= totalFrames:
+            raise IndexError('list index out of range')
+        myStarts = numpy.array(self._frameStarts, dtype=numpy.int64)
+        myIdx = numpy.searchsorted(myStarts, myFrames, side='right') - 1
+        myNumFrames = numpy.array([r.numFrames for r in self.rle_items], dtype=numpy.int64)[myIdx]
+        myLrIdx, myOffsets = numpy.divmod(myFrames - myStarts[myIdx], myNumFrames)
+        mySeeks = numpy.array([r.datum for r in self.rle_items], dtype=numpy.int64)[myIdx] \
+            + numpy.array([r.stride for r in self.rle_items], dtype=numpy.int64)[myIdx] * myLrIdx
+        # Group the offsets by seek position preserving the frame order within each group
+        myOrder = numpy.argsort(mySeeks, kind='stable')
+        mySeeks = mySeeks[myOrder]
+        mySplits = numpy.flatnonzero(numpy.diff(mySeeks)) + 1
+        return {
+            int(mySeeks[i]) : offsets
+            for i, offsets in zip(numpy.concatenate(([0], mySplits)), numpy.split(myOffsets[myOrder], mySplits))
+        }
 
     def totalFrames(self):
         """Returns the total number of frames in this RLE object."""
         #logging.debug('RLEType01.totalFrames() self._rleS={:s}'.format(self))
-        return sum([r.totalFrames() for r in self.rle_items])
+        if len(self.rle_items) == 0:
+            return 0
+        return self._frameStarts[-1] + self.rle_items[-1].totalFrames()
 
     def xAxisFirst(self):
         """Returns the first X-axis value loaded or None if nothing loaded."""
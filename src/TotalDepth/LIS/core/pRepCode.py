@@ -34,6 +34,8 @@ import logging
 import math
 import struct
 
+import numpy
+
 from TotalDepth.LIS import ExceptionTotalDepthLIS
 
 class ExceptionRepCode(ExceptionTotalDepthLIS):
@@ -760,3 +762,193 @@ def read79(theFile):
 #############################
 # End: Python reference code.
 #############################
+
+###################################
+# Section: numpy array conversions.
+###################################
+#: numpy dtypes of the raw words for each Rep Code, these match the STRUCT_RC_... objects.
+#: Dipmeter codes are treated as one unsigned byte per value.
+NUMPY_WORD_DTYPE_MAP = {
+    49 : numpy.dtype('>i2'),
+    50 : numpy.dtype('>i4'),
+    56 : numpy.dtype('i1'),
+    66 : numpy.dtype('u1'),
+    68 : numpy.dtype('>u4'),
+    70 : numpy.dtype('>i4'),
+    73 : numpy.dtype('>i4'),
+    77 : numpy.dtype('u1'),
+    79 : numpy.dtype('>i2'),
+    DIPMETER_EDIT_TAPE_REP_CODE : numpy.dtype('u1'),
+    DIPMETER_CSU_FIELD_TAPE_REP_CODE : numpy.dtype('u1'),
+}
+
+def from49Array(theWords):
+    """Returns a numpy array of doubles from a numpy array of Rep code 49 words, see from49()."""
+    w = theWords.astype(numpy.int64) & 0xFFFF
+    m = w & 0xFFF0
+    m -= numpy.where(w & 0x8000, 0x10000, 0)
+    return numpy.ldexp(m / (1.0 * (1<<15)), (w & 0xF).astype(numpy.int32))
+
+def from50Array(theWords):
+    """Returns a numpy array of doubles from a numpy array of Rep code 50 words, see from50()."""
+    w = theWords.astype(numpy.int64) & 0xFFFFFFFF
+    mant = w & 0xFFFF
+    mant -= numpy.where(w & 0x8000, 0x10000, 0)
+    exp = ((w >> 16) & 0x03FF) - 15
+    exp -= numpy.where(w & 0x80000000, 0x10000, 0)
+    return numpy.ldexp(mant.astype(numpy.float64), exp.astype(numpy.int32))
+
+def from68Array(theWords):
+    """Returns a numpy array of doubles from a numpy array of Rep code 68 words, see from68()."""
+    w = theWords.astype(numpy.int64) & 0xFFFFFFFF
+    isNeg = (w & 0x80000000) != 0
+    mant = (w & 0x007FFFFF) - numpy.where(isNeg, 0x00800000, 0)
+    exp = (w & 0x7F800000) >> 23
+    exp = numpy.where(isNeg, 104 - exp, exp - 151)
+    return numpy.ldexp(mant.astype(numpy.float64), exp.astype(numpy.int32))
+
+def from70Array(theWords):
+    """Returns a numpy array of doubles from a numpy array of Rep code 70 words, see from70()."""
+    w = theWords.astype(numpy.int64) & 0xFFFFFFFF
+    retVal = ((w >> 16) & 0xFFFF) + (w & 0xFFFF) / (1 << 16)
+    retVal -= numpy.where(w & 0x80000000, 0x10000, 0)
+    return retVal
+
+def fromIntArray(theWords):
+    """Returns a numpy array of doubles from a numpy array of integer words such as Rep codes 56, 66, 73, 77, 79."""
+    return theWords.astype(numpy.float64)
+
+FROM_ARRAY_DESPATCH_MAP = {
+    49 : from49Array,
+    50 : from50Array,
+    56 : fromIntArray,
+    66 : fromIntArray,
+    68 : from68Array,
+    70 : from70Array,
+    73 : fromIntArray,
+    77 : fromIntArray,
+    79 : fromIntArray,
+    DIPMETER_EDIT_TAPE_REP_CODE : fromIntArray,
+    DIPMETER_CSU_FIELD_TAPE_REP_CODE : fromIntArray,
+}
+
+def hasArrayConverter(r):
+    """Returns True if the Rep Code can be converted in bulk by fromArray()."""
+    return r in FROM_ARRAY_DESPATCH_MAP
+
+def fromArray(theRc, theWords):
+    """Returns a numpy array of doubles from a numpy array of words of the given Rep Code.
+    theWords is typically created by viewing raw bytes with NUMPY_WORD_DTYPE_MAP[theRc].
+    May raise ExceptionRepCodeUnknown."""
+    try:
+        return FROM_ARRAY_DESPATCH_MAP[theRc](theWords)
+    except KeyError:
+        raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+
+def _stridedWords(theRc, theBuffer, theCount, theStride):
+    """Returns a numpy array of theCount words of Rep Code theRc from theBuffer, each theStride bytes apart.
+    May raise ExceptionRepCode."""
+    try:
+        myDtype = NUMPY_WORD_DTYPE_MAP[theRc]
+    except KeyError:
+        raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+    if theCount < 0 or theStride < myDtype.itemsize:
+        raise ExceptionRepCode('Illegal count {:d} or stride {:d} for representation code: {:d}'.format(
+            theCount, theStride, theRc)
+        )
+    if theCount == 0:
+        return numpy.empty(0, dtype=myDtype)
+    if len(theBuffer) < (theCount - 1) * theStride + myDtype.itemsize:
+        raise ExceptionRepCode('Buffer of {:d} bytes too short for {:d} words with stride {:d}'.format(
+            len(theBuffer), theCount, theStride)
+        )
+    myRaw = numpy.lib.stride_tricks.as_strided(
+        numpy.frombuffer(theBuffer, dtype=numpy.uint8),
+        shape=(theCount, myDtype.itemsize),
+        strides=(theStride, 1),
+        writeable=False,
+    )
+    return numpy.ascontiguousarray(myRaw).view(myDtype).reshape(theCount)
+
+def readBytesArray(theRc, theBuffer, theCount, theStride, theOut):
+    """Decodes theCount values of Rep Code theRc from the bytes like object theBuffer into the first theCount
+    elements of the preallocated float64 array theOut. The values start at theBuffer[0] and are theStride bytes
+    apart, theStride being the word length for contiguous values.
+    May raise ExceptionRepCode."""
+    if len(theOut) < theCount:
+        raise ExceptionRepCode('Output array of length {:d} too short for {:d} values'.format(len(theOut), theCount))
+    theOut[:theCount] = fromArray(theRc, _stridedWords(theRc, theBuffer, theCount, theStride))
+
+def to68Array(theValues):
+    """Returns a numpy array of Rep Code 68 words from a numpy array of doubles, see to68().
+    May raise ExceptionRepCode if any value is NaN, to68() raises ValueError for a NaN."""
+    v = numpy.asarray(theValues, dtype=numpy.float64)
+    if numpy.isnan(v).any():
+        raise ExceptionRepCode('NaN values for representation code 68')
+    mant, expOrig = numpy.frexp(v)
+    exp = expOrig.astype(numpy.int64)
+    # If exponent is <128 then reduce mantissa by excess 128
+    isSmall = exp < -128
+    # Large values overflow here but those results are discarded.
+    with numpy.errstate(over='ignore'):
+        mant = numpy.where(isSmall, numpy.ldexp(mant, (exp + 128).astype(numpy.int32)), mant)
+    exp = numpy.where(isSmall, -128, exp)
+    # Set exponent as excess 128 and the sign bit
+    isNeg = v < 0.0
+    exp = numpy.where(isNeg, 127 - exp, exp - 128)
+    w = numpy.where(isNeg, 1 << 31, 0)
+    w |= (exp & 0xFF) << 23
+    w |= numpy.trunc(mant * (1 << 23)).astype(numpy.int64) & 0x007FFFFF
+    # Overflow and underflow control
+    w = numpy.where(expOrig <= -(128+23), RC_68_CODE_ZERO, w)
+    w = numpy.where(expOrig > 127, numpy.where(isNeg, RC_68_CODE_MIN, RC_68_CODE_MAX), w)
+    return w
+
+def toIntArray(theRc, theValues):
+    """Returns a numpy array of integer words from a numpy array of values for Rep codes 56, 66, 73, 77, 79.
+    Values are truncated towards zero. May raise ExceptionRepCode if any value is out of range or NaN."""
+    w = numpy.trunc(numpy.asarray(theValues, dtype=numpy.float64))
+    if not numpy.all((w >= RC_MIN_MAP[theRc]) & (w <= RC_MAX_MAP[theRc])):
+        raise ExceptionRepCode('Values out of range for representation code {:d}'.format(theRc))
+    return w.astype(numpy.int64)
+
+#: Rep Codes that writeBytesArray() can encode with toIntArray()
+TO_INT_ARRAY_REP_CODES = (56, 66, 73, 77, 79)
+
+def toArray(theRc, theValues):
+    """Returns a numpy array of words of the given Rep Code from a numpy array of values.
+    May raise ExceptionRepCodeUnknown or ExceptionRepCode."""
+    if theRc == 68:
+        return to68Array(theValues)
+    elif theRc in TO_INT_ARRAY_REP_CODES:
+        return toIntArray(theRc, theValues)
+    raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+
+def writeBytesArray(theRc, theValues, theCount, theStride, theOut):
+    """Encodes the first theCount values of theValues as Rep Code theRc into the writable bytes like object
+    theOut, for example a bytearray. The words start at theOut[0] and are theStride bytes apart, bytes between the
+    words are unchanged.
+    May raise ExceptionRepCode, this includes NaN values and in that case nothing is written."""
+    if theRc != 68 and theRc not in TO_INT_ARRAY_REP_CODES:
+        raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+    myDtype = NUMPY_WORD_DTYPE_MAP[theRc]
+    if theCount < 0 or theStride < myDtype.itemsize or len(theValues) < theCount:
+        raise ExceptionRepCode('Illegal count {:d} or stride {:d} for representation code: {:d}'.format(
+            theCount, theStride, theRc)
+        )
+    if theCount == 0:
+        return
+    if len(theOut) < (theCount - 1) * theStride + myDtype.itemsize:
+        raise ExceptionRepCode('Buffer of {:d} bytes too short for {:d} words with stride {:d}'.format(
+            len(theOut), theCount, theStride)
+        )
+    myWords = toArray(theRc, theValues[:theCount]).astype(myDtype).view(numpy.uint8).reshape(theCount, myDtype.itemsize)
+    myRaw = numpy.lib.stride_tricks.as_strided(
+        numpy.frombuffer(theOut, dtype=numpy.uint8),
+        shape=(theCount, myDtype.itemsize),
+        strides=(theStride, 1),
+    )
+    myRaw[:] = myWords
+#################################
+# End: numpy array conversions.
+#################################
@@ -22,7 +22,7 @@ Representation Codes ('RepCodes').
 
 Internal types are double, int or string.
 """
-cdef extern from "math.h":
+cdef extern from "math.h" nogil:
     double ldexp(double m, int exp)
     double frexp(double v, int *exp)
     double HUGE_VAL
@@ -162,4 +162,213 @@ def from79(signed short int theWord):
 # End: Specific Representation Codes
 ########################################
 
+########################################
+# Section: Array conversions
+########################################
+# These decode or encode a strided run of values with the GIL released, see
+# pRepCode.readBytesArray() and pRepCode.writeBytesArray() for the reference
+# implementations that these replace.
+cimport cython
+
+from TotalDepth.LIS.core.pRepCode import ExceptionRepCode, ExceptionRepCodeUnknown
+
+cdef inline unsigned int _word16(const unsigned char *p) nogil:
+    return (p[0] << 8) | p[1]
+
+cdef inline unsigned int _word32(const unsigned char *p) nogil:
+    return (<unsigned int> p[0] << 24) | (p[1] << 16) | (p[2] << 8) | p[3]
+
+cdef inline void _setWord16(unsigned char *p, unsigned int w) nogil:
+    p[0] = (w >> 8) & 0xFF
+    p[1] = w & 0xFF
+
+cdef inline void _setWord32(unsigned char *p, unsigned int w) nogil:
+    p[0] = (w >> 24) & 0xFF
+    p[1] = (w >> 16) & 0xFF
+    p[2] = (w >> 8) & 0xFF
+    p[3] = w & 0xFF
+
+cdef inline double _from49(unsigned int w) nogil:
+    cdef int mant = w & 0xFFF0
+    if w & 0x8000:
+        mant -= 0x10000
+    return ldexp(mant / 32768.0, w & 0x0F)
+
+cdef inline double _from50(unsigned int w) nogil:
+    cdef int mant = w & 0xFFFF
+    cdef int exp = ((w >> 16) & 0x03FF) - 15
+    if w & 0x8000:
+        mant -= 0x10000
+    if w & 0x80000000U:
+        exp -= 0x10000
+    return ldexp(mant, exp)
+
+cdef inline double _from68(unsigned int w) nogil:
+    cdef int mant = w & 0x007FFFFF
+    cdef int exp = (w & 0x7F800000) >> 23
+    if w & 0x80000000U:
+        mant -= 0x00800000
+        exp = 104 - exp
+    else:
+        exp -= 151
+    return ldexp(mant, exp)
+
+cdef inline double _from70(unsigned int w) nogil:
+    cdef double val = (w >> 16) & 0xFFFF
+    val += (w & 0xFFFF) / 65536.0
+    if w & 0x80000000U:
+        val -= 0x10000
+    return val
+
+cdef inline unsigned int _to68(double v) nogil:
+    cdef unsigned int w = 0
+    cdef int exp = 0
+    cdef double mant = frexp(v, &exp)
+    if exp <= -(128+23):
+        return 0x40000000
+    elif exp > 127:
+        if v < 0:
+            return 0xFFC00000U
+        return 0x7FFFFFFFU
+    if exp < -128:
+        mant = ldexp(mant, exp + 128)
+        exp = -128
+    if v < 0.0:
+        exp = 127 - exp
+        w = 1
+    else:
+        exp -= 128
+        w = 0
+    w <<= 8
+    w |= exp & 0xFF
+    w <<= 23
+    w |= (<int> (mant * (1<<23))) & 0x007FFFFF
+    return w
 
+cdef int _wordLength(int rc):
+    """Returns the word length in bytes or -1 if the Rep Code is not supported."""
+    if rc in (56, 66, 77, 130, 234):
+        return 1
+    elif rc in (49, 79):
+        return 2
+    elif rc in (50, 68, 70, 73):
+        return 4
+    return -1
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def readBytesArray(int theRc, const unsigned char[:] theBuffer, Py_ssize_t theCount, Py_ssize_t theStride,
+                   double[:] theOut):
+    """Decodes theCount values of Rep Code theRc from the bytes like object theBuffer into the first theCount
+    elements of the preallocated float64 array theOut. The values start at theBuffer[0] and are theStride bytes
+    apart, theStride being the word length for contiguous values.
+    May raise ExceptionRepCode."""
+    cdef int wordLen = _wordLength(theRc)
+    cdef Py_ssize_t i
+    cdef const unsigned char *p
+    if wordLen < 0:
+        raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+    if theCount < 0 or theStride < wordLen:
+        raise ExceptionRepCode('Illegal count {:d} or stride {:d} for representation code: {:d}'.format(
+            theCount, theStride, theRc)
+        )
+    if theCount == 0:
+        return
+    if theOut.shape[0] < theCount:
+        raise ExceptionRepCode('Output array of length {:d} too short for {:d} values'.format(theOut.shape[0], theCount))
+    if theBuffer.shape[0] < (theCount - 1) * theStride + wordLen:
+        raise ExceptionRepCode('Buffer of {:d} bytes too short for {:d} words with stride {:d}'.format(
+            theBuffer.shape[0], theCount, theStride)
+        )
+    with nogil:
+        p = &theBuffer[0]
+        for i in range(theCount):
+            if theRc == 68:
+                theOut[i] = _from68(_word32(p))
+            elif theRc == 49:
+                theOut[i] = _from49(_word16(p))
+            elif theRc == 50:
+                theOut[i] = _from50(_word32(p))
+            elif theRc == 56:
+                theOut[i] = <signed char> p[0]
+            elif theRc == 70:
+                theOut[i] = _from70(_word32(p))
+            elif theRc == 73:
+                theOut[i] = <signed int> _word32(p)
+            elif theRc == 79:
+                theOut[i] = <signed short> _word16(p)
+            else:
+                # 66, 77 and the dipmeter codes
+                theOut[i] = p[0]
+            p += theStride
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def writeBytesArray(int theRc, const double[:] theValues, Py_ssize_t theCount, Py_ssize_t theStride,
+                    unsigned char[:] theOut):
+    """Encodes the first theCount values of theValues as Rep Code theRc into the writable bytes like object
+    theOut, for example a bytearray. The words start at theOut[0] and are theStride bytes apart, bytes between the
+    words are unchanged.
+    May raise ExceptionRepCode, this includes NaN values and in that case nothing is written."""
+    cdef int wordLen
+    cdef Py_ssize_t i
+    cdef unsigned char *p
+    cdef double minVal = 0, maxVal = 0
+    cdef bint outOfRange = False
+    cdef bint isNaN = False
+    if theRc == 68:
+        wordLen = 4
+    elif theRc == 56:
+        wordLen, minVal, maxVal = 1, -128, 127
+    elif theRc in (66, 77):
+        wordLen, minVal, maxVal = 1, 0, 255
+    elif theRc == 73:
+        wordLen, minVal, maxVal = 4, -2147483648, 2147483647
+    elif theRc == 79:
+        wordLen, minVal, maxVal = 2, -32768, 32767
+    else:
+        raise ExceptionRepCodeUnknown('No array converter for representation code: {:s}'.format(str(theRc)))
+    if theCount < 0 or theStride < wordLen or theValues.shape[0] < theCount:
+        raise ExceptionRepCode('Illegal count {:d} or stride {:d} for representation code: {:d}'.format(
+            theCount, theStride, theRc)
+        )
+    if theCount == 0:
+        return
+    if theOut.shape[0] < (theCount - 1) * theStride + wordLen:
+        raise ExceptionRepCode('Buffer of {:d} bytes too short for {:d} words with stride {:d}'.format(
+            theOut.shape[0], theCount, theStride)
+        )
+    with nogil:
+        if theRc == 68:
+            # NaN has no Rep Code 68 representation, check all values before writing any
+            for i in range(theCount):
+                if theValues[i] != theValues[i]:
+                    isNaN = True
+                    break
+        else:
+            # Range check all integer values before writing any
+            for i in range(theCount):
+                # Values are truncated towards zero, this also rejects NaN
+                if not (minVal - 1 < theValues[i] < maxVal + 1):
+                    outOfRange = True
+                    break
+        if not (outOfRange or isNaN):
+            p = &theOut[0]
+            for i in range(theCount):
+                if theRc == 68:
+                    _setWord32(p, _to68(theValues[i]))
+                elif wordLen == 1:
+                    p[0] = (<long long> theValues[i]) & 0xFF
+                elif wordLen == 2:
+                    _setWord16(p, (<long long> theValues[i]) & 0xFFFF)
+                else:
+                    _setWord32(p, (<long long> theValues[i]) & 0xFFFFFFFFU)
+                p += theStride
+    if outOfRange:
+        raise ExceptionRepCode('Values out of range for representation code {:d}'.format(theRc))
+    if isNaN:
+        raise ExceptionRepCode('NaN values for representation code {:d}'.format(theRc))
+
+########################################
+# End: Array conversions
+########################################
@@ -33,6 +33,7 @@ import os
 import logging
 import multiprocessing
 import collections
+import functools
 import traceback
 #from optparse import OptionParser
 
@@ -56,6 +57,7 @@ from TotalDepth.util import DictTree
 from TotalDepth.util import DirWalk
 from TotalDepth.util import XmlWrite
 from TotalDepth.common import cmn_cmd_opts
+from TotalDepth.common import schedule
 
 CSS_CONTENT_INDEX = """body {
 font-size:      12px;
@@ -98,7 +100,7 @@ th, td {
 """
 
 # The field names are not (yet) used.
-IndexTableValue = collections.namedtuple('IndexTableValue', 'scale evFirst evLast evInterval curves numPoints outPath')
+IndexTableValue = collections.namedtuple('IndexTableValue', 'scale evFirst evLast evInterval curves numPoints time outPath')
 
 class PlotLogInfo(object):
     """Class that collates information about the results of plotting log passes.
@@ -107,8 +109,8 @@ class PlotLogInfo(object):
     def __init__(self):
         # So here the essential data that we have to put in the index.html is:
         # A list of tuples of:
-        # (theInPath, theLpIdx, theFilmID, IndexTableValue(theScale, theEvFirst, theEvLast, evInterval, theCurveS, theOutPath))
-        # as: (str,     int,       str,    IndexTableValue(number,    EngVal,     EngVal,  [str, ...], str))
+        # (theInPath, theLpIdx, theFilmID, IndexTableValue(theScale, theEvFirst, theEvLast, evInterval, theCurveS, ptsPlotted, theTime, theOutPath))
+        # as: (str,     int,       str,    IndexTableValue(number,    EngVal,     EngVal,  [str, ...], int, str, str))
         self._plotS = []
         self._lisBytes = 0
         self.lisFileCntr = 0
@@ -116,6 +118,8 @@ class PlotLogInfo(object):
         self.logPassCntr = 0
         self.plotCntr = 0
         self.curvePoints = 0
+        # Total time in seconds spent rendering plots
+        self.plotTime = 0.0
         # List of EngVal objects that accumulate the number of 'curve feet'
         self._intervalCntrS = []
         
@@ -124,13 +128,14 @@ class PlotLogInfo(object):
         return self._intervalCntrS
         
     def __str__(self):
-        retL = ['PlotLogInfo {:s} Files={:d} Bytes={:d} LogPasses={:d} Plots={:d} Curve points={:d}'.format(
+        retL = ['PlotLogInfo {:s} Files={:d} Bytes={:d} LogPasses={:d} Plots={:d} Curve points={:d} Plot time={:.3f} (S)'.format(
                 repr(self),
                 self.lisFileCntr+self.lasFileCntr,
                 self._lisBytes,
                 self.logPassCntr,
                 self.plotCntr,
-                self.curvePoints
+                self.curvePoints,
+                self.plotTime,
             )
         ]
         for l in sorted(self._plotS):
@@ -147,11 +152,12 @@ class PlotLogInfo(object):
         self.logPassCntr += other.logPassCntr
         self.plotCntr += other.plotCntr
         self.curvePoints += other.curvePoints
+        self.plotTime += other.plotTime
         for anI in other.intervals:
             self._addInterval(anI)
         return self
     
-    def addPlotResult(self, theInPath, theOutPath, theLpIdx, theFilmID, theScale, theEvFirst, theEvLast, theCurveS, ptsPlotted):
+    def addPlotResult(self, theInPath, theOutPath, theLpIdx, theFilmID, theScale, theEvFirst, theEvLast, theCurveS, ptsPlotted, theTime=0.0):
         """Adds a successful plot.
         theInPath - The file path to the input file.
         theOutPath - The file path to the output file.
@@ -162,6 +168,7 @@ class PlotLogInfo(object):
         theEvLast - The last X axis as an EngVal.
         theCurveS - A list of Mnem of the curves plotted.
         ptsPlotted - Number of points plotted.
+        theTime - Time in seconds taken to render the plot.
         """
         myInterval = theEvLast - theEvFirst
         self._plotS.append(
@@ -176,6 +183,7 @@ class PlotLogInfo(object):
                     myInterval.newEngValInOpticalUnits().strFormat('{:.1f}', incPrefix=False),
                     ', '.join(sorted([c.pStr() for c in theCurveS])),
                     ptsPlotted,
+                    '{:.3f}'.format(theTime),
                     theOutPath,
                 )
             )
@@ -187,6 +195,7 @@ class PlotLogInfo(object):
             pass
         self.plotCntr += 1
         self.curvePoints += ptsPlotted
+        self.plotTime += theTime
         # Add interval counter
         if theEvFirst > theEvLast:
             # Decreasing log
@@ -270,7 +279,7 @@ class PlotLogInfo(object):
         assert(theVal is not None)
         for i, aVal in enumerate(theVal):
             myValAttrs = {}
-            if i in (4, 6):
+            if i in (4, len(theVal)-1):
                 # Curve list and link
                 myValAttrs = {'align' : 'left'}
             else:
@@ -284,7 +293,7 @@ class PlotLogInfo(object):
 
     def _writeHTMLTh(self, theS):
         with XmlWrite.Element(theS, 'tr'):
-            for aTh in ('Input', 'Pass', 'Film', 'Scale', 'From', 'To', 'Interval', 'Curves', 'Points', 'Plot'):
+            for aTh in ('Input', 'Pass', 'Film', 'Scale', 'From', 'To', 'Interval', 'Curves', 'Points', 'Time (S)', 'Plot'):
                 with XmlWrite.Element(theS, 'th'):
                     theS.characters(aTh)
     
@@ -318,6 +327,11 @@ class PlotLogPasses(object):
 
         apiHeader is a flag to control whether a API header is extracted from CONS tables
             is to be plotted on the top of the log.
+
+        dpi if non-zero decimates the curves to the minimum/maximum in each pixel at this resolution.
+
+        plotJobs is the number of processes used to render the plots of each log pass concurrently,
+            zero uses the number of native CPUs.
         """
         self._fpIn = fpIn
         self._fpOut = fpOut
@@ -330,6 +344,12 @@ class PlotLogPasses(object):
         self._apiHeader = opts.apiHeader
         self._lgFormatMinCurves = opts.LgFormat_min
         self._scale = opts.scale
+        self._dpi = getattr(opts, 'dpi', 0)
+        myPlotJobs = getattr(opts, 'plotJobs', 1)
+        if myPlotJobs < 1:
+            self._plotJobs = multiprocessing.cpu_count()
+        else:
+            self._plotJobs = myPlotJobs
         self.plotLogInfo = PlotLogInfo()
         self._processPath(self._fpIn, self._fpOut)
         
@@ -463,7 +483,7 @@ class PlotLogPasses(object):
             myLrPip = TotalDepth.LIS.core.LogiRec.LrTableRead(theFi)
         else:
             myLrPip = None
-        myPlot = Plot.PlotReadLIS(myLrFilm, myLrPres, myLrArea, myLrPip, self._scale)
+        myPlot = Plot.PlotReadLIS(myLrFilm, myLrPres, myLrArea, myLrPip, self._scale, self._dpi)
         return myPlot, thePrs.logPass, self._retCONSRecS(theFi, thePrs)
     
     def _retCONSRecS(self, theFi, thePrs):
@@ -486,45 +506,22 @@ class PlotLogPasses(object):
         theFpOut - Output file path for the SVG file(s), one per FILM ID.
         """
         myPlot, myLogPass, myCONSRecS = self._retPlotFromIntPlotRecordSet(theFi, thePrs)
+        myPlotS = []
         for aFilmId in myPlot.filmIdS():
             logging.info('PlotLogPasses._plotUsingLISLogicalRecords(): FILM ID={:s}.'.format(aFilmId.pStr(strip=True)))
             if myPlot.hasDataToPlotLIS(myLogPass, aFilmId):
                 myOutFilePath = '{:s}_{:04d}_{:s}.svg'.format(theFpOut, theLpIdx, aFilmId.pStr(strip=True))
-#                myFout = open(myOutFilePath, 'w')
-                myCurvIDs, numPoints = myPlot.plotLogPassLIS(
-                        theFi,
-                        myLogPass,
-                        myLogPass.xAxisFirstEngVal,
-                        myLogPass.xAxisLastEngVal,
-                        aFilmId,
-                        myOutFilePath,
-#                        myFout,
-                        frameStep=1,
-                        title="Plot: {:s} LogPass: {:d} FILM ID={:s}".format(
-                            os.path.abspath(myOutFilePath),
-                            theLpIdx,
-                            aFilmId.pStr(strip=True),
-                        ),
-                        lrCONS=myCONSRecS,
-                    )
-                assert(myCurvIDs is not None and numPoints is not None)
-                # So here the essential data that we have to put in the index.html is:
-                # Key: myOutFilePath or input file fp, lpIdx, aFilmId,
-                # Value: (myPlot.xScale(aFilmId), myLogPass.xAxisFirstEngVal, myLogPass.xAxisLastEngVal, myCurvIDs)
-                self.plotLogInfo.addPlotResult(
-                    theFi.fileId,
-                    myOutFilePath,
+                myTitle = "Plot: {:s} LogPass: {:d} FILM ID={:s}".format(
+                    os.path.abspath(myOutFilePath),
                     theLpIdx,
-                    aFilmId.pStr(),
-                    myPlot.xScale(aFilmId),
-                    myLogPass.xAxisFirstEngVal,
-                    myLogPass.xAxisLastEngVal,
-                    theCurveS=myCurvIDs,
-                    ptsPlotted=numPoints)
+                    aFilmId.pStr(strip=True),
+                )
+                myPlotS.append((myPlot, aFilmId, aFilmId.pStr(), myOutFilePath, myTitle))
             else:
                 logging.info(
                     'PlotLogPasses._plotUsingLISLogicalRecords(): No data to plot for FILM ID {!r:s}'.format(aFilmId)
                 )
+        self._plotLIS(theFi, theLpIdx, myLogPass, myPlotS, myCONSRecS)
     #=================================================================
     # End: Plotting LIS using LIS Logical Records to specify the plot.
     #=================================================================
@@ -536,7 +533,7 @@ class PlotLogPasses(object):
         assert(len(self._lgFormatS) > 0)
         assert(theUniqueId in self._lgFormatS)
         myFcfg = FILMCfgXML.FilmCfgXMLRead()
-        return Plot.PlotReadXML(myFcfg[theUniqueId], self._scale), theIdxLogPass.logPass
+        return Plot.PlotReadXML(myFcfg[theUniqueId], self._scale, self._dpi), theIdxLogPass.logPass
     
     def _retOutPathTitle(self, theFpOut, theLpIdx, aUniqueId):
         fp = '{:s}_{:04d}_{:s}.svg'.format(theFpOut, theLpIdx, aUniqueId)
@@ -564,6 +561,59 @@ class PlotLogPasses(object):
             return myLgUidS 
         return self._lgFormatS
             
+    def _plotLIS(self, theFi, theLpIdx, theLogPass, thePlotS, theCONSRecS):
+        """Plots a LogPass from a LIS file and adds the results to self.plotLogInfo.
+        theFi - the LIS File object.
+        theLpIdx - integer for the LogPass in the LIS File.
+        theLogPass - the LogPass.
+        thePlotS - a list of (Plot, FILM ID, FILM ID as a string, output path, title),
+            one for each plot that has data.
+        theCONSRecS - a list of CONS Logical Records for the API header or None.
+
+        The FrameSet is loaded once with the union of the channels needed by all
+        the plots then the plots are rendered from it, concurrently if required.
+        """
+        if len(thePlotS) == 0:
+            return
+        myChIdS = []
+        for aPlot, aFilmId, _idStr, _fp, _title in thePlotS:
+            for aChId in aPlot.outputChIDsLIS(theLogPass, aFilmId):
+                if aChId not in myChIdS:
+                    myChIdS.append(aChId)
+        theLogPass.setFrameSetChX(theFi, myChIdS, theLogPass.xAxisFirstEngVal, theLogPass.xAxisLastEngVal)
+        myFnS = [
+            functools.partial(
+                aPlot.plotLogPassLIS,
+                theFi,
+                theLogPass,
+                theLogPass.xAxisFirstEngVal,
+                theLogPass.xAxisLastEngVal,
+                aFilmId,
+                myOutFilePath,
+                frameStep=1,
+                title=myTitle,
+                lrCONS=theCONSRecS,
+            )
+            for aPlot, aFilmId, _idStr, myOutFilePath, myTitle in thePlotS
+        ]
+        for (aPlot, aFilmId, myIdStr, myOutFilePath, _title), ((myCurvIDs, numPoints), myTime) \
+                in zip(thePlotS, renderPlots(myFnS, self._plotJobs)):
+            assert(myCurvIDs is not None and numPoints is not None)
+            # So here the essential data that we have to put in the index.html is:
+            # Key: myOutFilePath or input file fp, lpIdx, aFilmId,
+            # Value: (myPlot.xScale(aFilmId), myLogPass.xAxisFirstEngVal, myLogPass.xAxisLastEngVal, myCurvIDs)
+            self.plotLogInfo.addPlotResult(
+                theFi.fileId,
+                myOutFilePath,
+                theLpIdx,
+                myIdStr,
+                aPlot.xScale(aFilmId),
+                theLogPass.xAxisFirstEngVal,
+                theLogPass.xAxisLastEngVal,
+                theCurveS=myCurvIDs,
+                ptsPlotted=numPoints,
+                theTime=myTime)
+            
     #=============================================
     # End: Plotting using XML files - common code.
     #=============================================
@@ -583,39 +633,16 @@ class PlotLogPasses(object):
         assert(not self.usesInternalRecords)
         logging.debug('PlotLogPasses._plotLISUsingLgFormats(): PlotRecords={:s}.'.format(str(thePrs)))
         myCONSRecS = self._retCONSRecS(theFi, thePrs)
+        myPlotS = []
         for aUniqueId in self._retUniqueIdS(thePrs.logPass):
             logging.info('PlotLogPasses._plotLISUsingLgFormats(): UniqueId={:s}.'.format(aUniqueId))
-            myPlot = Plot.PlotReadXML(aUniqueId, self._scale)
+            myPlot = Plot.PlotReadXML(aUniqueId, self._scale, self._dpi)
             if myPlot.hasDataToPlotLIS(thePrs.logPass, aUniqueId):
-                # Create output path and plot it
                 myOutFilePath, myTitle = self._retOutPathTitle(theFpOut, theLpIdx, aUniqueId)
-                myCurvIDs, numPoints = myPlot.plotLogPassLIS(
-                        theFi,
-                        thePrs.logPass,
-                        thePrs.logPass.xAxisFirstEngVal,
-                        thePrs.logPass.xAxisLastEngVal,
-                        aUniqueId,
-                        myOutFilePath,
-                        frameStep=1,
-                        title=myTitle,
-                        lrCONS=myCONSRecS,
-                    )
-                assert(myCurvIDs is not None and numPoints is not None)
-                # So here the essential data that we have to put in the index.html is:
-                # Key: myOutFilePath or input file fp, lpIdx, aFilmId,
-                # Value: (myPlot.xScale(aFilmId), myLogPass.xAxisFirstEngVal, myLogPass.xAxisLastEngVal, myCurvIDs)
-                self.plotLogInfo.addPlotResult(
-                    theFi.fileId,
-                    myOutFilePath,
-                    theLpIdx,
-                    aUniqueId,
-                    myPlot.xScale(aUniqueId),
-                    thePrs.logPass.xAxisFirstEngVal,
-                    thePrs.logPass.xAxisLastEngVal,
-                    theCurveS=myCurvIDs,
-                    ptsPlotted=numPoints)
+                myPlotS.append((myPlot, aUniqueId, aUniqueId, myOutFilePath, myTitle))
             else:
                 logging.info('PlotLogPasses._plotLISUsingLgFormats(): No data to plot for FILM ID {:s}'.format(aUniqueId))
+        self._plotLIS(theFi, theLpIdx, thePrs.logPass, myPlotS, myCONSRecS)
     #=======================================================
     # End: Plotting LIS using XML files to specify the plot.
     #=======================================================
@@ -630,37 +657,46 @@ class PlotLogPasses(object):
         theFpOut - Output file path for the SVG file(s), one per XML UniqueId.
         """
         assert(not self.usesInternalRecords)
+        myPlotS = []
         for aUniqueId in self._retUniqueIdS(theLasFile):
             logging.info('PlotLogPasses._plotLASUsingLgFormats(): UniqueId={:s}.'.format(aUniqueId))
             # Note: Only one log pass per LAS file so index 0
             myOutFilePath, myTitle = self._retOutPathTitle(theFpOut, 0, aUniqueId)
-            myPlot = Plot.PlotReadXML(aUniqueId, self._scale)
+            myPlot = Plot.PlotReadXML(aUniqueId, self._scale, self._dpi)
             if myPlot.hasDataToPlotLAS(theLasFile, aUniqueId):
-                myCurvIDs, numPoints = myPlot.plotLogPassLAS(
-                    theLasFile,
-                    theLasFile.xAxisStart,
-                    theLasFile.xAxisStop,
-                    aUniqueId,
-                    myOutFilePath,
-                    frameStep=1,
-                    title=myTitle,
-                    plotHeader=self._apiHeader,
-                )
-#                logging.fatal('Plot curves: {:s} and points: {:s}'.format(str(myCurvIDs), str(numPoints)))
-                assert(myCurvIDs is not None and numPoints is not None)
-                # So here the essential data that we have to put in the index.html is:
-                # Key: myOutFilePath or input file fp, lpIdx, aFilmId,
-                # Value: (myPlot.xScale(aFilmId), myLogPass.xAxisFirstEngVal, myLogPass.xAxisLastEngVal, myCurvIDs)
-                self.plotLogInfo.addPlotResult(
-                    theLasFile.id,
-                    myOutFilePath,
-                    0,
-                    aUniqueId,
-                    myPlot.xScale(aUniqueId),
-                    theLasFile.xAxisStart,
-                    theLasFile.xAxisStop,
-                    theCurveS=myCurvIDs,
-                    ptsPlotted=numPoints)
+                myPlotS.append((myPlot, aUniqueId, myOutFilePath, myTitle))
+        myFnS = [
+            functools.partial(
+                aPlot.plotLogPassLAS,
+                theLasFile,
+                theLasFile.xAxisStart,
+                theLasFile.xAxisStop,
+                aUniqueId,
+                myOutFilePath,
+                frameStep=1,
+                title=myTitle,
+                plotHeader=self._apiHeader,
+            )
+            for aPlot, aUniqueId, myOutFilePath, myTitle in myPlotS
+        ]
+        for (aPlot, aUniqueId, myOutFilePath, _title), ((myCurvIDs, numPoints), myTime) \
+                in zip(myPlotS, renderPlots(myFnS, self._plotJobs)):
+#            logging.fatal('Plot curves: {:s} and points: {:s}'.format(str(myCurvIDs), str(numPoints)))
+            assert(myCurvIDs is not None and numPoints is not None)
+            # So here the essential data that we have to put in the index.html is:
+            # Key: myOutFilePath or input file fp, lpIdx, aFilmId,
+            # Value: (myPlot.xScale(aFilmId), myLogPass.xAxisFirstEngVal, myLogPass.xAxisLastEngVal, myCurvIDs)
+            self.plotLogInfo.addPlotResult(
+                theLasFile.id,
+                myOutFilePath,
+                0,
+                aUniqueId,
+                aPlot.xScale(aUniqueId),
+                theLasFile.xAxisStart,
+                theLasFile.xAxisStop,
+                theCurveS=myCurvIDs,
+                ptsPlotted=numPoints,
+                theTime=myTime)
     #=======================================================
     # End: Plotting LAS using XML files to specify the plot.
     #=======================================================
@@ -668,6 +704,56 @@ class PlotLogPasses(object):
 ################################
 # Section: Multiprocessing code.
 ################################
+# The functions of the current call to renderPlots(). Forked processes inherit
+# these, along with the frame data they refer to, so only the index and the
+# result are pickled.
+_RENDER_FUNCTIONS = []
+
+def _renderTimed(theFn):
+    """Returns the result of theFn() and the time taken in seconds."""
+    myStart = time.perf_counter()
+    myResult = theFn()
+    return myResult, time.perf_counter() - myStart
+
+def _renderIndex(theIdx):
+    return _renderTimed(_RENDER_FUNCTIONS[theIdx])
+
+def _canRenderConcurrently():
+    """True if renderPlots() can use a pool of forked processes."""
+    return 'fork' in multiprocessing.get_all_start_methods() \
+        and not multiprocessing.current_process().daemon
+
+def renderPlots(theFnS, jobs=1):
+    """Calls each of a list of functions that take no arguments, such as a
+    partial of Plot.plotLogPassLIS(), and returns a list of
+    (result, time in seconds) in the same order.
+    
+    If jobs > 1 the functions are called concurrently by a pool of forked
+    processes. The decoded frames are not copied into explicit shared memory,
+    instead the pool processes inherit the FrameSet already loaded by this
+    process through copy-on-write memory at fork time so only the function
+    index and the result cross the process boundary. The LIS FrameSet is an
+    arbitrary set of Python objects so this avoids serialising it.
+    
+    As this relies on fork the functions are called in turn, in this process,
+    if this platform can not fork or this is already a daemonic pool process
+    (from plotLogPassesMP() for example). That fallback is logged."""
+    global _RENDER_FUNCTIONS
+    if jobs > 1 and len(theFnS) > 1:
+        if _canRenderConcurrently():
+            _RENDER_FUNCTIONS = theFnS
+            try:
+                with multiprocessing.get_context('fork').Pool(processes=min(jobs, len(theFnS))) as myPool:
+                    return myPool.map(_renderIndex, range(len(theFnS)), chunksize=1)
+            finally:
+                _RENDER_FUNCTIONS = []
+        logging.info(
+            'renderPlots(): Can not fork a pool of {:d} processes, rendering {:d} plots serially.'.format(
+                jobs, len(theFnS)
+            )
+        )
+    return [_renderTimed(fn) for fn in theFnS]
+
 def processFile(fpIn, fpOut, opts):
     if not os.path.exists(os.path.dirname(fpOut)):
         try:
@@ -678,26 +764,24 @@ def processFile(fpIn, fpOut, opts):
     return myPlp.plotLogInfo
 
 def plotLogPassesMP(dIn, dOut, opts):
-    """Multiprocessing code to plot log passes. Returns a PlotLogInfo object."""
-    if opts.jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    else:
-        jobs = opts.jobs
-    logging.info('plotLogPassesMP(): Setting multi-processing jobs to %d' % jobs)
-    myPool = multiprocessing.Pool(processes=jobs)
+    """Multiprocessing code to plot log passes. Returns a PlotLogInfo object.
+    Files are plotted largest first within the budget of opts.task_memory
+    and opts.task_timeout, see schedule.imap_tasks()."""
     myTaskS = [
-        (t.filePathIn, t.filePathOut, opts) \
+        schedule.file_task(t.filePathIn, t.filePathOut, opts) \
             for t in DirWalk.dirWalk(dIn, dOut, opts.glob, opts.recurse, bigFirst=True)
     ]
     retResult = PlotLogInfo()
-    myResults = [
-        r.get() for r in [
-            myPool.apply_async(processFile, t) for t in myTaskS
-        ]
-    ]
-    for r in myResults:
-        # r is a PlotLogInfo object
-        retResult += r
+    for myTaskResult in schedule.imap_tasks(
+            processFile, myTaskS, opts.jobs,
+            memory_limit=schedule.memory_limit_from_args(opts), timeout=opts.task_timeout):
+        if myTaskResult.exception:
+            logging.error('plotLogPassesMP(): {:s} failed: {:s}'.format(
+                myTaskResult.task.args[0], myTaskResult.exception)
+            )
+        else:
+            # result is a PlotLogInfo object
+            retResult += myTaskResult.result
     return retResult
 ################################
 # End: Multiprocessing code.
@@ -714,6 +798,7 @@ def main():
     )
     cmn_cmd_opts.add_log_level(parser)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     parser.add_argument("-A", "--API", action="store_true", dest="apiHeader", default=False,
                       help="Put an API header on each plot. [default: False]")
     parser.add_argument("-x", "--xml", action="append", dest="LgFormat", default=[],
@@ -730,6 +815,12 @@ def main():
     #        help="File format to assume for the input, AUTO will do it's best. [default: \"AUTO\"].")
     parser.add_argument("-s", "--scale", action="append", type=int, dest="scale", default=0,
             help="Scale of X axis to use (an integer). [default: 0].")
+    parser.add_argument("-d", "--dpi", type=int, dest="dpi", default=0,
+            help="Decimate curves to the minimum/maximum in each pixel at this resolution in dots per inch,"
+                 " 0 plots every sample. [default: %(default)s].")
+    parser.add_argument("--plot-jobs", type=int, dest="plotJobs", default=1,
+            help="Max processes to render the plots of each log pass concurrently from the data loaded once."
+                 " Zero uses number of native CPUs. [default: %(default)s].")
     args = parser.parse_args()
     # Initialise logging etc.
     cmn_cmd_opts.set_log_level(args)
@@ -0,0 +1,241 @@
+"""Read RP66V1 files and saves the index in the binary index format, see :py:mod:`TotalDepth.RP66V1.core.BinaryIndex`.
+
+This is the equivalent of :py:mod:`TotalDepth.RP66V1.IndexPickle` but the index is much smaller and much faster to
+read back."""
+import logging
+import os
+import sys
+import time
+import typing
+
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1.IndexPickle import IndexResult
+from TotalDepth.RP66V1.core import BinaryIndex
+from TotalDepth.RP66V1.core import LogicalFile
+from TotalDepth.common import cmn_cmd_opts
+from TotalDepth.common import data_table
+from TotalDepth.common import manifest
+from TotalDepth.common import process
+from TotalDepth.common import schedule
+from TotalDepth.util import DirWalk
+from TotalDepth.util.DirWalk import dirWalk
+from TotalDepth.util.bin_file_type import binary_file_type_from_path
+
+
+__author__  = 'Paul Ross'
+__date__    = '2026-10-18'
+__version__ = '0.1.0'
+__rights__  = 'Copyright (c) 2019 Paul Ross. All rights reserved.'
+
+
+logger = logging.getLogger(__file__)
+
+
+#: Extension of the index directory.
+INDEX_EXTENSION = '.idx'
+
+
+def _index_outputs(path_index: str) -> typing.List[str]:
+    """The files in the index directory, these are recorded in the manifest."""
+    return [entry.path for entry in os.scandir(path_index) if entry.is_file()]
+
+
+def index_dir_multiprocessing(dir_in: str, dir_out: str, jobs: int,
+                              recurse: bool, read_back: bool, incremental: bool = False,
+                              memory_limit: int = 0, timeout: float = 0.0) -> typing.Dict[str, IndexResult]:
+    """Multiprocessing code to index RP66V1 files.
+    If incremental then files unchanged since the last run, as recorded in the manifest in dir_out, are skipped.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
+    Returns a dict of {path_in : IndexResult, ...}"""
+    assert os.path.isdir(dir_in)
+    with manifest.Manifest(dir_in, dir_out, 'IndexBinary', __version__, enabled=incremental) as mfst:
+        ret = {}
+        tasks = []
+        for t in DirWalk.dirWalk(dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True):
+            result = mfst.unchanged_result(t.filePathIn)
+            if result is None:
+                tasks.append(schedule.file_task(t.filePathIn, t.filePathOut, read_back))
+            else:
+                ret[t.filePathIn] = result
+        for task_result in schedule.imap_tasks(index_a_single_file, tasks, jobs,
+                                               memory_limit=memory_limit, timeout=timeout):
+            path_in, path_out, _read_back = task_result.task.args
+            if task_result.exception:
+                result = IndexResult(path_in, task_result.task.size, 0, 0.0, 0.0, 0.0, True, False)
+            else:
+                result = task_result.result
+                if not result.exception and not result.ignored and path_out:
+                    mfst.update(path_in, result, _index_outputs(path_out + INDEX_EXTENSION))
+            ret[path_in] = result
+    return ret
+
+
+def index_a_single_file(path_in: str, path_out: str, read_back: bool) -> IndexResult:
+    """Indexes a single file and writes the binary index to the directory path_out + INDEX_EXTENSION.
+    If path_out is empty the file is indexed but nothing is written."""
+    bin_file_type = binary_file_type_from_path(path_in)
+    if bin_file_type in BINARY_FILE_TYPES:
+        if path_out:
+            out_dir = os.path.dirname(path_out)
+            if out_dir and not os.path.exists(out_dir):
+                logger.info(f'Making directory: {out_dir}')
+                os.makedirs(out_dir, exist_ok=True)
+        logger.info(f'Indexing {path_in} to binary index {path_out}')
+        try:
+            t_start = time.perf_counter()
+            with LogicalFile.LogicalIndex(path_in) as logical_index:
+                index_time = time.perf_counter() - t_start
+                if path_out:
+                    path_index = path_out + INDEX_EXTENSION
+                    t_start = time.perf_counter()
+                    size_index = BinaryIndex.write(logical_index, path_index)
+                    write_time = time.perf_counter() - t_start
+                    if read_back:
+                        t_start = time.perf_counter()
+                        with BinaryIndex.LogicalIndexBinary(path_index, path_in) as read_index:
+                            for logical_file in read_index.logical_files:
+                                # The log pass is created lazily, accessing it reads it back from the index.
+                                logical_file.log_pass
+                        read_time = time.perf_counter() - t_start
+                    else:
+                        read_time = 0.0
+                else:
+                    size_index = 0
+                    write_time = read_time = 0.0
+                result = IndexResult(
+                    path_in, os.path.getsize(path_in), size_index,
+                    index_time, write_time, read_time, False, False
+                )
+                return result
+        except ExceptionTotalDepthRP66V1:  # pragma: no cover
+            logger.exception(f'Failed to index with ExceptionTotalDepthRP66V1: {path_in}')
+        except Exception:  # pragma: no cover
+            logger.exception(f'Failed to index with Exception: {path_in}')
+        return IndexResult(path_in, os.path.getsize(path_in), 0, 0.0, 0.0, 0.0, True, False)  # pragma: no cover
+    return IndexResult(path_in, os.path.getsize(path_in), 0, 0.0, 0.0, 0.0, False, True)  # pragma: no cover
+
+
+def index_dir_or_file(path_in: str, path_out: str, recurse: bool, read_back: bool,
+                      incremental: bool = False) -> typing.Dict[str, IndexResult]:
+    """Index a directory or file and return the results.
+    If incremental then files unchanged since the last run, as recorded in the manifest in path_out, are skipped."""
+    logging.info(f'index_dir_or_file(): "{path_in}" to "{path_out}" recurse: {recurse}')
+    ret = {}
+    if os.path.isdir(path_in):
+        with manifest.Manifest(path_in, path_out, 'IndexBinary', __version__, enabled=incremental) as mfst:
+            for file_in_out in dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
+                result = mfst.unchanged_result(file_in_out.filePathIn)
+                if result is None:
+                    bin_file_type = binary_file_type_from_path(file_in_out.filePathIn)
+                    if bin_file_type in BINARY_FILE_TYPES:
+                        result = index_a_single_file(file_in_out.filePathIn, file_in_out.filePathOut, read_back)
+                        if not result.exception and file_in_out.filePathOut:
+                            mfst.update(
+                                file_in_out.filePathIn, result,
+                                _index_outputs(file_in_out.filePathOut + INDEX_EXTENSION)
+                            )
+                if result is not None:
+                    ret[file_in_out.filePathIn] = result
+    else:
+        bin_file_type = binary_file_type_from_path(path_in)
+        if bin_file_type in BINARY_FILE_TYPES:
+            ret[path_in] = index_a_single_file(path_in, path_out, read_back)
+    return ret
+
+
+def main() -> int:
+    description = """usage: %(prog)s [options] file
+Scans a RP66V1 file or directory and saves the index in the binary index format."""
+    print('Cmd: %s' % ' '.join(sys.argv))
+    parser = cmn_cmd_opts.path_in_out(
+        description, prog='TotalDepth.RP66V1.IndexBinary.main', version=__version__, epilog=__rights__
+    )
+    cmn_cmd_opts.add_log_level(parser, level=20)
+    cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
+    parser.add_argument('--read-back', action='store_true', help='Read and time the output. [default: %(default)s]')
+    cmn_cmd_opts.add_incremental(parser)
+    process.add_process_logger_to_argument_parser(parser)
+    args = parser.parse_args()
+    cmn_cmd_opts.set_log_level(args)
+    clk_start = time.perf_counter()
+    ret_val = 0
+    if cmn_cmd_opts.multiprocessing_requested(args) and os.path.isdir(args.path_in):
+        result: typing.Dict[str, IndexResult] = index_dir_multiprocessing(
+            args.path_in,
+            args.path_out,
+            args.jobs,
+            args.recurse,
+            args.read_back,
+            args.incremental,
+            schedule.memory_limit_from_args(args),
+            args.task_timeout,
+        )
+    else:
+        if args.log_process > 0.0:
+            with process.log_process(args.log_process):
+                result: typing.Dict[str, IndexResult] = index_dir_or_file(
+                    args.path_in, args.path_out, args.recurse, args.read_back, args.incremental,
+                )
+        else:
+            result: typing.Dict[str, IndexResult] = index_dir_or_file(
+                args.path_in, args.path_out, args.recurse, args.read_back, args.incremental,
+            )
+    clk_exec = time.perf_counter() - clk_start
+    size_index = size_input = 0
+    files_processed = 0
+    try:
+        path_prefix = os.path.commonpath(result.keys())
+        len_path_prefix = len(path_prefix)
+        table: typing.List[typing.List[str]] = [
+            [
+                'Size (b)', 'Index (b)', 'Ratio (%)',
+                'Index (s)', 'Index (ms/Mb)',
+                'Write (s)', 'Write (ms/Mb)',
+                'Read (s)', 'Read (ms/Mb)',
+                'Except',
+                'Path',
+            ]
+        ]
+        for path in sorted(result.keys()):
+            idx_result = result[path]
+            if not idx_result.ignored and idx_result.size_input > 0:
+                ms_mb_index = idx_result.time_index * 1000 / (idx_result.size_input / 1024 ** 2)
+                ms_mb_write = idx_result.time_write * 1000 / (idx_result.size_input / 1024 ** 2)
+                ms_mb_read = idx_result.time_read * 1000 / (idx_result.size_input / 1024 ** 2)
+                ratio = idx_result.size_index / idx_result.size_input
+                table.append(
+                    [
+                        f'{idx_result.size_input:,d}', f'{idx_result.size_index:,d}', f'{ratio:.3%}',
+                        f'{idx_result.time_index:.3f}', f'{ms_mb_index:.1f}',
+                        f'{idx_result.time_write:.3f}', f'{ms_mb_write:.1f}',
+                        f'{idx_result.time_read:.3f}', f'{ms_mb_read:.2f}',
+                        f'{str(idx_result.exception):5}',
+                        f'{path[len_path_prefix+1:]}',
+                    ]
+                )
+                size_input += result[path].size_input
+                size_index += result[path].size_index
+                files_processed += 1
+                if idx_result.exception:  # pragma: no cover
+                    ret_val = 1
+        print(f'Common path prefix: {path_prefix}')
+        print('\n'.join(data_table.format_table(table, pad=' | ', heading_underline='-')))
+    except Exception as err:  # pragma: no cover
+        logger.exception(str(err))
+        ret_val = 3
+    print('Execution time = %8.3f (S)' % clk_exec)
+    if size_input > 0:
+        ms_mb = clk_exec * 1000 / (size_input/ 1024**2)
+        ratio = size_index / size_input
+    else:  # pragma: no cover
+        ms_mb = 0.0
+        ratio = 0.0
+    print(f'Out of  {len(result):,d} processed {files_processed:,d} files of total size {size_input:,d} input bytes')
+    print(f'Wrote {size_index:,d} output bytes, ratio: {ratio:8.3%} at {ms_mb:.1f} ms/Mb')
+    print('Bye, bye!')
+    return ret_val
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -1,17 +1,18 @@
 """Read RP66V1 files and saves the index a s pickle file."""
 import logging
-import multiprocessing
 import os
 import pickle
 import sys
 import time
 import typing
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import LogicalFile
 from TotalDepth.common import cmn_cmd_opts
 from TotalDepth.common import data_table
+from TotalDepth.common import manifest
 from TotalDepth.common import process
+from TotalDepth.common import schedule
 from TotalDepth.util import gnuplot, DirWalk
 from TotalDepth.util.DirWalk import dirWalk
 from TotalDepth.util.bin_file_type import binary_file_type_from_path
@@ -44,33 +45,38 @@ def unpickle(path: str) -> LogicalFile.LogicalIndex:
 
 
 def index_dir_multiprocessing(dir_in: str, dir_out: str, jobs: int,
-                              recurse: bool, read_back: bool) -> typing.Dict[str, IndexResult]:
+                              recurse: bool, read_back: bool, incremental: bool = False,
+                              memory_limit: int = 0, timeout: float = 0.0) -> typing.Dict[str, IndexResult]:
     """Multiprocessing code to plot log passes.
+    If incremental then files unchanged since the last run, as recorded in the manifest in dir_out, are skipped.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
     Returns a dict of {path_in : IndexResult, ...}"""
     assert os.path.isdir(dir_in)
-    if jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    logging.info('scan_dir_multiprocessing(): Setting multi-processing jobs to %d' % jobs)
-    pool = multiprocessing.Pool(processes=jobs)
-    tasks = [
-        (t.filePathIn, t.filePathOut, read_back) for t in DirWalk.dirWalk(
-            dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True
-        )
-    ]
-    # print('tasks:')
-    # pprint.pprint(tasks, width=200)
-    # return {}
-    results = [
-        r.get() for r in [
-            pool.apply_async(index_a_single_file, t) for t in tasks
-        ]
-    ]
-    return {r.path_in: r for r in results}
+    with manifest.Manifest(dir_in, dir_out, 'IndexPickle', __version__, enabled=incremental) as mfst:
+        ret = {}
+        tasks = []
+        for t in DirWalk.dirWalk(dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True):
+            result = mfst.unchanged_result(t.filePathIn)
+            if result is None:
+                tasks.append(schedule.file_task(t.filePathIn, t.filePathOut, read_back))
+            else:
+                ret[t.filePathIn] = result
+        for task_result in schedule.imap_tasks(index_a_single_file, tasks, jobs,
+                                               memory_limit=memory_limit, timeout=timeout):
+            path_in, path_out, _read_back = task_result.task.args
+            if task_result.exception:
+                result = IndexResult(path_in, task_result.task.size, 0, 0.0, 0.0, 0.0, True, False)
+            else:
+                result = task_result.result
+                if not result.exception and not result.ignored:
+                    mfst.update(path_in, result, [path_out + '.pkl'])
+            ret[path_in] = result
+    return ret
 
 
 def index_a_single_file(path_in: str, path_out: str, read_back: bool) -> IndexResult:
     bin_file_type = binary_file_type_from_path(path_in)
-    if bin_file_type == 'RP66V1':
+    if bin_file_type in BINARY_FILE_TYPES:
         if path_out:
             out_dir = os.path.dirname(path_out)
             if not os.path.exists(out_dir):
@@ -110,17 +116,27 @@ def index_a_single_file(path_in: str, path_out: str, read_back: bool) -> IndexRe
     return IndexResult(path_in, os.path.getsize(path_in), 0, 0.0, 0.0, 0.0, False, True)  # pragma: no cover
 
 
-def index_dir_or_file(path_in: str, path_out: str, recurse: bool, read_back: bool) -> typing.Dict[str, IndexResult]:
+def index_dir_or_file(path_in: str, path_out: str, recurse: bool, read_back: bool,
+                      incremental: bool = False) -> typing.Dict[str, IndexResult]:
+    """Index a directory or file and return the results.
+    If incremental then files unchanged since the last run, as recorded in the manifest in path_out, are skipped."""
     logging.info(f'index_dir_or_file(): "{path_in}" to "{path_out}" recurse: {recurse}')
     ret = {}
     if os.path.isdir(path_in):
-        for file_in_out in dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
-            bin_file_type = binary_file_type_from_path(file_in_out.filePathIn)
-            if bin_file_type == 'RP66V1':
-                ret[file_in_out.filePathIn] = index_a_single_file(file_in_out.filePathIn, file_in_out.filePathOut, read_back)
+        with manifest.Manifest(path_in, path_out, 'IndexPickle', __version__, enabled=incremental) as mfst:
+            for file_in_out in dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
+                result = mfst.unchanged_result(file_in_out.filePathIn)
+                if result is None:
+                    bin_file_type = binary_file_type_from_path(file_in_out.filePathIn)
+                    if bin_file_type in BINARY_FILE_TYPES:
+                        result = index_a_single_file(file_in_out.filePathIn, file_in_out.filePathOut, read_back)
+                        if not result.exception:
+                            mfst.update(file_in_out.filePathIn, result, [file_in_out.filePathOut + '.pkl'])
+                if result is not None:
+                    ret[file_in_out.filePathIn] = result
     else:
         bin_file_type = binary_file_type_from_path(path_in)
-        if bin_file_type == 'RP66V1':
+        if bin_file_type in BINARY_FILE_TYPES:
             ret[path_in] = index_a_single_file(path_in, path_out, read_back)
     return ret
 
@@ -218,7 +234,9 @@ Scans a RP66V1 file or directory and saves the index as a pickled file."""
     )
     cmn_cmd_opts.add_log_level(parser, level=20)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     parser.add_argument('--read-back', action='store_true', help='Read and time the output. [default: %(default)s]')
+    cmn_cmd_opts.add_incremental(parser)
     process.add_process_logger_to_argument_parser(parser)
     gnuplot.add_gnuplot_to_argument_parser(parser)
     args = parser.parse_args()
@@ -235,6 +253,9 @@ Scans a RP66V1 file or directory and saves the index as a pickled file."""
             args.jobs,
             args.recurse,
             args.read_back,
+            args.incremental,
+            schedule.memory_limit_from_args(args),
+            args.task_timeout,
         )
     else:
         if args.log_process > 0.0:
@@ -244,6 +265,7 @@ Scans a RP66V1 file or directory and saves the index as a pickled file."""
                     args.path_out,
                     args.recurse,
                     args.read_back,
+                    args.incremental,
                 )
         else:
             result: typing.Dict[str, IndexResult] = index_dir_or_file(
@@ -251,6 +273,7 @@ Scans a RP66V1 file or directory and saves the index as a pickled file."""
                 args.path_out,
                 args.recurse,
                 args.read_back,
+                args.incremental,
             )
     clk_exec = time.perf_counter() - clk_start
     size_index = size_input = 0
@@ -1,13 +1,12 @@
 import datetime
 import io
 import logging
-import multiprocessing
 import os
 import sys
 import time
 import typing
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import LogPass
 from TotalDepth.RP66V1.core import LogicalFile
 from TotalDepth.RP66V1.core import LogicalRecord
@@ -16,7 +15,9 @@ from TotalDepth.RP66V1.core.Index import ExceptionIndex
 from TotalDepth.RP66V1.core.XAxis import IFLRReference
 from TotalDepth.common import process
 from TotalDepth.common import cmn_cmd_opts
+from TotalDepth.common import manifest
 from TotalDepth.common import Rle
+from TotalDepth.common import schedule
 from TotalDepth.util import DirWalk
 from TotalDepth.util.bin_file_type import binary_file_type_from_path
 from TotalDepth.util import gnuplot
@@ -286,7 +287,7 @@ class IndexResult(typing.NamedTuple):
 def index_a_single_file(path_in: str, path_out: str, private: bool) -> IndexResult:
     # logging.info(f'index_a_single_file(): "{path_in}" to "{path_out}"')
     bin_file_type = binary_file_type_from_path(path_in)
-    if bin_file_type == 'RP66V1':
+    if bin_file_type in BINARY_FILE_TYPES:
         if path_out:
             out_dir = os.path.dirname(path_out)
             if not os.path.exists(out_dir):
@@ -326,36 +327,55 @@ def index_a_single_file(path_in: str, path_out: str, private: bool) -> IndexResu
     return IndexResult(path_in, 0, 0, 0.0, False, True)
 
 
-def index_dir_multiprocessing(dir_in: str, dir_out: str, private: bool, jobs: int) -> typing.Dict[str, IndexResult]:
+def index_dir_multiprocessing(dir_in: str, dir_out: str, private: bool, jobs: int,
+                              incremental: bool = False,
+                              memory_limit: int = 0, timeout: float = 0.0) -> typing.Dict[str, IndexResult]:
     """Multiprocessing code to index in XML.
+    If incremental then files unchanged since the last run, as recorded in the manifest in dir_out, are skipped.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
     Returns a dict of {path_in : IndexResult, ...}"""
-    if jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    logging.info('scan_dir_multiprocessing(): Setting multi-processing jobs to %d' % jobs)
-    pool = multiprocessing.Pool(processes=jobs)
-    tasks = [
-        (t.filePathIn, t.filePathOut, private) for t in DirWalk.dirWalk(
-            dir_in, dir_out, theFnMatch='', recursive=True, bigFirst=True
-        )
-    ]
-    # print('tasks:')
-    # pprint.pprint(tasks, width=200)
-    # return {}
-    results = [
-        r.get() for r in [
-            pool.apply_async(index_a_single_file, t) for t in tasks
-        ]
-    ]
-    return {r.path_input : r for r in results}
+    # The private flag changes the output so is part of the version.
+    version = f'{__version__} private={private}'
+    with manifest.Manifest(dir_in, dir_out, 'IndexXML', version, enabled=incremental) as mfst:
+        ret = {}
+        tasks = []
+        for t in DirWalk.dirWalk(dir_in, dir_out, theFnMatch='', recursive=True, bigFirst=True):
+            result = mfst.unchanged_result(t.filePathIn)
+            if result is None:
+                tasks.append(schedule.file_task(t.filePathIn, t.filePathOut, private))
+            else:
+                ret[t.filePathIn] = result
+        for task_result in schedule.imap_tasks(index_a_single_file, tasks, jobs,
+                                               memory_limit=memory_limit, timeout=timeout):
+            path_in, path_out, _private = task_result.task.args
+            if task_result.exception:
+                result = IndexResult(path_in, task_result.task.size, 0, 0.0, True, False)
+            else:
+                result = task_result.result
+                if not result.exception and not result.ignored:
+                    mfst.update(path_in, result, [path_out + '.xml'])
+            ret[path_in] = result
+    return ret
 
 
-def index_dir_or_file(path_in: str, path_out: str, recurse: bool, private: bool) -> typing.Dict[str, IndexResult]:
+def index_dir_or_file(path_in: str, path_out: str, recurse: bool, private: bool,
+                      incremental: bool = False) -> typing.Dict[str, IndexResult]:
+    """Index a directory or file and return the results.
+    If incremental then files unchanged since the last run, as recorded in the manifest in path_out, are skipped."""
     logging.info(f'index_dir_or_file(): "{path_in}" to "{path_out}" recurse: {recurse}')
     ret = {}
     if os.path.isdir(path_in):
-        for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
-            # print(file_in_out)
-            ret[file_in_out.filePathIn] = index_a_single_file(file_in_out.filePathIn, file_in_out.filePathOut, private)
+        # The private flag changes the output so is part of the version.
+        version = f'{__version__} private={private}'
+        with manifest.Manifest(path_in, path_out, 'IndexXML', version, enabled=incremental) as mfst:
+            for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
+                # print(file_in_out)
+                result = mfst.unchanged_result(file_in_out.filePathIn)
+                if result is None:
+                    result = index_a_single_file(file_in_out.filePathIn, file_in_out.filePathOut, private)
+                    if not result.exception and not result.ignored:
+                        mfst.update(file_in_out.filePathIn, result, [file_in_out.filePathOut + '.xml'])
+                ret[file_in_out.filePathIn] = result
     else:
         ret[path_in] = index_a_single_file(path_in, path_out, private)
     return ret
@@ -458,6 +478,7 @@ def main() -> int:
     )
     cmn_cmd_opts.add_log_level(parser, level=20)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     parser.add_argument(
         '-e', '--encrypted', action='store_true',
         help='Output encrypted Logical Records as well. [default: %(default)s]',
@@ -468,6 +489,7 @@ def main() -> int:
         '-p', '--private', action='store_true',
         help='Also write out private EFLRs. [default: %(default)s]',
     )
+    cmn_cmd_opts.add_incremental(parser)
     args = parser.parse_args()
     # print('args:', args)
     # return 0
@@ -481,6 +503,9 @@ def main() -> int:
             args.path_out,
             args.private,
             args.jobs,
+            args.incremental,
+            schedule.memory_limit_from_args(args),
+            args.task_timeout,
         )
     else:
         if args.log_process > 0.0:
@@ -490,6 +515,7 @@ def main() -> int:
                     args.path_out,
                     args.recurse,
                     args.private,
+                    args.incremental,
                 )
         else:
             result: typing.Dict[str, IndexResult] = index_dir_or_file(
@@ -497,6 +523,7 @@ def main() -> int:
                 args.path_out,
                 args.recurse,
                 args.private,
+                args.incremental,
             )
     clk_exec = time.perf_counter() - clk_start
     size_index = size_input = 0
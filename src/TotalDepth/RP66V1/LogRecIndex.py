@@ -2,16 +2,15 @@
 Exercises the LogicalRecordIndex on real files.
 """
 import logging
-import multiprocessing
 import os
 import pickle
 import sys
 import time
 import typing
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import Index, File
-from TotalDepth.common import cmn_cmd_opts, process
+from TotalDepth.common import cmn_cmd_opts, manifest, process, schedule
 from TotalDepth.util import bin_file_type, DirWalk, ExecTimer
 from TotalDepth.util import gnuplot
 
@@ -42,31 +41,40 @@ class IndexResult(typing.NamedTuple):
 
 
 def index_dir_multiprocessing(dir_in: str, dir_out: str, jobs: int,
-                              recurse: bool, read_back: bool, validate: bool) -> typing.Dict[str, IndexResult]:
+                              recurse: bool, read_back: bool, validate: bool,
+                              incremental: bool = False,
+                              memory_limit: int = 0, timeout: float = 0.0) -> typing.Dict[str, IndexResult]:
     """Multiprocessing code to plot log passes.
+    If incremental then files unchanged since the last run, as recorded in the manifest in dir_out, are skipped.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
     Returns a dict of {path_in : IndexResult, ...}"""
     assert os.path.isdir(dir_in)
-    if jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    logging.info('scan_dir_multiprocessing(): Setting multi-processing jobs to %d' % jobs)
-    pool = multiprocessing.Pool(processes=jobs)
-    tasks = [
-        (t.filePathIn, t.filePathOut, read_back, validate) for t in DirWalk.dirWalk(
-            dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True
-        )
-    ]
-    results = [
-        r.get() for r in [
-            pool.apply_async(index_a_single_file, t) for t in tasks
-        ]
-    ]
-    return {r.path_in: r for r in results}
+    with manifest.Manifest(dir_in, dir_out, 'LogRecIndex', __version__, enabled=incremental) as mfst:
+        ret = {}
+        tasks = []
+        for t in DirWalk.dirWalk(dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True):
+            result = mfst.unchanged_result(t.filePathIn)
+            if result is None:
+                tasks.append(schedule.file_task(t.filePathIn, t.filePathOut, read_back, validate))
+            else:
+                ret[t.filePathIn] = result
+        for task_result in schedule.imap_tasks(index_a_single_file, tasks, jobs,
+                                               memory_limit=memory_limit, timeout=timeout):
+            path_in, path_out, _read_back, _validate = task_result.task.args
+            if task_result.exception:
+                result = IndexResult(path_in, task_result.task.size, 0, 0.0, 0.0, 0.0, True, False)
+            else:
+                result = task_result.result
+                if not result.exception and not result.ignored:
+                    mfst.update(path_in, result, [path_out + '.pkl'])
+            ret[path_in] = result
+    return ret
 
 
 def index_a_single_file(path_in: str, path_out: str, read_back: bool, validate: bool) -> IndexResult:
     """Read a single file and return an IndexResult."""
     file_type = bin_file_type.binary_file_type_from_path(path_in)
-    if file_type == 'RP66V1':
+    if file_type in BINARY_FILE_TYPES:
         if path_out:
             out_dir = os.path.dirname(path_out)
             if not os.path.exists(out_dir):
@@ -117,20 +125,29 @@ def index_a_single_file(path_in: str, path_out: str, read_back: bool, validate:
 
 
 def index_dir_or_file(path_in: str, path_out: str,
-                      recurse: bool, read_back: bool, validate: bool) -> typing.Dict[str, IndexResult]:
-    """Index a directory or file and return the results."""
+                      recurse: bool, read_back: bool, validate: bool,
+                      incremental: bool = False) -> typing.Dict[str, IndexResult]:
+    """Index a directory or file and return the results.
+    If incremental then files unchanged since the last run, as recorded in the manifest in path_out, are skipped."""
     logging.info(f'index_dir_or_file(): "{path_in}" to "{path_out}" recurse: {recurse}')
     ret = {}
     if os.path.isdir(path_in):
-        for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
-            file_type = bin_file_type.binary_file_type_from_path(file_in_out.filePathIn)
-            if file_type == 'RP66V1':
-                ret[file_in_out.filePathIn] = index_a_single_file(
-                    file_in_out.filePathIn, file_in_out.filePathOut, read_back, validate
-                )
+        with manifest.Manifest(path_in, path_out, 'LogRecIndex', __version__, enabled=incremental) as mfst:
+            for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recurse, bigFirst=False):
+                result = mfst.unchanged_result(file_in_out.filePathIn)
+                if result is None:
+                    file_type = bin_file_type.binary_file_type_from_path(file_in_out.filePathIn)
+                    if file_type in BINARY_FILE_TYPES:
+                        result = index_a_single_file(
+                            file_in_out.filePathIn, file_in_out.filePathOut, read_back, validate
+                        )
+                        if not result.exception:
+                            mfst.update(file_in_out.filePathIn, result, [file_in_out.filePathOut + '.pkl'])
+                if result is not None:
+                    ret[file_in_out.filePathIn] = result
     else:
         file_type = bin_file_type.binary_file_type_from_path(path_in)
-        if file_type == 'RP66V1':
+        if file_type in BINARY_FILE_TYPES:
             ret[path_in] = index_a_single_file(path_in, path_out, read_back, validate)
     return ret
 
@@ -230,6 +247,7 @@ def main() -> int:
     )
     cmn_cmd_opts.add_log_level(parser, level=20)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     process.add_process_logger_to_argument_parser(parser)
     gnuplot.add_gnuplot_to_argument_parser(parser)
     parser.add_argument(
@@ -240,6 +258,7 @@ def main() -> int:
         '--validate', action='store_true',
         help='Perform validation checks on the index.. [default: %(default)s]',
     )
+    cmn_cmd_opts.add_incremental(parser)
     args = parser.parse_args()
     # print('args:', args)
     # return 0
@@ -254,6 +273,9 @@ def main() -> int:
             args.recurse,
             args.read_back,
             args.validate,
+            args.incremental,
+            schedule.memory_limit_from_args(args),
+            args.task_timeout,
         )
     else:
         if args.log_process > 0.0:
@@ -264,6 +286,7 @@ def main() -> int:
                     args.recurse,
                     args.read_back,
                     args.validate,
+                    args.incremental,
                 )
         else:
             result: typing.Dict[str, IndexResult] = index_dir_or_file(
@@ -272,6 +295,7 @@ def main() -> int:
                 args.recurse,
                 args.read_back,
                 args.validate,
+                args.incremental,
             )
     size_index = size_input = 0
     files_processed = 0
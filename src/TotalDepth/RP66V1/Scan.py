@@ -23,7 +23,7 @@ import typing
 
 import colorama
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import AbsentValue
 from TotalDepth.RP66V1.core import File
 from TotalDepth.RP66V1.core import LogPass
@@ -613,7 +613,7 @@ IndexResult = collections.namedtuple('IndexResult', 'size_input, size_output, ti
 def scan_a_single_file(path_in: str, path_out: str, output_extension: str, function: typing.Callable, **kwargs) -> IndexResult:
     # logging.info(f'index_a_single_file(): "{path_in}" to "{path_out}"')
     binary_file_type = bin_file_type.binary_file_type_from_path(path_in)
-    if binary_file_type == 'RP66V1':
+    if binary_file_type in BINARY_FILE_TYPES:
         logger.info(f'Scanning "{path_in}" to "{path_out}"')
         with open(path_in, 'rb') as fobj:
             t_start = time.perf_counter()
@@ -2,7 +2,6 @@
 Scans a RP66V1 file an writes out the summary in HTML.
 """
 import logging
-import multiprocessing
 import os
 import sys
 import time
@@ -10,7 +9,7 @@ import typing
 
 import colorama
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import AbsentValue
 from TotalDepth.RP66V1.core import File
 from TotalDepth.RP66V1.core import LogPass
@@ -22,7 +21,9 @@ from TotalDepth.RP66V1.core import stringify
 from TotalDepth.RP66V1.core.LogicalRecord import EFLR
 from TotalDepth.common import Slice
 from TotalDepth.common import cmn_cmd_opts
+from TotalDepth.common import manifest
 from TotalDepth.common import process
+from TotalDepth.common import schedule
 from TotalDepth.util import DirWalk
 from TotalDepth.util import bin_file_type
 from TotalDepth.util import gnuplot, XmlWrite, DictTree
@@ -596,7 +597,7 @@ def scan_a_single_file(path_in: str, path_out: str, label_process: bool,
     file_path_out = path_out + '.html'
     logger.debug(f'Scanning "{path_in}" to "{file_path_out}"')
     binary_file_type = bin_file_type.binary_file_type_from_path(path_in)
-    if binary_file_type == 'RP66V1':
+    if binary_file_type in BINARY_FILE_TYPES:
         logging.info(f'ScanFileHTML.scan_a_single_file(): "{path_in}" to "{file_path_out}"')
         # logging.info(f'scan_a_single_file(): "{path_in}"')
         t_start = time.perf_counter()
@@ -874,36 +875,62 @@ def _write_top_level_index_table_body(index_file_path: str,
                         xhtml_stream.characters(str(event.branch[-1]))
 
 
+def _manifest(dir_in: str, dir_out: str,
+              frame_slice: typing.Union[Slice.Slice, Slice.Sample], incremental: bool) -> manifest.Manifest:
+    """Returns the manifest of this tool, the HTML depends on the frame slice as well as the version."""
+    return manifest.Manifest(dir_in, dir_out, 'ScanHTML', f'{__version__} {frame_slice}', enabled=incremental)
+
+
+def _scan_a_single_file_incremental(mfst: manifest.Manifest, path_in: str, path_out: str, label_process: bool,
+                                    frame_slice: typing.Union[Slice.Slice, Slice.Sample]) -> HTMLResult:
+    """Returns the previous result from the manifest if the file is unchanged, otherwise scans the file and records
+    the result in the manifest."""
+    result = mfst.unchanged_result(path_in)
+    if result is None:
+        result = scan_a_single_file(path_in, path_out, label_process, frame_slice)
+        if not result.exception and not result.ignored:
+            mfst.update(path_in, result, [result.path_output])
+    return result
+
+
 def scan_dir_multiprocessing(dir_in, dir_out, jobs,
-                             frame_slice: typing.Union[Slice.Slice, Slice.Sample]) -> typing.Dict[str, HTMLResult]:
+                             frame_slice: typing.Union[Slice.Slice, Slice.Sample],
+                             incremental: bool = False,
+                             memory_limit: int = 0, timeout: float = 0.0) -> typing.Dict[str, HTMLResult]:
     """Multiprocessing code to plot log passes.
+    If incremental then files unchanged since the last run, as recorded in the manifest in dir_out, are skipped.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
     Returns a dict of {path_in : HTMLResult, ...}"""
     assert os.path.isdir(dir_in)
-    if jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    logging.info('scan_dir_multiprocessing(): Setting multi-processing jobs to %d' % jobs)
-    pool = multiprocessing.Pool(processes=jobs)
-    tasks = [
-        (t.filePathIn, t.filePathOut, False, frame_slice) for t in DirWalk.dirWalk(
-            dir_in, dir_out, theFnMatch='', recursive=True, bigFirst=True
-        )
-    ]
-    # print('tasks:')
-    # pprint.pprint(tasks, width=200)
-    # return {}
-    results = [
-        r.get() for r in [
-            pool.apply_async(scan_a_single_file, t) for t in tasks
-        ]
-    ]
+    with _manifest(dir_in, dir_out, frame_slice, incremental) as mfst:
+        results = []
+        tasks = []
+        for t in DirWalk.dirWalk(dir_in, dir_out, theFnMatch='', recursive=True, bigFirst=True):
+            result = mfst.unchanged_result(t.filePathIn)
+            if result is None:
+                tasks.append(schedule.file_task(t.filePathIn, t.filePathOut, False, frame_slice))
+            else:
+                results.append(result)
+        for task_result in schedule.imap_tasks(scan_a_single_file, tasks, jobs,
+                                               memory_limit=memory_limit, timeout=timeout):
+            if task_result.exception:
+                path_in, path_out = task_result.task.args[:2]
+                result = HTMLResult(path_in, path_out + '.html', task_result.task.size, 0, 0.0, True, False, None)
+            else:
+                result = task_result.result
+                if not result.exception and not result.ignored:
+                    mfst.update(result.path_input, result, [result.path_output])
+            results.append(result)
     _write_indexes(dir_out, {r.path_output : r for r in results})
     return {r.path_input: r for r in results}
 
 
 def scan_dir_or_file(path_in: str, path_out: str,
                      recursive: bool, label_process: bool,
-                     frame_slice: typing.Union[Slice.Slice, Slice.Sample]) -> typing.Dict[str, HTMLResult]:
+                     frame_slice: typing.Union[Slice.Slice, Slice.Sample],
+                     incremental: bool = False) -> typing.Dict[str, HTMLResult]:
     """Scans a directory or file putting the results in path_out.
+    If incremental then files unchanged since the last run, as recorded in the manifest in path_out, are skipped.
     Returns a dict of {path_in : HTMLResult, ...}
     """
     # Required as we are going to split them by os.sep
@@ -915,34 +942,34 @@ def scan_dir_or_file(path_in: str, path_out: str,
     # Output file path to FileResult
     if os.path.isdir(path_in):
         index_map_global: typing.Dict[str, HTMLResult] = {}
-        if not recursive:
-            for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recursive, bigFirst=False):
-                result = scan_a_single_file(
-                    file_in_out.filePathIn, file_in_out.filePathOut, label_process, frame_slice
-                )
-                ret[file_in_out.filePathIn] = result
-                if not result.exception and not result.ignored:
-                    index_map_global[result.path_output] = result
-            if label_process:
-                process.add_message_to_queue('Writing Indexes.')
-            _write_indexes(path_out, index_map_global)
-        else:
-            len_path_in = len(path_in.split(os.sep))
-            for root, dirs, files in os.walk(path_in, topdown=False):
-                root_rel_to_path_in = root.split(os.sep)[len_path_in:]
-                dir_out = os.path.join(path_out, *root_rel_to_path_in)
-                for file in files:
-                    file_path_in = os.path.join(root, file)
-                    # Respect sub-directories in root
-                    # root_rel_to_path_in.append(file)
-                    file_path_out = os.path.join(dir_out, file)
-                    result = scan_a_single_file(file_path_in, file_path_out, label_process, frame_slice)
-                    ret[file_path_in] = result
+        with _manifest(path_in, path_out, frame_slice, incremental) as mfst:
+            if not recursive:
+                for file_in_out in DirWalk.dirWalk(path_in, path_out, theFnMatch='', recursive=recursive, bigFirst=False):
+                    result = _scan_a_single_file_incremental(
+                        mfst, file_in_out.filePathIn, file_in_out.filePathOut, label_process, frame_slice
+                    )
+                    ret[file_in_out.filePathIn] = result
                     if not result.exception and not result.ignored:
                         index_map_global[result.path_output] = result
-            if label_process:
-                process.add_message_to_queue('Writing Indexes.')
-            _write_indexes(path_out, index_map_global)
+            else:
+                len_path_in = len(path_in.split(os.sep))
+                for root, dirs, files in os.walk(path_in, topdown=False):
+                    root_rel_to_path_in = root.split(os.sep)[len_path_in:]
+                    dir_out = os.path.join(path_out, *root_rel_to_path_in)
+                    for file in files:
+                        file_path_in = os.path.join(root, file)
+                        # Respect sub-directories in root
+                        # root_rel_to_path_in.append(file)
+                        file_path_out = os.path.join(dir_out, file)
+                        result = _scan_a_single_file_incremental(
+                            mfst, file_path_in, file_path_out, label_process, frame_slice
+                        )
+                        ret[file_path_in] = result
+                        if not result.exception and not result.ignored:
+                            index_map_global[result.path_output] = result
+        if label_process:
+            process.add_message_to_queue('Writing Indexes.')
+        _write_indexes(path_out, index_map_global)
     else:
         ret[path_in] = scan_a_single_file(path_in, path_out, label_process, frame_slice)
     return ret
@@ -1059,11 +1086,13 @@ def main() -> int:
     )
     cmn_cmd_opts.add_log_level(parser, level=20)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     parser.add_argument(
         '-e', '--encrypted', action='store_true',
         help='Output encrypted Logical Records as well. [default: %(default)s]',
     )
     Slice.add_frame_slice_to_argument_parser(parser)
+    cmn_cmd_opts.add_incremental(parser)
     process.add_process_logger_to_argument_parser(parser)
     gnuplot.add_gnuplot_to_argument_parser(parser)
     args = parser.parse_args()
@@ -1080,6 +1109,7 @@ def main() -> int:
                 args.recurse,
                 label_process=True,
                 frame_slice=Slice.create_slice_or_sample(args.frame_slice),
+                incremental=args.incremental,
             )
     else:
         if cmn_cmd_opts.multiprocessing_requested(args) and os.path.isdir(args.path_in):
@@ -1088,6 +1118,9 @@ def main() -> int:
                 args.path_out,
                 args.jobs,
                 frame_slice=Slice.create_slice_or_sample(args.frame_slice),
+                incremental=args.incremental,
+                memory_limit=schedule.memory_limit_from_args(args),
+                timeout=args.task_timeout,
             )
         else:
             result: typing.Dict[str, HTMLResult] = scan_dir_or_file(
@@ -1096,6 +1129,7 @@ def main() -> int:
                 args.recurse,
                 label_process=False,
                 frame_slice=Slice.create_slice_or_sample(args.frame_slice),
+                incremental=args.incremental,
             )
     if args.log_process > 0.0:
         process.add_message_to_queue('Processing HTML Complete.')
@@ -15,7 +15,6 @@ import collections
 import contextlib
 import datetime
 import logging
-import multiprocessing
 import os
 import sys
 import time
@@ -24,7 +23,7 @@ import typing
 import colorama
 import numpy as np
 
-from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1 import BINARY_FILE_TYPES, ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import LogPass
 from TotalDepth.RP66V1.core import LogicalFile
 from TotalDepth.RP66V1.core import RepCode
@@ -33,6 +32,7 @@ from TotalDepth.RP66V1.core import stringify
 from TotalDepth.RP66V1.core.LogicalRecord import EFLR
 from TotalDepth.common import Slice, cmn_cmd_opts, process
 from TotalDepth.common import data_table
+from TotalDepth.common import schedule
 from TotalDepth.util.DirWalk import dirWalk
 from TotalDepth.util import bin_file_type, DirWalk
 from TotalDepth.util import gnuplot
@@ -341,6 +341,17 @@ def array_reduce(array: np.ndarray, method: str) -> typing.Union[float, int]:
     return getattr(np, method)(array)
 
 
+def array_reduce_frames(array: np.ndarray, method: str) -> np.ndarray:
+    """Take a numpy array of frames and apply a method to each frame to get a single value per frame.
+    This is the vectorised equivalent of ``array_reduce()`` on each frame."""
+    if method not in ARRAY_REDUCTIONS:
+        raise ValueError(f'{method} is not in {ARRAY_REDUCTIONS}')
+    array = array.reshape(len(array), -1)
+    if method == 'first':
+        return array[:, 0]
+    return getattr(np, method)(array, axis=1)
+
+
 def write_curve_section_to_las(
         frame_array: LogPass.FrameArray,
         channels: typing.Set[str],
@@ -366,6 +377,19 @@ def write_curve_section_to_las(
         ostream.write('\n')
 
 
+#: Number of frames that are decoded and written at a time by ``write_array_section_to_las()``.
+FRAME_CHUNK_SIZE = 4096
+
+
+def _array_value_format(channel: LogPass.FrameChannel, field_width: int, float_format: str) -> str:
+    """Returns the str.format() field for the values of a channel."""
+    if RepCode.REP_CODE_CATEGORY_MAP[channel.rep_code] == RepCode.NumericCategory.INTEGER:
+        return f'{{:{field_width}.0f}}'
+    elif RepCode.REP_CODE_CATEGORY_MAP[channel.rep_code] == RepCode.NumericCategory.FLOAT:
+        return f'{{:{field_width}{float_format}}}'
+    return '{!s}'
+
+
 def write_array_section_to_las(
         logical_file: LogicalFile.LogicalFile,
         frame_array: LogPass.FrameArray,
@@ -375,16 +399,18 @@ def write_array_section_to_las(
         field_width: int,
         float_format: str,
         ostream: typing.TextIO,
+        frame_chunk_size: int = FRAME_CHUNK_SIZE,
     ) -> None:
-    """Write the ``~Array Section`` to the LAS file, the actual log data"""
+    """Write the ``~Array Section`` to the LAS file, the actual log data.
+    This decodes, reduces and writes frame_chunk_size frames at a time so the memory used is independent of the
+    number of frames."""
     assert array_reduction in ARRAY_REDUCTIONS
-    # TODO: Could optimise memory by reading one frame at a time
     num_available_frames = logical_file.num_frames(frame_array)
+    num_writable_frames = frame_slice.count(num_available_frames)
     if len(channels):
         array_channels = [c.ident for c in frame_array.channels if c.ident.I.decode("ascii") in channels]
-        num_writable_frames = logical_file.populate_frame_array(frame_array, frame_slice, array_channels)
     else:
-        num_writable_frames = logical_file.populate_frame_array(frame_array, frame_slice)
+        array_channels = None
     # Write information about how the frames and channels were processed
     ostream.write(f'# Array processing information:\n')
     ostream.write(f'# Frame Array: ID: {frame_array.ident} description: {frame_array.description}\n')
@@ -401,8 +427,10 @@ def write_array_section_to_las(
         f', total number of frames presented here: {num_writable_frames}\n'
     )
     ostream.write('~A')
+    written_channels = []
     for c, channel in enumerate(frame_array.channels):
         if len(channels) == 0 or c == 0 or channel.ident.I.decode("ascii") in channels:
+            written_channels.append(channel)
             if c == 0:
                 ostream.write(f'{channel.ident.I.decode("ascii"):>{field_width-2}}')
             else:
@@ -414,21 +442,26 @@ def write_array_section_to_las(
         f'Writing array section with {num_writable_frames:,d} frames'
         f', {len(frame_array):,d} channels'
         f' and {num_values:,d} values per frame'
-        f', total: {num_writable_frames * num_values:,d} input values.'
+        f', total: {num_writable_frames * num_values:,d} input values'
+        f' in chunks of {frame_chunk_size:,d} frames.'
     )
-    for frame_number in range(num_writable_frames):
-        for c, channel in enumerate(frame_array.channels):
-            if len(channel.array):
-                value = array_reduce(channel.array[frame_number], array_reduction)
-                if c > 0:
-                    ostream.write(' ')
-                if RepCode.REP_CODE_CATEGORY_MAP[channel.rep_code] == RepCode.NumericCategory.INTEGER:
-                    ostream.write(f'{value:{field_width}.0f}')
-                elif RepCode.REP_CODE_CATEGORY_MAP[channel.rep_code] == RepCode.NumericCategory.FLOAT:
-                    ostream.write(f'{value:{field_width}{float_format}}')
-                else:
-                    ostream.write(str(value))
-        ostream.write('\n')
+    row_format = ' '.join(
+        _array_value_format(channel, field_width, float_format) for channel in written_channels
+    ) + '\n'
+    numeric = [
+        RepCode.REP_CODE_CATEGORY_MAP[channel.rep_code] in (RepCode.NumericCategory.INTEGER,
+                                                            RepCode.NumericCategory.FLOAT)
+        for channel in written_channels
+    ]
+    for frame_chunk in Slice.gen_chunks(frame_slice, num_available_frames, frame_chunk_size):
+        # The channel arrays are reused between chunks of the same size.
+        logical_file.populate_frame_array(frame_array, frame_chunk, array_channels)
+        columns = []
+        for channel, is_numeric in zip(written_channels, numeric):
+            values = array_reduce_frames(channel.array, array_reduction)
+            # Python numbers format faster than numpy scalars and identically for numeric types.
+            columns.append(values.tolist() if is_numeric else list(values))
+        ostream.writelines(row_format.format(*row) for row in zip(*columns))
     # Garbage collect
     frame_array.init_arrays(1)
 
@@ -495,7 +528,7 @@ def single_rp66v1_file_to_las(
     # logging.info(f'index_a_single_file(): "{path_in}" to "{path_out}"')
     assert array_reduction in ARRAY_REDUCTIONS
     binary_file_type = bin_file_type.binary_file_type_from_path(path_in)
-    if binary_file_type == 'RP66V1':
+    if binary_file_type in BINARY_FILE_TYPES:
         logger.info(f'Converting RP66V1 {path_in} to LAS {os.path.splitext(path_out)[0]}*')
         try:
             t_start = time.perf_counter()
@@ -534,30 +567,31 @@ def convert_rp66v1_dir_or_file_to_las_multiprocessing(
         channels: typing.Set[str],
         field_width: int,
         float_format: str,
-        jobs: int
+        jobs: int,
+        memory_limit: int = 0,
+        timeout: float = 0.0,
 ) -> typing.Dict[str, LASWriteResult]:
     """Multiprocessing code to LAS.
+    memory_limit and timeout are the budget of each file, see schedule.imap_tasks().
     Returns a dict of {path_in : LASWriteResult, ...}"""
     assert os.path.isdir(dir_in)
-    if jobs < 1:
-        jobs = multiprocessing.cpu_count()
-    logging.info('scan_dir_multiprocessing(): Setting multi-processing jobs to %d' % jobs)
-    pool = multiprocessing.Pool(processes=jobs)
     tasks = [
-        (t.filePathIn, array_reduction, t.filePathOut, frame_slice, channels, field_width, float_format)
+        schedule.file_task(
+            t.filePathIn, array_reduction, t.filePathOut, frame_slice, channels, field_width, float_format
+        )
         for t in DirWalk.dirWalk(
             dir_in, dir_out, theFnMatch='', recursive=recurse, bigFirst=True
         )
     ]
-    # print('tasks:')
-    # pprint.pprint(tasks, width=200)
-    # return {}
-    results = [
-        r.get() for r in [
-            pool.apply_async(single_rp66v1_file_to_las, t) for t in tasks
-        ]
-    ]
-    return {r.path_input: r for r in results}
+    ret = {}
+    for task_result in schedule.imap_tasks(single_rp66v1_file_to_las, tasks, jobs,
+                                           memory_limit=memory_limit, timeout=timeout):
+        path_in = task_result.task.args[0]
+        if task_result.exception:
+            ret[path_in] = LASWriteResult(path_in, task_result.task.size, 0, 0, 0.0, True, False)
+        else:
+            ret[path_in] = task_result.result
+    return ret
 
 
 def convert_rp66v1_dir_or_file_to_las(
@@ -608,7 +642,7 @@ def _output_section_header_trailer(header: str, fillchar: str,
 def dump_frames_and_or_channels_single_rp66v1_file(path_in: str, frame_slices, channels) -> None:
     """Write a summary of frames and channels."""
     binary_file_type = bin_file_type.binary_file_type_from_path(path_in)
-    if binary_file_type == 'RP66V1':
+    if binary_file_type in BINARY_FILE_TYPES:
         logger.info(f'Reading RP66V1 {path_in}')
         try:
             with _output_section_header_trailer(f'File {path_in}', '=', os=sys.stdout):
@@ -764,6 +798,7 @@ Reads RP66V1 file(s) and writes them out as LAS files."""
     )
     cmn_cmd_opts.add_log_level(parser, level=20)
     cmn_cmd_opts.add_multiprocessing(parser)
+    schedule.add_schedule_to_argument_parser(parser)
     Slice.add_frame_slice_to_argument_parser(parser, use_what=True)
     process.add_process_logger_to_argument_parser(parser)
     gnuplot.add_gnuplot_to_argument_parser(parser)
@@ -810,6 +845,8 @@ Reads RP66V1 file(s) and writes them out as LAS files."""
                 args.field_width,
                 args.float_format,
                 args.jobs,
+                schedule.memory_limit_from_args(args),
+                args.task_timeout,
             )
         else:
             if args.log_process > 0.0:
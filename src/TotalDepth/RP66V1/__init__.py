@@ -1,6 +1,6 @@
 
 
-__all__ = ['core', 'ExceptionTotalDepthRP66V1']
+__all__ = ['core', 'BINARY_FILE_TYPES', 'ExceptionTotalDepthRP66V1']
 
 
 from TotalDepth import ExceptionTotalDepth
@@ -9,3 +9,8 @@ from TotalDepth import ExceptionTotalDepth
 class ExceptionTotalDepthRP66V1(ExceptionTotalDepth):
     """Simple specialisation of an exception class for TotalDepth.RP66V1"""
     pass
+
+
+#: The file types from ``TotalDepth.util.bin_file_type`` that can be read as RP66V1.
+#: 'RP66V1t' has TIF markers that are stripped as the file is read, see ``TotalDepth.DeTif.TifStream``.
+BINARY_FILE_TYPES = ('RP66V1', 'RP66V1t')
@@ -0,0 +1,373 @@
+"""
+A compact, versioned, binary serialisation of a RP66V1 ``LogicalFile.LogicalIndex``.
+
+An index is a directory containing a small JSON header and a set of ``.npy`` columns:
+
+* The Visible Record position of every Logical Record.
+* The position, Logical Record type and raw Logical Data of every EFLR. The Logical Data of all the EFLRs is stored
+  as a single byte array with an array of offsets into it.
+* The Visible Record position, LRSH position, frame number and X axis value of every IFLR. Each X axis in each Logical
+  File is a contiguous range of these.
+
+When read back the columns are memory mapped with ``np.load(mmap_mode='r')`` and EFLRs are only parsed when they are
+first accessed so opening an index is fast and uses little memory regardless of the size of the original file.
+
+Example::
+
+    with LogicalFile.LogicalIndex(path_in) as logical_index:
+        BinaryIndex.write(logical_index, path_index)
+    # Later
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        for logical_file in logical_index.logical_files:
+            ...
+
+The index records the path and size of the original file, this path is used to read frame data unless another path
+or file object is given.
+"""
+import collections.abc
+import json
+import logging
+import os
+import shutil
+import typing
+
+import numpy as np
+
+from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1.core import File
+from TotalDepth.RP66V1.core import Index
+from TotalDepth.RP66V1.core import LogPass
+from TotalDepth.RP66V1.core import LogicalFile
+from TotalDepth.RP66V1.core import RepCode
+from TotalDepth.RP66V1.core import StorageUnitLabel
+from TotalDepth.RP66V1.core import XAxis
+from TotalDepth.RP66V1.core.LogicalRecord import EFLR
+
+
+logger = logging.getLogger(__file__)
+
+
+class ExceptionBinaryIndex(ExceptionTotalDepthRP66V1):
+    pass
+
+
+#: Identifies the index format in the header.
+INDEX_FORMAT = 'TotalDepth.RP66V1.BinaryIndex'
+#: Version of the index format, increment this on any incompatible change.
+INDEX_VERSION = 1
+#: Name of the header file in the index directory.
+HEADER_FILE = 'index.json'
+#: Names and dtypes of the columns in the index directory.
+COLUMNS = {
+    'lr_vr_position': np.int64,
+    'eflr_vr_position': np.int64,
+    'eflr_lrsh_position': np.int64,
+    'eflr_lr_type': np.uint8,
+    'eflr_offsets': np.int64,
+    'eflr_data': np.uint8,
+    'iflr_vr_position': np.int64,
+    'iflr_lrsh_position': np.int64,
+    'iflr_frame_number': np.int64,
+    'iflr_x_axis': np.float64,
+}
+
+
+def _column_path(path_index: str, name: str) -> str:
+    return os.path.join(path_index, f'{name}.npy')
+
+
+def _value_to_json(value: typing.Any) -> typing.Any:
+    """Encodes bytes and ObjectName values so that they can be written as JSON."""
+    if isinstance(value, RepCode.ObjectName):
+        return ['o', value.O, value.C, value.I.decode('latin-1')]
+    if isinstance(value, bytes):
+        return ['b', value.decode('latin-1')]
+    return value
+
+
+def _value_from_json(value: typing.Any) -> typing.Any:
+    """The reverse of _value_to_json()."""
+    if isinstance(value, list):
+        if value[0] == 'o':
+            return RepCode.ObjectName(value[1], value[2], value[3].encode('latin-1'))
+        return value[1].encode('latin-1')
+    return value
+
+
+def _index_of(position_eflrs: typing.Sequence[LogicalFile.PositionEFLR],
+              eflr: typing.Union[EFLR.ExplicitlyFormattedLogicalRecord, None]) -> typing.Union[int, None]:
+    """Returns the index of the EFLR in the Logical File's EFLRs or None."""
+    if eflr is not None:
+        for i, position_eflr in enumerate(position_eflrs):
+            if position_eflr.eflr is eflr:
+                return i
+    return None
+
+
+def write(logical_index: LogicalFile.LogicalIndex, path_index: str) -> int:
+    """Writes the LogicalIndex to a binary index in the directory path_index replacing any existing index.
+    The LogicalIndex must be open as the Logical Data of the EFLRs is read from the file.
+    Returns the total size of the index in bytes."""
+    columns: typing.Dict[str, list] = {k: [] for k in COLUMNS}
+    logical_files = []
+    eflr_offset = iflr_offset = 0
+    for logical_file in logical_index.logical_files:
+        eflr_start = len(columns['eflr_lr_type'])
+        for position_eflr in logical_file.eflrs:
+            position = position_eflr.lrsh_position
+            by = logical_index._logical_record_index.get_file_logical_data_at_position(position).logical_data.bytes
+            columns['eflr_vr_position'].append(position.vr_position)
+            columns['eflr_lrsh_position'].append(position.lrsh_position)
+            columns['eflr_lr_type'].append(position_eflr.eflr.lr_type)
+            columns['eflr_offsets'].append(eflr_offset)
+            columns['eflr_data'].append(np.frombuffer(by, dtype=np.uint8))
+            eflr_offset += len(by)
+        x_axes = []
+        for object_name, x_axis in logical_file.iflr_position_map.items():
+            for name in ('vr_position', 'lrsh_position', 'frame_number', 'x_axis'):
+                columns[f'iflr_{name}'].append(getattr(x_axis, name))
+            x_axes.append(
+                {
+                    'object_name': _value_to_json(object_name),
+                    'ident': _value_to_json(x_axis.ident),
+                    'long_name': _value_to_json(x_axis.long_name),
+                    'units': _value_to_json(x_axis.units),
+                    'iflrs': [iflr_offset, iflr_offset + len(x_axis)],
+                }
+            )
+            iflr_offset += len(x_axis)
+        logical_files.append(
+            {
+                'eflrs': [eflr_start, len(columns['eflr_lr_type'])],
+                'channel': _index_of(logical_file.eflrs, logical_file.channel),
+                'frame': _index_of(logical_file.eflrs, logical_file.frame),
+                'log_pass_eflr_digests': {
+                    k.decode('latin-1'): v for k, v in logical_file.log_pass_eflr_digests.items()
+                },
+                'x_axes': x_axes,
+            }
+        )
+    columns['eflr_offsets'].append(eflr_offset)
+    columns['lr_vr_position'] = logical_index.visible_record_positions
+    path = logical_index.id
+    is_file = os.path.isfile(path)
+    header = {
+        'format': INDEX_FORMAT,
+        'version': INDEX_VERSION,
+        'path': os.path.abspath(path) if is_file else path,
+        'size': os.path.getsize(path) if is_file else -1,
+        'storage_unit_label': logical_index.storage_unit_label.as_bytes().decode('latin-1'),
+        'logical_files': logical_files,
+    }
+    # Write to a temporary directory then rename.
+    temp_path = f'{path_index}.{os.getpid()}.tmp'
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    for name, dtype in COLUMNS.items():
+        values = columns[name]
+        if name.startswith('iflr_') or name == 'eflr_data':
+            array = np.concatenate(values).astype(dtype) if len(values) else np.empty(0, dtype=dtype)
+        else:
+            array = np.array(values, dtype=dtype)
+        np.save(_column_path(temp_path, name), array)
+    with open(os.path.join(temp_path, HEADER_FILE), 'w') as fobj:
+        json.dump(header, fobj)
+    shutil.rmtree(path_index, ignore_errors=True)
+    os.rename(temp_path, path_index)
+    return index_size(path_index)
+
+
+def index_size(path_index: str) -> int:
+    """Returns the total size of the index in bytes."""
+    return sum(entry.stat().st_size for entry in os.scandir(path_index) if entry.is_file())
+
+
+def read_header(path_index: str) -> typing.Dict[str, typing.Any]:
+    """Reads and checks the header of the index. Raises an ExceptionBinaryIndex if this is not an index or is of a
+    different version."""
+    try:
+        with open(os.path.join(path_index, HEADER_FILE)) as fobj:
+            header = json.load(fobj)
+    except (OSError, ValueError) as err:
+        raise ExceptionBinaryIndex(f'Can not read index header in {path_index}: {err}') from err
+    if not isinstance(header, dict) or header.get('format') != INDEX_FORMAT:
+        raise ExceptionBinaryIndex(f'Not a binary index: {path_index}')
+    if header.get('version') != INDEX_VERSION:
+        raise ExceptionBinaryIndex(
+            f'Binary index {path_index} is version {header.get("version")} not {INDEX_VERSION}'
+        )
+    return header
+
+
+class PositionEFLRs(collections.abc.Sequence):
+    """A read only sequence of LogicalFile.PositionEFLR objects where each EFLR is parsed from its Logical Data when it
+    is first accessed and then cached."""
+    def __init__(self, vr_position: np.ndarray, lrsh_position: np.ndarray, lr_type: np.ndarray,
+                 offsets: np.ndarray, data: np.ndarray):
+        """vr_position, lrsh_position and lr_type have an entry for each EFLR and offsets has one more than that, data
+        is all the Logical Data and is indexed by offsets."""
+        assert len(vr_position) == len(lrsh_position) == len(lr_type) == len(offsets) - 1
+        self._vr_position = vr_position
+        self._lrsh_position = lrsh_position
+        self._lr_type = lr_type
+        self._offsets = offsets
+        self._data = data
+        self._position_eflrs: typing.Dict[int, LogicalFile.PositionEFLR] = {}
+
+    def __len__(self) -> int:
+        return len(self._lr_type)
+
+    def _position_eflr(self, index: int) -> LogicalFile.PositionEFLR:
+        if index not in self._position_eflrs:
+            logical_data = File.LogicalData(
+                self._data[self._offsets[index]:self._offsets[index + 1]].tobytes()
+            )
+            self._position_eflrs[index] = LogicalFile.PositionEFLR(
+                File.LogicalRecordPositionBase(int(self._vr_position[index]), int(self._lrsh_position[index])),
+                EFLR.ExplicitlyFormattedLogicalRecord(int(self._lr_type[index]), logical_data),
+            )
+        return self._position_eflrs[index]
+
+    def __getitem__(self, item) -> typing.Union[LogicalFile.PositionEFLR, typing.List[LogicalFile.PositionEFLR]]:
+        if isinstance(item, slice):
+            return [self._position_eflr(i) for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError(f'EFLR index {item} out of range for length {len(self)}')
+        return self._position_eflr(item)
+
+    @property
+    def num_parsed(self) -> int:
+        """The number of EFLRs that have been parsed."""
+        return len(self._position_eflrs)
+
+
+class LogicalFileBinary(LogicalFile.LogicalFile):
+    """A LogicalFile read from a binary index. The EFLRs, CHANNEL, FRAME and LogPass are created when first accessed.
+    This is read only, EFLRs and IFLRs can not be added."""
+    def __init__(self, logical_record_index: Index.LogicalRecordIndex,
+                 eflrs: PositionEFLRs,
+                 channel_index: typing.Union[int, None],
+                 frame_index: typing.Union[int, None],
+                 iflr_position_map: typing.Dict[RepCode.ObjectName, XAxis.XAxis],
+                 log_pass_eflr_digests: typing.Dict[bytes, str]):
+        # Deliberately does not call super().__init__() as that needs the parsed FILE-HEADER EFLR.
+        self._logical_record_index = logical_record_index
+        self._eflrs = eflrs
+        self._channel_index = channel_index
+        self._frame_index = frame_index
+        self._log_pass: typing.Union[None, LogPass.LogPass] = None
+        self.origin_index: int = -1
+        self.iflr_position_map = iflr_position_map
+        self.log_pass_eflr_digests = log_pass_eflr_digests
+
+    @property
+    def eflrs(self) -> PositionEFLRs:
+        return self._eflrs
+
+    @property
+    def channel(self) -> typing.Union[None, EFLR.ExplicitlyFormattedLogicalRecord]:
+        if self._channel_index is None:
+            return None
+        return self._eflrs[self._channel_index].eflr
+
+    @property
+    def frame(self) -> typing.Union[None, EFLR.ExplicitlyFormattedLogicalRecord]:
+        if self._frame_index is None:
+            return None
+        return self._eflrs[self._frame_index].eflr
+
+    @property
+    def log_pass(self) -> typing.Union[None, LogPass.LogPass]:
+        if self._log_pass is None and self._channel_index is not None and self._frame_index is not None:
+            self._log_pass = LogPass.log_pass_from_RP66V1(self.frame, self.channel)
+        return self._log_pass
+
+    def add_eflr(self, file_logical_data: File.FileLogicalData, eflr: EFLR.ExplicitlyFormattedLogicalRecord) -> None:
+        raise ExceptionBinaryIndex('Can not add an EFLR to a LogicalFile read from a binary index.')
+
+    def add_iflr(self, file_logical_data: File.FileLogicalData, iflr) -> None:
+        raise ExceptionBinaryIndex('Can not add an IFLR to a LogicalFile read from a binary index.')
+
+
+class LogicalIndexBinary(LogicalFile.LogicalIndex):
+    """A LogicalIndex read from a binary index written by ``write()``.
+    The Logical Files are available when this is used as a context manager, this does not scan the original file.
+
+    path_or_file is the original file used for reading frame data, if None the path recorded in the index is used.
+    The size of that file must match the size recorded in the index unless the index was written from a file object.
+    """
+    def __init__(self, path_index: str,
+                 path_or_file: typing.Union[str, typing.BinaryIO, None] = None,
+                 use_mmap: bool = False):
+        self.path_index = path_index
+        self._header = read_header(path_index)
+        if path_or_file is None:
+            path_or_file = self._header['path']
+        if isinstance(path_or_file, str) and os.path.isfile(path_or_file) and self._header['size'] >= 0 \
+                and os.path.getsize(path_or_file) != self._header['size']:
+            raise ExceptionBinaryIndex(
+                f'Size of {path_or_file} is {os.path.getsize(path_or_file)} but index {path_index}'
+                f' expects {self._header["size"]}'
+            )
+        super().__init__(path_or_file, use_mmap)
+
+    def _load(self, name: str) -> np.ndarray:
+        """Returns the column as a read only memory mapped array."""
+        try:
+            return np.load(_column_path(self.path_index, name), mmap_mode='r')
+        except (OSError, ValueError) as err:
+            raise ExceptionBinaryIndex(f'Can not read column {name} in {self.path_index}: {err}') from err
+
+    @property
+    def storage_unit_label(self) -> StorageUnitLabel.StorageUnitLabel:
+        """The Storage Unit Label. This comes from the index."""
+        return StorageUnitLabel.StorageUnitLabel(self._header['storage_unit_label'].encode('latin-1'))
+
+    @property
+    def visible_record_positions(self) -> typing.List[int]:
+        """A list of Visible Record positions. This comes from the index."""
+        return self._load('lr_vr_position').tolist()
+
+    def _logical_files(self) -> typing.List[LogicalFileBinary]:
+        eflr_columns = [
+            self._load(name) for name in ('eflr_vr_position', 'eflr_lrsh_position', 'eflr_lr_type', 'eflr_offsets')
+        ]
+        eflr_data = self._load('eflr_data')
+        iflr_columns = [
+            self._load(name)
+            for name in ('iflr_vr_position', 'iflr_lrsh_position', 'iflr_frame_number', 'iflr_x_axis')
+        ]
+        ret = []
+        for logical_file in self._header['logical_files']:
+            start, stop = logical_file['eflrs']
+            # The offsets are absolute into eflr_data.
+            eflrs = PositionEFLRs(*(column[start:stop] for column in eflr_columns[:3]),
+                                  eflr_columns[3][start:stop + 1], eflr_data)
+            iflr_position_map = {}
+            for x_axis in logical_file['x_axes']:
+                iflr_start, iflr_stop = x_axis['iflrs']
+                iflr_position_map[_value_from_json(x_axis['object_name'])] = XAxis.XAxis.from_arrays(
+                    _value_from_json(x_axis['ident']),
+                    _value_from_json(x_axis['long_name']),
+                    _value_from_json(x_axis['units']),
+                    *(column[iflr_start:iflr_stop] for column in iflr_columns),
+                )
+            ret.append(
+                LogicalFileBinary(
+                    self._logical_record_index,
+                    eflrs,
+                    logical_file['channel'],
+                    logical_file['frame'],
+                    iflr_position_map,
+                    {k.encode('latin-1'): v for k, v in logical_file['log_pass_eflr_digests'].items()},
+                )
+            )
+        return ret
+
+    def __enter__(self):
+        """Context manager support. This opens the original file and reads the Logical Files from the index."""
+        self._logical_record_index.rp66v1_file._enter()
+        self.logical_files = self._logical_files()
+        return self
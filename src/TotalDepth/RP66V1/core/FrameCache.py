@@ -0,0 +1,163 @@
+"""
+A persistent on-disk cache of decoded RP66V1 FrameArray channel data.
+
+Each entry is a directory of ``.npy`` files, one per channel, that are memory mapped when read back.
+Entries are keyed on the file path, size and modification time, a digest of the EFLRs that define the Log Pass and the
+FrameArray, frame slice and channels requested.
+The total size of the cache is limited by evicting the least recently used entries.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import typing
+
+import numpy as np
+
+from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
+from TotalDepth.RP66V1.core import LogPass
+from TotalDepth.common import Slice
+
+
+logger = logging.getLogger(__file__)
+
+
+class ExceptionFrameCache(ExceptionTotalDepthRP66V1):
+    pass
+
+
+class FrameCache:
+    """Persistent cache of FrameArray channel data in a directory.
+
+    ``hits``, ``misses`` and ``evictions`` count the cache activity for monitoring.
+    """
+    DEFAULT_MAX_BYTES = 1024 ** 3
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ExceptionFrameCache(f'max_bytes must be >= 0 not {max_bytes}')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __str__(self) -> str:
+        return f'<FrameCache {self.directory} hits: {self.hits} misses: {self.misses} evictions: {self.evictions}>'
+
+    @staticmethod
+    def _slice_description(frame_slice: typing.Any, num_frames: int) -> str:
+        """A description of the frame slice that is unique to the frames it selects. The ``str()`` of an IndexList
+        only shows the count and the first and last index so the full index list is used."""
+        if isinstance(frame_slice, Slice.IndexList):
+            return f'<IndexList {frame_slice.indices(num_frames)}>'
+        return str(frame_slice)
+
+    @staticmethod
+    def key(path: str,
+            eflr_digest: str,
+            frame_array: LogPass.FrameArray,
+            frame_slice: typing.Any,
+            channels: typing.Union[typing.Set[typing.Hashable], None],
+            num_frames: int) -> typing.Union[str, None]:
+        """Returns the cache key or None if path is not a file, for example if the data was read from memory.
+        num_frames is the total number of frames in the FrameArray."""
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        hash_key = hashlib.sha1()
+        for value in (
+                os.path.abspath(path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                eflr_digest,
+                frame_array.ident,
+                FrameCache._slice_description(frame_slice, num_frames),
+                None if channels is None else sorted(str(c) for c in channels),
+        ):
+            hash_key.update(str(value).encode('utf-8'))
+            hash_key.update(b'\x00')
+        return hash_key.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    @staticmethod
+    def _channel_path(entry_path: str, index: int) -> str:
+        return os.path.join(entry_path, f'c{index}.npy')
+
+    def load(self, key: str, frame_array: LogPass.FrameArray) -> bool:
+        """Sets the channel arrays of the FrameArray as read only memory mapped arrays from the cache.
+        Returns True on a cache hit, False on a miss in which case the FrameArray is unchanged."""
+        entry_path = self._entry_path(key)
+        channel_paths = [self._channel_path(entry_path, c) for c in range(len(frame_array))]
+        if not all(os.path.isfile(p) for p in channel_paths):
+            self.misses += 1
+            return False
+        try:
+            arrays = [np.load(p, mmap_mode='r') for p in channel_paths]
+        except (OSError, ValueError) as err:
+            logger.warning(f'FrameCache: ignoring corrupt entry {entry_path}: {err}')
+            self.misses += 1
+            return False
+        for channel, array in zip(frame_array.channels, arrays):
+            channel.array = array
+        # Mark as most recently used.
+        os.utime(entry_path)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, frame_array: LogPass.FrameArray) -> None:
+        """Writes the channel arrays of the FrameArray to the cache then evicts entries if over size.
+        Entries that are larger than max_bytes are not stored."""
+        entry_size = sum(channel.array.nbytes for channel in frame_array.channels)
+        if entry_size > self.max_bytes:
+            logger.debug(f'FrameCache: not storing {key} of {entry_size} bytes, more than {self.max_bytes}')
+            return
+        entry_path = self._entry_path(key)
+        temp_path = f'{entry_path}.{os.getpid()}.tmp'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+        for c, channel in enumerate(frame_array.channels):
+            np.save(self._channel_path(temp_path, c), channel.array)
+        shutil.rmtree(entry_path, ignore_errors=True)
+        try:
+            os.rename(temp_path, entry_path)
+        except OSError:
+            # Another process has written this entry.
+            shutil.rmtree(temp_path, ignore_errors=True)
+        self.evict(key)
+
+    @staticmethod
+    def _entry_size(entry_path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(entry_path) if entry.is_file())
+
+    @property
+    def size(self) -> int:
+        """The total size of the cache entries in bytes."""
+        return sum(self._entry_size(entry.path) for entry in os.scandir(self.directory) if entry.is_dir())
+
+    def evict(self, keep_key: typing.Union[str, None] = None) -> None:
+        """Removes the least recently used entries until the cache is no bigger than max_bytes.
+        The entry for keep_key, typically the one just stored, is never evicted."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and not entry.name.endswith('.tmp') and entry.name != keep_key:
+                entries.append((entry.stat().st_mtime_ns, self._entry_size(entry.path), entry.path))
+        total = sum(v[1] for v in entries)
+        if keep_key is not None and os.path.isdir(self._entry_path(keep_key)):
+            total += self._entry_size(self._entry_path(keep_key))
+        for _mtime, entry_size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            logger.debug(f'FrameCache: evicting {entry_path}')
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total -= entry_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        for entry in os.scandir(self.directory):
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
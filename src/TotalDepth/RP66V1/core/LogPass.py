@@ -76,7 +76,51 @@ class FrameChannel:
         self.np_dtype: np.dtype = np_dtype
         self.rank: int = len(self.dimensions)
         self.count: int = reduce(lambda x, y: x * y, self.dimensions, 1)
-        self.array: np.ndarray = self._init_array(0)
+        self._array: typing.Union[None, np.ndarray] = self._init_array(0)
+        # If set then the array is decoded on demand by this, see LogicalFile.LazyChannelLoader
+        self.lazy_loader = None
+
+    @property
+    def array(self) -> np.ndarray:
+        """The numpy array of values. If there is a lazy loader this will be decoded when first accessed."""
+        if self.lazy_loader is not None:
+            if self._array is None:
+                self._array = self.lazy_loader.load(self)
+            else:
+                self.lazy_loader.touch(self)
+        return self._array
+
+    @array.setter
+    def array(self, value: np.ndarray) -> None:
+        """Sets the array explicitly, this removes any lazy loader."""
+        self.lazy_loader = None
+        self._array = value
+
+    @property
+    def is_loaded(self) -> bool:
+        """False if the array is waiting to be decoded by a lazy loader."""
+        return self._array is not None
+
+    def unload(self) -> None:
+        """Discards the array so that the lazy loader will decode it again when next accessed."""
+        if self.lazy_loader is None:
+            raise ExceptionFrameChannel(f'Can not unload channel {self.ident} that has no lazy loader.')
+        self._array = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The lazy loader has file references so is not pickled.
+        state['lazy_loader'] = None
+        if state['_array'] is None:
+            state['_array'] = self._init_array(0)
+        return state
+
+    def __setstate__(self, state):
+        # Older pickles have 'array' rather than '_array'
+        if 'array' in state:
+            state['_array'] = state.pop('array')
+        state.setdefault('lazy_loader', None)
+        self.__dict__.update(state)
 
     def __str__(self) -> str:
         return f'FrameChannel: {self.ident:18} Rc: {self.rep_code:3d} Co: {self.count:4d}' \
@@ -88,12 +132,14 @@ class FrameChannel:
     def init_array(self, number_of_frames: int) -> None:
         """
         Initialises an empty Numpy array suitable to fill with <frames> number of frame data for this channel.
-        If an array already exists of the correct length it is reused.
+        If a writeable array already exists of the correct length it is reused.
+        This removes any lazy loader.
         """
         if number_of_frames < 0:
             raise ExceptionFrameChannel(f'Number of frames must be >= 0 not {number_of_frames}')
-        if self.array is None or len(self.array) != number_of_frames:
-            self.array = self._init_array(number_of_frames)
+        self.lazy_loader = None
+        if self._array is None or len(self._array) != number_of_frames or not self._array.flags.writeable:
+            self._array = self._init_array(number_of_frames)
 
     @property
     def array_size(self) -> int:
@@ -280,6 +326,93 @@ class FrameArray:
                 channel.seek(ld)
         self._handle_remaining(ld, frame_number)
 
+    @property
+    def is_numpy_decodable(self) -> bool:
+        """True if every channel has a fixed length Representation Code that numpy can decode. If so then whole frames
+        can be read in bulk with ``read_frames()``."""
+        return len(self.channels) > 0 and all(RepCode.has_numpy_raw_dtype(ch.rep_code) for ch in self.channels)
+
+    @property
+    def numpy_frame_dtype(self) -> np.dtype:
+        """A numpy structured dtype that describes the raw RP66V1 bytes of one frame.
+        There is one field per channel named ``'c0'``, ``'c1'`` etc. with the channel dimensions as the sub-array shape.
+
+        Will raise an ExceptionFrameArray if any channel can not be decoded by numpy, see ``is_numpy_decodable``."""
+        fields = []
+        for c, channel in enumerate(self.channels):
+            try:
+                fields.append((f'c{c}', RepCode.numpy_raw_dtype(channel.rep_code), tuple(channel.dimensions)))
+            except RepCode.ExceptionRepCode as err:
+                raise ExceptionFrameArray(f'Channel {channel.ident} can not be decoded by numpy: {err}') from err
+        return np.dtype(fields)
+
+    def read_frames(self, by: typing.Union[bytes, bytearray, memoryview], array_index: int, number_of_frames: int,
+                    channels: typing.Union[typing.Set[typing.Hashable], None] = None) -> None:
+        """Reads contiguous frame data into the numpy arrays starting at array_index.
+        The frame data is the IFLR data with the leading OBNAME and frame number removed, each frame being exactly
+        ``len_input_bytes`` long.
+
+        This decodes all the frames with a single ``np.frombuffer()`` call rather than a call per value as ``read()``
+        does. The channels parameter limits the decoding to those channels, the X axis is always decoded."""
+        frame_dtype = self.numpy_frame_dtype
+        if len(by) < number_of_frames * frame_dtype.itemsize:
+            raise ExceptionFrameArray(
+                f'read_frames() needs {number_of_frames * frame_dtype.itemsize} bytes for {number_of_frames} frames'
+                f' but was given {len(by)} bytes.'
+            )
+        frames = np.frombuffer(by, dtype=frame_dtype, count=number_of_frames)
+        for c, channel in enumerate(self.channels):
+            if c == 0 or channels is None or channel.ident in channels:
+                channel.array[array_index:array_index + number_of_frames] = RepCode.numpy_array_convert(
+                    channel.rep_code, frames[f'c{c}']
+                )
+
+    @property
+    def channel_offsets(self) -> typing.List[int]:
+        """The byte offset of each channel in a frame from the ``len_input_bytes`` of the preceding channels.
+
+        Will raise an ExceptionFrameChannel if any channel, apart from the last, is not represented by a fixed length
+        Representation Code."""
+        offsets = [0]
+        for channel in self.channels[:-1]:
+            offsets.append(offsets[-1] + channel.len_input_bytes)
+        return offsets
+
+    def decode_channel_frames(self, by: typing.Union[bytes, bytearray, memoryview], channel_index: int,
+                              number_of_frames: int, channel_only: bool = False) -> np.ndarray:
+        """Decodes a single channel from contiguous frame data, as for ``read_frames()``, and returns a new array.
+        Only that channel needs to be numpy decodable, the other channels are skipped over using
+        ``channel_offsets``.
+        If channel_only is True then the data is only the bytes of this channel for each frame."""
+        channel = self.channels[channel_index]
+        if channel_only:
+            frame_length = channel.len_input_bytes
+            channel_offset = 0
+        else:
+            frame_length = self.len_input_bytes
+            channel_offset = self.channel_offsets[channel_index]
+        if len(by) < number_of_frames * frame_length:
+            raise ExceptionFrameArray(
+                f'decode_channel_frames() needs {number_of_frames * frame_length} bytes for {number_of_frames} frames'
+                f' but was given {len(by)} bytes.'
+            )
+        try:
+            raw_dtype = RepCode.numpy_raw_dtype(channel.rep_code)
+        except RepCode.ExceptionRepCode as err:
+            raise ExceptionFrameArray(f'Channel {channel.ident} can not be decoded by numpy: {err}') from err
+        channel_dtype = np.dtype(
+            {
+                'names': ['v'],
+                'formats': [(raw_dtype, tuple(channel.dimensions))],
+                'offsets': [channel_offset],
+                'itemsize': frame_length,
+            }
+        )
+        frames = np.frombuffer(by, dtype=channel_dtype, count=number_of_frames)
+        array = channel._init_array(number_of_frames)
+        array[:] = RepCode.numpy_array_convert(channel.rep_code, frames['v'])
+        return array
+
     @property
     def x_axis(self) -> FrameChannel:
         if len(self.channels) == 0:
@@ -6,15 +6,22 @@ Represents a RP66V1 file as a 'logical' level.
 
 import bisect
 import collections
+import concurrent.futures
 import io
 import logging
+import os
 import pickle
 import typing
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+
+import numpy as np
 
 from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core.LogicalRecord import EFLR
 from TotalDepth.RP66V1.core.LogicalRecord import IFLR
 from TotalDepth.RP66V1.core import File, Index
+from TotalDepth.RP66V1.core import FrameCache
 from TotalDepth.RP66V1.core import RepCode
 from TotalDepth.RP66V1.core import LogPass
 from TotalDepth.RP66V1.core import XAxis
@@ -109,6 +116,8 @@ class LogicalFile:
         self.frame: typing.Union[None, EFLR.ExplicitlyFormattedLogicalRecord] = None
         self.log_pass: typing.Union[None, LogPass.LogPass] = None
         self.iflr_position_map: typing.Dict[RepCode.ObjectName, XAxis.XAxis] = {}
+        # SHA1 hex digests of the CHANNEL and FRAME EFLRs that define the Log Pass, used to key a FrameCache.
+        self.log_pass_eflr_digests: typing.Dict[bytes, str] = {}
 
     def _check_fld_matches_eflr(self, file_logical_data: File.FileLogicalData,
                                 eflr: EFLR.ExplicitlyFormattedLogicalRecord) -> None:
@@ -199,10 +208,12 @@ class LogicalFile:
                 if self.channel is not None or self.log_pass is not None:
                     raise ExceptionLogicalFileAdd(f'Multiple CHANNEL EFLRs in a Logical File.')
                 self.channel = eflr
+                self.log_pass_eflr_digests[eflr.set.type] = file_logical_data.logical_data.sha1.hexdigest()
             elif eflr.set.type == b'FRAME':
                 if self.frame is not None or self.log_pass is not None:
                     raise ExceptionLogicalFileAdd(f'Multiple FRAME EFLRs in a Logical File.')
                 self.frame = eflr
+                self.log_pass_eflr_digests[eflr.set.type] = file_logical_data.logical_data.sha1.hexdigest()
             # If the data is now there then construct a LogPass
             if self.channel is not None and self.frame is not None:
                 if self.log_pass is None:
@@ -247,24 +258,39 @@ class LogicalFile:
     def populate_frame_array(
             self,
             frame_array: LogPass.FrameArray,
-            frame_slice: typing.Union[Slice.Slice, Slice.Sample, None] = None,
+            frame_slice: typing.Union[Slice.Slice, Slice.Sample, XAxis.XRange, None] = None,
             channels: typing.Union[typing.Set[typing.Hashable], None] = None,
+            frame_cache: typing.Union[FrameCache.FrameCache, None] = None,
     ) -> int:
         """Populates a FrameArray with channel values.
 
         frame_array must be a member of the LogPass in thisLogicalFile.
 
-        frame_slice Allows partial population in the X axis.
+        frame_slice Allows partial population in the X axis. This can also be a XAxis.XRange of X axis values in which
+        case only the frames in that range are populated, these are found by a binary search on the X axis.
 
         channels Allows partial population of specific channels.
 
+        frame_cache If given then the channel arrays are read from the cache if present as read only memory mapped
+        arrays. Otherwise the FrameArray is populated from the file and the result written to the cache.
+
         The FrameArray will be populated and this returns the number of frames populated.
         """
         if self.log_pass is None:
             raise ExceptionLogicalFile(f'populate_frame_array(): when no Log Pass')
         if not id(frame_array) in [id(v) for v in self.log_pass.frame_arrays]:
             raise ExceptionLogicalFile(f'populate_frame_array(): given FrameArray is not in Log Pass')
+        if frame_cache is not None:
+            key = self.frame_cache_key(frame_array, frame_slice, channels)
+            if key is not None:
+                if frame_cache.load(key, frame_array):
+                    return len(frame_array.x_axis.array)
+                num_frames = self.populate_frame_array(frame_array, frame_slice, channels)
+                frame_cache.store(key, frame_array)
+                return num_frames
         iflrs: XAxis.XAxis = self.iflr_position_map[frame_array.ident]
+        if isinstance(frame_slice, XAxis.XRange):
+            frame_slice = iflrs.frames_between(frame_slice.start, frame_slice.stop)
         if len(iflrs):
             # Set partial frames
             if frame_slice is not None:
@@ -273,6 +299,10 @@ class LogicalFile:
             else:
                 range_gen = range(len(iflrs))
                 num_frames = len(iflrs)
+            if num_frames == 0:
+                for channel in frame_array.channels:
+                    channel.init_array(0)
+                return num_frames
             # Set partial channels
             if channels is not None:
                 frame_array.init_arrays_partial(num_frames, channels)
@@ -281,29 +311,314 @@ class LogicalFile:
             # Now populate
             logger.debug(f'populate_frame_array(): len(iflrs): {len(iflrs)} slice: {frame_slice}'
                          f' num_frames: {num_frames} range_gen: {range_gen}.')
-            for array_index, frame_number in enumerate(range_gen):
-                iflr_reference = iflrs[frame_number]
-                fld: File.FileLogicalData = self._logical_record_index.get_file_logical_data_at_position(
-                    iflr_reference.logical_record_position
-                )
-                # Create an IFLR but we don't use it, just the remaining bytes in the Logical Data.
-                _iflr = IFLR.IndirectlyFormattedLogicalRecord(fld.lr_type, fld.logical_data)
-                if channels is not None:
-                    frame_array.read_partial(fld.logical_data, array_index, channels)
-                else:
-                    frame_array.read(fld.logical_data, array_index)
+            if frame_array.is_numpy_decodable:
+                self._populate_frame_array_numpy(frame_array, iflrs, range_gen, num_frames, channels)
+            else:
+                for array_index, frame_number in enumerate(range_gen):
+                    iflr_reference = iflrs[frame_number]
+                    fld: File.FileLogicalData = self._logical_record_index.get_file_logical_data_at_position(
+                        iflr_reference.logical_record_position
+                    )
+                    # Create an IFLR but we don't use it, just the remaining bytes in the Logical Data.
+                    _iflr = IFLR.IndirectlyFormattedLogicalRecord(fld.lr_type, fld.logical_data)
+                    if channels is not None:
+                        frame_array.read_partial(fld.logical_data, array_index, channels)
+                    else:
+                        frame_array.read(fld.logical_data, array_index)
         else:
             num_frames = 0
             frame_array.init_arrays(num_frames)
         return num_frames
 
+    def frame_cache_key(
+            self,
+            frame_array: LogPass.FrameArray,
+            frame_slice: typing.Union[Slice.Slice, Slice.Sample, Slice.IndexList, XAxis.XRange, None],
+            channels: typing.Union[typing.Set[typing.Hashable], None],
+    ) -> typing.Union[str, None]:
+        """Returns the FrameCache key for populating the FrameArray or None if this can not be cached, for example if
+        the file was read from memory."""
+        eflr_digest = ' '.join(f'{k.decode("ascii")}:{v}' for k, v in sorted(self.log_pass_eflr_digests.items()))
+        return FrameCache.FrameCache.key(
+            self._logical_record_index.path, eflr_digest, frame_array, frame_slice, channels,
+            self.num_frames(frame_array),
+        )
+
+    def _populate_frame_array_numpy(
+            self,
+            frame_array: LogPass.FrameArray,
+            iflrs: XAxis.XAxis,
+            range_gen: typing.Iterable[int],
+            num_frames: int,
+            channels: typing.Union[typing.Set[typing.Hashable], None],
+    ) -> None:
+        """Populates a FrameArray where every channel is numpy decodable. This reads the Logical Data of all the IFLRs
+        in bulk into a contiguous buffer and decodes that in one go with ``FrameArray.read_frames()``."""
+        positions = [iflrs[frame_number].logical_record_position for frame_number in range_gen]
+        frame_bytes = self._read_frame_bytes(frame_array, positions)
+        frame_array.read_frames(frame_bytes, 0, num_frames, channels)
+
+    def _read_frame_bytes(
+            self,
+            frame_array: LogPass.FrameArray,
+            positions: typing.Sequence[File.LogicalRecordPositionBase],
+    ) -> typing.Union[bytes, bytearray]:
+        """Reads the Logical Data of the IFLRs at the given positions in bulk and returns the frame data as a contiguous
+        buffer of frames each exactly ``frame_array.len_input_bytes`` long."""
+        num_frames = len(positions)
+        by, offsets = self._logical_record_index.get_logical_data_bulk(positions)
+        frame_bytes, frame_offsets = IFLR.frame_data_bulk(by, offsets)
+        frame_length = frame_array.len_input_bytes
+        frame_lengths = np.diff(frame_offsets)
+        if len(frame_lengths) and frame_lengths.min() < frame_length:
+            array_index = int(np.argmax(frame_lengths < frame_length))
+            raise ExceptionLogicalFile(
+                f'populate_frame_array(): frame {array_index} has {frame_lengths[array_index]} bytes'
+                f' but needs {frame_length}'
+            )
+        if np.any(frame_lengths != frame_length):
+            # Some IFLRs have excess data so copy the frames to a buffer with fixed length frames.
+            for array_index in np.flatnonzero(frame_lengths != frame_length):
+                logger.warning(
+                    f'Not all logical data consumed, frame {array_index}'
+                    f' remaining {frame_lengths[array_index] - frame_length} bytes'
+                )
+            frame_bytes = b''.join(
+                frame_bytes[frame_offsets[i]:frame_offsets[i] + frame_length] for i in range(num_frames)
+            )
+        return frame_bytes
+
+    def populate_frame_array_lazy(
+            self,
+            frame_array: LogPass.FrameArray,
+            frame_slice: typing.Union[Slice.Slice, Slice.Sample, XAxis.XRange, None] = None,
+            max_channels: typing.Union[int, None] = None,
+    ) -> int:
+        """Makes a FrameArray lazy, each channel array is decoded when it is first accessed and only that channel is
+        decoded. Decoded channels are kept in a bounded cache of size max_channels, None means
+        ``LazyChannelLoader.DEFAULT_MAX_CHANNELS``.
+
+        frame_slice is as for ``populate_frame_array()``.
+
+        Every channel must have a fixed length Representation Code.
+        The arrays can only be decoded while the LogicalIndex is open.
+
+        This returns the number of frames that each channel array will have.
+        """
+        if self.log_pass is None:
+            raise ExceptionLogicalFile('populate_frame_array_lazy(): when no Log Pass')
+        if not id(frame_array) in [id(v) for v in self.log_pass.frame_arrays]:
+            raise ExceptionLogicalFile(
+                f'populate_frame_array_lazy(): given FrameArray {frame_array.ident} is not in Log Pass'
+            )
+        try:
+            frame_array.len_input_bytes
+        except LogPass.ExceptionFrameChannel as err:
+            raise ExceptionLogicalFile(f'populate_frame_array_lazy(): {err}') from err
+        iflrs: XAxis.XAxis = self.iflr_position_map.get(frame_array.ident, None)
+        if iflrs is None:
+            positions = []
+        else:
+            if isinstance(frame_slice, XAxis.XRange):
+                frame_slice = iflrs.frames_between(frame_slice.start, frame_slice.stop)
+            if frame_slice is not None:
+                range_gen = frame_slice.gen_indices(len(iflrs))
+            else:
+                range_gen = range(len(iflrs))
+            positions = [iflrs[frame_number].logical_record_position for frame_number in range_gen]
+        if max_channels is None:
+            max_channels = LazyChannelLoader.DEFAULT_MAX_CHANNELS
+        loader = LazyChannelLoader(self, frame_array, positions, max_channels)
+        for channel in frame_array.channels:
+            channel.lazy_loader = loader
+            channel.unload()
+        return len(positions)
+
+
+class LazyChannelLoader:
+    """Decodes the channels of a FrameArray on demand, see ``LogicalFile.populate_frame_array_lazy()``.
+
+    This keeps at most max_channels decoded, the least recently accessed channel is unloaded when that is exceeded.
+    Each channel is decoded by reading only the bytes of that channel from each IFLR.
+    """
+    DEFAULT_MAX_CHANNELS = 8
+
+    def __init__(self,
+                 logical_file: LogicalFile,
+                 frame_array: LogPass.FrameArray,
+                 positions: typing.List[File.LogicalRecordPositionBase],
+                 max_channels: int):
+        if max_channels < 1:
+            raise ExceptionLogicalFile(f'LazyChannelLoader: max_channels must be > 0 not {max_channels}')
+        self.logical_file = logical_file
+        self.frame_array = frame_array
+        self.positions = positions
+        self.max_channels = max_channels
+        # Channel indexes of the loaded channels, least recently used first.
+        self.loaded: typing.Dict[int, None] = collections.OrderedDict()
+        # Offset of the frame data in the Logical Data of each IFLR, this is found on the first load.
+        self._frame_data_offsets: typing.Union[typing.List[int], None] = None
+
+    def __len__(self) -> int:
+        """The number of frames."""
+        return len(self.positions)
+
+    def _channel_index(self, channel: LogPass.FrameChannel) -> int:
+        return self.frame_array.channel_ident_map[channel.ident]
+
+    def _read_frame_data_offsets(self) -> typing.List[int]:
+        """Reads the OBNAME and frame number at the start of each IFLR and returns the offset of the frame data."""
+        index = self.logical_file._logical_record_index
+        by, offsets = index.get_logical_data_bulk(
+            self.positions, [(0, IFLR_PREAMBLE_MAX_LENGTH)] * len(self.positions)
+        )
+        ret = []
+        for offset in offsets[:-1]:
+            offset = int(offset)
+            ld_offset = RepCode.OBNAME_len(by, offset)
+            ld_offset += RepCode.UVARI_len(by, offset + ld_offset)
+            ret.append(ld_offset)
+        return ret
+
+    def _read_channel_bytes(self, channel_index: int) -> bytearray:
+        """Reads only the bytes of the channel from each IFLR and returns them as a contiguous buffer."""
+        if self._frame_data_offsets is None:
+            self._frame_data_offsets = self._read_frame_data_offsets()
+        channel_offset = self.frame_array.channel_offsets[channel_index]
+        channel_length = self.frame_array.channels[channel_index].len_input_bytes
+        by, offsets = self.logical_file._logical_record_index.get_logical_data_bulk(
+            self.positions, [(v + channel_offset, channel_length) for v in self._frame_data_offsets]
+        )
+        lengths = np.diff(offsets)
+        if len(lengths) and lengths.min() < channel_length:
+            array_index = int(np.argmax(lengths < channel_length))
+            raise ExceptionLogicalFile(
+                f'LazyChannelLoader: frame {array_index} has {lengths[array_index]} bytes for channel'
+                f' {self.frame_array.channels[channel_index].ident} but needs {channel_length}'
+            )
+        return by
+
+    def _decode(self, channel_index: int) -> np.ndarray:
+        channel = self.frame_array.channels[channel_index]
+        num_frames = len(self.positions)
+        if num_frames == 0:
+            return channel._init_array(0)
+        channel_bytes = self._read_channel_bytes(channel_index)
+        if RepCode.has_numpy_raw_dtype(channel.rep_code):
+            return self.frame_array.decode_channel_frames(channel_bytes, channel_index, num_frames, channel_only=True)
+        # Decode value by value.
+        array = channel._init_array(num_frames)
+        channel_length = channel.len_input_bytes
+        for frame_number in range(num_frames):
+            start = frame_number * channel_length
+            ld = File.LogicalData(bytes(channel_bytes[start:start + channel_length]))
+            for dim in channel.numpy_indexes(frame_number):
+                array[dim] = RepCode.code_read(channel.rep_code, ld)
+        return array
+
+    def load(self, channel: LogPass.FrameChannel) -> np.ndarray:
+        """Decodes and returns the array for the channel, this may unload other channels."""
+        channel_index = self._channel_index(channel)
+        array = self._decode(channel_index)
+        self.loaded[channel_index] = None
+        self.loaded.move_to_end(channel_index)
+        while len(self.loaded) > self.max_channels:
+            evict_index, _value = self.loaded.popitem(last=False)
+            evict_channel = self.frame_array.channels[evict_index]
+            if evict_channel.lazy_loader is self:
+                evict_channel.unload()
+        return array
+
+    def touch(self, channel: LogPass.FrameChannel) -> None:
+        """Marks the channel as recently used."""
+        channel_index = self._channel_index(channel)
+        if channel_index in self.loaded:
+            self.loaded.move_to_end(channel_index)
+
+
+#: Description of a channel array in shared memory: (shared memory name, array shape, array dtype string)
+SharedArrayDescription = typing.Tuple[str, typing.Tuple[int, ...], str]
+
+
+def _populate_frame_array_shared(
+        pickled_logical_file: bytes,
+        frame_array_index: int,
+        frame_slice: typing.Union[Slice.Slice, Slice.Sample, XAxis.XRange, None],
+        channels: typing.Union[typing.Set[typing.Hashable], None],
+) -> typing.Tuple[int, typing.List[SharedArrayDescription]]:
+    """Worker for ``LogicalIndex.populate_all()``. This un-pickles a LogicalFile, which opens its own file handle,
+    populates a FrameArray then copies each channel array into shared memory.
+    Returns the number of frames and a description of each channel array in shared memory.
+    The caller is responsible for unlinking the shared memory so this process does not track it, otherwise the
+    resource tracker of this process would unlink it, or warn that it has gone, when this process exits."""
+    logical_file: LogicalFile = pickle.loads(pickled_logical_file)
+    rp66v1_file = logical_file._logical_record_index.rp66v1_file
+    rp66v1_file._enter()
+    try:
+        frame_array = logical_file.log_pass[frame_array_index]
+        num_frames = logical_file.populate_frame_array(frame_array, frame_slice, channels)
+    finally:
+        rp66v1_file._exit()
+    shared_arrays: typing.List[SharedArrayDescription] = []
+    for channel in frame_array.channels:
+        # SharedMemory does not allow zero size.
+        shm = shared_memory.SharedMemory(create=True, size=max(1, channel.array.nbytes))
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        shared_array = np.ndarray(channel.array.shape, dtype=channel.array.dtype, buffer=shm.buf)
+        shared_array[...] = channel.array
+        shared_arrays.append((shm.name, channel.array.shape, channel.array.dtype.str))
+        del shared_array
+        shm.close()
+    return num_frames, shared_arrays
+
+
+class _SharedArrayBase:
+    """The base object of an array that is mapped onto shared memory. This keeps the shared memory open for the
+    lifetime of the array and its views, it is closed when they have all gone."""
+    def __init__(self, shm: shared_memory.SharedMemory, shape: typing.Tuple[int, ...], dtype: str):
+        self.shm = shm
+        # The array interface refers to the shared memory without holding an export of its buffer, an export would
+        # prevent SharedMemory.close().
+        self.__array_interface__ = np.ndarray(shape, dtype=dtype, buffer=shm.buf).__array_interface__
+
+
+def _array_from_shared_memory(shared_array: SharedArrayDescription) -> np.ndarray:
+    """Returns an array mapped onto shared memory, the array is not copied.
+    The shared memory is unlinked immediately so it is released when the array is."""
+    name, shape, dtype = shared_array
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        array = np.asarray(_SharedArrayBase(shm, shape, dtype))
+    finally:
+        # On POSIX this removes the name but the memory stays mapped, on Windows this does nothing and the memory is
+        # released when the last handle, ours, is closed.
+        shm.unlink()
+    return array
+
+
+def _unlink_shared_memory(shared_arrays: typing.List[SharedArrayDescription]) -> None:
+    """Unlinks the shared memory of arrays that have not been mapped, this ignores any that have been unlinked."""
+    for name, _shape, _dtype in shared_arrays:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+#: The maximum length of the OBNAME and frame number UVARI at the start of an IFLR.
+#: OBNAME is a UVARI origin (4 bytes), USHORT copy number (1 byte) and an IDENT (up to 256 bytes).
+IFLR_PREAMBLE_MAX_LENGTH = 4 + 1 + 256 + 4
+
 
 class LogicalIndex:
-    """This takes a RP66V1 file and indexes it into a sequence of Logical Files."""
-    def __init__(self, path_or_file: typing.Union[str, typing.BinaryIO]):
+    """This takes a RP66V1 file and indexes it into a sequence of Logical Files.
+    If use_mmap is True the file is memory mapped, see ``File.FileRead``."""
+    def __init__(self, path_or_file: typing.Union[str, typing.BinaryIO], use_mmap: bool = False):
         self.logical_files: typing.List[LogicalFile] = []
         # Low level index of Logical Records. A reference to this is given to every LogicalFile
-        self._logical_record_index = Index.LogicalRecordIndex(path_or_file)
+        self._logical_record_index = Index.LogicalRecordIndex(path_or_file, use_mmap)
         # TODO: Created from the FILE-HEADER values
         # {ID : {SEQUENCE-NUMBER : index_into_self.logical_files, ...}, ...}
         self.sequence_map: typing.Dict[str, typing.Dict[int, int]] = {}
@@ -330,14 +645,90 @@ class LogicalIndex:
         """A list of Visible Record positions. This is used by the XML index for example."""
         return self._logical_record_index.visible_record_positions
 
+    def populate_all(
+            self,
+            executor: typing.Union[concurrent.futures.Executor, None] = None,
+            channels: typing.Union[typing.Set[typing.Hashable], None] = None,
+            frame_slice: typing.Union[Slice.Slice, Slice.Sample, XAxis.XRange, None] = None,
+            frame_cache: typing.Union[FrameCache.FrameCache, None] = None,
+    ) -> typing.Dict[typing.Tuple[int, typing.Hashable], int]:
+        """Populates every FrameArray in every Logical File, channels, frame_slice and frame_cache are as for
+        ``LogicalFile.populate_frame_array()``.
+
+        If executor is None this is done serially. Otherwise each FrameArray is populated by the executor, typically a
+        ``concurrent.futures.ProcessPoolExecutor``. Each task gets a pickled LogicalFile and opens its own file handle
+        so this needs the index to have been created from a file path. The channel data comes back in shared memory so
+        it is not pickled and the channel arrays are mapped onto that shared memory rather than copied out of it.
+
+        Returns a dict of ``{(logical_file_index, frame_array.ident) : number_of_frames, ...}``.
+        """
+        result: typing.Dict[typing.Tuple[int, typing.Hashable], int] = {}
+        if executor is None:
+            for lf_index, logical_file in enumerate(self.logical_files):
+                if logical_file.has_log_pass:
+                    for frame_array in logical_file.log_pass.frame_arrays:
+                        result[(lf_index, frame_array.ident)] = logical_file.populate_frame_array(
+                            frame_array, frame_slice, channels, frame_cache
+                        )
+            return result
+        if not os.path.isfile(self._logical_record_index.path):
+            raise ExceptionLogicalIndex(
+                f'populate_all() with an executor needs a file path not {self._logical_record_index.path}'
+            )
+        futures: typing.Dict[
+            concurrent.futures.Future, typing.Tuple[int, LogPass.FrameArray, typing.Union[str, None]]
+        ] = {}
+        for lf_index, logical_file in enumerate(self.logical_files):
+            if logical_file.has_log_pass:
+                pickled_logical_file = pickle.dumps(logical_file)
+                for fa_index, frame_array in enumerate(logical_file.log_pass.frame_arrays):
+                    key = None
+                    if frame_cache is not None:
+                        key = logical_file.frame_cache_key(frame_array, frame_slice, channels)
+                        if key is not None and frame_cache.load(key, frame_array):
+                            result[(lf_index, frame_array.ident)] = len(frame_array.x_axis.array)
+                            continue
+                    future = executor.submit(
+                        _populate_frame_array_shared, pickled_logical_file, fa_index, frame_slice, channels
+                    )
+                    futures[future] = (lf_index, frame_array, key)
+        # Futures whose shared memory has not been mapped and unlinked.
+        outstanding = set(futures)
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                lf_index, frame_array, key = futures[future]
+                num_frames, shared_arrays = future.result()
+                for channel, shared_array in zip(frame_array.channels, shared_arrays):
+                    channel.array = _array_from_shared_memory(shared_array)
+                outstanding.remove(future)
+                if key is not None:
+                    frame_cache.store(key, frame_array)
+                result[(lf_index, frame_array.ident)] = num_frames
+        finally:
+            # On failure cancel any task not yet started, wait for the others and release their shared memory.
+            for future in outstanding:
+                if not future.cancel() and future.exception() is None:
+                    _unlink_shared_memory(future.result()[1])
+        return result
+
+    def _iflr_read_length(self) -> int:
+        """The number of bytes of the next IFLR that are needed to index it, -1 for all of them.
+        This is the largest OBNAME and frame number and the largest X axis of the current Log Pass."""
+        if len(self.logical_files) and self.logical_files[-1].log_pass is not None:
+            try:
+                return IFLR_PREAMBLE_MAX_LENGTH + max(
+                    frame_array.x_axis_len_input_bytes for frame_array in self.logical_files[-1].log_pass.frame_arrays
+                )
+            except LogPass.ExceptionFrameChannel:
+                # Variable length X axis
+                pass
+        return -1
+
     def __enter__(self):
-        """Context manager support."""
-        self._logical_record_index._enter()
+        """Context manager support.
+        This indexes the file in a single forward sweep, for IFLRs only the bytes needed for the X axis are read."""
         self.logical_files = []
-        for lr_index in range(len(self._logical_record_index)):
-            # TODO: This is greedy and for IFLRs we could only read a partial amount for performance.
-            #  See FrameArray.x_axis_len_input_bytes
-            file_logical_data = self._logical_record_index.get_file_logical_data(lr_index, 0, -1)
+        for file_logical_data in self._logical_record_index._enter_iter_logical_data(self._iflr_read_length):
             assert file_logical_data.is_sealed()
             if not file_logical_data.lr_is_encrypted:
                 if file_logical_data.lr_is_eflr:
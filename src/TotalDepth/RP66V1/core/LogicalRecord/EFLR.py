@@ -8,6 +8,8 @@ Specifically section 3:
     http://w3.energistics.org/rp66/v1/rp66v1_sec3.html
 """
 # import collections
+import bisect
+import collections.abc
 import logging
 import typing
 
@@ -344,6 +346,111 @@ class Object:
 """
 
 
+def _seek(ld: LogicalData, length: int) -> None:
+    """Increments the index by a length from one of the RepCode ..._len() functions where zero means failure."""
+    if length == 0:
+        raise ExceptionEFLRAttribute(f'Attribute overruns the Logical Data of length {len(ld)} at index {ld.index}.')
+    ld.seek(length)
+
+
+def _skip_attribute(descriptor: int, ld: LogicalData, by: bytes, template_attribute: TemplateAttribute) -> None:
+    """Skips over an Attribute in the Logical Data without decoding the value.
+    This follows the same logic as Attribute.__init__() but uses the raw Component Descriptor for speed,
+    by is ld.bytes."""
+    if descriptor & ComponentDescriptor.CHARACTERISTICS_AND_COMPONENT_FORMAT_ATTRIBUTE_L:
+        _seek(ld, RepCode.IDENT_len(by, ld.index))
+    if descriptor & ComponentDescriptor.CHARACTERISTICS_AND_COMPONENT_FORMAT_ATTRIBUTE_C:
+        count = RepCode.UVARI(ld)
+    else:
+        count = template_attribute.count
+    if descriptor & ComponentDescriptor.CHARACTERISTICS_AND_COMPONENT_FORMAT_ATTRIBUTE_R:
+        rep_code = RepCode.USHORT(ld)
+    else:
+        rep_code = template_attribute.rep_code
+    if descriptor & ComponentDescriptor.CHARACTERISTICS_AND_COMPONENT_FORMAT_ATTRIBUTE_U:
+        _seek(ld, RepCode.UNITS_len(by, ld.index))
+    if descriptor & ComponentDescriptor.CHARACTERISTICS_AND_COMPONENT_FORMAT_ATTRIBUTE_V:
+        if count and RepCode.is_fixed_length(rep_code):
+            # Only the first value is bounds checked, the caller checks the overall length.
+            _seek(ld, RepCode.code_len(rep_code, by, ld.index))
+            ld.seek((count - 1) * RepCode.rep_code_fixed_length(rep_code))
+        else:
+            for _i in range(count):
+                _seek(ld, RepCode.code_len(rep_code, by, ld.index))
+
+
+def _skip_object(ld: LogicalData, by: bytes, template: Template, template_has_value: typing.List[bool]) \
+        -> RepCode.ObjectName:
+    """Skips over an Object in the Logical Data without decoding the Attributes and returns the Object name.
+    This follows the same logic as Object.__init__(), by is ld.bytes.
+    template_has_value is True for each template attribute that is neither invariant nor absent."""
+    component_descriptor = ComponentDescriptor(ld.read())
+    if not component_descriptor.is_object:
+        raise ExceptionEFLRObject(
+            f'Component Descriptor does not represent a object but a {component_descriptor.type}.')
+    name: RepCode.ObjectName = RepCode.OBNAME(ld)
+    index: int = 0
+    while True:
+        descriptor = ld.read()
+        if descriptor & ComponentDescriptor.ROLE_MASK >= ComponentDescriptor.ROLE_OBJECT:
+            raise ExceptionEFLRObject(
+                f'Component Descriptor does not represent a attribute but a {ComponentDescriptor(descriptor).type}.'
+            )
+        if template_has_value[index]:
+            _skip_attribute(descriptor, ld, by, template[index])
+            if ld.remain == 0 or ld.peek() & ComponentDescriptor.ROLE_MASK == ComponentDescriptor.ROLE_OBJECT:
+                break
+        index += 1
+    if ld.index > len(by):
+        raise ExceptionEFLRObject(f'Object {name} overruns the Logical Data of length {len(by)}.')
+    return name
+
+
+class ObjectSequence(collections.abc.Sequence):
+    """A sequence of Objects where each Object is decoded from the Logical Data only when it is accessed, it is then
+    cached. This is used by the ExplicitlyFormattedLogicalRecord as most users only want a few Objects from a large
+    table, for example the CHANNEL Objects that are referenced by one FRAME."""
+    def __init__(self, by: bytes, template: Template):
+        self.bytes: bytes = by
+        self.template: Template = template
+        # Positions in self.bytes of the start of each Object.
+        self.positions: typing.List[int] = []
+        self._objects: typing.List[typing.Union[Object, None]] = []
+
+    def decode(self, position: int) -> Object:
+        """Decode and return the Object at the position in the Logical Data."""
+        ld = LogicalData(self.bytes)
+        ld.seek(position)
+        return Object(ld, self.template)
+
+    def append(self, position: int, obj: typing.Union[Object, None] = None) -> None:
+        """Add the position of an Object. obj is the Object if it has already been decoded."""
+        self.positions.append(position)
+        self._objects.append(obj)
+
+    @property
+    def num_decoded(self) -> int:
+        """The number of Objects that have been decoded."""
+        return sum(obj is not None for obj in self._objects)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, item):
+        """Get an Object, or a list of Objects for a slice, by integer index."""
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        obj = self._objects[item]
+        if obj is None:
+            obj = self.decode(self.positions[item])
+            self._objects[item] = obj
+        return obj
+
+    def __delitem__(self, item: int) -> None:
+        del self.positions[item]
+        del self._objects[item]
+
+
 class PublicEFLRType(typing.NamedTuple):
     """From [RP66V1 Appendix A: Logical Record Types] Figure A-2. Numeric Codes for Public EFLR Types."""
     code: int
@@ -374,7 +481,10 @@ PUBLIC_EFLR_TYPES: typing.Dict[int, PublicEFLRType] = {
 
 class ExplicitlyFormattedLogicalRecord:
     """Represents a RP66V1 Explicitly Formatted Logical Record (EFLR).
-    Effectively this is a table containing a list of rows, each row is represented by an Object."""
+    Effectively this is a table containing a list of rows, each row is represented by an Object.
+
+    The constructor only decodes the Set, the Template and the Object names, the Attributes of an Object are decoded
+    when the Object is first accessed by name or index. See ObjectSequence."""
     #: The strategy for dealing with duplicate objects.
     DUPE_OBJECT_STRATEGY = DuplicateObjectStrategy.REPLACE
     #: What level to log duplicate object operations.
@@ -385,53 +495,61 @@ class ExplicitlyFormattedLogicalRecord:
         ld.rewind()
         self.set: Set = Set(ld)
         self.template: Template = Template()
+        # NOTE: ld.bytes may be a copy so only take it once.
+        by = ld.bytes
         # This object list contains all objects not including duplicates.
-        self.objects: typing.List[Object] = []
+        self.objects: ObjectSequence = ObjectSequence(by, self.template)
         # This is the final object name map after de-duplication depending on the de-duplication strategy.
-        # TODO: Perfomance. Use self.object_name_map throughout then don't need to rebuild it if there are duplicates
-        #  to remove.
         self.object_name_map: typing.Dict[RepCode.ObjectName, int] = {}
         temp_object_name_map: typing.Dict[RepCode.ObjectName, int] = {}
         dupes_to_remove: typing.List[int] = []
         if ld:
             self.template.read(ld)
+            template_has_value = [
+                not (attr.component_descriptor.is_invariant_attribute or attr.component_descriptor.is_absent_attribute)
+                for attr in self.template.attrs
+            ]
             while ld:
-                obj = Object(ld, self.template)
-                if obj.name not in temp_object_name_map:
-                    temp_object_name_map[obj.name] = len(self.objects)
-                    self.objects.append(obj)
+                position = ld.index
+                name = _skip_object(ld, by, self.template, template_has_value)
+                if name not in temp_object_name_map:
+                    temp_object_name_map[name] = len(self.objects)
+                    self.objects.append(position)
                 else:
-                    self._handle_duplicate_object(obj, temp_object_name_map, dupes_to_remove)
+                    self._handle_duplicate_object(name, position, temp_object_name_map, dupes_to_remove)
         # Clear out any duplicates then index those remaining.
         dupes_to_remove.sort()
         for i in reversed(dupes_to_remove):
             self.DUPE_OBJECT_LOGGER(f'Cleaning table by removing duplicate object:\n{self.objects[i]}')
             del self.objects[i]
         assert len(self.object_name_map) == 0
-        for i, obj in enumerate(self.objects):
-            self.object_name_map[obj.name] = i
+        # Each remaining object moves down by the number of objects removed before it.
+        for name, i in sorted(temp_object_name_map.items(), key=lambda name_index: name_index[1]):
+            self.object_name_map[name] = i - bisect.bisect_left(dupes_to_remove, i)
         self.logical_data_consumed = ld.index
 
-    def _handle_duplicate_object(self, obj: Object,
+    def _handle_duplicate_object(self, name: RepCode.ObjectName, position: int,
                                  temp_object_name_map: typing.Dict[RepCode.ObjectName, int],
                                  dupes_to_remove: typing.List[int]) -> None:
-        """Applies a strategy to handle duplicate objects."""
+        """Applies a strategy to handle duplicate objects.
+        name is the name of the duplicate object and position its position in the Logical Data."""
         if self.DUPE_OBJECT_STRATEGY == DuplicateObjectStrategy.RAISE:
             raise ExceptionEFLRSetDuplicateObjectNames(
-                f'Duplicate Object {obj.name} already seen in the {self.set}.'
+                f'Duplicate Object {name} already seen in the {self.set}.'
             )
         elif self.DUPE_OBJECT_STRATEGY == DuplicateObjectStrategy.IGNORE:
-            self.DUPE_OBJECT_LOGGER(f'Ignoring duplicate Object {obj.name} already seen in the {self.set}.')
+            self.DUPE_OBJECT_LOGGER(f'Ignoring duplicate Object {name} already seen in the {self.set}.')
         elif self.DUPE_OBJECT_STRATEGY == DuplicateObjectStrategy.REPLACE:
-            self.DUPE_OBJECT_LOGGER(f'Replacing Object {obj.name} previously seen in the {self.set}.')
+            self.DUPE_OBJECT_LOGGER(f'Replacing Object {name} previously seen in the {self.set}.')
             # Mark the  old one to be removed
-            dupes_to_remove.append(temp_object_name_map[obj.name])
+            dupes_to_remove.append(temp_object_name_map[name])
             # Update the map with the new one and add the new one to the list of objects.
-            temp_object_name_map[obj.name] = len(self.objects)
-            self.objects.append(obj)
+            temp_object_name_map[name] = len(self.objects)
+            self.objects.append(position)
         elif self.DUPE_OBJECT_STRATEGY == DuplicateObjectStrategy.REPLACE_IF_DIFFERENT:
-            # If equal then ignore
-            prev_obj = self.objects[temp_object_name_map[obj.name]]
+            # If equal then ignore, this needs both objects to be decoded.
+            obj = self.objects.decode(position)
+            prev_obj = self.objects[temp_object_name_map[name]]
             if obj == prev_obj:
                 self.DUPE_OBJECT_LOGGER(f'Ignoring duplicate Object {obj.name} already seen in the {self.set}.')
             else:
@@ -442,27 +560,28 @@ class ExplicitlyFormattedLogicalRecord:
                 self.DUPE_OBJECT_LOGGER('NOW:')
                 self.DUPE_OBJECT_LOGGER(str(obj))
                 # Mark the old one to be removed
-                dupes_to_remove.append(temp_object_name_map[obj.name])
+                dupes_to_remove.append(temp_object_name_map[name])
                 # Update the map with the new one and add the new one to the list of objects.
-                temp_object_name_map[obj.name] = len(self.objects)
-                self.objects.append(obj)
+                temp_object_name_map[name] = len(self.objects)
+                self.objects.append(position, obj)
         elif self.DUPE_OBJECT_STRATEGY == DuplicateObjectStrategy.REPLACE_LATER_COPY:  # pragma: no cover
             # If later copy then  use  it regardless of content.
-            if obj.name.C > self[obj.name].name.C:
+            prev_name = self.objects[temp_object_name_map[name]].name
+            if name.C > prev_name.C:
                 self.DUPE_OBJECT_LOGGER(
-                    f'Replacing Object {obj.name} already seen in the {self.set}'
-                    f' as C: {obj.name.C} > {self[obj.name].name.C}.'
+                    f'Replacing Object {name} already seen in the {self.set}'
+                    f' as C: {name.C} > {prev_name.C}.'
                 )
                 # Mark the old one to be removed
-                dupes_to_remove.append(temp_object_name_map[obj.name])
+                dupes_to_remove.append(temp_object_name_map[name])
                 # Update the map with the new one and add the new one to the list of objects.
-                temp_object_name_map[obj.name] = len(self.objects)
-                self.objects.append(obj)
+                temp_object_name_map[name] = len(self.objects)
+                self.objects.append(position)
             else:
                 # Not a later copy so ignore it.
                 self.DUPE_OBJECT_LOGGER(
-                    f'Ignoring Object {obj.name} already seen in the {self.set}'
-                    f' as C: {obj.name.C} > {self[obj.name].name.C}.'
+                    f'Ignoring Object {name} already seen in the {self.set}'
+                    f' as C: {name.C} > {prev_name.C}.'
                 )
         else:  # pragma: no cover
             assert 0, f'Unsupported DuplicateObjectStrategy {self.DUPE_OBJECT_STRATEGY}'
@@ -561,9 +680,10 @@ def reduced_object_map(eflr: ExplicitlyFormattedLogicalRecord) -> typing.Dict[by
     ret: typing.Dict[bytes, int] = {}
     # Temporary to keep track of counts.
     name_count: typing.Dict[bytes, int] = {}
-    for index, obj in enumerate(eflr.objects):
-        name = obj.name.I
-        if name not in ret or obj.name.C > name_count[name]:
+    # NOTE: This uses the object_name_map rather than the objects so that no object is decoded.
+    for object_name, index in eflr.object_name_map.items():
+        name = object_name.I
+        if name not in ret or object_name.C > name_count[name]:
             ret[name] = index
-            name_count[name] = obj.name.C
+            name_count[name] = object_name.C
     return ret
@@ -3,6 +3,9 @@ Indirectly Formatted Logical Records
 
 """
 import logging
+import typing
+
+import numpy as np
 
 from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import File, RepCode
@@ -45,3 +48,21 @@ class IndirectlyFormattedLogicalRecord:
         return f'<IndirectlyFormattedLogicalRecord {str(self.object_name)}' \
             f' frame: {self.frame_number:,d}' \
             f' free data: {self.remain:,d}>'
+
+
+def frame_data_bulk(by: typing.Union[bytes, bytearray], offsets: np.ndarray) -> typing.Tuple[bytearray, np.ndarray]:
+    """Given the Logical Data of many IFLRs as a contiguous buffer and an array of ``len(IFLRs) + 1`` offsets into that
+    buffer, such as from ``FileRead.get_logical_data_bulk()``, this strips the OBNAME and frame number from every IFLR.
+    It returns the frame data of all the IFLRs as a contiguous buffer and a corresponding offsets array."""
+    frame_offsets = np.empty_like(offsets)
+    frame_offsets[0] = 0
+    fragments = []
+    view = memoryview(by)
+    for i in range(len(offsets) - 1):
+        index = int(offsets[i])
+        index += RepCode.OBNAME_len(by, index)
+        index += RepCode.UVARI_len(by, index)
+        fragment = view[index:offsets[i + 1]]
+        fragments.append(fragment)
+        frame_offsets[i + 1] = frame_offsets[i] + len(fragment)
+    return bytearray(b''.join(fragments)), frame_offsets
@@ -6,7 +6,13 @@ import typing
 
 import numpy as np
 
+from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import File
+from TotalDepth.common import Slice
+
+
+class ExceptionXAxis(ExceptionTotalDepthRP66V1):
+    pass
 
 
 class XAxisSpacingCounts(typing.NamedTuple):
@@ -107,6 +113,13 @@ class XAxisSummary(typing.NamedTuple):
     spacing: typing.Union[XAxisSpacingSummary, None]
 
 
+class XAxisSearch(typing.NamedTuple):
+    """Arrays for binary searches of the X axis. values are the X axis values, negated if decreasing, in sorted order
+    and order is the frame index of each of them."""
+    values: np.ndarray
+    order: np.ndarray
+
+
 class IFLRReference(typing.NamedTuple):
     """POD class that represents the position of the IFLR in the file."""
     logical_record_position: File.LogicalRecordPositionBase
@@ -114,42 +127,241 @@ class IFLRReference(typing.NamedTuple):
     x_axis: typing.Union[int, float]
 
 
+class XRange(typing.NamedTuple):
+    """An inclusive range of X axis values. The order of start and stop does not matter so this can describe an interval
+    on increasing or decreasing (logged up) data."""
+    start: typing.Union[int, float]
+    stop: typing.Union[int, float]
+
+
 class XAxis:
     """This represents an X axis of a log pass for a particular object in that log pass.
     It has an ident, long name and units. It accumulates, for every IFLR in the set, the VR position LRSH position, frame number
     and X axis value.
+
+    These are stored in growable numpy arrays rather than as a list of IFLRReference objects. Indexing returns an
+    IFLRReference for compatibility.
     """
+    #: Initial capacity of the arrays, this doubles as required.
+    INITIAL_CAPACITY = 64
+
     def __init__(self, ident: bytes, long_name: bytes, units: bytes):
         self.ident = ident
         self.long_name = long_name
         self.units = units
-        self._data: typing.List[IFLRReference] = []
+        self._length: int = 0
+        self._init_arrays(self.INITIAL_CAPACITY)
         self._summary: typing.Union[None, XAxisSummary] = None
+        # Lazily computed direction and sorted arrays for X axis searches.
+        self._is_decreasing: typing.Union[None, bool] = None
+        self._x_axis_search: typing.Union[None, XAxisSearch] = None
+
+    @classmethod
+    def from_arrays(cls, ident: bytes, long_name: bytes, units: bytes,
+                    vr_position: np.ndarray, lrsh_position: np.ndarray,
+                    frame_number: np.ndarray, x_axis: np.ndarray) -> 'XAxis':
+        """Returns a XAxis that uses the given arrays, which might be read only memory mapped arrays, without copying
+        them. Appending to the XAxis copies the arrays."""
+        if not len(vr_position) == len(lrsh_position) == len(frame_number) == len(x_axis):
+            raise ExceptionXAxis(
+                f'Array lengths differ: {len(vr_position)}, {len(lrsh_position)}, {len(frame_number)}, {len(x_axis)}'
+            )
+        ret = cls(ident, long_name, units)
+        ret._vr_position = vr_position
+        ret._lrsh_position = lrsh_position
+        ret._frame_number = frame_number
+        ret._x_axis = x_axis
+        ret._length = len(x_axis)
+        return ret
+
+    def _init_arrays(self, capacity: int) -> None:
+        self._vr_position: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self._lrsh_position: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self._frame_number: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self._x_axis: np.ndarray = np.empty(capacity, dtype=np.float64)
+
+    def _resize(self, capacity: int) -> None:
+        """Resize the arrays, the capacity must be >= the current length."""
+        assert capacity >= self._length
+        for name in ('_vr_position', '_lrsh_position', '_frame_number', '_x_axis'):
+            array = getattr(self, name)
+            new_array = np.empty(capacity, dtype=array.dtype)
+            new_array[:self._length] = array[:self._length]
+            setattr(self, name, new_array)
 
     def append(self, position: File.LogicalRecordPositionBase, frame_number: int, x_axis: typing.Union[int, float]) -> None:
         """Add a IFLRReference to the XAxis."""
         # TODO: Verify the data position, frame number increasing etc.
         self._summary = None
-        self._data.append(IFLRReference(position, frame_number, x_axis))
+        self._is_decreasing = None
+        self._x_axis_search = None
+        if self._length == len(self._x_axis):
+            self._resize(max(self.INITIAL_CAPACITY, 2 * self._length))
+        self._vr_position[self._length] = position.vr_position
+        self._lrsh_position[self._length] = position.lrsh_position
+        self._frame_number[self._length] = frame_number
+        self._x_axis[self._length] = x_axis
+        self._length += 1
+
+    def _iflr_reference(self, index: int) -> IFLRReference:
+        return IFLRReference(
+            File.LogicalRecordPositionBase(int(self._vr_position[index]), int(self._lrsh_position[index])),
+            int(self._frame_number[index]),
+            float(self._x_axis[index]),
+        )
 
-    def __getitem__(self, item) -> IFLRReference:
-        """Return the IFLRReference for the index."""
-        return self._data[item]
+    def __getitem__(self, item) -> typing.Union[IFLRReference, typing.List[IFLRReference]]:
+        """Return the IFLRReference for the index or a list of them for a slice."""
+        if isinstance(item, slice):
+            return [self._iflr_reference(i) for i in range(*item.indices(self._length))]
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError(f'XAxis index {item} out of range for length {self._length}')
+        return self._iflr_reference(item)
+
+    def __iter__(self) -> typing.Iterator[IFLRReference]:
+        for i in range(self._length):
+            yield self._iflr_reference(i)
 
     def __len__(self) -> int:
         """Return the number of IFLRs."""
-        return len(self._data)
+        return self._length
+
+    @property
+    def vr_position(self) -> np.ndarray:
+        """The Visible Record positions as a read only np.int64 array."""
+        return self._read_only(self._vr_position)
+
+    @property
+    def lrsh_position(self) -> np.ndarray:
+        """The Logical Record Segment Header positions as a read only np.int64 array."""
+        return self._read_only(self._lrsh_position)
+
+    @property
+    def frame_number(self) -> np.ndarray:
+        """The frame numbers as a read only np.int64 array."""
+        return self._read_only(self._frame_number)
+
+    @property
+    def x_axis(self) -> np.ndarray:
+        """The X axis values as a read only np.float64 array."""
+        return self._read_only(self._x_axis)
+
+    def _read_only(self, array: np.ndarray) -> np.ndarray:
+        ret = array[:self._length]
+        ret.flags.writeable = False
+        return ret
+
+    def __getstate__(self):
+        """Trim the arrays to the current length when pickling, this does not change self."""
+        state = self.__dict__.copy()
+        for name in ('_vr_position', '_lrsh_position', '_frame_number', '_x_axis'):
+            state[name] = state[name][:self._length].copy()
+        state['_is_decreasing'] = None
+        state['_x_axis_search'] = None
+        return state
+
+    def __setstate__(self, state):
+        if '_data' in state:
+            # Older pickles have a list of IFLRReference objects.
+            data: typing.List[IFLRReference] = state.pop('_data')
+            self.__dict__.update(state)
+            self._length = 0
+            self._init_arrays(max(self.INITIAL_CAPACITY, len(data)))
+            for iflr_reference in data:
+                self.append(*iflr_reference)
+            self._summary = None
+        else:
+            self.__dict__.update(state)
+        self._is_decreasing = None
+        self._x_axis_search = None
 
     @property
     def summary(self) -> XAxisSummary:
         """Lazily compute the summary."""
         if self._summary is None:
-            x_array: np.ndarray = np.empty(len(self._data), dtype=np.float64)
-            for i in range(len(self._data)):
-                x_array[i] = self._data[i].x_axis
+            x_array: np.ndarray = self.x_axis
             self._summary = XAxisSummary(x_array.min(), x_array.max(), len(x_array), compute_spacing(x_array))
         return self._summary
 
-    # TODO: Add an API that can turn an X axis value into the nearest frame number. Needs to cope with decreasing data.
+    @property
+    def is_decreasing(self) -> bool:
+        """True if the X axis values generally decrease, for example when logging up. This is decided on the median of
+        the first differential so is robust to the odd glitch. This is computed once and cached."""
+        if self._is_decreasing is None:
+            x_array = self.x_axis
+            self._is_decreasing = bool(len(x_array) > 1 and np.median(x_array[1:] - x_array[:-1]) < 0)
+        return self._is_decreasing
+
+    def _search_array(self) -> XAxisSearch:
+        """Returns the arrays for np.searchsorted(). For decreasing data the X axis is negated. A stable sort is used
+        rather than assuming the X axis is monotonic so non-monotonic glitches, however large, only affect their own
+        frames."""
+        if self._x_axis_search is None:
+            x_array = self.x_axis
+            if self.is_decreasing:
+                x_array = -x_array
+            order = np.argsort(x_array, kind='stable')
+            self._x_axis_search = XAxisSearch(x_array[order], order)
+        return self._x_axis_search
+
+    def _frame(self, search: XAxisSearch, index: int) -> int:
+        """The frame index of the index into the sorted search arrays, len(self) if beyond the end."""
+        if index < len(search.order):
+            return int(search.order[index])
+        return self._length
+
+    def _search_value(self, value: typing.Union[int, float]) -> typing.Union[int, float]:
+        if self.is_decreasing:
+            return -value
+        return value
+
+    def frame_for_x(self, value: typing.Union[int, float], side: str = 'nearest') -> int:
+        """Returns the index of the frame for the X axis value using a binary search.
+        This copes with increasing and decreasing data and with non-monotonic glitches.
+
+        side can be:
+
+        * 'left' - the frame with the closest X axis value at or beyond the value in the logging direction so an
+          exact match is that frame. For monotonic data this is ``np.searchsorted(..., side='left')``.
+        * 'right' - the frame with the closest X axis value strictly beyond the value in the logging direction so an
+          exact match is the frame after the last frame with that value. This makes it suitable as an exclusive stop.
+          For monotonic data this is ``np.searchsorted(..., side='right')``.
+        * 'nearest' - the frame whose X axis value is nearest to the value.
+
+        With 'left' or 'right' the result may be ``len(self)`` if the value is beyond the end of the data."""
+        if side not in ('left', 'right', 'nearest'):
+            raise ExceptionXAxis(f'side must be \'left\', \'right\' or \'nearest\' not {side!r}')
+        if self._length == 0:
+            raise ExceptionXAxis('Can not search an empty X axis.')
+        search = self._search_array()
+        search_value = self._search_value(value)
+        if side != 'nearest':
+            return self._frame(search, int(np.searchsorted(search.values, search_value, side=side)))
+        index = int(np.searchsorted(search.values, search_value, side='left'))
+        if index == len(search.values):
+            return int(search.order[index - 1])
+        if index > 0 and search_value - search.values[index - 1] <= search.values[index] - search_value:
+            return int(search.order[index - 1])
+        return int(search.order[index])
+
+    def frames_between(self, x_start: typing.Union[int, float], x_stop: typing.Union[int, float]) -> Slice.Slice:
+        """Returns a Slice of the frames whose X axis values are in the inclusive range x_start to x_stop using a
+        binary search. The order of x_start and x_stop does not matter.
+        This copes with increasing and decreasing data and with non-monotonic glitches. With glitches the Slice spans
+        all the frames in the range so it may include glitched frames between them.
+        The Slice may be empty."""
+        if self._length == 0:
+            return Slice.Slice(0, 0)
+        search = self._search_array()
+        search_lower, search_upper = sorted((self._search_value(x_start), self._search_value(x_stop)))
+        lower = int(np.searchsorted(search.values, search_lower, side='left'))
+        upper = int(np.searchsorted(search.values, search_upper, side='right'))
+        if lower == upper:
+            start = self._frame(search, lower)
+            return Slice.Slice(start, start)
+        frames = search.order[lower:upper]
+        return Slice.Slice(int(frames.min()), int(frames.max()) + 1)
 
 
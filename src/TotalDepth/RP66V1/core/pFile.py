@@ -8,8 +8,12 @@ import copy
 import hashlib
 import io
 import logging
+import mmap
 import typing
 
+import numpy as np
+
+from TotalDepth import DeTif
 from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import StorageUnitLabel
 from TotalDepth.util.bin_file_type import format_bytes
@@ -503,6 +507,79 @@ class LogicalData:
         return f'<LogicalData Len: 0x{len(self.bytes):0x} Idx: 0x{self.index:0x}>'#' Bytes: {format_bytes(self.bytes[:16])}>'
 
 
+class LogicalDataView(LogicalData):
+    """LogicalData that wraps a memoryview, for example a slice of a memory mapped file, without copying it.
+    Methods that return data return bytes objects so that this behaves identically to LogicalData."""
+    def __init__(self, view: memoryview):
+        # NOTE: Does not call super().__init__() as self.bytes is a property.
+        self.view: memoryview = view
+        self.index: int = 0
+        self._sha1: typing.Union[hashlib.sha1, None] = None
+
+    @property
+    def bytes(self) -> bytes:
+        """A copy of the complete binary data."""
+        return self.view.tobytes()
+
+    def peek(self) -> int:
+        """Return the next bytes without incrementing the index.
+        May raise an IndexError if there is no data left."""
+        return self.view[self.index]
+
+    def read(self) -> int:
+        """Return the next byte and increment the index.
+        May raise an IndexError if there is no data left."""
+        ret = self.view[self.index]
+        self.index += 1
+        return ret
+
+    def view_remaining(self, length: int) -> bytes:
+        """Read only method to return a slice of length from the current index."""
+        if length < 0:
+            raise IndexError(f'view_remaining length {length} must be >= 0')
+        return self.view[self.index:self.index+length].tobytes()
+
+    def chunk(self, length: int) -> bytes:
+        """Return the next length bytes and increment the index.
+        May raise an IndexError if there is not enough data."""
+        if length > self.remain:
+            raise IndexError(
+                f'Chunk length {length} is out of range where remain is {self.remain} of length {len(self.view)}'
+            )
+        ret = self.view[self.index:self.index + length].tobytes()
+        self.index += length
+        return ret
+
+    @property
+    def remain(self) -> int:
+        """The number of bytes remaining."""
+        if len(self.view) > self.index:
+            return len(self.view) - self.index
+        return 0
+
+    @property
+    def sha1(self) -> hashlib.sha1:
+        """Lazy SHA1 evaluation of the complete binary data."""
+        if self._sha1 is None:
+            self._sha1 = hashlib.sha1(self.view)
+        return self._sha1
+
+    def __len__(self):
+        """Total length of the binary data."""
+        return len(self.view)
+
+    def __getitem__(self, index):
+        """Return a byte and the given index."""
+        ret = self.view[index]
+        if isinstance(ret, memoryview):
+            return ret.tobytes()
+        return ret
+
+    def __str__(self) -> str:
+        """String representation."""
+        return f'<LogicalData Len: 0x{len(self.view):0x} Idx: 0x{self.index:0x}>'
+
+
 class FileLogicalData:
     """
     Class that contains information about a Logical Record within a physical file.
@@ -516,26 +593,31 @@ class FileLogicalData:
         self.lr_type: int = lrsh.record_type
         self.lr_is_eflr: bool = lrsh.attributes.is_eflr
         self.lr_is_encrypted: bool = lrsh.attributes.is_encrypted
-        self._bytes: typing.Union[None, bytearray] = bytearray()
+        # A list of fragments, one for each Logical Record Segment.
+        self._bytes: typing.Union[None, typing.List[typing.Union[bytes, memoryview]]] = []
         self.logical_data: typing.Union[None, LogicalData] = None
         assert self._invariants()
 
     def _invariants(self) -> bool:
         return (self._bytes is None) != (self.logical_data is None)
 
-    def add_bytes(self, by: bytes) -> None:
+    def add_bytes(self, by: typing.Union[bytes, memoryview]) -> None:
         """Add some raw data that is part of aa Logical Record."""
         assert self._invariants()
-        self._bytes.extend(by)
+        self._bytes.append(by)
 
     def seal(self):
         """All of the Logical Record has been read into this class so seal it to prevent any more data being added.
-        This also creates a LogicalData object that encapsulates the logical data."""
+        This also creates a LogicalData object that encapsulates the logical data.
+        If the data is a single memoryview, such as a single segment Logical Record from a memory mapped file, then it
+        is not copied."""
         assert self._invariants()
         if self.is_sealed():
             raise ValueError('FileLogicalData: Can not seal() after seal()')
-        # TODO: Review the cost of this copy. Maybe a list of bytes, like a rope.
-        self.logical_data = LogicalData(bytes(self._bytes))
+        if len(self._bytes) == 1 and isinstance(self._bytes[0], memoryview):
+            self.logical_data = LogicalDataView(self._bytes[0])
+        else:
+            self.logical_data = LogicalData(b''.join(self._bytes))
         self._bytes = None
 
     def is_sealed(self) -> bool:
@@ -548,7 +630,7 @@ class FileLogicalData:
         assert self._invariants()
         if self._bytes is None:
             return len(self.logical_data)
-        return len(self._bytes)
+        return sum(len(by) for by in self._bytes)
 
     def __str__(self) -> str:
         assert self._invariants()
@@ -558,14 +640,73 @@ class FileLogicalData:
         position = str(self.position)
         if self.logical_data is None:
             return f'<FileLogicalData {position} LR {self.lr_type:3d} {lr_is_eflr} {lr_is_encrypted}' \
-                f' PARTIAL READ: len 0x{len(self._bytes):04x}' \
-                f' Bytes: {format_bytes(bytes(self._bytes[:DUMP_BYTE_LEN]))}>'
+                f' PARTIAL READ: len 0x{len(self):04x}' \
+                f' Bytes: {format_bytes(b"".join(self._bytes)[:DUMP_BYTE_LEN])}>'
         return f'<FileLogicalData {position} LR {self.lr_type:3d} {lr_is_eflr} {lr_is_encrypted} {self.logical_data}>'
 
 
+class _WindowedRead:
+    """Serves small reads of increasing file position from a window of the file. This turns many small reads into a few
+    large sequential reads."""
+    def __init__(self, fobj: typing.BinaryIO, read_size: int):
+        self.file = fobj
+        self.read_size = read_size
+        self.window_position = 0
+        self.window = b''
+
+    def read(self, position: int, length: int) -> bytes:
+        """Returns length bytes at the file position, reading a new window from the file if necessary."""
+        index = position - self.window_position
+        if index < 0 or index + length > len(self.window):
+            self.file.seek(position)
+            self.window = self.file.read(max(self.read_size, length))
+            self.window_position = position
+            index = 0
+        if index + length > len(self.window):
+            raise ExceptionFileReadEOF(f'Premature EOF reading at 0x{position:x} of {length} bytes')
+        return self.window[index:index + length]
+
+
+class _MemoryMapRead:
+    """A minimal read only file like object on a memory map. Unlike a mmap.mmap this allows seeking beyond the end so
+    that it behaves like a file."""
+    def __init__(self, memory_map: mmap.mmap):
+        self.mmap = memory_map
+        self.position = 0
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.mmap)
+        if offset < 0:
+            raise ValueError(f'negative seek value {offset}')
+        self.position = offset
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            ret = self.mmap[self.position:]
+        else:
+            ret = self.mmap[self.position:self.position + size]
+        self.position += len(ret)
+        return ret
+
+
 class FileRead:
-    """RP66V1 file reader."""
-    def __init__(self, path_or_file: typing.Union[str, typing.BinaryIO]):
+    """RP66V1 file reader.
+
+    If use_mmap is True the file is memory mapped. Then reading Visible Record and LRSH headers involves no system calls
+    and the Logical Data of single segment Logical Records is a zero copy LogicalDataView of the mapping. This needs a
+    file that has a file descriptor, io.BytesIO objects can not be memory mapped.
+
+    If the file has TIF markers these are stripped as the file is read, see ``DeTif.TifStream``. All positions are then
+    in the file as if it had been de-TIF'd. A memory mapped TIF file avoids system calls but the Logical Data is a copy.
+    """
+    def __init__(self, path_or_file: typing.Union[str, typing.BinaryIO], use_mmap: bool = False):
         if isinstance(path_or_file, str):
             self.file = None
             self.path = path_or_file
@@ -578,6 +719,13 @@ class FileRead:
         else:
             raise ExceptionFileRead(f'path_or_file must be a str or a binary file not {type(path_or_file)}')
         self.must_close = self.file is None
+        self.use_mmap = use_mmap
+        # If memory mapped then self.file is a _MemoryMapRead and the original file is kept here.
+        self._file_unmapped: typing.Union[None, typing.BinaryIO] = None
+        # If the file has TIF markers then self.file is a DeTif.TifStream and the file it wraps is kept here.
+        self._file_tif: typing.Union[None, typing.BinaryIO] = None
+        self.mmap: typing.Union[None, mmap.mmap] = None
+        self.mmap_view: typing.Union[None, memoryview] = None
         self.sul = None
         self.visible_record = None
         self.logical_record_segment_header = None
@@ -588,6 +736,12 @@ class FileRead:
             self.must_close = True
         else:
             self.file.seek(0)
+        if self.use_mmap:
+            self._enter_mmap()
+        if DeTif.has_tif_file(self.file):
+            self._enter_tif()
+        else:
+            self.file.seek(0)
         # Read the Storage Unit Label, see [RP66V1] 2.3.2
         try:
             self.sul = StorageUnitLabel.StorageUnitLabel(self.file.read(StorageUnitLabel.StorageUnitLabel.SIZE))
@@ -600,12 +754,56 @@ class FileRead:
         if not self.logical_record_segment_header.attributes.is_first:
             raise ExceptionFileRead('Logical Record Segment Header is not first segment.')
 
+    def _enter_mmap(self):
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError) as err:
+            # io.UnsupportedOperation is an OSError, ValueError is raised for empty files.
+            raise ExceptionFileRead(f'FileRead can not memory map {self.path}: {str(err)}')
+        self.mmap_view = memoryview(self.mmap)
+        self._file_unmapped = self.file
+        self.file = _MemoryMapRead(self.mmap)
+
+    def _enter_tif(self):
+        try:
+            tif_stream = DeTif.TifStream(self.file)
+        except DeTif.DeTifException as err:
+            raise ExceptionFileRead(f'FileRead can not read TIF markers in {self.path}: {str(err)}')
+        logger.debug(f'FileRead._enter_tif(): {self.path} has {len(tif_stream.tifs):,d} TIF markers.')
+        if self.mmap_view is not None:
+            # Positions are logical not physical so the Logical Data can not be a view of the mapping.
+            self.mmap_view.release()
+            self.mmap_view = None
+        self._file_tif = self.file
+        self.file = tif_stream
+
     def __enter__(self):
         self._enter()
         return self
 
+    def _exit_tif(self):
+        self.file = self._file_tif
+        self._file_tif = None
+
+    def _exit_mmap(self):
+        self.file = self._file_unmapped
+        self._file_unmapped = None
+        if self.mmap_view is not None:
+            self.mmap_view.release()
+            self.mmap_view = None
+        try:
+            self.mmap.close()
+        except BufferError:
+            # A LogicalDataView is still referencing the mapping, it will be closed when that goes.
+            logger.debug(f'FileRead._exit_mmap(): can not close memory map of {self.path}, views still exist.')
+        self.mmap = None
+
     def _exit(self):
         assert self.file is not None
+        if self._file_tif is not None:
+            self._exit_tif()
+        if self.mmap is not None:
+            self._exit_mmap()
         if self.must_close:
             self.file.close()
         else:
@@ -699,7 +897,12 @@ class FileRead:
         """
         tell: int = self.file.tell()
         assert tell == self.logical_record_segment_header.position + self.logical_record_segment_header.HEAD_LENGTH
-        by: bytes = self.file.read(self.logical_record_segment_header.logical_data_length)
+        if self.mmap_view is not None:
+            # Zero copy, this is a memoryview.
+            by = self.mmap_view[tell:tell + self.logical_record_segment_header.logical_data_length]
+            self.file.seek(tell + len(by))
+        else:
+            by: bytes = self.file.read(self.logical_record_segment_header.logical_data_length)
         if len(by) != self.logical_record_segment_header.logical_data_length:
             current_vr_lr_position = LogicalRecordPosition(self.visible_record, self.logical_record_segment_header)
             raise ExceptionFileReadEOF(
@@ -780,6 +983,76 @@ class FileRead:
                 else:
                     previous_lrsh_is_last = lrsh.attributes.is_last
 
+    #: The maximum number of bytes of pad that can be at the end of a Logical Record Segment.
+    MAX_PAD_LENGTH = 255
+
+    def _read_partial_logical_data(self, length: int) -> bytes:
+        """
+        Reads from the current file position the first length bytes of the Logical Record Segment and returns them.
+        The whole segment is read if length is not less than its Logical Data or if the end might be padding.
+        """
+        logical_data_length = self.logical_record_segment_header.logical_data_length
+        if length >= logical_data_length or (
+                self.logical_record_segment_header.must_strip_padding
+                and length > logical_data_length - self.MAX_PAD_LENGTH - 1):
+            return self._read_full_logical_data()
+        by: bytes = self.file.read(length)
+        if len(by) != length:
+            current_vr_lr_position = LogicalRecordPosition(self.visible_record, self.logical_record_segment_header)
+            raise ExceptionFileReadEOF(f'Premature EOF reading at {current_vr_lr_position} of {length} bytes')
+        return by
+
+    def iter_logical_record_positions_and_data(
+            self,
+            iflr_length: typing.Callable[[], int]) -> typing.Iterator[typing.Tuple[LRPosDesc, FileLogicalData]]:
+        """Iterate across the file from the beginning in a single forward sweep yielding a (LRPosDesc,
+        FileLogicalData) for each Logical Record. The LRPosDesc is as ``iter_logical_record_positions()``.
+
+        The FileLogicalData has all the Logical Data of an EFLR but for an IFLR only the first ``iflr_length()`` bytes,
+        if that is < 0 then all the data. The rest of the IFLR is skipped rather than read.
+        This is called for each IFLR so the length can change as the caller interprets the file.
+        """
+        self._set_file_and_read_first_logical_record_segment_header()
+        try:
+            while True:
+                lrsh = self.logical_record_segment_header
+                file_logical_data = FileLogicalData(self.visible_record, lrsh)
+                description_attributes, description_lr_type = lrsh.attributes, lrsh.record_type
+                length = -1 if lrsh.attributes.is_eflr else iflr_length()
+                logical_data_length = bytes_read = 0
+                while True:
+                    logical_data_length += self.logical_record_segment_header.logical_data_length
+                    if length < 0:
+                        file_logical_data.add_bytes(self._read_full_logical_data())
+                    elif bytes_read < length:
+                        by = self._read_partial_logical_data(length - bytes_read)
+                        file_logical_data.add_bytes(by)
+                        bytes_read += len(by)
+                    if self.logical_record_segment_header.attributes.is_last:
+                        break
+                    self._seek_and_read_next_logical_record_segment_header()
+                    if self.logical_record_segment_header.attributes.is_first:
+                        raise ExceptionLogicalRecordSegmentHeaderSequence(
+                            f'Current LRSH is first but previous is not last'
+                            f' @ 0x{self.logical_record_segment_header.position:x}'
+                        )
+                file_logical_data.seal()
+                yield (
+                    LRPosDesc(
+                        file_logical_data.position,
+                        LogicalDataDescription(description_attributes, description_lr_type, logical_data_length),
+                    ),
+                    file_logical_data,
+                )
+                self._seek_and_read_next_logical_record_segment_header()
+                if not self.logical_record_segment_header.attributes.is_first:
+                    raise ExceptionLogicalRecordSegmentHeaderSequence(
+                        f'Previous LRSH is last but current is not first'
+                        f' @ 0x{self.logical_record_segment_header.position:x}'
+                    )
+        except (ExceptionVisibleRecordEOF, ExceptionLogicalRecordSegmentHeaderEOF):
+            pass
+
     def get_file_logical_data(self, position: LogicalRecordPositionBase,
                               offset: int = 0, length: int = -1) -> FileLogicalData:
         """
@@ -828,6 +1101,86 @@ class FileRead:
         file_logical_data.seal()
         return file_logical_data
 
+    #: Default size of the sequential reads made by get_logical_data_bulk().
+    BULK_READ_SIZE = 1024 * 1024
+
+    def get_logical_data_bulk(self, positions: typing.Sequence[LogicalRecordPositionBase],
+                              read_size: int = BULK_READ_SIZE,
+                              ranges: typing.Union[typing.Sequence[typing.Tuple[int, int]], None] = None,
+                              ) -> typing.Tuple[bytearray, np.ndarray]:
+        """
+        Reads the complete Logical Data of many Logical Records and returns it as a single contiguous buffer along with
+        an array of offsets into that buffer. The offsets array has ``len(positions) + 1`` entries and the Logical Data
+        for ``positions[i]`` is ``buffer[offsets[i]:offsets[i + 1]]``.
+
+        This is equivalent to calling ``get_file_logical_data(position).logical_data`` for every position but the file
+        is read in ascending order with sequential reads of read_size bytes so neighbouring Logical Records are
+        coalesced into one read and the Visible Record and LRSH headers are stripped from the buffer.
+        No FileLogicalData or LogicalData objects are created.
+
+        If ranges is given then only part of each Logical Data is read, ``ranges[i]`` is ``(offset, length)`` and the
+        result for ``positions[i]`` is ``logical_data[offset:offset + length]``, a negative length means to the end.
+        This may be shorter if the Logical Data is.
+
+        :param: positions A sequence of LogicalRecordPosition that specify the Logical Records.
+        :param: read_size The minimum size of each read from the file.
+        :param: ranges An optional sequence of (offset, length) one for each position.
+        """
+        window = _WindowedRead(self.file, read_size)
+        if self.mmap_view is not None:
+            # The window is the whole file.
+            window.window = self.mmap_view
+        by_position: typing.List[typing.Union[None, bytes]] = [None] * len(positions)
+        for index in sorted(range(len(positions)), key=lambda i: positions[i].lrsh_position):
+            position = positions[index]
+            vr_by = window.read(position.vr_position, VisibleRecord.NUMBER_OF_HEADER_BYTES)
+            vr_next_position = position.vr_position + (vr_by[0] << 8 | vr_by[1])
+            lrsh_position = position.lrsh_position
+            if ranges is None:
+                range_start, range_stop = 0, -1
+            else:
+                range_start, range_length = ranges[index]
+                range_stop = range_start + range_length if range_length >= 0 else -1
+            # Index in the Logical Data of the start of the current segment.
+            ld_index = 0
+            fragments = []
+            while True:
+                lrsh_by = window.read(lrsh_position, LogicalRecordSegmentHeader.HEAD_LENGTH)
+                lrsh_length = lrsh_by[0] << 8 | lrsh_by[1]
+                attributes = LogicalRecordSegmentHeaderAttributes(lrsh_by[2])
+                # See LogicalRecordSegmentHeader.logical_data_length
+                ld_length = lrsh_length - LogicalRecordSegmentHeader.HEAD_LENGTH
+                if attributes.has_checksum:
+                    ld_length -= 2
+                if attributes.has_trailing_length:
+                    ld_length -= 2
+                ld_position = lrsh_position + LogicalRecordSegmentHeader.HEAD_LENGTH
+                # Only read the part of this segment that is in range.
+                first = max(0, range_start - ld_index)
+                last = ld_length if range_stop < 0 else max(first, min(ld_length, range_stop - ld_index))
+                by = window.read(ld_position + first, last - first) if last > first else b''
+                # See LogicalRecordSegmentHeader.must_strip_padding
+                if attributes.has_pad_bytes and not attributes.is_encrypted:
+                    pad_length = by[-1] if last == ld_length and last > first else window.read(
+                        ld_position + ld_length - 1, 1
+                    )[0]
+                    by = by[:max(0, ld_length - pad_length - first)]
+                    ld_index += ld_length - pad_length
+                else:
+                    ld_index += ld_length
+                fragments.append(by)
+                if attributes.is_last or 0 <= range_stop <= ld_index:
+                    break
+                lrsh_position += lrsh_length
+                if lrsh_position == vr_next_position:
+                    vr_by = window.read(lrsh_position, VisibleRecord.NUMBER_OF_HEADER_BYTES)
+                    vr_next_position = lrsh_position + (vr_by[0] << 8 | vr_by[1])
+                    lrsh_position += VisibleRecord.NUMBER_OF_HEADER_BYTES
+            by_position[index] = b''.join(fragments)
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(by) for by in by_position])
+        return bytearray(b''.join(by_position)), offsets
+
     def validate_positions(self) -> None:
         """Iterate through the Visible Records and Logical Record Segment Headers and raise a
         ExceptionFileReadPositionsInconsistent on the first inconsistent position."""
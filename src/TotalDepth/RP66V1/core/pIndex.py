@@ -13,6 +13,8 @@ TODO: Replace this with the C/C++ implementation.
 import io
 import typing
 
+import numpy as np
+
 from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
 from TotalDepth.RP66V1.core import File
 
@@ -34,11 +36,14 @@ class LogicalRecordIndex:
         - ``.description`` A LogicalDataDescription which provides some basic information about the Logical Data such as
             the LRSH attributes, Logical Record type and the Logical Data length. This will be of interest to indexers
             to offer up to their callers.
+
+    If use_mmap is True the file is memory mapped, see ``File.FileRead``.
     """
-    def __init__(self, path_or_file: typing.Union[str, io.BytesIO]):
+    def __init__(self, path_or_file: typing.Union[str, io.BytesIO], use_mmap: bool = False):
         self.lr_pos_desc: typing.List[File.LRPosDesc] = []
-        self.rp66v1_file: File.FileRead = File.FileRead(path_or_file)
+        self.rp66v1_file: File.FileRead = File.FileRead(path_or_file, use_mmap)
         self.path = self.rp66v1_file.path
+        self.use_mmap = use_mmap
 
     def __len__(self) -> int:
         return len(self.lr_pos_desc)
@@ -53,6 +58,16 @@ class LogicalRecordIndex:
         # Initialise self and scan the File.FileRead
         self.lr_pos_desc = list(self.rp66v1_file.iter_logical_record_positions())
 
+    def _enter_iter_logical_data(self, iflr_length: typing.Callable[[], int]) -> typing.Iterator[File.FileLogicalData]:
+        """Populate the internal representation from a File.FileRead in a single forward sweep and yield the
+        FileLogicalData of each Logical Record as it is indexed. For IFLRs this is only the first ``iflr_length()``
+        bytes, see ``File.FileRead.iter_logical_record_positions_and_data()``."""
+        self.rp66v1_file._enter()
+        self.lr_pos_desc = []
+        for lr_pos_desc, file_logical_data in self.rp66v1_file.iter_logical_record_positions_and_data(iflr_length):
+            self.lr_pos_desc.append(lr_pos_desc)
+            yield file_logical_data
+
     def __enter__(self):
         self._enter()
         return self
@@ -72,7 +87,9 @@ class LogicalRecordIndex:
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self.rp66v1_file = File.FileRead(self.path)
+        # Older pickles do not have use_mmap.
+        self.use_mmap = state.get('use_mmap', False)
+        self.rp66v1_file = File.FileRead(self.path, self.use_mmap)
 
     @property
     def sul(self) -> File.StorageUnitLabel:
@@ -119,6 +136,22 @@ class LogicalRecordIndex:
         """
         return self.rp66v1_file.get_file_logical_data(position, offset, length)
 
+    def get_logical_data_bulk(
+            self,
+            positions: typing.Sequence[File.LogicalRecordPositionBase],
+            ranges: typing.Union[typing.Sequence[typing.Tuple[int, int]], None] = None,
+    ) -> typing.Tuple[bytearray, np.ndarray]:
+        """
+        Returns the Logical Data of many Logical Records from their positions as a single contiguous buffer and an array
+        of ``len(positions) + 1`` offsets into that buffer.
+        This is much faster than calling ``get_file_logical_data_at_position()`` for each position.
+
+        :param: positions The Logical Record positions in the file.
+        :param: ranges An optional (offset, length) for each position to read part of each Logical Data, see
+            ``File.FileRead.get_logical_data_bulk()``.
+        """
+        return self.rp66v1_file.get_logical_data_bulk(positions, ranges=ranges)
+
     def validate(self):
         """Perform validation checks."""
         self.rp66v1_file.validate_positions()
@@ -41,6 +41,7 @@ From: http://w3.energistics.org/rp66/v1/rp66v1_appb.html ::
 import datetime
 import enum
 import logging
+import math
 import string
 import struct
 import typing
@@ -98,10 +99,10 @@ assert all(_ in REP_CODE_INT_TO_STR_ALL for _ in REP_CODES_ALL)
 
 #: Supported Representation Codes
 REP_CODES_SUPPORTED = {
-    # 1, # - Not found in practice.
+    1,
     2,
     # 3, 4, # - Not found in practice.
-    # 5, # - Antiquated types, rarely if ever found.
+    5,
     6,
     7,
     # 8, 9, # - Not found in practice.
@@ -112,11 +113,11 @@ REP_CODES_SUPPORTED = {
 
 #: Map of supported Representation Codes to name.
 REP_CODE_INT_TO_STR: typing.Dict[int, str] = {
-    # 1: 'FSHORT',
+    1: 'FSHORT',
     2: 'FSINGL',
     # 3: 'FSING1',
     # 4: 'FSING2',
-    # 5: 'ISINGL',
+    5: 'ISINGL',
     6: 'VSINGL',
     7: 'FDOUBL',
     # 8: 'FDOUB1',
@@ -213,6 +214,18 @@ def rep_code_fixed_length(rc: int) -> int:
         raise ExceptionRepCode(f'Representation code {rc} is not fixed length.') from err
 
 
+def FSHORT(ld: LogicalData) -> float:
+    """Representation code 1, Low precision floating point.
+    A 12 bit two's complement fractional mantissa followed by a 4 bit unsigned exponent.
+    [RP66V1 Appendix B Section B.1]"""
+    by = ld.chunk(2)
+    m = (by[0] << 4) | (by[1] >> 4)
+    if m & 0x800:
+        m -= 0x1000
+    e = by[1] & 0xf
+    return math.ldexp(m, e - 11)
+
+
 def FSINGL(ld: LogicalData) -> float:
     """Representation code 2, IEEE single precision floating point."""
     by = ld.chunk(4)
@@ -220,6 +233,19 @@ def FSINGL(ld: LogicalData) -> float:
     return value[0]
 
 
+def ISINGL(ld: LogicalData) -> float:
+    """Representation code 5, IBM single precision floating point.
+    A sign bit, a 7 bit excess 64 base 16 exponent then a 24 bit fractional mantissa.
+    [RP66V1 Appendix B Section B.5]"""
+    by = ld.chunk(4)
+    m = (by[1] << 16) | (by[2] << 8) | by[3]
+    e = by[0] & 0x7f
+    value = math.ldexp(m, 4 * (e - 64) - 24)
+    if by[0] & 0x80:
+        return -value
+    return value
+
+
 def VSINGL(ld: LogicalData) -> float:
     """Representation code 6, VAX single precision floating point."""
     by = ld.chunk(4)
@@ -380,6 +406,20 @@ def ASCII(ld: LogicalData) -> bytes:
     return ld.chunk(size)
 
 
+def ASCII_len(by: typing.Union[bytes, bytearray], index: int) -> int:
+    """
+    Return the number of bytes that will be read as a ASCII or zero on failure.
+    NOTE: This does not check that the length of the bytes object is sufficient.
+    """
+    length = UVARI_len(by, index)
+    if length and len(by) >= index + length:
+        ld = LogicalData(by)
+        ld.seek(index)
+        # The UVARI for the length plus the length
+        return length + UVARI(ld)
+    return 0
+
+
 class DateTime:
     """Representation code 21, Date/time. [RP66V1 Appendix B Section B.21]
     TZ = Time Zone (0 = Local Standard, 1 = Local Daylight Savings, 2 = Greenwich Mean Time)"""
@@ -540,6 +580,20 @@ def OBJREF(ld: LogicalData) -> ObjectReference:
     return ObjectReference(t, n)
 
 
+def OBJREF_len(by: typing.Union[bytes, bytearray], index: int) -> int:
+    """Return the number of bytes that will be read as a OBJREF or zero on failure.
+
+    T: Object Type is an IDENT
+    N: Object Name is an OBNAME
+    """
+    length = IDENT_len(by, index)
+    if length:
+        obname_length = OBNAME_len(by, index + length)
+        if obname_length:
+            return length + obname_length
+    return 0
+
+
 def STATUS(ld: LogicalData) -> int:
     """
     Representation code 26, Boolean status value.
@@ -597,14 +651,20 @@ def UNITS(ld: LogicalData) -> bytes:
     return ret
 
 
+def UNITS_len(by: typing.Union[bytes, bytearray], index: int) -> int:
+    """Return the number of bytes that will be read as a UNITS or zero on failure.
+    UNITS has the same syntax as IDENT."""
+    return IDENT_len(by, index)
+
+
 #: Map of Representation code name to functions that take a LogicalData object.
 #: Has the range 1 to 27 inclusive with some Rep Codes unsupported.
 REP_CODE_MAP = {
-    # 1: FSHORT,
+    1: FSHORT,
     2: FSINGL,
     # 3: FSING1,
     # 4: FSING2,
-    # 5: ISINGL,
+    5: ISINGL,
     6: VSINGL,
     7: FDOUBL,
     # 8: FDOUB1,
@@ -638,12 +698,42 @@ def code_read(rep_code: int, ld: LogicalData):
     except KeyError as err:
         raise ExceptionRepCode(f'Unsupported Representation code {rep_code}') from err
 
+
+#: Map of variable length Representation code to functions that take a bytes object and an index and return the
+#: length of the value. Fixed length Representation codes are in REP_CODE_FIXED_LENGTHS.
+REP_CODE_LEN_MAP = {
+    18: UVARI_len,
+    19: IDENT_len,
+    20: ASCII_len,
+    22: ORIGIN_len,
+    23: OBNAME_len,
+    24: OBJREF_len,
+    # 25: ATTREF_len,
+    27: UNITS_len,
+}
+assert set(REP_CODE_LEN_MAP.keys()) | (set(REP_CODE_FIXED_LENGTHS.keys()) & REP_CODES_SUPPORTED) == REP_CODES_SUPPORTED
+
+
+def code_len(rep_code: int, by: typing.Union[bytes, bytearray], index: int) -> int:
+    """Return the number of bytes that code_read() would read for the Rep Code value at the index without decoding
+    the value. Returns zero on failure in the same way as the other ..._len() functions."""
+    if rep_code not in REP_CODES_SUPPORTED:
+        raise ExceptionRepCode(f'Unsupported Representation code {rep_code}')
+    if rep_code in REP_CODE_FIXED_LENGTHS:
+        if len(by) >= index + REP_CODE_FIXED_LENGTHS[rep_code]:
+            return REP_CODE_FIXED_LENGTHS[rep_code]
+        return 0
+    return REP_CODE_LEN_MAP[rep_code](by, index)
+
 # Numpy related stuff
 
 #: Numpy dtypes, numeric Rep Codes only.
 REP_CODE_NUMPY_TYPE_MAP = {
+    1: np.float32,
     2: np.float32,
 
+    # The IBM exponent range exceeds that of np.float32.
+    5: np.float64,
     6: np.float32,
     7: np.float64,
 
@@ -669,6 +759,96 @@ def numpy_dtype(rep_code: int):
         raise ExceptionRepCode(f'Unsupported Representation code {rep_code}') from err
 
 
+def FSHORT_array(raw: np.ndarray) -> np.ndarray:
+    """Vectorised Representation code 1, Low precision floating point.
+    This takes an array of the raw bytes interpreted as big endian 16 bit signed integers and returns an array of
+    np.float64 of the same shape. This is the bulk equivalent of ``FSHORT()``."""
+    raw = raw.astype(np.int16)
+    # Arithmetic shift preserves the sign of the mantissa.
+    m = raw >> 4
+    e = raw & 0xf
+    return np.ldexp(m.astype(np.float64), e.astype(np.int32) - 11)
+
+
+def ISINGL_array(raw: np.ndarray) -> np.ndarray:
+    """Vectorised Representation code 5, IBM single precision floating point.
+    This takes an array of the raw bytes interpreted as big endian 32 bit unsigned integers and returns an array of
+    np.float64 of the same shape. This is the bulk equivalent of ``ISINGL()``."""
+    raw = raw.astype(np.uint32)
+    m = raw & 0xffffff
+    e = (raw >> 24) & 0x7f
+    value = np.ldexp(m.astype(np.float64), 4 * (e.astype(np.int32) - 64) - 24)
+    return np.where(raw & 0x80000000, -value, value)
+
+
+def VSINGL_array(raw: np.ndarray) -> np.ndarray:
+    """Vectorised Representation code 6, VAX single precision floating point.
+    This takes an array of the raw bytes interpreted as big endian 32 bit unsigned integers and returns an array of
+    np.float64 of the same shape. This is the bulk equivalent of ``VSINGL()``."""
+    raw = raw.astype(np.uint32)
+    b0 = (raw >> 24) & 0xff
+    b1 = (raw >> 16) & 0xff
+    b2 = (raw >> 8) & 0xff
+    b3 = raw & 0xff
+    s = b1 & 0x80
+    m = ((b0 & 0x7f) << 16) | (b3 << 8) | b2
+    e = ((b1 & 0x7f) << 1) | ((b0 & 0x80) >> 7)
+    value = np.ldexp(0.5 + m.astype(np.float64) / (1 << 23), e.astype(np.int32) - 128)
+    value[(e == 0) & (s == 0)] = 0.0
+    return np.where(s != 0, -value, value)
+
+
+#: Big endian numpy dtypes that describe the raw RP66V1 bytes of fixed length numeric Rep Codes.
+#: These can be used with ``np.frombuffer()`` to decode many values at once.
+REP_CODE_NUMPY_RAW_TYPE_MAP = {
+    1: np.dtype('>i2'),  # Needs conversion with FSHORT_array()
+    2: np.dtype('>f4'),
+    5: np.dtype('>u4'),  # Needs conversion with ISINGL_array()
+    6: np.dtype('>u4'),  # Needs conversion with VSINGL_array()
+    7: np.dtype('>f8'),
+
+    12: np.dtype('i1'),
+    13: np.dtype('>i2'),
+    14: np.dtype('>i4'),
+    15: np.dtype('u1'),
+    16: np.dtype('>u2'),
+    17: np.dtype('>u4'),
+}
+assert set(REP_CODE_NUMPY_RAW_TYPE_MAP.keys()) - set(REP_CODE_NUMPY_TYPE_MAP.keys()) == set()
+assert all(REP_CODE_NUMPY_RAW_TYPE_MAP[k].itemsize == REP_CODE_FIXED_LENGTHS[k] for k in REP_CODE_NUMPY_RAW_TYPE_MAP)
+
+#: Map of Rep Code to functions that convert an array of REP_CODE_NUMPY_RAW_TYPE_MAP values to actual values.
+#: Rep Codes not in this map need no conversion other than the numpy type conversion.
+REP_CODE_NUMPY_CONVERTER_MAP = {
+    1: FSHORT_array,
+    5: ISINGL_array,
+    6: VSINGL_array,
+}
+assert set(REP_CODE_NUMPY_CONVERTER_MAP.keys()) - set(REP_CODE_NUMPY_RAW_TYPE_MAP.keys()) == set()
+
+
+def has_numpy_raw_dtype(rep_code: int) -> bool:
+    """True if the Rep Code can be decoded in bulk by numpy."""
+    return rep_code in REP_CODE_NUMPY_RAW_TYPE_MAP
+
+
+def numpy_raw_dtype(rep_code: int) -> np.dtype:
+    """Returns the big endian numpy dtype that describes the raw RP66V1 bytes of the Rep Code.
+    Will raise ExceptionRepCode for Rep codes that can not be decoded in bulk."""
+    try:
+        return REP_CODE_NUMPY_RAW_TYPE_MAP[rep_code]
+    except KeyError as err:
+        raise ExceptionRepCode(f'Representation code {rep_code} has no raw numpy dtype') from err
+
+
+def numpy_array_convert(rep_code: int, raw: np.ndarray) -> np.ndarray:
+    """Given an array of raw values described by ``numpy_raw_dtype(rep_code)`` this returns an array of the actual
+    values. For many Rep Codes this is the array itself."""
+    if rep_code in REP_CODE_NUMPY_CONVERTER_MAP:
+        return REP_CODE_NUMPY_CONVERTER_MAP[rep_code](raw)
+    return raw
+
+
 class NumericCategory(enum.Enum):
     """Categories of Representation Codes. Useful for deciding absent value."""
     NONE = 0
@@ -677,11 +857,11 @@ class NumericCategory(enum.Enum):
 
 #: Categories of Representation Codes. These should match REP_CODE_NUMPY_TYPE_MAP.
 REP_CODE_CATEGORY_MAP: typing.Dict[int, NumericCategory] = {
-    # 1: FSHORT,
+    1: NumericCategory.FLOAT,  # FSHORT,
     2: NumericCategory.FLOAT,  # FSINGL,
     # 3: NumericCategory.NONE,  # FSING1,
     # 4: NumericCategory.NONE,  # FSING2,
-    # 5: NumericCategory.FLOAT,  # ISINGL,
+    5: NumericCategory.FLOAT,  # ISINGL,
     6: NumericCategory.FLOAT,  # VSINGL,
     7: NumericCategory.FLOAT,  # FDOUBL,
     # 8: NumericCategory.NONE,  # FDOUB1,
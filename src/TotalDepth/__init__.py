@@ -60,6 +60,7 @@ entry_points_console_scripts_dict = {
     'tdrp66v1scanhtml': 'TotalDepth.RP66V1.ScanHTML:main',
     'tdrp66v1logrecindex': 'TotalDepth.RP66V1.LogRecIndex:main',
     'tdrp66v1indexpickle': 'TotalDepth.RP66V1.IndexPickle:main',
+    'tdrp66v1indexbinary': 'TotalDepth.RP66V1.IndexBinary:main',
     'tdrp66v1indexxml': 'TotalDepth.RP66V1.IndexXML:main',
 }
 
@@ -1,5 +1,6 @@
 import abc
 import argparse
+import itertools
 import typing
 
 # from TotalDepth.RP66V1 import ExceptionTotalDepthRP66V1
@@ -96,7 +97,7 @@ class Slice(SliceABC):
 
     def count(self, length: int) -> int:
         """Returns the number of values that will result if the slice is applied to a sequence of given length."""
-        return len(list(self.gen_indices(length)))
+        return len(range(*self._slice.indices(length)))
 
     def gen_indices(self, length: int) -> range:
         """Generates the indices for the sequence of the given length."""
@@ -187,6 +188,76 @@ class Sample(SliceABC):
         return f'<Sample fraction: {self._sample_size}>'
 
 
+class IndexList(SliceABC):
+    """This has the same API as Slice but takes an explicit, increasing, list of indices.
+    This is typically a chunk of the indices of another Slice or Sample, see ``gen_chunks()``.
+    Indices that are beyond the length of a sequence are ignored.
+    """
+    def __init__(self, indices: typing.Sequence[int]):
+        self._indices = list(indices)
+
+    def _indices_within(self, length: int) -> typing.List[int]:
+        return [i for i in self._indices if i < length]
+
+    def first(self, length: int) -> int:
+        """The index of the first element of a sequence of length."""
+        return self._indices_within(length)[0]
+
+    def last(self, length: int) -> int:
+        """The index of the last element of a sequence of length."""
+        return self._indices_within(length)[-1]
+
+    def step(self, length: int) -> int:
+        """The sequence of length step, this is the smallest step between indices."""
+        indices = self._indices_within(length)
+        if len(indices) < 2:
+            return 1
+        return min(b - a for a, b in zip(indices, indices[1:]))
+
+    def count(self, length: int) -> int:
+        """Returns the number of values that will result if the slice is applied to a sequence of given length."""
+        return len(self._indices_within(length))
+
+    def gen_indices(self, length: int) -> typing.Iterator[int]:
+        """Generates the indices for the sequence of the given length."""
+        yield from self._indices_within(length)
+
+    def indices(self, length: int) -> typing.List[int]:
+        """Returns a fully composed list of indices for the sequence of the given length."""
+        return self._indices_within(length)
+
+    def __eq__(self, other) -> bool:
+        """Mostly used for testing."""
+        if other.__class__ == self.__class__:
+            return other._indices == self._indices
+        return NotImplemented
+
+    def long_str(self, length: int) -> str:
+        """Long descriptive string."""
+        indices = self._indices_within(length)
+        if indices:
+            return f'<IndexList {len(indices)} out of {length} from {indices[0]} to {indices[-1]}>'
+        return f'<IndexList 0 out of {length}>'
+
+    def __str__(self) -> str:
+        if self._indices:
+            return f'<IndexList count: {len(self._indices)} from {self._indices[0]} to {self._indices[-1]}>'
+        return '<IndexList count: 0>'
+
+
+def gen_chunks(slice_or_sample: SliceABC, length: int, chunk_size: int) -> typing.Iterator[IndexList]:
+    """Generates the indices of the slice or sample on a sequence of length as successive IndexList objects of up to
+    chunk_size indices. Only a single chunk of indices is held in memory at a time."""
+    if chunk_size < 1:
+        raise ValueError(f'Chunk size must be an integer >= 1 not {chunk_size}')
+    gen = slice_or_sample.gen_indices(length)
+    while True:
+        chunk = list(itertools.islice(gen, chunk_size))
+        if not chunk:
+            break
+        yield IndexList(chunk)
+
+
 def create_slice_or_sample(slice_string: str) -> typing.Union[Slice, Sample]:
     """Returns a Slice object from a string such as:
     '', 'None,72', 'None,72,14'
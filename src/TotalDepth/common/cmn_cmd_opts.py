@@ -147,3 +147,17 @@ def number_multiprocessing_jobs(parsed_args) -> int:
     return 1
 
 # ============ END: Multiprocessing ==================
+
+# ============ Incremental ==================
+
+
+def add_incremental(parser: argparse.ArgumentParser) -> None:
+    """Adds incremental processing to the argument parser as --incremental."""
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Use the manifest in the output directory to skip input files that are unchanged since the last run"
+             " and to remove the outputs of input files that have gone. Default: %(default)s."
+    )
+
+# ============ END: Incremental ==================
@@ -0,0 +1,166 @@
+"""
+A manifest of the files that a batch tool has processed from an input directory to an output directory.
+
+Each tool keeps its own manifest in the output directory. For each input file it records the size, modification time,
+a fast content fingerprint, the tool version, the output files written and the result.
+On a re-run an input file that is unchanged is skipped and its previous result is used.
+When the manifest is closed the outputs of input files that no longer exist are removed.
+
+Example::
+
+    with manifest.Manifest(dir_in, dir_out, 'IndexXML', __version__, enabled=incremental) as mfst:
+        for file_in_out in DirWalk.dirWalk(dir_in, dir_out, recursive=True):
+            result = mfst.unchanged_result(file_in_out.filePathIn)
+            if result is None:
+                result = process_file(file_in_out.filePathIn, file_in_out.filePathOut)
+                mfst.update(file_in_out.filePathIn, result, [file_in_out.filePathOut + '.xml'])
+"""
+import hashlib
+import logging
+import os
+import pickle
+import typing
+
+
+logger = logging.getLogger(__file__)
+
+
+#: The name of the manifest file in the output directory, formatted with the tool name.
+MANIFEST_FILE = '.manifest.{tool}.pkl'
+#: Number of bytes at each end of a file that is used for the fingerprint.
+FINGERPRINT_SIZE = 64 * 1024
+
+
+def fingerprint(path: str) -> str:
+    """Returns a fast fingerprint of the file from its size and the first and last FINGERPRINT_SIZE bytes."""
+    size = os.path.getsize(path)
+    hash_digest = hashlib.sha1(str(size).encode('ascii'))
+    with open(path, 'rb') as fobj:
+        hash_digest.update(fobj.read(FINGERPRINT_SIZE))
+        if size > FINGERPRINT_SIZE:
+            fobj.seek(max(FINGERPRINT_SIZE, size - FINGERPRINT_SIZE))
+            hash_digest.update(fobj.read(FINGERPRINT_SIZE))
+    return hash_digest.hexdigest()
+
+
+class ManifestEntry(typing.NamedTuple):
+    """The record of processing a single input file."""
+    size: int
+    mtime_ns: int
+    fingerprint: str
+    version: str
+    # Paths relative to the output directory.
+    outputs: typing.Tuple[str, ...]
+    result: typing.Any
+
+
+class Manifest:
+    """Records the input files processed from dir_in to dir_out by the named tool of the given version.
+    If enabled is False every file is treated as changed and nothing is written.
+
+    ``skipped`` and ``processed`` count the unchanged and the updated files for monitoring.
+    """
+    def __init__(self, dir_in: str, dir_out: str, tool: str, version: str, enabled: bool = True):
+        self.dir_in = dir_in
+        self.dir_out = dir_out
+        self.tool = tool
+        self.version = version
+        self.enabled = enabled and bool(dir_out)
+        self.skipped = 0
+        self.processed = 0
+        self._entries: typing.Dict[str, ManifestEntry] = {}
+        if self.enabled and os.path.isfile(self.path):
+            try:
+                with open(self.path, 'rb') as fobj:
+                    self._entries = pickle.load(fobj)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as err:
+                logger.warning(f'Manifest: ignoring unreadable {self.path}: {err}')
+
+    def __str__(self) -> str:
+        return f'<Manifest {self.path} entries: {len(self)} skipped: {self.skipped} processed: {self.processed}>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.remove_orphans()
+            self.write()
+        return False
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.dir_out, MANIFEST_FILE.format(tool=self.tool))
+
+    def _key(self, path_in: str) -> str:
+        return os.path.relpath(path_in, self.dir_in)
+
+    def unchanged_result(self, path_in: str) -> typing.Any:
+        """Returns the previous result if the input file is unchanged since it was processed by this version and the
+        outputs still exist, otherwise None.
+        If only the modification time has changed the fingerprint decides."""
+        if not self.enabled:
+            return None
+        key = self._key(path_in)
+        entry = self._entries.get(key)
+        if entry is None or entry.version != self.version:
+            return None
+        if not all(os.path.isfile(os.path.join(self.dir_out, p)) for p in entry.outputs):
+            return None
+        stat = os.stat(path_in)
+        if stat.st_size != entry.size:
+            return None
+        if stat.st_mtime_ns != entry.mtime_ns:
+            if fingerprint(path_in) != entry.fingerprint:
+                return None
+            self._entries[key] = entry._replace(mtime_ns=stat.st_mtime_ns)
+        logger.debug(f'Manifest: unchanged {path_in}')
+        self.skipped += 1
+        return entry.result
+
+    def update(self, path_in: str, result: typing.Any, outputs: typing.Sequence[str]) -> None:
+        """Records the result of processing the input file and the output paths written.
+        Outputs of a previous entry that are not in the new outputs are removed."""
+        if not self.enabled:
+            return
+        key = self._key(path_in)
+        rel_outputs = tuple(os.path.relpath(p, self.dir_out) for p in outputs)
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._remove_outputs(set(previous.outputs) - set(rel_outputs))
+        stat = os.stat(path_in)
+        self._entries[key] = ManifestEntry(
+            stat.st_size, stat.st_mtime_ns, fingerprint(path_in), self.version, rel_outputs, result
+        )
+        self.processed += 1
+
+    def _remove_outputs(self, rel_outputs: typing.Iterable[str]) -> typing.List[str]:
+        ret = []
+        for rel_output in rel_outputs:
+            output = os.path.join(self.dir_out, rel_output)
+            if os.path.isfile(output):
+                logger.info(f'Manifest: removing {output}')
+                os.remove(output)
+                ret.append(output)
+        return ret
+
+    def remove_orphans(self) -> typing.List[str]:
+        """Removes the outputs and entries of input files that no longer exist.
+        Returns the output paths removed."""
+        ret = []
+        if self.enabled:
+            for key in [k for k in self._entries if not os.path.isfile(os.path.join(self.dir_in, k))]:
+                ret.extend(self._remove_outputs(self._entries.pop(key).outputs))
+        return ret
+
+    def write(self) -> None:
+        """Writes the manifest to the output directory."""
+        if self.enabled:
+            os.makedirs(self.dir_out, exist_ok=True)
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as fobj:
+                pickle.dump(self._entries, fobj)
+            os.replace(temp_path, self.path)
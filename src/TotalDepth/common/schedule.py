@@ -0,0 +1,179 @@
+"""
+Schedules the processing of many files across a pool of processes.
+
+Tasks are submitted largest first so that a single very large file does not start last and leave the other processes
+idle for a long tail. Results are yielded as they complete and a task that raises, exceeds its time limit or exceeds
+its memory budget yields a failed :py:class:`TaskResult` rather than stalling the batch.
+
+Example::
+
+    tasks = [
+        schedule.file_task(t.filePathIn, t.filePathOut) for t in DirWalk.dirWalk(dir_in, dir_out, recursive=True)
+    ]
+    for task_result in schedule.imap_tasks(process_file, tasks, jobs, timeout=600.0):
+        if task_result.exception:
+            ...
+        else:
+            ...
+
+The memory budget is applied to each worker process as a limit on its address space, so it needs the ``resource``
+module and is ignored on platforms without it. The time limit uses ``signal.setitimer()`` and is likewise ignored
+where that is not available.
+A worker process that is killed, rather than raising, will still stall the pool.
+"""
+import argparse
+import contextlib
+import functools
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import typing
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from TotalDepth import ExceptionTotalDepth
+
+
+logger = logging.getLogger(__file__)
+
+
+class ExceptionSchedule(ExceptionTotalDepth):
+    """Exception class for this module."""
+    pass
+
+
+class ExceptionScheduleTimeout(ExceptionSchedule):
+    """Raised in a worker when a task exceeds its time limit."""
+    pass
+
+
+class Task(typing.NamedTuple):
+    """A task is a set of arguments to a function and a size that is used to schedule the largest tasks first."""
+    size: int
+    args: typing.Tuple[typing.Any, ...]
+
+
+class TaskResult(typing.NamedTuple):
+    """The result of a task. If the task failed then result is None and exception is a non-empty description."""
+    task: Task
+    result: typing.Any
+    exception: str
+    time: float
+
+
+def file_task(path_in: str, *args) -> Task:
+    """Returns a Task where the first argument is the path to the input file, the size is that of the file."""
+    return Task(os.path.getsize(path_in), (path_in,) + args)
+
+
+def largest_first(tasks: typing.Iterable[Task]) -> typing.List[Task]:
+    """Returns the tasks sorted largest first, tasks of the same size retain their order."""
+    return sorted(tasks, key=lambda task: task.size, reverse=True)
+
+
+@contextlib.contextmanager
+def _time_limit(timeout: float):
+    """Raises ExceptionScheduleTimeout if the body exceeds timeout seconds. If timeout <= 0 there is no limit."""
+    if timeout <= 0.0 or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def _handler(signum, frame):
+        raise ExceptionScheduleTimeout(f'Task exceeded time limit of {timeout} (s)')
+
+    previous = signal.signal(signal.SIGALRM, _handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0.0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _initialise_worker(memory_limit: int) -> None:
+    """Limits the address space of this worker process to memory_limit bytes. If memory_limit <= 0 there is no
+    limit."""
+    if memory_limit > 0:
+        if resource is None:  # pragma: no cover
+            logger.warning(f'Can not limit memory to {memory_limit} bytes on this platform.')
+            return
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+def _run_task(function: typing.Callable,
+              timeout: float,
+              index_args: typing.Tuple[int, typing.Tuple[typing.Any, ...]],
+              ) -> typing.Tuple[int, typing.Any, str, float]:
+    """Runs a single task in a worker. Returns (index, result, exception, time)."""
+    index, args = index_args
+    t_start = time.perf_counter()
+    try:
+        with _time_limit(timeout):
+            result = function(*args)
+        return index, result, '', time.perf_counter() - t_start
+    except Exception as err:
+        logger.exception(f'Task {function.__name__}{args} failed.')
+        return index, None, f'{type(err).__name__}: {err}', time.perf_counter() - t_start
+
+
+def imap_tasks(function: typing.Callable,
+               tasks: typing.Iterable[Task],
+               jobs: int = 0,
+               chunksize: int = 1,
+               memory_limit: int = 0,
+               timeout: float = 0.0) -> typing.Iterator[TaskResult]:
+    """Calls function(*task.args) for each task in a pool of jobs processes, largest task first, yielding a
+    TaskResult as each one completes. The order of the results is not the order of the tasks.
+
+    function - A module level function, it is pickled by reference.
+    jobs - The number of processes, if < 1 this is the number of CPUs.
+    chunksize - The number of tasks sent to a worker at a time.
+    memory_limit - The maximum address space of each worker in bytes, if <= 0 there is no limit.
+    timeout - The maximum time of each task in seconds, if <= 0 there is no limit.
+    """
+    tasks = largest_first(tasks)
+    if not tasks:
+        return
+    if jobs < 1:
+        jobs = multiprocessing.cpu_count()
+    jobs = min(jobs, len(tasks))
+    logger.info(
+        f'imap_tasks(): {function.__name__} tasks: {len(tasks)} jobs: {jobs} chunksize: {chunksize}'
+        f' memory_limit: {memory_limit} timeout: {timeout}'
+    )
+    with multiprocessing.Pool(processes=jobs, initializer=_initialise_worker, initargs=(memory_limit,)) as pool:
+        for count, (index, result, exception, task_time) in enumerate(
+                pool.imap_unordered(
+                    functools.partial(_run_task, function, timeout),
+                    enumerate(task.args for task in tasks),
+                    chunksize=chunksize,
+                ), start=1):
+            logger.debug(f'imap_tasks(): completed {count}/{len(tasks)} in {task_time:.3f} (s): {tasks[index].args}')
+            yield TaskResult(tasks[index], result, exception, task_time)
+
+
+def add_schedule_to_argument_parser(parser: argparse.ArgumentParser) -> None:
+    """Add ``--task-memory`` and ``--task-timeout`` options to the argument parser."""
+    parser.add_argument(
+        '--task-memory', default=0, type=int,
+        help='Maximum memory of each multiprocessing task in megabytes, a task that exceeds this fails.'
+             ' If 0 there is no limit. [default: %(default)s]',
+    )
+    parser.add_argument(
+        '--task-timeout', default=0.0, type=float,
+        help='Maximum time of each multiprocessing task in seconds, a task that exceeds this fails.'
+             ' If 0.0 there is no limit. [default: %(default)s]',
+    )
+
+
+def memory_limit_from_args(parsed_args) -> int:
+    """Returns the memory limit in bytes from the ``--task-memory`` option."""
+    return parsed_args.task_memory * 1024**2
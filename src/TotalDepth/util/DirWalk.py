@@ -62,7 +62,7 @@ def gen_big_first(directory):
         if os.path.isfile(path):
             size_paths.append((os.path.getsize(path), name))
     # print(size_paths)
-    for size, name in sorted(size_paths):
+    for size, name in sorted(size_paths, key=lambda size_name: (-size_name[0], size_name[1])):
         yield name
 
 
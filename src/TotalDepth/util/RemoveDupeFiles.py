@@ -1,9 +1,22 @@
 """
 Scans a directory and removes duplicate files based on their SHA.
+
+This is done in stages so that most files are never read in full:
+
+1. Files are bucketed by size, a file with a unique size can not have a duplicate.
+2. Files of the same size are hashed on their first and last ``partial_size`` bytes.
+3. Files that still match are hashed in full.
+
+Hashing is done by a thread pool, hashlib releases the GIL for large updates.
+Optionally the hashes can be kept in a :py:class:`HashDatabase` so that re-running over an unchanged tree reads little
+more than the directory entries.
 """
+import collections
+import concurrent.futures
 import hashlib
 import logging
 import os
+import sqlite3
 import sys
 import time
 import typing
@@ -12,38 +25,195 @@ from TotalDepth.common import cmn_cmd_opts
 
 logger = logging.getLogger(__file__)
 
-__version__ = '0.1.0'
+__version__ = '0.2.0'
 __rights__  = 'Copyright (c) 2019 Paul Ross. All rights reserved.'
 
 
-def remove_dupes(path: str, nervous: bool) -> typing.Tuple[int, int]:
-    """Scans a directory tree removing duplicate files detected by their SHA512."""
-    BLOCK_SIZE = 1024**2
-    file_count = byte_count = 0
-    dupes: typing.Dict[bytes, str] = {}
-    for root, dirs, files in os.walk(path):
-        for file in sorted(files):
+BLOCK_SIZE = 1024**2
+#: Number of bytes at each end of a file that is used for the partial hash.
+PARTIAL_SIZE = 64 * 1024
+
+
+class HashDatabase:
+    """A persistent store of the partial and full SHA512 of files in a SQLite database.
+
+    A stored hash is only used if the size and modification time of the file are unchanged.
+    ``hits`` and ``misses`` count the lookups for monitoring.
+    """
+    PARTIAL = 'partial'
+    FULL = 'full'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS hashes ('
+            'path TEXT, kind TEXT, size INTEGER, mtime_ns INTEGER, partial_size INTEGER, digest BLOB,'
+            ' PRIMARY KEY (path, kind))'
+        )
+
+    def __str__(self) -> str:
+        return f'<HashDatabase {self.path} hits: {self.hits} misses: {self.misses}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def get(self, path: str, kind: str, stat: os.stat_result, partial_size: int) -> typing.Union[bytes, None]:
+        """Returns the digest or None if absent or the file has changed."""
+        row = self._connection.execute(
+            'SELECT digest FROM hashes WHERE path = ? AND kind = ? AND size = ? AND mtime_ns = ? AND partial_size = ?',
+            (os.path.abspath(path), kind, stat.st_size, stat.st_mtime_ns, partial_size),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, path: str, kind: str, stat: os.stat_result, partial_size: int, digest: bytes) -> None:
+        """Records the digest."""
+        self._connection.execute(
+            'INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)',
+            (os.path.abspath(path), kind, stat.st_size, stat.st_mtime_ns, partial_size, digest),
+        )
+
+    def remove(self, path: str) -> None:
+        """Removes all digests of the file."""
+        self._connection.execute('DELETE FROM hashes WHERE path = ?', (os.path.abspath(path),))
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+
+def partial_hash(path: str, size: int, partial_size: int) -> bytes:
+    """Returns the SHA512 of the first and last partial_size bytes of the file.
+    If the file is no longer than twice partial_size this is the SHA512 of the whole file."""
+    if size <= 2 * partial_size:
+        return full_hash(path)
+    hash_digest = hashlib.sha512()
+    with open(path, 'rb') as fobj:
+        hash_digest.update(fobj.read(partial_size))
+        fobj.seek(size - partial_size)
+        hash_digest.update(fobj.read(partial_size))
+    return hash_digest.digest()
+
+
+def full_hash(path: str) -> bytes:
+    """Returns the SHA512 of the whole file."""
+    hash_digest = hashlib.sha512()
+    with open(path, 'rb') as fobj:
+        while True:
+            data = fobj.read(BLOCK_SIZE)
+            if not data:
+                break
+            hash_digest.update(data)
+    return hash_digest.digest()
+
+
+def _hash_files(kind: str,
+                files: typing.List[typing.Tuple[str, os.stat_result]],
+                partial_size: int,
+                executor: concurrent.futures.Executor,
+                hash_db: typing.Union[HashDatabase, None]) -> typing.Dict[str, bytes]:
+    """Returns a dict of {path: digest, ...} of the files using the hash database where possible and the executor
+    for the remainder."""
+    ret: typing.Dict[str, bytes] = {}
+    futures = {}
+    for file_path, stat in files:
+        digest = None
+        if hash_db is not None:
+            digest = hash_db.get(file_path, kind, stat, partial_size)
+        if digest is None:
+            if kind == HashDatabase.PARTIAL:
+                futures[executor.submit(partial_hash, file_path, stat.st_size, partial_size)] = file_path, stat
+            else:
+                futures[executor.submit(full_hash, file_path)] = file_path, stat
+        else:
+            ret[file_path] = digest
+    for future in concurrent.futures.as_completed(futures):
+        file_path, stat = futures[future]
+        ret[file_path] = future.result()
+        if hash_db is not None:
+            hash_db.set(file_path, kind, stat, partial_size, ret[file_path])
+    if hash_db is not None:
+        hash_db.commit()
+    return ret
+
+
+def _retain_groups(files: typing.List[typing.Tuple[str, os.stat_result]],
+                   keys: typing.Callable[[str], typing.Hashable]) -> typing.List[typing.Tuple[str, os.stat_result]]:
+    """Returns the files, in the same order, that share their key with at least one other file."""
+    counts = collections.Counter(keys(file_path) for file_path, _stat in files)
+    return [(file_path, stat) for file_path, stat in files if counts[keys(file_path)] > 1]
+
+
+def find_dupes(path: str,
+               partial_size: int = PARTIAL_SIZE,
+               jobs: int = 0,
+               hash_db: typing.Union[HashDatabase, None] = None) -> typing.List[typing.Tuple[str, str]]:
+    """Scans a directory tree for duplicate files detected by their SHA512.
+    Returns a list of (duplicate, original) file paths where the original is the first in directory walk order.
+    Hashing is done by a thread pool of jobs threads, 0 uses the ``concurrent.futures`` default."""
+    files: typing.List[typing.Tuple[str, os.stat_result]] = []
+    for root, dirs, file_names in os.walk(path):
+        for file in sorted(file_names):
             if not file.startswith('.'):
                 file_path = os.path.join(root, file)
-                logger.debug(f'Checking {file_path}')
-                with open(file_path, 'rb') as fobj:
-                    hash_digest = hashlib.sha512()
-                    while True:
-                        data = fobj.read(BLOCK_SIZE)
-                        if not data:
-                            break
-                        hash_digest.update(data)
-                    hash_digest = hash_digest.digest()
-                    if hash_digest in dupes:
-                        byte_count += os.path.getsize(file_path)
-                        file_count += 1
-                        if nervous:
-                            logger.info(f'Would remove {file_path} as duplicate of {dupes[hash_digest]}')
-                        else:
-                            logger.info(f'Removing {file_path} as duplicate of {dupes[hash_digest]}')
-                            os.remove(file_path)
-                    else:
-                        dupes[hash_digest] = file_path
+                files.append((file_path, os.stat(file_path)))
+    stats = {file_path: stat for file_path, stat in files}
+    candidates = _retain_groups(files, lambda p: stats[p].st_size)
+    logger.debug(f'Files: {len(files)} with the same size: {len(candidates)}')
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        partials = _hash_files(HashDatabase.PARTIAL, candidates, partial_size, executor, hash_db)
+        candidates = _retain_groups(candidates, lambda p: (stats[p].st_size, partials[p]))
+        logger.debug(f'Files with the same partial hash: {len(candidates)}')
+        # Files no longer than twice partial_size have been hashed in full already.
+        fulls = _hash_files(
+            HashDatabase.FULL,
+            [(file_path, stat) for file_path, stat in candidates if stat.st_size > 2 * partial_size],
+            partial_size, executor, hash_db,
+        )
+    ret = []
+    originals: typing.Dict[typing.Tuple[int, bytes], str] = {}
+    for file_path, stat in candidates:
+        key = stat.st_size, fulls.get(file_path, partials[file_path])
+        if key in originals:
+            ret.append((file_path, originals[key]))
+        else:
+            originals[key] = file_path
+    return ret
+
+
+def remove_dupes(path: str,
+                 nervous: bool,
+                 partial_size: int = PARTIAL_SIZE,
+                 jobs: int = 0,
+                 hash_db: typing.Union[HashDatabase, None] = None) -> typing.Tuple[int, int]:
+    """Scans a directory tree removing duplicate files detected by their SHA512.
+    Returns the count of files and bytes removed, or that would be removed if nervous."""
+    file_count = byte_count = 0
+    for file_path, original in find_dupes(path, partial_size, jobs, hash_db):
+        byte_count += os.path.getsize(file_path)
+        file_count += 1
+        if nervous:
+            logger.info(f'Would remove {file_path} as duplicate of {original}')
+        else:
+            logger.info(f'Removing {file_path} as duplicate of {original}')
+            os.remove(file_path)
+            if hash_db is not None:
+                hash_db.remove(file_path)
+    if hash_db is not None:
+        hash_db.commit()
     return file_count, byte_count
 
 
@@ -58,11 +228,24 @@ def main() -> int:
     parser.add_argument('-n', '--nervous',
                         help='Nervous mode, does not do anything but report [default: %(default)s].',
                         action='store_true')
+    parser.add_argument('--partial-size', type=int, default=PARTIAL_SIZE,
+                        help='Bytes at each end of a file to hash before hashing the whole file'
+                             ' [default: %(default)s].')
+    parser.add_argument('-t', '--threads', type=int, default=0,
+                        help='Number of hashing threads, 0 is the Python default [default: %(default)s].')
+    parser.add_argument('--hash-db', type=str, default='',
+                        help='Path to a SQLite database of file hashes that is used and updated'
+                             ' so that unchanged files are not hashed again [default: %(default)s].')
     args = parser.parse_args()
     # print(args)
     cmn_cmd_opts.set_log_level(args)
     t_start = time.perf_counter()
-    num_files, byte_count = remove_dupes(args.path_in, args.nervous)
+    if args.hash_db:
+        with HashDatabase(args.hash_db) as hash_db:
+            num_files, byte_count = remove_dupes(args.path_in, args.nervous, args.partial_size, args.threads, hash_db)
+            print(hash_db)
+    else:
+        num_files, byte_count = remove_dupes(args.path_in, args.nervous, args.partial_size, args.threads)
     t_exec = time.perf_counter() - t_start
     print(f'Execution time: {t_exec:.3f} (s)')
     print(f' Removed Files: {num_files:8,d} rate {num_files / t_exec:,.1f} (files/s)')
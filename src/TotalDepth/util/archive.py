@@ -55,17 +55,19 @@ class FileBase:
 
 
 class FileOnDisc(FileBase):
-    """Represents an on-disc file."""
+    """Represents an on-disc file.
+    If the classification is given, for example from classify_paths(), then the file is not read again."""
 
-    def __init__(self, path: str):
+    def __init__(self, path: str,
+                 classification: typing.Optional[TotalDepth.util.bin_file_type.FileClassification] = None):
         super().__init__(path)
         os_stat = os.stat(self.path)
-        self.size = os_stat.st_size
         self.mod_date = datetime.datetime(*(time.localtime(os_stat.st_mtime)[:6]))
-        with open(self.path, 'rb') as f:
-            self.bin_type = TotalDepth.util.bin_file_type.binary_file_type(f)
-            f.seek(0)
-            self.bytes = f.read(self.XXD_NUM_BYTES)
+        if classification is None:
+            classification = TotalDepth.util.bin_file_type.classify_path(self.path, self.XXD_NUM_BYTES)
+        self.size = classification.size
+        self.bin_type = classification.bin_type
+        self.bytes = classification.head
 
 
 class FileInMemory(FileBase):
@@ -100,18 +102,20 @@ class FileMembers:
 class FileArchive(FileOnDisc):
     """Represents a file that is an archive of other files."""
 
-    def __init__(self, archive_path: str, depth: int):
-        super().__init__(archive_path)
+    def __init__(self, archive_path: str, depth: int,
+                 classification: typing.Optional[TotalDepth.util.bin_file_type.FileClassification] = None):
+        super().__init__(archive_path, classification)
         self.members: FileMembers = FileMembers(archive_path, depth)
 
 
 class FileZip(FileArchive):
-    """Represents an on-disc file that is a ZIP file."""
+    """Represents an on-disc file that is a ZIP file.
+    If the classification is given, for example from classify_paths(), then the file is not read again."""
 
-    def __init__(self, archive_path: str):
-        assert zipfile.is_zipfile(archive_path)
-        super().__init__(archive_path, depth=0)
-        # assert self.bin_type == 'ZIP', f'Binary type is "{self.bin_type}" not ZIP'
+    def __init__(self, archive_path: str,
+                 classification: typing.Optional[TotalDepth.util.bin_file_type.FileClassification] = None):
+        super().__init__(archive_path, 0, classification)
+        assert self.bin_type == 'ZIP' or zipfile.is_zipfile(archive_path), f'{archive_path} is not a ZIP file'
         # XXD_NUM_BYTES = 18
         # Recurse into the archive. This can fail with io.UnsupportedOperation: seek when attempting to determine the
         # binary file type.
@@ -135,7 +139,12 @@ class FileZip(FileArchive):
                             self._expand_archive(z_member_archive, depth + 1)
                     else:
                         try:
-                            bin_file_type = TotalDepth.util.bin_file_type.binary_file_type(z_member_file)
+                            by = z_member_file.read(
+                                max(TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES, self.XXD_NUM_BYTES)
+                            )
+                            bin_file_type = TotalDepth.util.bin_file_type.binary_file_type_from_head(
+                                by, z_member_file
+                            )
                         except Exception as err:
                             logger.exception(
                                 f'Can not determine binary file type for member {z_member_file} of {z_archive}'
@@ -146,10 +155,9 @@ class FileZip(FileArchive):
                             #     f'{xxd(by):{xxd_size(XXD_NUM_BYTES)}s} {z_info.file_size:12,d}'
                             #     f' {bin_file_type:8s} {z_info.filename}'
                             # )
-                            z_member_file.seek(0)
-                            by = z_member_file.read(self.XXD_NUM_BYTES)
                             self.members.append(
-                                z_info.filename, z_info.file_size, bin_file_type, datetime.datetime(*z_info.date_time), by
+                                z_info.filename, z_info.file_size, bin_file_type, datetime.datetime(*z_info.date_time),
+                                by[:self.XXD_NUM_BYTES]
                             )
 
     def __str__(self):
@@ -266,30 +274,46 @@ def analyse_archive(files: typing.List[FileBase],
 EXCLUDE_FILENAMES = ('.DS_Store', '.DS_STORE',)
 
 
-def _process_file(dir_name: str, file_name: str, result: typing.List[FileBase]) -> None:
+def _process_file(dir_name: str, file_name: str, result: typing.List[str]) -> None:
     if file_name not in EXCLUDE_FILENAMES:
         path = os.path.join(dir_name, file_name)
         if os.path.isfile(path):
-            # If this is a ZIP archive then open it a process the contents.
-            if zipfile.is_zipfile(path):
-                # result.extend(process_zip_path(path))
-                result.append(FileZip(path))
-            else:
-                result.append(FileOnDisc(path))
+            result.append(path)
 
 
-def explore_tree(path: str, recurse: bool) -> typing.List[FileBase]:
-    result: typing.List[FileBase] = []
+# Binary file types that might still be a ZIP archive. An empty archive starts with b'PK\x05\x06' which looks like
+# ASCII, a self-extracting or prefixed archive has an unknown head.
+ZIP_FALLBACK_BIN_TYPES = ('', 'ASCII')
+
+
+def explore_tree(path: str, recurse: bool, jobs: int = 1) -> typing.List[FileBase]:
+    """Returns a list of FileBase for the files at path. The binary file types are found by a pool of jobs threads,
+    see classify_paths().
+    ZIP archives are found from the classified head, which has the ZIP magic number b'PK\x03\x04'. Only if the head
+    is ASCII or unknown is the file opened again with zipfile.is_zipfile() to find empty, self-extracting or prefixed
+    archives. A ZIP archive that has some other known file type as a prefix is not recognised."""
+    paths: typing.List[str] = []
     if os.path.isdir(path):
         if recurse:
             for root, dirs, files in os.walk(path):
                 for file in files:
-                    _process_file(root, file, result)
+                    _process_file(root, file, paths)
         else:
             for file_name in sorted(os.listdir(path)):
-                _process_file(path, file_name, result)
+                _process_file(path, file_name, paths)
     else:
-        _process_file(os.path.dirname(path), os.path.basename(path), result)
+        _process_file(os.path.dirname(path), os.path.basename(path), paths)
+    result: typing.List[FileBase] = []
+    for classification in TotalDepth.util.bin_file_type.classify_paths(paths, jobs, FileBase.XXD_NUM_BYTES):
+        # If this is a ZIP archive then open it a process the contents.
+        # The ZIP magic number is in the head that classify_paths() has read so most files are not opened again.
+        if classification.bin_type == 'ZIP' or (
+                classification.bin_type in ZIP_FALLBACK_BIN_TYPES and zipfile.is_zipfile(classification.path)
+        ):
+            # result.extend(process_zip_path(path))
+            result.append(FileZip(classification.path, classification))
+        else:
+            result.append(FileOnDisc(classification.path, classification))
     return result
 
 
@@ -418,6 +442,11 @@ will be copied across."""
         '--expand-and-delete', help='Expand and delete archive files, implies --recurse.', action='store_true'
     )
     parser.add_argument('--histogram', help='Include size histogram.', action='store_true')
+    parser.add_argument(
+        '-j', '--jobs', default=0, type=int,
+        help='Number of threads used to find the binary file types, zero uses the thread pool default.'
+             ' [default: %(default)s]',
+    )
     parser.add_argument('-n', '--nervous', help='Nervous mode, does not do anything but report.', action='store_true')
     parser.add_argument('-o', '--over-write', help='Over write existing files, otherwise warns.', action='store_true')
     # parser.add_argument('copy-to', help='Location to copy the files to.', nargs='?')
@@ -444,7 +473,7 @@ will be copied across."""
             num_files, byte_count = expand_and_delete_archives(args.path_in, args.nervous)
         else:
             print('Analysing archive.')
-            files: typing.List[FileBase] = explore_tree(args.path_in, args.recurse)
+            files: typing.List[FileBase] = explore_tree(args.path_in, args.recurse, args.jobs)
             analyse_archive(files, args.file_type, args.bytes, args.histogram)
             num_files = len(files)
             byte_count = sum(len(f.bytes) for f in files)
@@ -3,10 +3,16 @@ Identifies the type of file as a string such as "PDF", "RP66V1" by an analysis (
 initial bytes of the file.
 """
 
+import concurrent.futures
+import logging
+import os
 import re
 import string
 import typing
 
+
+logger = logging.getLogger(__file__)
+
 RE_COMPILED = {
     'RP66V1': {
         'Comment_1': re.compile(b'^[0 ]*([1-9]+)$'),
@@ -41,6 +47,16 @@ ASCII_VISUAL_BYTES = set(
 )
 ASCII_BYTES_LOWER_128 = set(bytes(range(128)))
 RE_LAS_VERSION_LINE = re.compile(br'^\s*VERS\s*\.\s+([\d.]+)\s*:\s*(.+?)?\s*$')
+#: Returned by a test on the initial bytes of a file when those are not enough to decide.
+RESULT_NEEDS_MORE_BYTES = -2
+
+
+def _las_line(line: bytes) -> bytes:
+    """Returns the line without any comment or surrounding whitespace."""
+    comment_idx = line.find(b'#')
+    if comment_idx != -1:
+        line = line[:comment_idx]
+    return line.strip()
 
 
 def _las(fobj: typing.BinaryIO, version_prefix: bytes) -> int:
@@ -48,16 +64,41 @@ def _las(fobj: typing.BinaryIO, version_prefix: bytes) -> int:
     fobj.seek(0)
     lines = []
     for line in fobj:
-        comment_idx = line.find(b'#')
-        if comment_idx != -1:
-            line = line[:comment_idx]
-        line = line.strip()
+        line = _las_line(line)
         if len(line) > 0:
             lines.append(line)
         if len(lines) > 1:
             break
     else:
         return 6
+    return _las_lines(lines, version_prefix)
+
+
+def _las_bytes(by: bytes, version_prefix: bytes) -> int:
+    """As _las() but given the initial bytes of the file, the last line of which might be truncated.
+    Returns RESULT_NEEDS_MORE_BYTES if the bytes do not contain the first two non-empty lines."""
+    lines = []
+    start = 0
+    while True:
+        end = by.find(b'\n', start)
+        line = _las_line(by[start:] if end == -1 else by[start:end])
+        if len(line) > 0:
+            if len(lines) == 0 and not line.startswith(b'~V') and not b'~V'.startswith(line):
+                # Not LAS even if this line is truncated. This saves reading more of most non-LAS files.
+                return 1
+            if end == -1:
+                return RESULT_NEEDS_MORE_BYTES
+            lines.append(line)
+            if len(lines) > 1:
+                return _las_lines(lines, version_prefix)
+        elif end == -1:
+            return RESULT_NEEDS_MORE_BYTES
+        start = end + 1
+
+
+def _las_lines(lines: typing.List[bytes], version_prefix: bytes) -> int:
+    """Given the first two non-empty lines returns zero if this is a LAS file of specified version(s), non-zero
+    otherwise."""
     # ~Version Information
     # if lines[0] not in (
     #         b'~V',
@@ -97,6 +138,18 @@ def _lasv30(fobj: typing.BinaryIO) -> int:
     return _las(fobj, b'3.0')
 
 
+def _lasv12_bytes(by: bytes) -> int:
+    return _las_bytes(by, b'1.2')
+
+
+def _lasv20_bytes(by: bytes) -> int:
+    return _las_bytes(by, b'2.0')
+
+
+def _lasv30_bytes(by: bytes) -> int:
+    return _las_bytes(by, b'3.0')
+
+
 def _lis_bytes(by: bytes) -> int:
     """Basic LIS with no TIF markers.
 
@@ -224,7 +277,11 @@ def _lis_tif_general(by: bytes, tif_next: int) -> int:
 def _lis_tif(fobj: typing.BinaryIO) -> int:
     """Basic LIS with TIF markers correctly written (little endian)."""
     fobj.seek(0)
-    by: bytes = fobj.read(TIF_PLUS_LIS_LEN_REQUIRED_BYTES)
+    return _lis_tif_bytes(fobj.read(TIF_PLUS_LIS_LEN_REQUIRED_BYTES))
+
+
+def _lis_tif_bytes(by: bytes) -> int:
+    """Basic LIS with TIF markers correctly written (little endian)."""
     if len(by) < TIF_PLUS_LIS_LEN_REQUIRED_BYTES:
         return -1
     # TIF next, little endian
@@ -237,7 +294,11 @@ def _lis_tif(fobj: typing.BinaryIO) -> int:
 def _lis_tif_r(fobj: typing.BinaryIO) -> int:
     """Basic LIS with TIF markers reversed (big endian)."""
     fobj.seek(0)
-    by: bytes = fobj.read(TIF_PLUS_LIS_LEN_REQUIRED_BYTES)
+    return _lis_tif_r_bytes(fobj.read(TIF_PLUS_LIS_LEN_REQUIRED_BYTES))
+
+
+def _lis_tif_r_bytes(by: bytes) -> int:
+    """Basic LIS with TIF markers reversed (big endian)."""
     if len(by) < TIF_PLUS_LIS_LEN_REQUIRED_BYTES:
         return -1
     # TIF next, big endian
@@ -292,7 +353,11 @@ def _rp66v1_tif_general(by: bytes, tif_next: int) -> int:
 def _rp66v1_tif(fobj: typing.BinaryIO) -> int:
     """RP66V1 with TIF markers correctly written (little endian)."""
     fobj.seek(0)
-    by = fobj.read(RP66V1_LEN_WITH_TIFF)
+    return _rp66v1_tif_bytes(fobj.read(RP66V1_LEN_WITH_TIFF))
+
+
+def _rp66v1_tif_bytes(by: bytes) -> int:
+    """RP66V1 with TIF markers correctly written (little endian)."""
     if len(by) < RP66V1_LEN_WITH_TIFF:
         return -1
     # TIF next, little endian
@@ -305,7 +370,11 @@ def _rp66v1_tif(fobj: typing.BinaryIO) -> int:
 def _rp66v1_tif_r(fobj: typing.BinaryIO) -> int:
     """RP66V1 with TIF markers reversed (big endian)."""
     fobj.seek(0)
-    by = fobj.read(RP66V1_LEN_WITH_TIFF)
+    return _rp66v1_tif_r_bytes(fobj.read(RP66V1_LEN_WITH_TIFF))
+
+
+def _rp66v1_tif_r_bytes(by: bytes) -> int:
+    """RP66V1 with TIF markers reversed (big endian)."""
     if len(by) < RP66V1_LEN_WITH_TIFF:
         return -1
     # TIF next, big endian
@@ -318,7 +387,10 @@ def _rp66v1_tif_r(fobj: typing.BinaryIO) -> int:
 
 def _rp66v2(fobj: typing.BinaryIO) -> int:
     fobj.seek(0)
-    by = fobj.read(128)
+    return _rp66v2_bytes(fobj.read(128))
+
+
+def _rp66v2_bytes(by: bytes) -> int:
     if len(by) < 128:
         return -1
     # TODO: Test this
@@ -350,7 +422,11 @@ def _ascii(fobj: typing.BinaryIO) -> int:
     """Returns 0 if all the bytes are ASCII characters 0 to 127, non-zero otherwise.
     """
     fobj.seek(0)
-    if set(fobj.read(256)).issubset(ASCII_BYTES_LOWER_128):#ASCII_PRINTABLE_BYTES):
+    return _ascii_bytes(fobj.read(256))
+
+
+def _ascii_bytes(by: bytes) -> int:
+    if set(by[:256]).issubset(ASCII_BYTES_LOWER_128):#ASCII_PRINTABLE_BYTES):
         return 0
     return 1
 
@@ -363,7 +439,11 @@ def _zip(fobj: typing.BinaryIO) -> int:
     Do not support empty (b'\x50\x4b\x05\x06') or spanned (b'\x50\x4b\x07\x08') files.
     """
     fobj.seek(0)
-    if fobj.read(4) == b'\x50\x4b\x03\x04':
+    return _zip_bytes(fobj.read(4))
+
+
+def _zip_bytes(by: bytes) -> int:
+    if by[:4] == b'\x50\x4b\x03\x04':
         return 0
     return 1
 
@@ -374,7 +454,11 @@ def _pdf(fobj: typing.BinaryIO) -> int:
     Five bytes have to be right so 2^40
     """
     fobj.seek(0)
-    if fobj.read(5) == b'%PDF-':
+    return _pdf_bytes(fobj.read(5))
+
+
+def _pdf_bytes(by: bytes) -> int:
+    if by[:5] == b'%PDF-':
         return 0
     return 1
 
@@ -384,7 +468,11 @@ def _ps(fobj: typing.BinaryIO) -> int:
     Five bytes have to be right so 2^40
     """
     fobj.seek(0)
-    if fobj.read(5) == b'%!Ps-':
+    return _ps_bytes(fobj.read(5))
+
+
+def _ps_bytes(by: bytes) -> int:
+    if by[:5] == b'%!Ps-':
         return 0
     return 1
 
@@ -395,8 +483,12 @@ def _tiff(fobj: typing.BinaryIO) -> int:
     Four bytes have to be right so 2^32
     """
     fobj.seek(0)
+    return _tiff_bytes(fobj.read(4))
+
+
+def _tiff_bytes(by: bytes) -> int:
     # 4949 2a00 3d00 0000 3e3e 205f 6766 665f 6669 II*.=...>> _gff_fi
-    if fobj.read(4) == b'II*\x00':
+    if by[:4] == b'II*\x00':
         return 0
     return 1
 
@@ -405,7 +497,11 @@ def _xml(fobj: typing.BinaryIO) -> int:
     """Returns 0 if the file is a XML file, non-zero otherwise.
     """
     fobj.seek(0)
-    if fobj.read(6) == b'<?xml ':
+    return _xml_bytes(fobj.read(6))
+
+
+def _xml_bytes(by: bytes) -> int:
+    if by[:6] == b'<?xml ':
         return 0
     return 1
 
@@ -420,6 +516,7 @@ EBCDIC_PRINTABLE = set(
     b'\xe2\xe3\xe4\xe5\xe6\xe7\xe8\xe9'  # S-Z
     b'\xf0\xf1\xf2\xf3\xf4\xf5\xf6\xf7\xf8\xf9'  # 0-9
 )
+SEGY_LEN_REQUIRED_BYTES = 3200
 
 
 def _segy(fobj: typing.BinaryIO) -> int:
@@ -427,10 +524,12 @@ def _segy(fobj: typing.BinaryIO) -> int:
     EBCDIC charcters used. Reference: https://en.wikipedia.org/wiki/EBCDIC
     """
     fobj.seek(0)
-    for i in range(3200):
-        by = fobj.read(1)
-        if len(by) != 1 or by[0] not in EBCDIC_PRINTABLE:
-            return 1
+    return _segy_bytes(fobj.read(SEGY_LEN_REQUIRED_BYTES))
+
+
+def _segy_bytes(by: bytes) -> int:
+    if len(by) < SEGY_LEN_REQUIRED_BYTES or not EBCDIC_PRINTABLE.issuperset(by[:SEGY_LEN_REQUIRED_BYTES]):
+        return 1
     return 0
 
 
@@ -458,6 +557,34 @@ FUNCTION_ID_MAP: typing.Tuple[typing.Tuple[typing.Callable, str], ...] = (
 BINARY_FILE_TYPE_CODE_WIDTH: int = max(len(v[1]) for v in FUNCTION_ID_MAP)
 BINARY_FILE_TYPES_SUPPORTED: typing.Set[str] = {v[1] for v in FUNCTION_ID_MAP}
 
+# The same tests, in the same order, on the initial bytes of the file.
+# These can return RESULT_NEEDS_MORE_BYTES in which case the test in FUNCTION_ID_MAP is used on the file.
+BYTES_FUNCTION_ID_MAP: typing.Tuple[typing.Tuple[typing.Callable, str], ...] = (
+    (_xml_bytes, 'XML'),
+    (_pdf_bytes, 'PDF'),
+    (_ps_bytes, 'PS'),
+    (_zip_bytes, 'ZIP'),
+    (_tiff_bytes, 'TIFF'),
+    (_segy_bytes, 'SEGY'),
+    (_lis_tif_bytes, 'LISt'),
+    (_lis_tif_r_bytes, 'LIStr'),
+    (_lasv12_bytes, 'LAS1.2'),
+    (_lasv20_bytes, 'LAS2.0'),
+    (_lasv30_bytes, 'LAS3.0'),
+    (_rp66v1_bytes, 'RP66V1'),
+    (_rp66v1_tif_bytes, 'RP66V1t'),
+    (_rp66v1_tif_r_bytes, 'RP66V1tr'),
+    (_rp66v2_bytes, 'RP66V2'),
+    (_ascii_bytes, 'ASCII'),
+    (_lis_bytes, 'LIS'),
+)
+assert [v[1] for v in BYTES_FUNCTION_ID_MAP] == [v[1] for v in FUNCTION_ID_MAP]
+FUNCTION_MAP: typing.Dict[str, typing.Callable] = {v[1]: v[0] for v in FUNCTION_ID_MAP}
+#: The number of initial bytes that decides every test except, rarely, LAS. This is more than any fixed size test
+#: needs, the largest being SEGY.
+HEAD_LEN_REQUIRED_BYTES = 4096
+assert HEAD_LEN_REQUIRED_BYTES >= SEGY_LEN_REQUIRED_BYTES
+
 
 # TODO: Allow more generic cases such as 'LAS', 'RP66" ?
 
@@ -496,16 +623,30 @@ def summary_file_types_supported(short: bool) -> str:
     return '\n'.join(lst)
 
 
+def binary_file_type_from_head(head: bytes, fobj: typing.Optional[typing.BinaryIO] = None) -> str:
+    """Returns a file type based on the analysis of the initial bytes of the file. head must be at least
+    HEAD_LEN_REQUIRED_BYTES long or the whole of the file.
+    If the head is not enough to decide a test then that test is made on fobj, this is rare and only happens with LAS
+    files that have very long comments or lines. If fobj is None that test fails.
+    On return fobj will be in an indeterminate state.
+    """
+    for fn, typ in BYTES_FUNCTION_ID_MAP:
+        result = fn(head)
+        if result == RESULT_NEEDS_MORE_BYTES and fobj is not None:
+            result = FUNCTION_MAP[typ](fobj)
+        if result == 0:
+            return typ
+    return ''
+
+
 def binary_file_type(fobj: typing.BinaryIO) -> str:
     """Function that takes a file object that supports read() and seek() and returns a file type based on the
     analysis of the contents of the file.
+    This reads the initial HEAD_LEN_REQUIRED_BYTES bytes of the file once and, almost always, only those.
     On success fobj will be at the start of file. On failure fobj will be in an indeterminate state.
     """
-    result = ''
-    for fn, typ in FUNCTION_ID_MAP:
-        if fn(fobj) == 0:
-            result = typ
-            break
+    fobj.seek(0)
+    result = binary_file_type_from_head(fobj.read(HEAD_LEN_REQUIRED_BYTES), fobj)
     fobj.seek(0)
     return result
 
@@ -515,6 +656,44 @@ def binary_file_type_from_path(path: str) -> str:
         return binary_file_type(file_object)
 
 
+class FileClassification(typing.NamedTuple):
+    """The result of classifying a file, bin_type is '' if the file type is not known or the file can not be
+    read."""
+    path: str
+    size: int
+    bin_type: str
+    head: bytes
+
+
+def classify_path(path: str, num_bytes: int = 32) -> FileClassification:
+    """Returns the FileClassification of the file at path with the first num_bytes of the file.
+    This opens the file once and reads the initial HEAD_LEN_REQUIRED_BYTES bytes, almost always only those."""
+    with open(path, 'rb') as file_object:
+        size = os.fstat(file_object.fileno()).st_size
+        head = file_object.read(max(HEAD_LEN_REQUIRED_BYTES, num_bytes))
+        return FileClassification(path, size, binary_file_type_from_head(head, file_object), head[:num_bytes])
+
+
+def _classify_path_or_log(path: str, num_bytes: int) -> FileClassification:
+    try:
+        return classify_path(path, num_bytes)
+    except OSError as err:
+        logger.error(f'Can not classify {path}: {err}')
+        return FileClassification(path, 0, '', b'')
+
+
+def classify_paths(paths: typing.Iterable[str], jobs: int = 0,
+                   num_bytes: int = 32) -> typing.List[FileClassification]:
+    """Returns a list of FileClassification for each path in the same order as paths.
+    This is I/O bound so uses a pool of jobs threads, if jobs < 1 the thread pool default is used, if jobs is 1 the
+    paths are classified sequentially.
+    A file that can not be read is logged and has a size of 0, bin_type of '' and no head bytes."""
+    if jobs == 1:
+        return [_classify_path_or_log(path, num_bytes) for path in paths]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs if jobs > 0 else None) as executor:
+        return list(executor.map(lambda path: _classify_path_or_log(path, num_bytes), paths))
+
+
 def xxd(by: bytes) -> str:
     """Returns an xxd style string of the bytes. For example:
     0084 8000 8400 2647 3546 3239 2020 2020 2020 ......&G5F29     """
@@ -236,6 +236,8 @@ import math
 #import numbers
 import collections
 
+import numpy
+
 from TotalDepth.LIS import ExceptionTotalDepthLIS
 from TotalDepth.LIS.core import LogiRec
 from TotalDepth.LIS.core import Mnem
@@ -479,6 +481,23 @@ class LineTransBase(object):
             return 1
         return 0
 
+    def offScaleArray(self, w):
+        """As offScale() but for a numpy array of wrap values, returns an integer numpy array."""
+        retVal = numpy.zeros(len(w), dtype=numpy.int8)
+        if self._bu[1]:
+            retVal[(w > 0) & (w > self._bu[1])] = 1
+        if self._bu[0]:
+            retVal[(w < 0) & (w < self._bu[0])] = -1
+        return retVal
+
+    def wrapPosArray(self, vals):
+        """As wrapPos() but for a numpy array of values. Returns a tuple of
+        three numpy arrays (wrap, pos, valid). wrap is the integer wrap as a
+        float, valid is a boolean array that is False where wrapPos() would
+        have raised an ExceptionLineTransBaseMath, wrap and pos are undefined
+        at those positions."""
+        raise NotImplementedError()
+
     def isOffScaleLeft(self, w):
         """True is wrap integer is off-scale low according to the backup setting."""
         return self.offScale(w) == -1
@@ -516,6 +535,13 @@ class LineTransLin(LineTransBase):
         f = self._lP + (p - w) * self._pWidth
         return w, f
 
+    def wrapPosArray(self, vals):
+        """As wrapPos() but for a numpy array of values, see LineTransBase.wrapPosArray()."""
+        p = (vals - self._lL) / self._den
+        w = numpy.floor(p)
+        f = self._lP + (p - w) * self._pWidth
+        return w, f, numpy.ones(len(vals), dtype=bool)
+
 class LineTransLog10(LineTransBase):
     """Logrithmic grid."""
     def __init__(self, leftP, rightP, leftL, rightR, backup=BACKUP_ALL):
@@ -549,6 +575,18 @@ class LineTransLog10(LineTransBase):
         w = math.floor(p)
         r = self._lP + (p - w) * self._pWidth
         return w, r
+
+    def wrapPosArray(self, vals):
+        """As wrapPos() but for a numpy array of values, see LineTransBase.wrapPosArray().
+        NOTE: This uses math.log10() rather than numpy.log10() so that the
+        results are identical to wrapPos()."""
+        valid = vals > 0.0
+        p = numpy.zeros(len(vals), dtype=numpy.float64)
+        q = vals[valid] / self._lL
+        p[valid] = numpy.fromiter(map(math.log10, q.tolist()), dtype=numpy.float64, count=len(q)) / self._den
+        w = numpy.floor(p)
+        r = self._lP + (p - w) * self._pWidth
+        return w, r, valid
 #===============================
 # Section: Line transformations.
 #===============================
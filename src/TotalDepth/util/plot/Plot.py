@@ -118,9 +118,12 @@ import os
 import logging
 import collections
 import pprint
+import numbers
 #import math
 #from optparse import OptionParser
 
+import numpy
+
 from TotalDepth.LIS import ExceptionTotalDepthLIS
 from TotalDepth.LIS.core import EngVal
 from TotalDepth.LIS.core import Units
@@ -138,6 +141,8 @@ from TotalDepth.util.plot import LogHeader
 
 #: Allows detailed trace comments to appear in the SVG
 COMMENTS_IN_SVG_TRACE = False
+#: Plot curves from whole numpy columns where the frame holder supports it, see Plot._plotSingleOutputArrays()
+VECTORISE_CURVE_PLOTS = True
 #: A few comments in SVG to delinialte header, Grid, Xaxis, curves etc
 COMMENTS_IN_SVG_SECTION = True
 #: Width of comment for sections
@@ -556,7 +561,7 @@ class Plot(object):
     #: See the source of ``_filterCrossLineList()`` for an explanation.
     MAX_BACKUP_TRACK_CROSSING_LINES = 4
     
-    def __init__(self, theFilmCfg, thePresCfg, theScale=0):
+    def __init__(self, theFilmCfg, thePresCfg, theScale=0, theDpi=0):
         # A FILMCfg.FilmCfg() object
         self._filmCfg = theFilmCfg
         # A PRESCfg.PresCfg() object
@@ -570,6 +575,16 @@ class Plot(object):
         if self._scale < 0:
             raise ExceptionTotalDepthLISPlot(
                 'Plot.__init__(): Scale override {:g} is < 0'.format(self._scale))
+        # Curves are decimated to the minimum/maximum in each pixel at this
+        # resolution in dots per inch, if zero every point is plotted.
+        self._dpi = theDpi
+        if not isinstance(theDpi, (int, float)):
+            raise ExceptionTotalDepthLISPlot(
+                'Plot.__init__(): DPI of type {!r:s} is not'
+                ' a number.'.format(type(self._dpi)))
+        if self._dpi < 0:
+            raise ExceptionTotalDepthLISPlot(
+                'Plot.__init__(): DPI {:g} is < 0'.format(self._dpi))
                 
     def xScale(self, theFilmID):
         """Returns the X axis scale as a number given the FILM ID."""
@@ -962,6 +977,11 @@ class Plot(object):
         # Will raise KeyError if not self._presCfg.hasCurvesForDest(myPhsFiCf.name):
         return self._presCfg.outpChIDs(myPhsFiCf.name)
     
+    def outputChIDsLIS(self, theLogPass, theFilmId):
+        """Returns a list of output mnem that are needed for plotting and are
+        present in the LogPass. May raise KeyError."""
+        return [m for m in self._retOutputChIDs(theFilmId) if theLogPass.hasOutpMnem(m)]
+    
 #    def _outpCurveIDs(self, theFilmId, theOutpId):
 #        # Get the PhysFilmCfg that corresponds to theFilmId, may raise KeyError.
 #        myPhsFiCf = self._filmCfg[theFilmId]
@@ -972,10 +992,15 @@ class Plot(object):
         """Loads the LogPass FrameSet with the output channels that are needed for the plot.
         theLisFile is a File object, theLogPass is a LogPass, theXStart/Stop are
         EngVal objects, theFilmId is a Mnem.
-        Returns number of LIS bytes read."""
+        If the FrameSet already holds these channels, for example when the union
+        of channels for several plots has been loaded, it is not reloaded.
+        Returns number of LIS bytes read, this is zero if the FrameSet was not reloaded."""
+        myChIdS = self.outputChIDsLIS(theLogPass, theFilmId)
+        if theLogPass.hasFrameSetChX(myChIdS, theXStart, theXStop, frStep=frameStep):
+            logging.info('Plot._loadFrameSet(): LogPass FrameSet already loaded.')
+            return 0
         # Load the FrameSet
         logging.info('Plot._loadFrameSet(): Loading LogPass FrameSet...')
-        myChIdS = [m for m in self._retOutputChIDs(theFilmId) if theLogPass.hasOutpMnem(m)]
         logging.info('Plot._loadFrameSet(): X axis from="{:s}" to="{:s}" frame step={:d}. Channel IDs[{:d}]:\n{:s}'.format(
                 str(theXStart),
                 str(theXStop),
@@ -1299,7 +1324,7 @@ class Plot(object):
             self._insertCommentInSVG(xS, ' Output {:s} START '.format(anO.pStr()), 1)
             if self._presCfg.usesOutpChannel(theFilmID, anO):
                 if theFrameHolder.hasOutpMnem(anO):
-                    c, n = self._plotSingleOutput(theFilmID, anO, theFrameHolder, thePlRo, xS)
+                    c, n = self._plotSingleOutputArrays(theFilmID, anO, theFrameHolder, thePlRo, xS)
                     curveS += c
                     numPoints += n
                 else:
@@ -1381,9 +1406,160 @@ class Plot(object):
                                                                                                         theOutpID))
         return myCurvIdS, numPoints
     
+    def _plotSingleOutputArrays(self, theFilmID, theOutpID, theFrameHolder, thePlRo, xS):
+        """As _plotSingleOutput() but takes the X axis and values as numpy
+        columns from theFrameHolder.outpPointArrays() and computes the wrap,
+        track positions and polyline points for each curve in one go. The SVG
+        written is identical to that of _plotSingleOutput().
+        This falls back to _plotSingleOutput() if VECTORISE_CURVE_PLOTS is False,
+        COMMENTS_IN_SVG_TRACE is True, theFrameHolder can not supply the columns
+        or any of the values are not finite.
+        """
+        myArrays = None
+        if VECTORISE_CURVE_PLOTS and not COMMENTS_IN_SVG_TRACE and hasattr(theFrameHolder, 'outpPointArrays'):
+            myArrays = theFrameHolder.outpPointArrays(theOutpID)
+        if myArrays is None:
+            return self._plotSingleOutput(theFilmID, theOutpID, theFrameHolder, thePlRo, xS)
+        xArr, vArr = myArrays
+        if isinstance(theFrameHolder.nullValue, numbers.Real):
+            isNull = vArr == theFrameHolder.nullValue
+        else:
+            isNull = numpy.zeros(len(vArr), dtype=bool)
+        # Indexes into the columns of the non-null values
+        nnIdx = numpy.flatnonzero(~isNull)
+        nnVals = vArr[nnIdx]
+        if not numpy.all(numpy.isfinite(nnVals)):
+            logging.debug('Plot._plotSingleOutputArrays(): non-finite values in {!r:s}, plotting point by point.'.format(theOutpID))
+            return self._plotSingleOutput(theFilmID, theOutpID, theFrameHolder, thePlRo, xS)
+        logging.info('Plot._plotSingleOutputArrays(theFilmId={!r:s} theOutpId={!r:s}'.format(theFilmID, theOutpID))
+        assert(self._presCfg.usesOutpChannel(theFilmID, theOutpID))
+        myCurvIdS = self._presCfg.outpCurveIDs(theFilmID, theOutpID)
+        myCurvPlotS = [CurvePlotData(c, self._presCfg[c].tracValueFunction(theFilmID)) for c in myCurvIdS]
+        logging.debug('Plot._plotSingleOutputArrays: myCurvPlotS: {!r:s}'.format([str(c) for c in myCurvPlotS]))
+        numPoints = len(nnIdx) * len(myCurvIdS)
+        numMathErrors = 0
+        # Each polyline is flushed at the start of a run of null values
+        nullStartS = numpy.flatnonzero(isNull[1:] & ~isNull[:-1]) + 1
+        if len(isNull) and isNull[0]:
+            nullStartS = numpy.concatenate(([0], nullStartS))
+        # Per curve: column index, wrap and position of each valid value then
+        # the index of each on scale value and its point.
+        myColS = []
+        myWrapS = []
+        myPosS = []
+        myOnIdxS = []
+        myPtS = []
+        # Events in plot order as (column index, curve index, valid value index),
+        # curve index is -1 for the start of a null run
+        myEventS = [(int(s), -1, 0) for s in nullStartS]
+        for cuIdx, cuPlot in enumerate(myCurvPlotS):
+            w, p, valid = cuPlot.fn.wrapPosArray(nnVals)
+            validIdx = numpy.flatnonzero(valid)
+            numMathErrors += len(nnVals) - len(validIdx)
+            myColS.append(nnIdx[validIdx])
+            myWrapS.append(w[validIdx])
+            myPosS.append(p[validIdx])
+            onIdx = numpy.flatnonzero(cuPlot.fn.offScaleArray(myWrapS[-1]) == 0)
+            myOnIdxS.append(onIdx)
+            myPtS.append(
+                thePlRo.polyLinePt(
+                    EngVal.EngVal(xArr[myColS[-1][onIdx]], theFrameHolder.xAxisUnits),
+                    myPosS[-1][onIdx],
+                )
+            )
+            # Changes of wrap between consecutive valid values
+            for k in (numpy.flatnonzero(myWrapS[-1][1:] != myWrapS[-1][:-1]) + 1).tolist():
+                myEventS.append((int(myColS[-1][k]), cuIdx, k))
+        myEventS.sort()
+        # Index of the next valid value to add to each curve buffer
+        myNextS = [0] * len(myCurvPlotS)
+        for col, cuIdx, k in myEventS:
+            if cuIdx == -1:
+                for c, cuPlot in enumerate(myCurvPlotS):
+                    kStop = int(numpy.searchsorted(myColS[c], col))
+                    self._appendPointArrays(cuPlot, myOnIdxS[c], myPtS[c], myNextS[c], kStop)
+                    myNextS[c] = kStop
+                    self._flushPolyLineBuffer(cuPlot, xS)
+            else:
+                cuPlot = myCurvPlotS[cuIdx]
+                self._appendPointArrays(cuPlot, myOnIdxS[cuIdx], myPtS[cuIdx], myNextS[cuIdx], k)
+                myNextS[cuIdx] = k
+                cuPlot.prevWrap = int(myWrapS[cuIdx][k-1])
+                # X of the previous non-null value
+                xPrev = float(xArr[nnIdx[numpy.searchsorted(nnIdx, col) - 1]])
+                self._interpolateBackup(
+                    cuPlot,
+                    xS,
+                    thePlRo,
+                    # theTwd and theLtb
+                    self._presCfg[cuPlot.id].tracWidthData(theFilmID),
+                    self._presCfg[cuPlot.id].tracValueFunction(theFilmID),
+                    xPrev,
+                    float(xArr[col]),
+                    float(myPosS[cuIdx][k]),
+                    cuPlot.prevWrap,
+                    int(myWrapS[cuIdx][k]),
+                    theFrameHolder.xAxisUnits,
+                )
+        logging.info('DONE: Plot._plotSingleOutputArrays(theFilmId={!r:s} theOutpId={!r:s}'.format(theFilmID, theOutpID))
+        for c, cuPlot in enumerate(myCurvPlotS):
+            self._appendPointArrays(cuPlot, myOnIdxS[c], myPtS[c], myNextS[c], len(myColS[c]))
+            if len(myWrapS[c]):
+                cuPlot.prevWrap = int(myWrapS[c][-1])
+            self._flushPolyLineBuffer(cuPlot, xS)
+        if numMathErrors > 0:
+            logging.warning('Plot._plotSingleOutputArrays(): {:d} maths errors plotting output {!r:s}'.format(
+                numMathErrors, theOutpID))
+        return myCurvIdS, numPoints
+    
+    def _appendPointArrays(self, theCurvPlotData, theOnIdx, thePts, theStart, theStop):
+        """Appends to the curve buffer, as a single Coord.Pt() of numpy arrays,
+        the points of the on scale values from valid value index theStart to theStop.
+        thePts is a Coord.Pt() of numpy arrays of all the on scale values."""
+        iStart = numpy.searchsorted(theOnIdx, theStart)
+        iStop = numpy.searchsorted(theOnIdx, theStop)
+        if iStop > iStart:
+            theCurvPlotData.buffer.append(
+                Coord.Pt(
+                    Coord.Dim(thePts.x.value[iStart:iStop], thePts.x.units),
+                    Coord.Dim(thePts.y.value[iStart:iStop], thePts.y.units),
+                )
+            )
+    
+    def _retDecimatedIndexes(self, theTracS, theDepthS):
+        """Given numpy arrays of the track and depth positions of a polyline in
+        view box units this returns a numpy array of the indexes of the points
+        to plot at self._dpi. For every run of points that fall on the same
+        pixel in the depth direction this keeps the first and last points and
+        those with the minimum and maximum track position. All indexes are
+        returned if self._dpi is zero."""
+        numPts = len(theDepthS)
+        if self._dpi == 0 or numPts <= 4:
+            return numpy.arange(numPts)
+        myPixelS = numpy.floor(theDepthS * (self._dpi / PlotConstants.VIEW_BOX_UNITS_PER_PLOT_UNITS))
+        myStartS = numpy.flatnonzero(myPixelS[1:] != myPixelS[:-1]) + 1
+        myStartS = numpy.concatenate(([0], myStartS))
+        myLengthS = numpy.diff(numpy.append(myStartS, numPts))
+        myStopS = myStartS + myLengthS - 1
+        # Sort by run then track position so the minimum and maximum of each
+        # run are at its start and stop.
+        myOrder = numpy.lexsort((theTracS, numpy.repeat(numpy.arange(len(myStartS)), myLengthS)))
+        return numpy.unique(numpy.concatenate((myStartS, myStopS, myOrder[myStartS], myOrder[myStopS])))
+    
     def _flushPolyLineBuffer(self, theCurvPlotData, xS):
-        """Flush buffer and plot the points."""
+        """Flush buffer and plot the points.
+        Members of the buffer are Coord.Pt() of numbers or, from
+        _appendPointArrays(), of numpy arrays. The points are decimated if
+        self._dpi is non-zero."""
         if len(theCurvPlotData.buffer) > 0:
+            if self._dpi or any(isinstance(p.x.value, numpy.ndarray) for p in theCurvPlotData.buffer):
+                myXs = numpy.concatenate([numpy.atleast_1d(p.x.value) for p in theCurvPlotData.buffer])
+                myYs = numpy.concatenate([numpy.atleast_1d(p.y.value) for p in theCurvPlotData.buffer])
+                if self._dpi:
+                    myIdx = self._retDecimatedIndexes(myXs, myYs)
+                    myXs = myXs[myIdx]
+                    myYs = myYs[myIdx]
+                theCurvPlotData.buffer = [SVGWriter.pointArraysToTxt(myXs, myYs)]
             if COMMENTS_IN_SVG_TRACE: xS.comment(' Plot._flushPolyLineBuffer() curve={:s}'.format(theCurvPlotData.id.pStr()))
             myAttrs = Stroke.retSVGAttrsFromStroke(self._presCfg[theCurvPlotData.id].codiStroke)
             myAttrs['fill'] = "none"
@@ -1616,14 +1792,14 @@ class Plot(object):
 
 class PlotReadLIS(Plot):
     """A subclass of Plot that is configured from FILM, PRES and (optionally) AREA, PIP Logical Records."""
-    def __init__(self, lrFILM, lrPRES, lrAREA=None, lrPIP=None, theScale=0):
+    def __init__(self, lrFILM, lrPRES, lrAREA=None, lrPIP=None, theScale=0, theDpi=0):
         myFilmCfg = FILMCfg.FilmCfgLISRead(lrFILM)
         myPresCfg = PRESCfg.PresCfgLISRead(lrPRES, myFilmCfg)
-        super().__init__(myFilmCfg, myPresCfg, theScale)
+        super().__init__(myFilmCfg, myPresCfg, theScale, theDpi)
 
 class PlotReadXML(Plot):
     """A subclass of Plot that is configured from XML file(s) using LgFormat."""
-    def __init__(self, uniqueId, theScale=0):
+    def __init__(self, uniqueId, theScale=0, theDpi=0):
         myFilmCfg = FILMCfgXML.FilmCfgXMLRead()
         myPresCfg = PRESCfgXML.PresCfgXMLRead(myFilmCfg, uniqueId)
-        super().__init__(myFilmCfg, myPresCfg, theScale)
+        super().__init__(myFilmCfg, myPresCfg, theScale, theDpi)
@@ -45,6 +45,24 @@ def dimToTxt(theDim):
 #    return '%s%s' % (theDim.value, theDim.units)
     return (DEFAULT_VALUE_FORMAT+'{:s}').format(theDim.value, theDim.units)
 
+#: Format of a single x,y pair in a points attribute
+DEFAULT_VALUE_FORMAT_POINT_PAIR = DEFAULT_VALUE_FORMAT_POINTS + ',' + DEFAULT_VALUE_FORMAT_POINTS
+
+def pointsToTxt(pointS):
+    """Converts a list of Coord.Pt() objects to text for a SVG points attribute.
+    Members of the list may also be strings of points that have already been
+    formatted, for example by pointArraysToTxt()."""
+    return ' '.join(
+        [
+            p if isinstance(p, str) else DEFAULT_VALUE_FORMAT_POINT_PAIR.format(p.x.value, p.y.value) for p in pointS
+        ]
+    )
+
+def pointArraysToTxt(theXs, theYs):
+    """Converts numpy arrays of x and y values to text for a SVG points attribute.
+    The result is identical to pointsToTxt() with the equivalent Coord.Pt() objects."""
+    return ' '.join(map(DEFAULT_VALUE_FORMAT_POINT_PAIR.format, theXs.tolist(), theYs.tolist()))
+
 class SVGWriter(XmlWrite.XmlStream):
     def __init__(self, theFile, theViewPort, rootAttrs=None):
         """Initialise the stream with a file and Coord.Box() object.
@@ -173,27 +191,17 @@ class SVGPointList(XmlWrite.Element):
     NOTE: The units of the points are ignored, it is up to the caller to convert
     them to the User Coordinate System.
     
-    TODO: Make the caller supply points as numbers not Coord.Pt as this may be faster??? e.g.::
-    
-        FMT_PAIR_STR = FMT_STR + ',' + FMT_STR
-        ' '.join([self.FMT_PAIR_STR.format(x, y) for x,y in pointS])
+    Members of the list can also be strings of points already formatted by
+    pointArraysToTxt(), this is much faster for large numbers of points.
     """
     def __init__(self, theXmlStream, name, pointS, attrs):
         """Initialise the element with a stream, a name, and a list of Coord.Pt() objects.
         NOTE: The units of the points are ignored, it is up to the caller to convert
         them to the User Coordinate System.
-        TODO: Make the caller supply points as numbers not Coord.Pt as this may be faster???
-        e.g.
-        FMT_PAIR_STR = FMT_STR + ',' + FMT_STR
-        ' '.join([self.FMT_PAIR_STR.format(x, y) for x,y in pointS])
-        """
+        Members of pointS can also be strings of pre-formatted points, see pointArraysToTxt()."""
         _attrs = {
 #            'points' : ' '.join(['%s,%s' % (p.x.value, p.y.value) for p in pointS])
-            'points' : ' '.join(
-                [
-                    (DEFAULT_VALUE_FORMAT_POINTS+','+DEFAULT_VALUE_FORMAT_POINTS).format(p.x.value, p.y.value) for p in pointS
-                ]
-            )
+            'points' : pointsToTxt(pointS)
         }
         if attrs:
             _attrs.update(attrs)
@@ -288,6 +288,36 @@ def test_tdrp66v1indexpickle_gnuplot(tmpdir):
 # -------- END: tdrp66v1indexpickle --------
 
 
+# -------- tdrp66v1indexbinary --------
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    'args',
+    (
+        [],
+        ['-v'],
+        ['--log-process=1.0'],
+    )
+)
+def test_tdrp66v1indexbinary_file_stdout(args):
+    subprocess.check_call(['tdrp66v1indexbinary',] + args + [RP66V1_BASIC_FILE])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    'args',
+    (
+        ['-r'],
+        ['-r', '-j 2'],
+        ['-r', '--read-back'],
+        ['-r', '--incremental'],
+    )
+)
+def test_tdrp66v1indexbinary_dir(tmpdir, args):
+    subprocess.check_call(['tdrp66v1indexbinary',] + args + [EXAMPLE_DATA_DIRECTORY, str(tmpdir)])
+
+# -------- END: tdrp66v1indexbinary --------
+
+
 # -------- tdrp66v1indexxml --------
 @pytest.mark.slow
 @pytest.mark.parametrize(
@@ -1110,6 +1110,81 @@ def test_ExplicitlyFormattedLogicalRecord_table_as_string(sort_order, expected):
     assert result == expected
 
 
+def test_ExplicitlyFormattedLogicalRecord_objects_are_lazy():
+    ld = LogicalData(LOGICAL_BYTES_FROM_STANDARD)
+    eflr = EFLR.ExplicitlyFormattedLogicalRecord(3, ld)
+    assert isinstance(eflr.objects, EFLR.ObjectSequence)
+    assert eflr.objects.num_decoded == 0
+    assert len(eflr) == 3
+    assert EFLR.reduced_object_map(eflr) == {b'TIME': 0, b'PRESSURE': 1, b'PAD-ARRAY': 2}
+    assert eflr.objects.num_decoded == 0
+    obj = eflr[ObjectName(1, 0, b'PRESSURE')]
+    assert obj.name == ObjectName(1, 0, b'PRESSURE')
+    assert eflr.objects.num_decoded == 1
+    # Cached
+    assert eflr[1] is obj
+    assert eflr.objects[-2] is obj
+    assert eflr.objects.num_decoded == 1
+    assert [o.name.I for o in eflr.objects[1:]] == [b'PRESSURE', b'PAD-ARRAY']
+    assert eflr.objects.num_decoded == 2
+
+
+@pytest.mark.parametrize(
+    'by',
+    (LOGICAL_BYTES_FROM_STANDARD, LOGICAL_BYTES_FROM_STANDARD_SINGLE_OBJECT),
+)
+def test_ExplicitlyFormattedLogicalRecord_objects_same_as_sequential_read(by):
+    ld = LogicalData(by)
+    eflr = EFLR.ExplicitlyFormattedLogicalRecord(3, ld)
+    ld.rewind()
+    EFLR.Set(ld)
+    template = EFLR.Template()
+    template.read(ld)
+    expected = []
+    while ld:
+        expected.append(EFLR.Object(ld, template))
+    assert list(eflr.objects) == expected
+    assert eflr.object_name_map == {obj.name: i for i, obj in enumerate(expected)}
+
+
+def test_ExplicitlyFormattedLogicalRecord_dupe_replace_object_name_map():
+    ld = LOGICAL_DATA_WITH_DIFFERENT_DUPLICATE
+    ld.rewind()
+    eflr = EFLR.ExplicitlyFormattedLogicalRecord(3, ld)
+    assert eflr.object_name_map == {ObjectName(0, 0, b'TIME'): 0}
+    assert eflr[ObjectName(0, 0, b'TIME')][b'UNITS'].value == [b'SECONDS']
+
+
+@pytest.mark.parametrize(
+    'by, exception, expected',
+    (
+        # Remove the last byte of the last value.
+        (
+            LOGICAL_BYTES_FROM_STANDARD[:-1],
+            EFLR.ExceptionEFLRAttribute,
+            'Attribute overruns the Logical Data of length 154 at index 154.',
+        ),
+        # Template is FSINGL, object has a count of two values but the data has one.
+        (
+            b'\xf0\x07CHANNEL' + b'\x34\x05VALUE\x02' + b'\x70\x00\x00\x01A' + b'\x29\x02' + b'\x00' * 4,
+            EFLR.ExceptionEFLRObject,
+            "Object OBNAME: O: 0 C: 0 I: b'A' overruns the Logical Data of length 28.",
+        ),
+        # As above but no values at all.
+        (
+            b'\xf0\x07CHANNEL' + b'\x34\x05VALUE\x02' + b'\x70\x00\x00\x01A' + b'\x29\x02',
+            EFLR.ExceptionEFLRAttribute,
+            'Attribute overruns the Logical Data of length 24 at index 24.',
+        ),
+    )
+)
+def test_ExplicitlyFormattedLogicalRecord_raises_overrun(by, exception, expected):
+    ld = LogicalData(by)
+    with pytest.raises(exception) as err:
+        EFLR.ExplicitlyFormattedLogicalRecord(3, ld)
+    assert err.value.args[0] == expected
+
+
 def test_ExplicitlyFormattedLogicalRecord_table_shape():
     ld = LogicalData(LOGICAL_BYTES_FROM_STANDARD)
     eflr = EFLR.ExplicitlyFormattedLogicalRecord(3, ld)
@@ -1,4 +1,5 @@
 
+import numpy as np
 import pytest
 
 from TotalDepth.RP66V1.core import File, RepCode
@@ -77,3 +78,11 @@ def test_iflr_ctor_zero_not_empty():
     assert iflr.preamble_length == 6
     assert iflr.remain == 36
     assert iflr.remain == ld.remain
+
+
+def test_iflr_frame_data_bulk():
+    offsets = np.zeros(len(IFLR_BYTES) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(by) for by in IFLR_BYTES])
+    frame_bytes, frame_offsets = IFLR.frame_data_bulk(b''.join(IFLR_BYTES), offsets)
+    assert list(frame_offsets) == [36 * i for i in range(len(IFLR_BYTES) + 1)]
+    assert frame_bytes == b''.join(by[6:] for by in IFLR_BYTES)
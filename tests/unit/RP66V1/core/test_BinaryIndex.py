@@ -0,0 +1,180 @@
+import io
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from TotalDepth.RP66V1.core import BinaryIndex, LogicalFile, RepCode
+from tests.unit.RP66V1.core import test_data
+
+
+def _write_index(tmpdir, bytes_name: str) -> str:
+    path = tmpdir.join(f'{bytes_name}.dlis')
+    path.write_binary(getattr(test_data, bytes_name), ensure=True)
+    path_index = os.path.join(tmpdir, f'{bytes_name}.idx')
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        BinaryIndex.write(logical_index, path_index)
+    return path_index
+
+
+def _summary(logical_index: LogicalFile.LogicalIndex) -> list:
+    ret = []
+    for logical_file in logical_index.logical_files:
+        ret.append(
+            (
+                [str(v.lrsh_position) for v in logical_file.eflrs],
+                [str(v.eflr) for v in logical_file.eflrs],
+                str(logical_file.channel),
+                str(logical_file.frame),
+                str(logical_file.log_pass),
+                logical_file.has_log_pass,
+                logical_file.log_pass_eflr_digests,
+                {
+                    k: (v.ident, v.long_name, v.units, [tuple(a) for a in (
+                        v.vr_position, v.lrsh_position, v.frame_number, v.x_axis)])
+                    for k, v in logical_file.iflr_position_map.items()
+                },
+            )
+        )
+    return ret
+
+
+BYTES_NAMES = ('SMALL_FILE', 'MINIMAL_FILE', 'BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS', 'BASIC_FILE', 'FILE_256kb',)
+
+
+@pytest.mark.parametrize('bytes_name', BYTES_NAMES)
+def test_binary_index_round_trip(tmpdir, bytes_name):
+    path_index = _write_index(tmpdir, bytes_name)
+    with LogicalFile.LogicalIndex(io.BytesIO(getattr(test_data, bytes_name))) as logical_index:
+        expected = _summary(logical_index)
+        expected_visible_record_positions = logical_index.visible_record_positions
+        expected_sul = logical_index.storage_unit_label.as_bytes()
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        assert _summary(logical_index) == expected
+        assert logical_index.visible_record_positions == expected_visible_record_positions
+        assert logical_index.storage_unit_label.as_bytes() == expected_sul
+        assert logical_index.id == os.path.join(tmpdir, f'{bytes_name}.dlis')
+
+
+def test_binary_index_columns(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    assert sorted(os.listdir(path_index)) == sorted(
+        [BinaryIndex.HEADER_FILE] + [f'{k}.npy' for k in BinaryIndex.COLUMNS]
+    )
+    for name, dtype in BinaryIndex.COLUMNS.items():
+        array = np.load(os.path.join(path_index, f'{name}.npy'), mmap_mode='r')
+        assert array.dtype == dtype
+    assert BinaryIndex.index_size(path_index) == sum(
+        os.path.getsize(os.path.join(path_index, v)) for v in os.listdir(path_index)
+    )
+
+
+def test_binary_index_is_lazy(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        assert isinstance(logical_file.eflrs, BinaryIndex.PositionEFLRs)
+        assert logical_file.eflrs.num_parsed == 0
+        assert logical_file.file_header_logical_record.set.type == b'FILE-HEADER'
+        assert logical_file.eflrs.num_parsed == 1
+        # Cached
+        assert logical_file.eflrs[0] is logical_file.eflrs[0]
+        assert logical_file.eflrs[-1] is logical_file.eflrs[len(logical_file.eflrs) - 1]
+        assert logical_file.eflrs.num_parsed == 2
+        assert logical_file.log_pass is logical_file.log_pass
+        assert isinstance(logical_file.iflr_position_map[RepCode.ObjectName(2, 0, b'50')].x_axis, np.memmap)
+
+
+def test_binary_index_populate_frame_array(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    with LogicalFile.LogicalIndex(io.BytesIO(test_data.BASIC_FILE)) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array)
+        expected = [channel.array.copy() for channel in frame_array.channels]
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        assert logical_file.populate_frame_array(frame_array) == 649
+        for channel, array in zip(frame_array.channels, expected):
+            assert np.array_equal(channel.array, array)
+
+
+def test_binary_index_pickle_logical_file(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        logical_file_copy = pickle.loads(pickle.dumps(logical_file))
+        assert str(logical_file_copy.log_pass) == str(logical_file.log_pass)
+        assert list(logical_file_copy.iflr_position_map) == list(logical_file.iflr_position_map)
+
+
+def test_binary_index_with_file_object(tmpdir):
+    path_index = os.path.join(tmpdir, 'BASIC_FILE.idx')
+    with LogicalFile.LogicalIndex(io.BytesIO(test_data.BASIC_FILE)) as logical_index:
+        BinaryIndex.write(logical_index, path_index)
+        expected = _summary(logical_index)
+    with BinaryIndex.LogicalIndexBinary(path_index, io.BytesIO(test_data.BASIC_FILE)) as logical_index:
+        assert _summary(logical_index) == expected
+
+
+def test_binary_index_overwrite(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    path = tmpdir.join('MINIMAL_FILE.dlis')
+    path.write_binary(test_data.MINIMAL_FILE, ensure=True)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        BinaryIndex.write(logical_index, path_index)
+    assert sorted(os.listdir(tmpdir)) == ['BASIC_FILE.dlis', 'BASIC_FILE.idx', 'MINIMAL_FILE.dlis']
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        assert logical_index.id == path.strpath
+
+
+def test_binary_index_raises_add_eflr(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    with BinaryIndex.LogicalIndexBinary(path_index) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        with pytest.raises(BinaryIndex.ExceptionBinaryIndex):
+            logical_file.add_eflr(None, logical_file.eflrs[0].eflr)
+
+
+def test_binary_index_raises_size_changed(tmpdir):
+    path_index = _write_index(tmpdir, 'BASIC_FILE')
+    with open(os.path.join(tmpdir, 'BASIC_FILE.dlis'), 'ab') as fobj:
+        fobj.write(b'\x00')
+    with pytest.raises(BinaryIndex.ExceptionBinaryIndex) as err:
+        BinaryIndex.LogicalIndexBinary(path_index)
+    assert err.value.args[0].startswith('Size of ')
+
+
+def test_binary_index_raises_not_an_index(tmpdir):
+    with pytest.raises(BinaryIndex.ExceptionBinaryIndex) as err:
+        BinaryIndex.LogicalIndexBinary(str(tmpdir))
+    assert err.value.args[0].startswith('Can not read index header in ')
+
+
+@pytest.mark.parametrize(
+    'header, expected',
+    (
+        ({'format': 'other'}, 'Not a binary index: '),
+        ([], 'Not a binary index: '),
+        ({'format': BinaryIndex.INDEX_FORMAT, 'version': 0}, 'Binary index '),
+    )
+)
+def test_binary_index_read_header_raises(tmpdir, header, expected):
+    with open(os.path.join(tmpdir, BinaryIndex.HEADER_FILE), 'w') as fobj:
+        json.dump(header, fobj)
+    with pytest.raises(BinaryIndex.ExceptionBinaryIndex) as err:
+        BinaryIndex.read_header(str(tmpdir))
+    assert err.value.args[0].startswith(expected)
+
+
+@pytest.mark.parametrize(
+    'value',
+    (None, 1, 1.5, b'', b'DEPT\xff', RepCode.ObjectName(2, 0, b'50'), RepCode.ObjectName(0, 255, b'')),
+)
+def test_value_json_round_trip(value):
+    result = BinaryIndex._value_from_json(json.loads(json.dumps(BinaryIndex._value_to_json(value))))
+    assert result == value
+    assert type(result) == type(value)
@@ -5,11 +5,13 @@ import typing
 
 import pytest
 
+from TotalDepth import DeTif
 from TotalDepth.RP66V1.core import File
 from TotalDepth.RP66V1.core import StorageUnitLabel
 
 # from . import test_data
 from tests.unit.RP66V1.core import test_data
+from tests.unit import test_DeTif
 
 
 def test_read_one_bytes():
@@ -1528,3 +1530,254 @@ def test_file_get_file_logical_data_partial_raises_on_negative_offset():
 
 
 # ==================== END: Test of FileRead ========================
+
+
+@pytest.mark.parametrize(
+    'by, read_size',
+    (
+        (getattr(test_data, name), read_size)
+        for name in (
+            'MINIMAL_FILE', 'BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS', 'BASIC_FILE', 'FILE_256kb',
+        )
+        for read_size in (1, 256, File.FileRead.BULK_READ_SIZE)
+    )
+)
+def test_file_get_logical_data_bulk(by, read_size):
+    fobj = io.BytesIO(by)
+    with File.FileRead(fobj) as file_read:
+        lrps = [v.position for v in file_read.iter_logical_record_positions()]
+        expected = [file_read.get_file_logical_data(lrp).logical_data.bytes for lrp in lrps]
+        result, offsets = file_read.get_logical_data_bulk(lrps, read_size)
+        assert len(offsets) == len(lrps) + 1
+        assert [result[offsets[i]:offsets[i + 1]] for i in range(len(lrps))] == expected
+
+
+@pytest.mark.parametrize(
+    'by, read_size, offset, length',
+    (
+        (getattr(test_data, name), read_size, offset, length)
+        for name in ('BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS', 'BASIC_FILE', 'FILE_256kb',)
+        for read_size in (1, File.FileRead.BULK_READ_SIZE)
+        for offset, length in ((0, -1), (0, 0), (3, 5), (0, 1000), (100, -1), (7, 3000), (10**6, 4))
+    )
+)
+def test_file_get_logical_data_bulk_ranges(by, read_size, offset, length):
+    fobj = io.BytesIO(by)
+    with File.FileRead(fobj) as file_read:
+        lrps = [v.position for v in file_read.iter_logical_record_positions()]
+        expected = [file_read.get_file_logical_data(lrp).logical_data.bytes for lrp in lrps]
+        if length >= 0:
+            expected = [v[offset:offset + length] for v in expected]
+        else:
+            expected = [v[offset:] for v in expected]
+        result, offsets = file_read.get_logical_data_bulk(lrps, read_size, [(offset, length)] * len(lrps))
+        assert [result[offsets[i]:offsets[i + 1]] for i in range(len(lrps))] == expected
+
+
+def test_file_get_logical_data_bulk_unordered():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with File.FileRead(fobj) as file_read:
+        lrps = [v.position for v in file_read.iter_logical_record_positions()][::-3]
+        expected = [file_read.get_file_logical_data(lrp).logical_data.bytes for lrp in lrps]
+        result, offsets = file_read.get_logical_data_bulk(lrps)
+        assert [result[offsets[i]:offsets[i + 1]] for i in range(len(lrps))] == expected
+
+
+def test_file_get_logical_data_bulk_raises_eof():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with File.FileRead(fobj) as file_read:
+        lrps = [v.position for v in file_read.iter_logical_record_positions()]
+    fobj = io.BytesIO(test_data.BASIC_FILE[:lrps[-1].lrsh_position + 8])
+    with File.FileRead(fobj) as file_read:
+        with pytest.raises(File.ExceptionFileReadEOF):
+            file_read.get_logical_data_bulk(lrps[-1:])
+
+
+# ==================== Test of memory mapped FileRead ========================
+
+
+def test_logical_data_view():
+    ld = File.LogicalDataView(memoryview(b'\x01\x02\x03\x04\x05'))
+    assert len(ld) == 5
+    assert ld.bytes == b'\x01\x02\x03\x04\x05'
+    assert ld.peek() == 1
+    assert ld.read() == 1
+    assert ld.view_remaining(2) == b'\x02\x03'
+    chunk = ld.chunk(2)
+    assert isinstance(chunk, bytes)
+    assert chunk == b'\x02\x03'
+    assert ld.remain == 2
+    assert ld[1:3] == b'\x02\x03'
+    assert ld[4] == 5
+    assert ld.sha1.hexdigest() == File.LogicalData(b'\x01\x02\x03\x04\x05').sha1.hexdigest()
+    assert str(ld) == '<LogicalData Len: 0x5 Idx: 0x3>'
+    with pytest.raises(IndexError):
+        ld.chunk(3)
+
+
+def test_FileLogicalData_seal_memoryview_is_zero_copy():
+    fobj = io.BytesIO(
+        b''.join([
+            b'\x00' * StorageUnitLabel.StorageUnitLabel.SIZE,  # Simulated Storage Unit Label
+            b'\x01\x00\xff\x01',  # Visible record: position=0, length=256, type=0xff01),
+            b'\x00\x80\x80\x01',  # LRSH
+        ])
+    )
+    fobj.seek(StorageUnitLabel.StorageUnitLabel.SIZE)
+    vr = File.VisibleRecord(fobj)
+    lrsh = File.LogicalRecordSegmentHeader(fobj)
+    fld = File.FileLogicalData(vr, lrsh)
+    view = memoryview(b'\x00\x01\x02')
+    fld.add_bytes(view)
+    fld.seal()
+    assert isinstance(fld.logical_data, File.LogicalDataView)
+    assert fld.logical_data.view is view
+
+
+@pytest.mark.parametrize(
+    'file_bytes',
+    (
+        test_data.MINIMAL_FILE,
+        test_data.BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS,
+        test_data.BASIC_FILE,
+        test_data.FILE_256kb,
+    )
+)
+def test_file_mmap_iter_logical_records(tmpdir, file_bytes):
+    path = tmpdir.join('rp66v1file.dlis')
+    path.write_binary(file_bytes, ensure=True)
+    with File.FileRead(path.strpath) as file_read:
+        expected = [(str(fld), fld.logical_data.bytes) for fld in file_read.iter_logical_records()]
+    with File.FileRead(path.strpath, use_mmap=True) as file_read:
+        result = [(str(fld), fld.logical_data.bytes) for fld in file_read.iter_logical_records()]
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    'file_bytes',
+    (
+        test_data.MINIMAL_FILE,
+        test_data.BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS,
+        test_data.BASIC_FILE,
+        test_data.FILE_256kb,
+    )
+)
+def test_file_mmap_get_file_logical_data(tmpdir, file_bytes):
+    path = tmpdir.join('rp66v1file.dlis')
+    path.write_binary(file_bytes, ensure=True)
+    with File.FileRead(path.strpath) as file_read:
+        positions = [str(v) for v in file_read.iter_logical_record_positions()]
+        expected = [
+            file_read.get_file_logical_data(v.position).logical_data.bytes
+            for v in file_read.iter_logical_record_positions()
+        ]
+    with File.FileRead(path.strpath, use_mmap=True) as file_read:
+        assert [str(v) for v in file_read.iter_logical_record_positions()] == positions
+        result = [
+            file_read.get_file_logical_data(v.position).logical_data.bytes
+            for v in file_read.iter_logical_record_positions()
+        ]
+        by, offsets = file_read.get_logical_data_bulk([v.position for v in file_read.iter_logical_record_positions()])
+    assert result == expected
+    assert [by[offsets[i]:offsets[i + 1]] for i in range(len(expected))] == expected
+
+
+def test_file_mmap_raises_on_bytes_io():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with pytest.raises(File.ExceptionFileRead) as err:
+        with File.FileRead(fobj, use_mmap=True):
+            pass
+    assert err.value.args[0].startswith('FileRead can not memory map')
+
+
+def test_file_mmap_raises_on_empty_file(tmpdir):
+    path = tmpdir.join('rp66v1file.dlis')
+    path.write_binary(b'', ensure=True)
+    with pytest.raises(File.ExceptionFileRead) as err:
+        with File.FileRead(path.strpath, use_mmap=True):
+            pass
+    assert err.value.args[0].startswith('FileRead can not memory map')
+
+
+@pytest.mark.parametrize(
+    'file_bytes',
+    (
+        test_data.MINIMAL_FILE,
+        test_data.BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS,
+        test_data.BASIC_FILE,
+        test_data.FILE_256kb,
+    )
+)
+@pytest.mark.parametrize('iflr_length', (-1, 0, 1, 8, 64, 1024))
+def test_file_iter_logical_record_positions_and_data(file_bytes, iflr_length):
+    with File.FileRead(io.BytesIO(file_bytes)) as file_read:
+        positions = [str(v) for v in file_read.iter_logical_record_positions()]
+        expected = [
+            file_read.get_file_logical_data(v.position).logical_data.bytes
+            for v in file_read.iter_logical_record_positions()
+        ]
+    with File.FileRead(io.BytesIO(file_bytes)) as file_read:
+        result = list(file_read.iter_logical_record_positions_and_data(lambda: iflr_length))
+    assert [str(lr_pos_desc) for lr_pos_desc, _fld in result] == positions
+    assert len(result) == len(expected)
+    for (lr_pos_desc, file_logical_data), expected_bytes in zip(result, expected):
+        assert file_logical_data.is_sealed()
+        if lr_pos_desc.description.attributes.is_eflr or iflr_length < 0:
+            assert file_logical_data.logical_data.bytes == expected_bytes
+        else:
+            assert expected_bytes.startswith(file_logical_data.logical_data.bytes)
+            assert len(file_logical_data.logical_data.bytes) >= min(iflr_length, len(expected_bytes))
+
+
+def test_file_iter_logical_record_positions_and_data_fails_not_is_first():
+    fobj = io.BytesIO(test_data.FILE_WITH_SECOND_LRSH_NOT_FIRST_RECORD)
+    with pytest.raises(File.ExceptionLogicalRecordSegmentHeaderSequence) as err:
+        with File.FileRead(fobj) as file_read:
+            list(file_read.iter_logical_record_positions_and_data(lambda: -1))
+    assert err.value.args[0] == 'Previous LRSH is last but current is not first @ 0xd0'
+
+
+@pytest.mark.parametrize(
+    'file_bytes',
+    (
+        test_data.MINIMAL_FILE,
+        test_data.BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS,
+        test_data.BASIC_FILE,
+        test_data.FILE_256kb,
+    )
+)
+@pytest.mark.parametrize('block_size', (1, 7, 100, 8192))
+def test_file_tif_iter_logical_record_positions_and_data(file_bytes, block_size):
+    with File.FileRead(io.BytesIO(file_bytes)) as file_read:
+        positions = [str(v) for v in file_read.iter_logical_record_positions()]
+        expected = [
+            file_read.get_file_logical_data(v.position).logical_data.bytes
+            for v in file_read.iter_logical_record_positions()
+        ]
+    with File.FileRead(io.BytesIO(test_DeTif.tif_encode(file_bytes, block_size))) as file_read:
+        assert [str(v) for v in file_read.iter_logical_record_positions()] == positions
+        result = [
+            file_read.get_file_logical_data(v.position).logical_data.bytes
+            for v in file_read.iter_logical_record_positions()
+        ]
+    assert result == expected
+
+
+@pytest.mark.parametrize('use_mmap', (False, True))
+def test_file_tif_path(tmpdir, use_mmap):
+    with File.FileRead(io.BytesIO(test_data.BASIC_FILE)) as file_read:
+        expected = [(str(fld), fld.logical_data.bytes) for fld in file_read.iter_logical_records()]
+    path = tmpdir.join('rp66v1file.dlis')
+    path.write_binary(test_DeTif.tif_encode(test_data.BASIC_FILE, 1024), ensure=True)
+    with File.FileRead(path.strpath, use_mmap=use_mmap) as file_read:
+        result = [(str(fld), fld.logical_data.bytes) for fld in file_read.iter_logical_records()]
+    assert result == expected
+
+
+def test_file_tif_raises():
+    # The second TIF marker has a next pointer that suggests a negative block size.
+    by = DeTif.TIFS_STRUCT.pack(0, 0, 92) + test_data.BASIC_FILE[:80] + DeTif.TIFS_STRUCT.pack(0, 0, 96)
+    with pytest.raises(File.ExceptionFileRead) as err:
+        with File.FileRead(io.BytesIO(by)):
+            pass
+    assert err.value.args[0].startswith('FileRead can not read TIF markers in')
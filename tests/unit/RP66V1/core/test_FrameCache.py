@@ -0,0 +1,164 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+from TotalDepth.RP66V1.core import FrameCache, LogicalFile
+from TotalDepth.common import Slice
+from tests.unit.RP66V1.core import test_data
+
+
+def test_frame_cache_ctor(tmpdir):
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'))
+    assert os.path.isdir(frame_cache.directory)
+    assert frame_cache.size == 0
+    assert str(frame_cache) == f'<FrameCache {frame_cache.directory} hits: 0 misses: 0 evictions: 0>'
+
+
+def test_frame_cache_ctor_raises(tmpdir):
+    with pytest.raises(FrameCache.ExceptionFrameCache) as err:
+        FrameCache.FrameCache(os.path.join(tmpdir, 'cache'), -1)
+    assert err.value.args[0] == 'max_bytes must be >= 0 not -1'
+
+
+def test_frame_cache_key_none_for_bytes_io():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        assert logical_file.frame_cache_key(logical_file.log_pass[0], None, None) is None
+
+
+def test_frame_cache_key_differs(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        keys = {
+            logical_file.frame_cache_key(frame_array, None, None),
+            logical_file.frame_cache_key(frame_array, Slice.Slice(8, 64, 2), None),
+            logical_file.frame_cache_key(frame_array, None, {frame_array.channels[1].ident}),
+        }
+        assert len(keys) == 3
+
+
+def test_frame_cache_key_index_list(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        index_lists = (Slice.IndexList([0, 1, 9]), Slice.IndexList([0, 8, 9]))
+        # These have the same str() but select different frames.
+        assert str(index_lists[0]) == str(index_lists[1])
+        keys = {logical_file.frame_cache_key(frame_array, index_list, None) for index_list in index_lists}
+        assert len(keys) == 2
+        assert sorted(logical_file.log_pass_eflr_digests.keys()) == [b'CHANNEL', b'FRAME']
+
+
+@pytest.mark.parametrize(
+    'frame_slice, channels, expected',
+    (
+        (None, None, 649),
+        (Slice.Slice(8, 64, 2), None, 28),
+        (None, 1, 649),
+    )
+)
+def test_frame_cache_populate_frame_array(tmpdir, frame_slice, channels, expected):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'))
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        if channels is not None:
+            channels = {frame_array.channels[channels].ident}
+        assert logical_file.populate_frame_array(frame_array, frame_slice, channels) == expected
+        expected_arrays = [channel.array.copy() for channel in frame_array.channels]
+        # Miss
+        assert logical_file.populate_frame_array(frame_array, frame_slice, channels, frame_cache) == expected
+        assert (frame_cache.hits, frame_cache.misses) == (0, 1)
+        assert frame_cache.size > 0
+        # Hit
+        for channel in frame_array.channels:
+            channel.array = None
+        assert logical_file.populate_frame_array(frame_array, frame_slice, channels, frame_cache) == expected
+        assert (frame_cache.hits, frame_cache.misses) == (1, 1)
+        for channel, expected_array in zip(frame_array.channels, expected_arrays):
+            assert isinstance(channel.array, np.memmap)
+            assert np.array_equal(channel.array, expected_array)
+
+
+def test_frame_cache_populate_all(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'))
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        result = logical_index.populate_all(frame_cache=frame_cache)
+        assert frame_cache.misses == 1
+        assert logical_index.populate_all(frame_cache=frame_cache) == result
+        assert frame_cache.hits == 1
+
+
+def test_frame_cache_eviction(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'), max_bytes=10 * 1024)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array, Slice.Slice(0, 100), None, frame_cache)
+        logical_file.populate_frame_array(frame_array, Slice.Slice(100, 200), None, frame_cache)
+        assert frame_cache.evictions == 0
+        size = frame_cache.size
+        # This is too big for the cache so it is not stored and nothing is evicted.
+        assert logical_file.populate_frame_array(frame_array, None, None, frame_cache) == 649
+        assert frame_cache.evictions == 0
+        assert frame_cache.size == size
+        assert logical_file.populate_frame_array(frame_array, None, None, frame_cache) == 649
+        assert frame_cache.hits == 0
+
+
+def test_frame_cache_eviction_keeps_stored_entry(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'), max_bytes=10 * 1024)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array, Slice.Slice(0, 100), None, frame_cache)
+        logical_file.populate_frame_array(frame_array, Slice.Slice(100, 200), None, frame_cache)
+        # Together with the other entries this is too big so the least recently used entries are evicted.
+        logical_file.populate_frame_array(frame_array, Slice.Slice(200, 400), None, frame_cache)
+        assert frame_cache.evictions == 1
+        assert 0 < frame_cache.size <= frame_cache.max_bytes
+        key = logical_file.frame_cache_key(frame_array, Slice.Slice(200, 400), None)
+        assert os.path.isdir(os.path.join(frame_cache.directory, key))
+
+
+def test_frame_cache_clear(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'))
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        logical_file.populate_frame_array(logical_file.log_pass[0], None, None, frame_cache)
+    assert frame_cache.size > 0
+    frame_cache.clear()
+    assert frame_cache.size == 0
+
+
+def test_frame_cache_eviction_never_evicts_stored_entry(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    path.write_binary(test_data.BASIC_FILE, ensure=True)
+    # The array data fits but the .npy files with their headers do not.
+    frame_cache = FrameCache.FrameCache(os.path.join(tmpdir, 'cache'), max_bytes=2800)
+    with LogicalFile.LogicalIndex(path.strpath) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array, Slice.Slice(0, 100), None, frame_cache)
+        assert frame_cache.evictions == 0
+        assert frame_cache.size > frame_cache.max_bytes
+        logical_file.populate_frame_array(frame_array, Slice.Slice(0, 100), None, frame_cache)
+        assert frame_cache.hits == 1
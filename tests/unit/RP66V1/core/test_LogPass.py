@@ -1,4 +1,5 @@
 import io
+import pickle
 import typing
 
 import pytest
@@ -272,6 +273,195 @@ def test_read_iflr_partial():
     assert str(frame_array.channels[8].array) == """[]"""
 
 
+def _frame_bytes_from_iflr_bytes() -> bytes:
+    ret = []
+    for by in IFLR_BYTES:
+        iflr, logical_data = _iflr_and_logical_data_from_bytes(by)
+        ret.append(logical_data.view_remaining(logical_data.remain))
+    return b''.join(ret)
+
+
+def test_frame_array_is_numpy_decodable():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    assert frame_array.is_numpy_decodable
+    assert frame_array.numpy_frame_dtype.itemsize == frame_array.len_input_bytes
+
+
+def test_frame_array_is_not_numpy_decodable():
+    frame_array = LogPass.FrameArray(FRAME_ARRAY_IDENT, b'')
+    assert not frame_array.is_numpy_decodable
+    frame_array.append(
+        LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 2, b'm', [1])
+    )
+    assert frame_array.is_numpy_decodable
+    frame_array.append(
+        LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'UVAR'), b'', 18, b'', [1])
+    )
+    assert not frame_array.is_numpy_decodable
+    with pytest.raises(LogPass.ExceptionFrameArray):
+        frame_array.numpy_frame_dtype
+
+
+def test_frame_array_numpy_frame_dtype_dimensions():
+    frame_array = LogPass.FrameArray(FRAME_ARRAY_IDENT, b'')
+    frame_array.append(
+        LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 7, b'm', [1])
+    )
+    frame_array.append(
+        LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'WAVE'), b'', 13, b'', [4, 8])
+    )
+    dtype = frame_array.numpy_frame_dtype
+    assert dtype.itemsize == 8 + 4 * 8 * 2 == frame_array.len_input_bytes
+    assert dtype['c1'].shape == (4, 8)
+
+
+def test_read_frames_matches_read():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    frame_array.init_arrays(len(IFLR_BYTES))
+    for f, by in enumerate(IFLR_BYTES):
+        iflr, logical_data = _iflr_and_logical_data_from_bytes(by)
+        frame_array.read(logical_data, f)
+    expected = [channel.array.copy() for channel in frame_array.channels]
+    frame_array.init_arrays(len(IFLR_BYTES))
+    for channel in frame_array.channels:
+        channel.array.fill(0)
+    frame_array.read_frames(_frame_bytes_from_iflr_bytes(), 0, len(IFLR_BYTES))
+    for channel, array in zip(frame_array.channels, expected):
+        assert channel.array.dtype == array.dtype
+        assert (channel.array == array).all()
+
+
+def test_read_frames_partial():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    channels = {
+            RepCode.ObjectName(O=11, C=0, I=b'INC'),
+            RepCode.ObjectName(O=11, C=0, I=b'SECT'),
+    }
+    frame_array.init_arrays_partial(len(IFLR_BYTES), channels)
+    frame_array.read_frames(_frame_bytes_from_iflr_bytes(), 0, len(IFLR_BYTES), channels)
+    assert frame_array.shape == [(8, 1), (8, 1), (0, 1), (0, 1), (8, 1), (0, 1), (0, 1), (0, 1), (0, 1)]
+    assert str(frame_array.channels[4].array) == """[[0.833423]
+ [2.596255]
+ [4.809544]
+ [6.92684 ]
+ [9.256786]
+ [9.268364]
+ [7.632412]
+ [6.981416]]"""
+
+
+def test_read_frames_raises_on_short_data():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    frame_array.init_arrays(len(IFLR_BYTES))
+    with pytest.raises(LogPass.ExceptionFrameArray) as err:
+        frame_array.read_frames(_frame_bytes_from_iflr_bytes()[:-1], 0, len(IFLR_BYTES))
+    assert err.value.args[0] == 'read_frames() needs 288 bytes for 8 frames but was given 287 bytes.'
+
+
+def test_frame_array_channel_offsets():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    offsets = frame_array.channel_offsets
+    assert len(offsets) == len(frame_array)
+    assert offsets[0] == 0
+    assert offsets[-1] + frame_array.channels[-1].len_input_bytes == frame_array.len_input_bytes
+
+
+@pytest.mark.parametrize('channel_index', list(range(9)))
+def test_decode_channel_frames_matches_read_frames(channel_index):
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    frame_array.init_arrays(len(IFLR_BYTES))
+    frame_array.read_frames(_frame_bytes_from_iflr_bytes(), 0, len(IFLR_BYTES))
+    array = frame_array.decode_channel_frames(_frame_bytes_from_iflr_bytes(), channel_index, len(IFLR_BYTES))
+    expected = frame_array.channels[channel_index].array
+    assert array.dtype == expected.dtype
+    assert (array == expected).all()
+
+
+@pytest.mark.parametrize('channel_index', list(range(9)))
+def test_decode_channel_frames_channel_only(channel_index):
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    frame_bytes = _frame_bytes_from_iflr_bytes()
+    offset = frame_array.channel_offsets[channel_index]
+    length = frame_array.channels[channel_index].len_input_bytes
+    channel_bytes = b''.join(
+        frame_bytes[start + offset:start + offset + length]
+        for start in range(0, len(frame_bytes), frame_array.len_input_bytes)
+    )
+    array = frame_array.decode_channel_frames(channel_bytes, channel_index, len(IFLR_BYTES), channel_only=True)
+    expected = frame_array.decode_channel_frames(frame_bytes, channel_index, len(IFLR_BYTES))
+    assert array.dtype == expected.dtype
+    assert (array == expected).all()
+
+
+def test_decode_channel_frames_raises_on_short_data():
+    log_pass = _log_pass()
+    frame_array: LogPass.FrameArray = log_pass[FRAME_ARRAY_IDENT]
+    with pytest.raises(LogPass.ExceptionFrameArray) as err:
+        frame_array.decode_channel_frames(_frame_bytes_from_iflr_bytes()[:-1], 1, len(IFLR_BYTES))
+    assert err.value.args[0] == 'decode_channel_frames() needs 288 bytes for 8 frames but was given 287 bytes.'
+
+
+class _MockLazyLoader:
+    def __init__(self):
+        self.loads = []
+        self.touches = 0
+
+    def load(self, channel: LogPass.FrameChannel):
+        self.loads.append(channel.ident)
+        return channel._init_array(4)
+
+    def touch(self, channel: LogPass.FrameChannel):
+        self.touches += 1
+
+
+def test_frame_channel_lazy_loader():
+    channel = LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 2, b'm', [1])
+    loader = _MockLazyLoader()
+    channel.lazy_loader = loader
+    channel.unload()
+    assert not channel.is_loaded
+    assert channel.array.shape == (4, 1)
+    assert channel.is_loaded
+    assert channel.array.shape == (4, 1)
+    assert loader.loads == [channel.ident]
+    assert loader.touches == 1
+    channel.unload()
+    assert channel.array.shape == (4, 1)
+    assert len(loader.loads) == 2
+
+
+def test_frame_channel_lazy_loader_removed_by_init_array():
+    channel = LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 2, b'm', [1])
+    channel.lazy_loader = _MockLazyLoader()
+    channel.unload()
+    channel.init_array(8)
+    assert channel.lazy_loader is None
+    assert channel.array.shape == (8, 1)
+
+
+def test_frame_channel_unload_raises():
+    channel = LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 2, b'm', [1])
+    with pytest.raises(LogPass.ExceptionFrameChannel) as err:
+        channel.unload()
+    assert err.value.args[0] == f'Can not unload channel {channel.ident} that has no lazy loader.'
+
+
+def test_frame_channel_lazy_pickle():
+    channel = LogPass.FrameChannel(RepCode.ObjectName(O=11, C=0, I=b'DEPT'), b'', 2, b'm', [1])
+    channel.lazy_loader = _MockLazyLoader()
+    channel.unload()
+    channel_copy = pickle.loads(pickle.dumps(channel))
+    assert channel_copy.lazy_loader is None
+    assert channel_copy.array.shape == (0, 1)
+
+
 def test_log_pass_write_XML():
     log_pass = _log_pass()
     ostream = io.StringIO()
@@ -1,11 +1,19 @@
+import concurrent.futures
 import copy
 import io
+import os
 import pprint
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
 
 import numpy as np
 import pytest
 
-from TotalDepth.RP66V1.core import LogicalFile, RepCode
+from TotalDepth.RP66V1.core import File, LogicalFile, RepCode, XAxis
+from TotalDepth.RP66V1.core.LogicalRecord import IFLR
 from TotalDepth.common import Slice
 from tests.unit.RP66V1.core import test_data
 
@@ -64,6 +72,26 @@ def test_logical_index_logical_file_iflr_position_map():
         assert list(logical_file.iflr_position_map.keys()) == [expected_key]
 
 
+@pytest.mark.parametrize(
+    'bytes_name',
+    ('SMALL_FILE', 'MINIMAL_FILE', 'BASIC_FILE_WITH_TWO_VISIBLE_RECORDS_NO_IFLRS', 'BASIC_FILE', 'FILE_256kb',)
+)
+def test_logical_index_logical_record_index_matches_scan(bytes_name):
+    by = getattr(test_data, bytes_name)
+    with File.FileRead(io.BytesIO(by)) as file_read:
+        expected = [str(v) for v in file_read.iter_logical_record_positions()]
+    with LogicalFile.LogicalIndex(io.BytesIO(by)) as logical_index:
+        assert [str(v) for v in logical_index._logical_record_index.lr_pos_desc] == expected
+
+
+def test_logical_index_iflr_read_length():
+    with LogicalFile.LogicalIndex(io.BytesIO(test_data.BASIC_FILE)) as logical_index:
+        # X axis is a single FDOUBL.
+        assert logical_index._iflr_read_length() == LogicalFile.IFLR_PREAMBLE_MAX_LENGTH + 8
+        logical_index.logical_files = []
+        assert logical_index._iflr_read_length() == -1
+
+
 def test_logical_index_logical_file_iflr_position_map_x_axis_summary():
     fobj = io.BytesIO(test_data.BASIC_FILE)
     with LogicalFile.LogicalIndex(fobj) as logical_index:
@@ -187,3 +215,291 @@ def test_logical_file_populate_frame_array_partial_split():
         frame_slice = Slice.Sample(64)
         frame_count = logical_file.populate_frame_array(frame_array, frame_slice)
         assert frame_count == 64
+
+
+@pytest.mark.parametrize(
+    'x_range, expected',
+    (
+        (XAxis.XRange(2889.4, 2954.2), 649),
+        (XAxis.XRange(2954.2, 2889.4), 649),
+        (XAxis.XRange(2899.95, 2910.05), 101),
+        (XAxis.XRange(0.0, 1.0), 0),
+    )
+)
+def test_logical_file_populate_frame_array_x_range(x_range, expected):
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        frame_count = logical_file.populate_frame_array(frame_array, x_range)
+        assert frame_count == expected
+        assert frame_array[0].array.shape == (expected, 1)
+        if expected:
+            assert min(x_range) - 0.01 <= frame_array[0].array[0][0] <= max(x_range) + 0.01
+            assert min(x_range) - 0.01 <= frame_array[0].array[-1][0] <= max(x_range) + 0.01
+
+
+def test_logical_file_populate_frame_array_numpy_matches_read():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        assert frame_array.is_numpy_decodable
+        frame_count = logical_file.populate_frame_array(frame_array)
+        result = [channel.array.copy() for channel in frame_array.channels]
+        # Now read frame by frame.
+        frame_array.init_arrays(frame_count)
+        iflrs = logical_file.iflr_position_map[frame_array.ident]
+        for frame_number in range(frame_count):
+            fld = logical_index._logical_record_index.get_file_logical_data_at_position(
+                iflrs[frame_number].logical_record_position
+            )
+            IFLR.IndirectlyFormattedLogicalRecord(fld.lr_type, fld.logical_data)
+            frame_array.read(fld.logical_data, frame_number)
+        for channel, array in zip(frame_array.channels, result):
+            assert (channel.array == array).all()
+
+
+def test_logical_index_use_mmap(tmpdir):
+    path = tmpdir.join('BASIC_FILE.dlis')
+    with open(path, 'wb') as fobj:
+        fobj.write(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(path.strpath, use_mmap=True) as logical_index:
+        assert len(logical_index) == 1
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        assert logical_file.populate_frame_array(frame_array) == 649
+        assert frame_array.shape == [(649, 1), (649, 1), (649, 1), (649, 1), (649, 1)]
+
+
+def _channel_arrays(logical_index: LogicalFile.LogicalIndex) -> list:
+    return [
+        channel.array for logical_file in logical_index.logical_files
+        for frame_array in logical_file.log_pass.frame_arrays for channel in frame_array.channels
+    ]
+
+
+@pytest.mark.parametrize(
+    'channels, frame_slice, expected',
+    (
+        (None, None, 649),
+        ({RepCode.ObjectName(O=2, C=0, I=b'TENS')}, None, 649),
+        (None, Slice.Slice(8, 64, 2), 28),
+        (None, XAxis.XRange(2899.95, 2910.05), 101),
+    )
+)
+def test_logical_index_populate_all_serial(channels, frame_slice, expected):
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        result = logical_index.populate_all(channels=channels, frame_slice=frame_slice)
+        frame_array = logical_index.logical_files[0].log_pass[0]
+        assert result == {(0, frame_array.ident): expected}
+        assert frame_array[0].array.shape == (expected, 1)
+        if channels is not None:
+            assert frame_array.shape == [(expected, 1), (expected, 1), (0, 1), (0, 1), (0, 1)]
+
+
+@pytest.mark.parametrize(
+    'channels, frame_slice',
+    (
+        (None, None),
+        ({RepCode.ObjectName(O=2, C=0, I=b'TENS')}, None),
+        (None, Slice.Slice(8, 64, 2)),
+    )
+)
+def test_logical_index_populate_all_executor(tmpdir, channels, frame_slice):
+    path = os.path.join(tmpdir, 'BASIC_FILE.dlis')
+    with open(path, 'wb') as file_out:
+        file_out.write(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(path) as logical_index:
+        expected_result = logical_index.populate_all(channels=channels, frame_slice=frame_slice)
+        expected_arrays = _channel_arrays(logical_index)
+    with LogicalFile.LogicalIndex(path) as logical_index:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            result = logical_index.populate_all(executor, channels=channels, frame_slice=frame_slice)
+        arrays = _channel_arrays(logical_index)
+    assert result == expected_result
+    assert len(arrays) == len(expected_arrays)
+    for array, expected_array in zip(arrays, expected_arrays):
+        assert array.dtype == expected_array.dtype
+        assert np.array_equal(array, expected_array)
+        # Mapped onto the shared memory, not copied out of it, and that shared memory is already unlinked.
+        assert isinstance(array.base, LogicalFile._SharedArrayBase)
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=array.base.shm.name)
+
+
+POPULATE_ALL_CODE = """
+import concurrent.futures
+import sys
+
+from TotalDepth.RP66V1.core import LogicalFile
+
+if __name__ == '__main__':
+    with LogicalFile.LogicalIndex(sys.argv[1]) as logical_index:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            print(logical_index.populate_all(executor))
+"""
+
+
+def test_logical_index_populate_all_executor_resource_tracker(tmpdir):
+    """The shared memory is created in the worker and unlinked in the parent, no resource tracker should report that
+    as leaked or missing. This runs in a new process as the resource trackers report when they exit."""
+    path = os.path.join(tmpdir, 'BASIC_FILE.dlis')
+    with open(path, 'wb') as file_out:
+        file_out.write(test_data.BASIC_FILE)
+    path_code = os.path.join(tmpdir, 'populate_all.py')
+    with open(path_code, 'w') as file_out:
+        file_out.write(POPULATE_ALL_CODE)
+    result = subprocess.run(
+        [sys.executable, path_code, path], capture_output=True, timeout=120,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    assert result.returncode == 0, result.stderr.decode()
+    assert b'649' in result.stdout
+    assert b'resource_tracker' not in result.stderr
+
+
+class _ExecutorFailsFirstTask(concurrent.futures.ThreadPoolExecutor):
+    """Fails the first task submitted once the others have created their shared memory but before they have returned
+    it. This records the shared memory of the other tasks."""
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.num_submitted = 0
+        self.shared_memory_names = []
+        self.shared_memory_created = threading.Event()
+
+    def _fail(self):
+        self.shared_memory_created.wait(timeout=10.0)
+        raise ZeroDivisionError()
+
+    def _record(self, fn, *args):
+        num_frames, shared_arrays = fn(*args)
+        self.shared_memory_names.extend(v[0] for v in shared_arrays)
+        self.shared_memory_created.set()
+        time.sleep(0.1)
+        return num_frames, shared_arrays
+
+    def submit(self, fn, *args, **kwargs):
+        self.num_submitted += 1
+        if self.num_submitted == 1:
+            return super().submit(self._fail)
+        return super().submit(self._record, fn, *args, **kwargs)
+
+
+def test_logical_index_populate_all_executor_raises_releases_shared_memory(tmpdir):
+    path = os.path.join(tmpdir, 'FILE_256kb.dlis')
+    with open(path, 'wb') as file_out:
+        file_out.write(test_data.FILE_256kb)
+    with LogicalFile.LogicalIndex(path) as logical_index:
+        with _ExecutorFailsFirstTask() as executor:
+            with pytest.raises(ZeroDivisionError):
+                logical_index.populate_all(executor)
+    assert executor.num_submitted == 2
+    assert len(executor.shared_memory_names) > 0
+    for name in executor.shared_memory_names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_logical_index_populate_all_executor_raises_without_path():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(LogicalFile.ExceptionLogicalIndex) as err:
+                logical_index.populate_all(executor)
+    assert err.value.args[0] == 'populate_all() with an executor needs a file path not <unknown>'
+
+
+@pytest.mark.parametrize(
+    'frame_slice, expected',
+    (
+        (None, 649),
+        (Slice.Slice(8, 64, 2), 28),
+        (XAxis.XRange(2899.95, 2910.05), 101),
+    )
+)
+def test_logical_file_populate_frame_array_lazy(frame_slice, expected):
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array, frame_slice)
+        expected_arrays = [channel.array.copy() for channel in frame_array.channels]
+        assert logical_file.populate_frame_array_lazy(frame_array, frame_slice) == expected
+        assert not any(channel.is_loaded for channel in frame_array.channels)
+        # Access channels out of order
+        for c in (4, 1, 0, 3, 2):
+            assert np.array_equal(frame_array.channels[c].array, expected_arrays[c])
+            assert frame_array.channels[c].is_loaded
+
+
+def test_logical_file_populate_frame_array_lazy_reads_only_the_channel(monkeypatch):
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array)
+        expected_arrays = [channel.array.copy() for channel in frame_array.channels]
+        logical_file.populate_frame_array_lazy(frame_array)
+        record_index = logical_index._logical_record_index
+        get_logical_data_bulk = record_index.get_logical_data_bulk
+        lengths_read = []
+
+        def _get_logical_data_bulk(positions, ranges=None):
+            by, offsets = get_logical_data_bulk(positions, ranges)
+            lengths_read.append(len(by))
+            return by, offsets
+
+        monkeypatch.setattr(record_index, 'get_logical_data_bulk', _get_logical_data_bulk)
+        for c in (4, 1):
+            assert np.array_equal(frame_array.channels[c].array, expected_arrays[c])
+        # The IFLR preambles are read once then only the bytes of each channel.
+        assert len(lengths_read) == 3
+        assert lengths_read[1:] == [649 * frame_array.channels[c].len_input_bytes for c in (4, 1)]
+
+
+def test_logical_file_populate_frame_array_lazy_bounded():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array_lazy(frame_array, max_channels=2)
+        frame_array[4].array
+        frame_array[1].array
+        frame_array[4].array
+        frame_array[2].array
+        assert [channel.is_loaded for channel in frame_array.channels] == [False, False, True, False, True]
+
+
+def test_logical_file_populate_frame_array_lazy_then_eager():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array_lazy(frame_array)
+        assert logical_file.populate_frame_array(frame_array) == 649
+        assert all(channel.lazy_loader is None for channel in frame_array.channels)
+        assert frame_array.shape == [(649, 1)] * 5
+
+
+def test_logical_file_populate_frame_array_lazy_raises_max_channels():
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        with pytest.raises(LogicalFile.ExceptionLogicalFile) as err:
+            logical_file.populate_frame_array_lazy(logical_file.log_pass[0], max_channels=0)
+    assert err.value.args[0] == 'LazyChannelLoader: max_channels must be > 0 not 0'
+
+
+def test_logical_file_populate_frame_array_lazy_value_by_value(monkeypatch):
+    fobj = io.BytesIO(test_data.BASIC_FILE)
+    with LogicalFile.LogicalIndex(fobj) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        frame_array = logical_file.log_pass[0]
+        logical_file.populate_frame_array(frame_array)
+        expected_arrays = [channel.array.copy() for channel in frame_array.channels]
+        logical_file.populate_frame_array_lazy(frame_array)
+        monkeypatch.setattr(RepCode, 'has_numpy_raw_dtype', lambda rep_code: False)
+        for channel, expected_array in zip(frame_array.channels, expected_arrays):
+            assert np.array_equal(channel.array, expected_array)
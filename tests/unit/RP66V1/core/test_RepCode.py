@@ -109,6 +109,36 @@ def test_rep_code_fixed_length_raises(rc):
     assert err.value.args[0] == f'Representation code {rc} is not fixed length.'
 
 
+@pytest.mark.parametrize(
+    'ld, expected',
+    (
+        # Examples from [RP66V1 Appendix B Section B.1]
+        (LogicalData(b'\x4c\x88'), 153.0),
+        (LogicalData(b'\xb3\x88'), -153.0),
+        (LogicalData(b'\x00\x00'), 0.0),
+    )
+)
+def test_FSHORT(ld, expected):
+    result = RepCode.FSHORT(ld)
+    assert result == expected
+    assert ld.remain == 0
+
+
+@pytest.mark.parametrize(
+    'ld, expected',
+    (
+        # Examples from [RP66V1 Appendix B Section B.5]
+        (LogicalData(b'\x42\x99\x00\x00'), 153.0),
+        (LogicalData(b'\xc2\x99\x00\x00'), -153.0),
+        (LogicalData(b'\x00\x00\x00\x00'), 0.0),
+    )
+)
+def test_ISINGL(ld, expected):
+    result = RepCode.ISINGL(ld)
+    assert result == expected
+    assert ld.remain == 0
+
+
 @pytest.mark.parametrize(
     'ld, expected',
     (
@@ -359,6 +389,23 @@ def test_ASCII(ld, expected):
     assert ld.remain == 0
 
 
+@pytest.mark.parametrize(
+    'ld, expected',
+    (
+        (LogicalData(b''), 0),  # Error condition
+        (LogicalData(b'\x80'), 0),  # Error condition, incomplete UVARI
+        (LogicalData(b'\x00'), 1),
+        (LogicalData(b'\x03A\x0ab'), 4),
+        (LogicalData(b'\x03'), 4),
+        (LogicalData(b'\x80\x80' + b'A' * 128), 130),
+        (LogicalData(b'\xc0\x00\x40\x00'), 4 + 2 ** 14),
+    )
+)
+def test_ASCII_len(ld, expected):
+    result = RepCode.ASCII_len(ld.bytes, 0)
+    assert result == expected
+
+
 # TODO: Test DTIME out of range.
 @pytest.mark.parametrize(
     'ld, expected',
@@ -625,6 +672,19 @@ def test_OBJREF_str(ld, expected):
     assert ld.remain == 0
 
 
+@pytest.mark.parametrize(
+    'ld, expected',
+    (
+        (LogicalData(b''), 0),  # Error condition
+        (LogicalData(b'\x0512345'), 0),  # Error condition, no OBNAME
+        (LogicalData(b'\x0512345' + b'\x00' + b'\x01' + b'\x03ABC'), 12),
+    )
+)
+def test_OBJREF_len(ld, expected):
+    result = RepCode.OBJREF_len(ld.bytes, 0)
+    assert result == expected
+
+
 @pytest.mark.parametrize(
     'ld, expected',
     (
@@ -773,6 +833,43 @@ def test_code_read_raises():
     assert err.value.args[0] == 'Unsupported Representation code 0'
 
 
+@pytest.mark.parametrize(
+    'rc, by',
+    (
+        (2, b'\x00\x00\x00\x00'),
+        (7, b'\x00\x00\x00\x00\x00\x00\x00\x00'),
+        (15, b'\xff'),
+        (18, b'\x01'),
+        (18, b'\x80\x80'),
+        (18, b'\xc0\x00\x40\x00'),
+        (19, b'\x03ABC'),
+        (20, b'\x03A\x0ab'),
+        (21, b'\x57\x14\x13\x15\x14\x0f\x02\x6c'),
+        (22, b'\x80\x80'),
+        (23, b'\x00' + b'\x01' + b'\x03ABC'),
+        (24, b'\x0512345' + b'\x00' + b'\x01' + b'\x03ABC'),
+        (26, b'\x01'),
+        (27, b'\x06 -./()'),
+    )
+)
+def test_code_len(rc, by):
+    ld = LogicalData(by + b'trailing')
+    RepCode.code_read(rc, ld)
+    assert RepCode.code_len(rc, ld.bytes, 0) == ld.index == len(by)
+
+
+@pytest.mark.parametrize('rc', (7, 19, 23))
+def test_code_len_short(rc):
+    assert RepCode.code_len(rc, b'', 0) == 0
+
+
+@pytest.mark.parametrize('rc', (0, 3, 25, 28))
+def test_code_len_raises(rc):
+    with pytest.raises(RepCode.ExceptionRepCode) as err:
+        RepCode.code_len(rc, b'\x00' * 16, 0)
+    assert err.value.args[0] == f'Unsupported Representation code {rc}'
+
+
 @pytest.mark.parametrize(
     'rc, expected',
     (
@@ -788,3 +885,54 @@ def test_numpy_dtype_raises():
     with pytest.raises(RepCode.ExceptionRepCode) as err:
         RepCode.numpy_dtype(0)
     assert err.value.args[0] == 'Unsupported Representation code 0'
+
+
+@pytest.mark.parametrize(
+    'by',
+    (
+        b'\x00\x00\x00\x00',
+        b'\x0c\x44\x00\x80',
+        b'\x0c\xc4\x00\x80',
+        # e == 0 and s != 0
+        b'\x00\x80\x00\x80',
+        b'\x12\x34\x56\x78',
+        b'\xff\xff\xff\xff',
+    )
+)
+def test_VSINGL_array(by):
+    raw = np.frombuffer(by, dtype=RepCode.numpy_raw_dtype(6))
+    result = RepCode.numpy_array_convert(6, raw)
+    assert result.shape == (1,)
+    assert result[0] == RepCode.VSINGL(LogicalData(by))
+
+
+@pytest.mark.parametrize(
+    'rc, by',
+    (
+        (1, b'\x4c\x88\xb3\x88\x00\x00\x7f\xff\x80\x0f\x12\x34'),
+        (2, b'\x43\x19\x00\x00\xc3\x19\x00\x00'),
+        (5, b'\x42\x99\x00\x00\xc2\x99\x00\x00\x00\x00\x00\x00\x7f\xff\xff\xff\x80\x12\x34\x56'),
+        (7, b'\x40\x63\x20\x00\x00\x00\x00\x00\xc0\x63\x20\x00\x00\x00\x00\x00'),
+        (12, b'\x00\x7f\x80\xff'),
+        (13, b'\x00\x99\xff\x67'),
+        (14, b'\x00\x00\x00\x99\xff\xff\xff\x67'),
+        (15, b'\x00\x7f\x80\xff'),
+        (16, b'\x00\x99\x80\x00'),
+        (17, b'\x00\x00\x00\x99\xff\xff\xff\x67'),
+    )
+)
+def test_numpy_array_convert(rc, by):
+    raw = np.frombuffer(by, dtype=RepCode.numpy_raw_dtype(rc))
+    result = RepCode.numpy_array_convert(rc, raw)
+    ld = LogicalData(by)
+    expected = []
+    while ld:
+        expected.append(RepCode.code_read(rc, ld))
+    assert list(result) == expected
+
+
+def test_numpy_raw_dtype_raises():
+    assert not RepCode.has_numpy_raw_dtype(18)
+    with pytest.raises(RepCode.ExceptionRepCode) as err:
+        RepCode.numpy_raw_dtype(18)
+    assert err.value.args[0] == 'Representation code 18 has no raw numpy dtype'
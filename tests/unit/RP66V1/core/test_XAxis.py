@@ -1,7 +1,10 @@
+import pickle
+
 import numpy as np
 import pytest
 
 from TotalDepth.RP66V1.core import XAxis, File
+from TotalDepth.common import Slice
 
 
 @pytest.mark.parametrize(
@@ -227,3 +230,216 @@ def test_XAxis_getitem(position_xvalues, expected):
     for i in range(len(x_axis)):
         # print(x_axis[i])
         assert x_axis[i] == expected[i]
+
+
+def _x_axis_with_values(count: int) -> XAxis.XAxis:
+    x_axis = XAxis.XAxis(ident=b'A', long_name=b'B', units=b'C')
+    for i in range(count):
+        x_axis.append(File.LogicalRecordPositionBase(0x100 * i, 0x100 * i + 4), i + 1, 10.0 + 0.5 * i)
+    return x_axis
+
+
+@pytest.mark.parametrize('count', (0, 1, XAxis.XAxis.INITIAL_CAPACITY, 1000))
+def test_XAxis_arrays(count):
+    x_axis = _x_axis_with_values(count)
+    assert len(x_axis) == count
+    assert x_axis.vr_position.dtype == np.int64
+    assert x_axis.lrsh_position.dtype == np.int64
+    assert x_axis.frame_number.dtype == np.int64
+    assert x_axis.x_axis.dtype == np.float64
+    assert list(x_axis.vr_position) == [0x100 * i for i in range(count)]
+    assert list(x_axis.lrsh_position) == [0x100 * i + 4 for i in range(count)]
+    assert list(x_axis.frame_number) == [i + 1 for i in range(count)]
+    assert list(x_axis.x_axis) == [10.0 + 0.5 * i for i in range(count)]
+
+
+def test_XAxis_arrays_read_only():
+    x_axis = _x_axis_with_values(4)
+    with pytest.raises(ValueError):
+        x_axis.x_axis[0] = 1.0
+
+
+def test_XAxis_getitem_negative_and_slice():
+    x_axis = _x_axis_with_values(8)
+    assert x_axis[-1] == x_axis[7]
+    assert x_axis[-1].frame_number == 8
+    assert x_axis[2:6:2] == [x_axis[2], x_axis[4]]
+    assert list(x_axis) == x_axis[:]
+
+
+@pytest.mark.parametrize('index', (8, -9))
+def test_XAxis_getitem_raises(index):
+    x_axis = _x_axis_with_values(8)
+    with pytest.raises(IndexError):
+        x_axis[index]
+
+
+def test_XAxis_pickle():
+    x_axis = _x_axis_with_values(100)
+    x_axis_copy = pickle.loads(pickle.dumps(x_axis))
+    assert len(x_axis_copy.x_axis) == 100
+    assert list(x_axis_copy) == list(x_axis)
+    assert x_axis_copy.summary == x_axis.summary
+    x_axis_copy.append(File.LogicalRecordPositionBase(0x0, 0x4), 101, 1.0)
+    assert len(x_axis_copy) == 101
+
+
+def test_XAxis_pickle_does_not_change_self():
+    x_axis = _x_axis_with_values(100)
+    x_axis.frame_for_x(x_axis[50].x_axis)
+    search = x_axis._x_axis_search
+    capacity = len(x_axis._x_axis)
+    assert capacity > 100
+    pickle.dumps(x_axis)
+    assert x_axis._x_axis_search is search
+    assert x_axis._is_decreasing is not None
+    assert len(x_axis._x_axis) == capacity
+
+
+def test_XAxis_from_arrays():
+    x_axis = _x_axis_with_values(10)
+    arrays = [x_axis.vr_position, x_axis.lrsh_position, x_axis.frame_number, x_axis.x_axis]
+    x_axis_copy = XAxis.XAxis.from_arrays(b'A', b'B', b'C', *arrays)
+    assert list(x_axis_copy) == list(x_axis)
+    assert x_axis_copy.x_axis.base is x_axis.x_axis.base
+    x_axis_copy.append(File.LogicalRecordPositionBase(0x0, 0x4), 11, 1.0)
+    assert len(x_axis_copy) == 11
+    assert len(x_axis) == 10
+
+
+def test_XAxis_from_arrays_raises():
+    arrays = [np.zeros(2, dtype=np.int64)] * 3 + [np.zeros(3, dtype=np.float64)]
+    with pytest.raises(XAxis.ExceptionXAxis) as err:
+        XAxis.XAxis.from_arrays(b'A', b'B', b'C', *arrays)
+    assert err.value.args[0] == 'Array lengths differ: 2, 2, 2, 3'
+
+
+def test_XAxis_setstate_from_list_of_iflr_references():
+    x_axis = _x_axis_with_values(10)
+    state = {
+        'ident': b'A', 'long_name': b'B', 'units': b'C', '_summary': None,
+        '_data': list(x_axis),
+    }
+    x_axis_copy = XAxis.XAxis.__new__(XAxis.XAxis)
+    x_axis_copy.__setstate__(state)
+    assert list(x_axis_copy) == list(x_axis)
+
+
+def _x_axis_from_values(values) -> XAxis.XAxis:
+    x_axis = XAxis.XAxis(ident=b'A', long_name=b'B', units=b'C')
+    for i, value in enumerate(values):
+        x_axis.append(File.LogicalRecordPositionBase(0x100 * i, 0x100 * i + 4), i + 1, value)
+    return x_axis
+
+
+@pytest.mark.parametrize(
+    'values, expected',
+    (
+        ((1.0,), False),
+        ((1.0, 2.0, 3.0), False),
+        ((3.0, 2.0, 1.0), True),
+        ((3.0, 2.0, 4.0, 1.0, 0.0), True),
+    )
+)
+def test_XAxis_is_decreasing(values, expected):
+    assert _x_axis_from_values(values).is_decreasing == expected
+
+
+@pytest.mark.parametrize(
+    'values, value, side, expected',
+    (
+        # Increasing
+        ((10.0, 10.5, 11.0, 11.5), 10.0, 'nearest', 0),
+        ((10.0, 10.5, 11.0, 11.5), 10.2, 'nearest', 0),
+        ((10.0, 10.5, 11.0, 11.5), 10.3, 'nearest', 1),
+        ((10.0, 10.5, 11.0, 11.5), 9.0, 'nearest', 0),
+        ((10.0, 10.5, 11.0, 11.5), 12.0, 'nearest', 3),
+        ((10.0, 10.5, 11.0, 11.5), 10.5, 'left', 1),
+        ((10.0, 10.5, 11.0, 11.5), 10.5, 'right', 2),
+        ((10.0, 10.5, 11.0, 11.5), 12.0, 'left', 4),
+        # Decreasing
+        ((11.5, 11.0, 10.5, 10.0), 11.5, 'nearest', 0),
+        ((11.5, 11.0, 10.5, 10.0), 10.2, 'nearest', 3),
+        ((11.5, 11.0, 10.5, 10.0), 10.3, 'nearest', 2),
+        ((11.5, 11.0, 10.5, 10.0), 12.0, 'nearest', 0),
+        ((11.5, 11.0, 10.5, 10.0), 9.0, 'nearest', 3),
+        ((11.5, 11.0, 10.5, 10.0), 11.0, 'left', 1),
+        ((11.5, 11.0, 10.5, 10.0), 11.0, 'right', 2),
+        # Glitch
+        ((10.0, 10.5, 10.25, 11.0, 11.5), 10.25, 'left', 2),
+        ((10.0, 10.5, 10.25, 11.0, 11.5), 10.25, 'right', 1),
+        ((10.0, 10.5, 10.25, 11.0, 11.5), 11.0, 'left', 3),
+        # Large spike
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 5.0, 'nearest', 5),
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 5.0, 'left', 5),
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 5.0, 'right', 6),
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 900.0, 'nearest', 3),
+        ((8.0, 7.0, 6.0, 5.0, -1000.0, 3.0, 2.0, 1.0, 0.0), 2.0, 'nearest', 6),
+        ((8.0, 7.0, 6.0, 5.0, -1000.0, 3.0, 2.0, 1.0, 0.0), 2.0, 'left', 6),
+        ((8.0, 7.0, 6.0, 5.0, -1000.0, 3.0, 2.0, 1.0, 0.0), 2.0, 'right', 7),
+    )
+)
+def test_XAxis_frame_for_x(values, value, side, expected):
+    x_axis = _x_axis_from_values(values)
+    assert x_axis.frame_for_x(value, side) == expected
+
+
+def test_XAxis_frame_for_x_raises_side():
+    x_axis = _x_axis_from_values((1.0, 2.0))
+    with pytest.raises(XAxis.ExceptionXAxis) as err:
+        x_axis.frame_for_x(1.0, 'middle')
+    assert err.value.args[0] == "side must be 'left', 'right' or 'nearest' not 'middle'"
+
+
+def test_XAxis_frame_for_x_raises_empty():
+    x_axis = _x_axis_from_values(())
+    with pytest.raises(XAxis.ExceptionXAxis) as err:
+        x_axis.frame_for_x(1.0)
+    assert err.value.args[0] == 'Can not search an empty X axis.'
+
+
+@pytest.mark.parametrize(
+    'values, x_start, x_stop, expected',
+    (
+        ((), 0.0, 1.0, Slice.Slice(0, 0)),
+        ((10.0, 10.5, 11.0, 11.5), 10.5, 11.0, Slice.Slice(1, 3)),
+        ((10.0, 10.5, 11.0, 11.5), 11.0, 10.5, Slice.Slice(1, 3)),
+        ((10.0, 10.5, 11.0, 11.5), 10.4, 11.1, Slice.Slice(1, 3)),
+        ((10.0, 10.5, 11.0, 11.5), 0.0, 100.0, Slice.Slice(0, 4)),
+        ((10.0, 10.5, 11.0, 11.5), 12.0, 13.0, Slice.Slice(4, 4)),
+        ((11.5, 11.0, 10.5, 10.0), 10.5, 11.0, Slice.Slice(1, 3)),
+        ((11.5, 11.0, 10.5, 10.0), 11.0, 10.5, Slice.Slice(1, 3)),
+        ((11.5, 11.0, 10.5, 10.0), 0.0, 100.0, Slice.Slice(0, 4)),
+        ((10.0, 10.5, 10.25, 11.0, 11.5), 10.5, 11.0, Slice.Slice(1, 4)),
+        # Large spike
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 4.0, 6.0, Slice.Slice(4, 7)),
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 1.0, 6.0, Slice.Slice(1, 7)),
+        ((0.0, 1.0, 2.0, 1000.0, 4.0, 5.0, 6.0, 7.0, 8.0), 2.5, 3.5, Slice.Slice(4, 4)),
+        ((8.0, 7.0, 6.0, 5.0, -1000.0, 3.0, 2.0, 1.0, 0.0), 1.0, 3.0, Slice.Slice(5, 8)),
+        ((8.0, 7.0, 6.0, 5.0, -1000.0, 3.0, 2.0, 1.0, 0.0), 3.0, 7.0, Slice.Slice(1, 6)),
+    )
+)
+def test_XAxis_frames_between(values, x_start, x_stop, expected):
+    x_axis = _x_axis_from_values(values)
+    assert x_axis.frames_between(x_start, x_stop) == expected
+
+
+def test_XAxis_search_computes_direction_once(monkeypatch):
+    x_axis = _x_axis_from_values((11.5, 11.0, 10.5, 10.0))
+    calls = []
+    median = XAxis.np.median
+    monkeypatch.setattr(XAxis.np, 'median', lambda *args, **kwargs: calls.append(args) or median(*args, **kwargs))
+    for value in (10.0, 10.5, 11.0):
+        x_axis.frame_for_x(value)
+        x_axis.frames_between(value, value + 1.0)
+    assert len(calls) == 1
+    x_axis.append(File.LogicalRecordPositionBase(0x1000, 0x1004), 5, 9.5)
+    assert x_axis.frame_for_x(9.5) == 4
+    assert len(calls) == 2
+
+
+def test_XAxis_frames_between_after_append():
+    x_axis = _x_axis_from_values((10.0, 10.5))
+    assert x_axis.frames_between(10.0, 20.0) == Slice.Slice(0, 2)
+    x_axis.append(File.LogicalRecordPositionBase(0x1000, 0x1004), 3, 11.0)
+    assert x_axis.frames_between(10.0, 20.0) == Slice.Slice(0, 3)
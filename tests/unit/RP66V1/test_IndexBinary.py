@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from TotalDepth.RP66V1 import IndexBinary
+from TotalDepth.RP66V1.core import BinaryIndex
+from tests.unit import test_DeTif
+from tests.unit.RP66V1.core import test_data
+
+
+@pytest.mark.parametrize('read_back', (False, True))
+def test_index_a_single_file(tmpdir, read_back):
+    path_in = tmpdir.join('BASIC_FILE.dlis')
+    path_in.write_binary(test_data.BASIC_FILE, ensure=True)
+    path_out = os.path.join(tmpdir, 'out', 'BASIC_FILE.dlis')
+    result = IndexBinary.index_a_single_file(path_in.strpath, path_out, read_back)
+    assert not result.exception
+    assert not result.ignored
+    assert result.size_index == BinaryIndex.index_size(path_out + IndexBinary.INDEX_EXTENSION)
+    assert (result.time_read > 0.0) == read_back
+    with BinaryIndex.LogicalIndexBinary(path_out + IndexBinary.INDEX_EXTENSION) as logical_index:
+        assert len(logical_index) == 1
+
+
+def test_index_dir_or_file_incremental(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    dir_out = os.path.join(tmpdir, 'out')
+    tmpdir.join('in', 'BASIC_FILE.dlis').write_binary(test_data.BASIC_FILE, ensure=True)
+    tmpdir.join('in', 'MINIMAL_FILE.dlis').write_binary(test_data.MINIMAL_FILE, ensure=True)
+    first = IndexBinary.index_dir_or_file(dir_in, dir_out, False, False, incremental=True)
+    assert sorted(os.path.basename(k) for k in first) == ['BASIC_FILE.dlis', 'MINIMAL_FILE.dlis']
+    header_path = os.path.join(dir_out, 'BASIC_FILE.dlis.idx', BinaryIndex.HEADER_FILE)
+    mtime_ns = os.stat(header_path).st_mtime_ns
+    second = IndexBinary.index_dir_or_file(dir_in, dir_out, False, False, incremental=True)
+    assert second == first
+    assert os.stat(header_path).st_mtime_ns == mtime_ns
+
+
+def test_index_dir_or_file_tif(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    dir_out = os.path.join(tmpdir, 'out')
+    tmpdir.join('in', 'BASIC_FILE.dlis').write_binary(test_data.BASIC_FILE, ensure=True)
+    tmpdir.join('in', 'BASIC_FILE_TIF.dlis').write_binary(
+        test_DeTif.tif_encode(test_data.BASIC_FILE, 1024), ensure=True
+    )
+    result = IndexBinary.index_dir_or_file(dir_in, dir_out, False, True)
+    assert sorted(os.path.basename(k) for k in result) == ['BASIC_FILE.dlis', 'BASIC_FILE_TIF.dlis']
+    assert not any(v.exception for v in result.values())
+    with BinaryIndex.LogicalIndexBinary(os.path.join(dir_out, 'BASIC_FILE.dlis.idx')) as logical_index:
+        expected = str(logical_index.logical_files[0].log_pass)
+    with BinaryIndex.LogicalIndexBinary(os.path.join(dir_out, 'BASIC_FILE_TIF.dlis.idx')) as logical_index:
+        assert str(logical_index.logical_files[0].log_pass) == expected
@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pytest
+
+from TotalDepth.RP66V1 import ToLAS
+from TotalDepth.RP66V1.core import LogicalFile
+from TotalDepth.common import Slice
+from tests.unit.RP66V1.core import test_data
+
+
+@pytest.mark.parametrize('method', sorted(ToLAS.ARRAY_REDUCTIONS))
+@pytest.mark.parametrize(
+    'array',
+    (
+        np.arange(8, dtype=np.float32).reshape(8, 1),
+        np.arange(24, dtype=np.int32).reshape(8, 3),
+        np.random.RandomState(1234).random_sample((8, 2, 3)),
+    )
+)
+def test_array_reduce_frames(array, method):
+    expected = np.array([ToLAS.array_reduce(frame, method) for frame in array])
+    assert np.array_equal(ToLAS.array_reduce_frames(array, method), expected)
+
+
+def test_array_reduce_frames_raises():
+    with pytest.raises(ValueError) as err:
+        ToLAS.array_reduce_frames(np.zeros((4, 1)), 'sum')
+    assert err.value.args[0].startswith('sum is not in')
+
+
+def _write_array_section(frame_slice, channels, frame_chunk_size) -> str:
+    ostream = io.StringIO()
+    with LogicalFile.LogicalIndex(io.BytesIO(test_data.BASIC_FILE)) as logical_index:
+        logical_file = logical_index.logical_files[0]
+        ToLAS.write_array_section_to_las(
+            logical_file, logical_file.log_pass[0], 'mean', frame_slice, channels, 16, '.3f', ostream,
+            frame_chunk_size=frame_chunk_size,
+        )
+    return ostream.getvalue()
+
+
+@pytest.mark.parametrize(
+    'frame_slice, channels',
+    (
+        (Slice.Slice(), set()),
+        (Slice.Slice(8, 64, 3), set()),
+        (Slice.Sample(7), set()),
+        (Slice.Slice(), {'TENS'}),
+    )
+)
+@pytest.mark.parametrize('frame_chunk_size', (1, 7, 649))
+def test_write_array_section_to_las_chunks(frame_slice, channels, frame_chunk_size):
+    expected = _write_array_section(frame_slice, channels, ToLAS.FRAME_CHUNK_SIZE)
+    assert _write_array_section(frame_slice, channels, frame_chunk_size) == expected
+    lines = expected.split('\n')
+    array_start = [i for i, line in enumerate(lines) if line.startswith('~A')][0]
+    num_frames = frame_slice.count(649)
+    # Header, frames and the empty string after the final newline.
+    assert len(lines) == array_start + 1 + num_frames + 1
+
+
+def test_write_array_section_to_las_values():
+    result = _write_array_section(Slice.Slice(0, 2), {'TENS'}, 1)
+    lines = result.split('\n')
+    array_start = [i for i, line in enumerate(lines) if line.startswith('~A')][0]
+    assert lines[array_start] == '~A          DEPT             TENS'
+    assert [len(line.split()) for line in lines[array_start + 1:]] == [2, 2, 0]
@@ -395,3 +395,59 @@ def test_create_slice_or_sample_raises(init, expected):
     with pytest.raises(ValueError) as err:
         Slice.create_slice_or_sample(init)
     assert err.value.args[0] == expected
+
+
+@pytest.mark.parametrize(
+    'init, length, expected',
+    (
+        ([], 8, []),
+        ([0, 2, 5], 8, [0, 2, 5]),
+        ([0, 2, 5], 5, [0, 2]),
+    )
+)
+def test_index_list_indices(init, length, expected):
+    index_list = Slice.IndexList(init)
+    assert index_list.indices(length) == expected
+    assert list(index_list.gen_indices(length)) == expected
+    assert index_list.count(length) == len(expected)
+
+
+def test_index_list_first_last_step():
+    index_list = Slice.IndexList([3, 5, 6, 10])
+    assert index_list.first(12) == 3
+    assert index_list.last(12) == 10
+    assert index_list.last(8) == 6
+    assert index_list.step(12) == 1
+    assert Slice.IndexList([4]).step(12) == 1
+
+
+def test_index_list_str():
+    assert str(Slice.IndexList([3, 5, 6, 10])) == '<IndexList count: 4 from 3 to 10>'
+    assert str(Slice.IndexList([])) == '<IndexList count: 0>'
+    assert Slice.IndexList([3, 5, 6, 10]).long_str(8) == '<IndexList 3 out of 8 from 3 to 6>'
+    assert Slice.IndexList([3, 5, 6, 10]).long_str(2) == '<IndexList 0 out of 2>'
+
+
+@pytest.mark.parametrize(
+    'slice_or_sample, length',
+    (
+        (Slice.Slice(), 0),
+        (Slice.Slice(), 1),
+        (Slice.Slice(), 100),
+        (Slice.Slice(3, 91, 7), 100),
+        (Slice.Slice(None, None, -2), 100),
+        (Slice.Sample(7), 12),
+        (Slice.Sample(64), 1000),
+    )
+)
+@pytest.mark.parametrize('chunk_size', (1, 3, 64, 1000))
+def test_gen_chunks(slice_or_sample, length, chunk_size):
+    chunks = list(Slice.gen_chunks(slice_or_sample, length, chunk_size))
+    assert [i for chunk in chunks for i in chunk.indices(length)] == slice_or_sample.indices(length)
+    assert all(0 < chunk.count(length) <= chunk_size for chunk in chunks)
+
+
+def test_gen_chunks_raises():
+    with pytest.raises(ValueError) as err:
+        list(Slice.gen_chunks(Slice.Slice(), 10, 0))
+    assert err.value.args[0] == 'Chunk size must be an integer >= 1 not 0'
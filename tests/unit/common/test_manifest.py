@@ -0,0 +1,158 @@
+import os
+
+import pytest
+
+from TotalDepth.common import manifest
+from TotalDepth.RP66V1 import IndexXML
+from tests.unit.RP66V1.core import test_data
+
+
+def _process(mfst: manifest.Manifest, path_in: str) -> str:
+    """Processes a single file unless unchanged, returns the result."""
+    result = mfst.unchanged_result(path_in)
+    if result is None:
+        path_out = os.path.join(mfst.dir_out, os.path.relpath(path_in, mfst.dir_in)) + '.out'
+        os.makedirs(os.path.dirname(path_out), exist_ok=True)
+        with open(path_out, 'wb') as fobj:
+            fobj.write(b'output')
+        result = f'result {os.path.basename(path_in)}'
+        mfst.update(path_in, result, [path_out])
+    return result
+
+
+def _run(dir_in, dir_out, version='0.1.0', enabled=True) -> manifest.Manifest:
+    with manifest.Manifest(dir_in, dir_out, 'Test', version, enabled=enabled) as mfst:
+        for name in sorted(os.listdir(dir_in)):
+            _process(mfst, os.path.join(dir_in, name))
+    return mfst
+
+
+@pytest.mark.parametrize(
+    'content',
+    (b'', b'small', b'A' * manifest.FINGERPRINT_SIZE, b'A' * (manifest.FINGERPRINT_SIZE + 1), b'A' * 300 * 1024)
+)
+def test_fingerprint(tmpdir, content):
+    path = tmpdir.join('a.bin')
+    path.write_binary(content, ensure=True)
+    assert manifest.fingerprint(path) == manifest.fingerprint(path)
+    # Different size.
+    other = tmpdir.join('b.bin')
+    other.write_binary(content + b'A', ensure=True)
+    assert manifest.fingerprint(path) != manifest.fingerprint(other)
+
+
+def test_manifest_first_run(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    tmpdir.join('in', 'b.bin').write_binary(b'B', ensure=True)
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (0, 2, 2)
+    assert os.path.isfile(os.path.join(tmpdir, 'out', '.manifest.Test.pkl'))
+    assert str(mfst) == f'<Manifest {mfst.path} entries: 2 skipped: 0 processed: 2>'
+
+
+def test_manifest_unchanged(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    tmpdir.join('in', 'b.bin').write_binary(b'B', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (2, 0, 2)
+    assert mfst.unchanged_result(os.path.join(dir_in, 'a.bin')) == 'result a.bin'
+
+
+def test_manifest_modified(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    tmpdir.join('in', 'b.bin').write_binary(b'B', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    tmpdir.join('in', 'b.bin').write_binary(b'BB', ensure=True)
+    tmpdir.join('in', 'c.bin').write_binary(b'C', ensure=True)
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (1, 2, 3)
+
+
+def test_manifest_touched_same_content(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    path = tmpdir.join('in', 'a.bin')
+    path.write_binary(b'A', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    os.utime(path, ns=(0, 0))
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed) == (1, 0)
+    # The new modification time has been recorded.
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert mfst._entries['a.bin'].mtime_ns == 0
+
+
+def test_manifest_touched_different_content(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    path = tmpdir.join('in', 'a.bin')
+    path.write_binary(b'A', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    path.write_binary(b'Z')
+    os.utime(path, ns=(0, 0))
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed) == (0, 1)
+
+
+def test_manifest_version_change(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'), version='0.2.0')
+    assert (mfst.skipped, mfst.processed) == (0, 1)
+
+
+def test_manifest_output_missing(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    os.remove(os.path.join(tmpdir, 'out', 'a.bin.out'))
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed) == (0, 1)
+    assert os.path.isfile(os.path.join(tmpdir, 'out', 'a.bin.out'))
+
+
+def test_manifest_removes_orphans(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    path = tmpdir.join('in', 'b.bin')
+    path.write_binary(b'B', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'))
+    os.remove(path)
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (1, 0, 1)
+    assert sorted(os.listdir(os.path.join(tmpdir, 'out'))) == ['.manifest.Test.pkl', 'a.bin.out']
+
+
+def test_manifest_disabled(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    _run(dir_in, os.path.join(tmpdir, 'out'), enabled=False)
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'), enabled=False)
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (0, 0, 0)
+    assert not os.path.exists(mfst.path)
+
+
+def test_manifest_unreadable(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    tmpdir.join('in', 'a.bin').write_binary(b'A', ensure=True)
+    tmpdir.join('out', '.manifest.Test.pkl').write_binary(b'not a pickle', ensure=True)
+    mfst = _run(dir_in, os.path.join(tmpdir, 'out'))
+    assert (mfst.skipped, mfst.processed, len(mfst)) == (0, 1, 1)
+
+
+def test_manifest_index_xml(tmpdir):
+    dir_in = os.path.join(tmpdir, 'in')
+    dir_out = os.path.join(tmpdir, 'out')
+    tmpdir.join('in', 'BASIC_FILE.dlis').write_binary(test_data.BASIC_FILE, ensure=True)
+    first = IndexXML.index_dir_or_file(dir_in, dir_out, False, False, incremental=True)
+    xml_path = os.path.join(dir_out, 'BASIC_FILE.dlis.xml')
+    mtime_ns = os.stat(xml_path).st_mtime_ns
+    second = IndexXML.index_dir_or_file(dir_in, dir_out, False, False, incremental=True)
+    assert second == first
+    assert os.stat(xml_path).st_mtime_ns == mtime_ns
+    # Changing the private flag changes the output so the file is processed again.
+    with manifest.Manifest(dir_in, dir_out, 'IndexXML', f'{IndexXML.__version__} private=True') as mfst:
+        assert mfst.unchanged_result(os.path.join(dir_in, 'BASIC_FILE.dlis')) is None
@@ -0,0 +1,96 @@
+import argparse
+import os
+import time
+
+import psutil
+import pytest
+
+from TotalDepth.common import schedule
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _fail_on_three(value: int) -> int:
+    if value == 3:
+        raise ValueError('Three')
+    return value
+
+
+def _sleep(value: float) -> float:
+    time.sleep(value)
+    return value
+
+
+def _allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+def test_file_task(tmpdir):
+    path = os.path.join(tmpdir, 'a.bin')
+    with open(path, 'wb') as fobj:
+        fobj.write(b'\x00' * 128)
+    assert schedule.file_task(path, 'out', True) == schedule.Task(128, (path, 'out', True))
+
+
+def test_largest_first():
+    tasks = [schedule.Task(1, ('a',)), schedule.Task(8, ('b',)), schedule.Task(1, ('c',)), schedule.Task(4, ('d',))]
+    assert [t.args[0] for t in schedule.largest_first(tasks)] == ['b', 'd', 'a', 'c']
+
+
+@pytest.mark.parametrize('jobs', (-1, 0, 1, 2, 8))
+@pytest.mark.parametrize('chunksize', (1, 3))
+def test_imap_tasks(jobs, chunksize):
+    tasks = [schedule.Task(v, (v,)) for v in range(8)]
+    results = list(schedule.imap_tasks(_square, tasks, jobs, chunksize))
+    assert sorted((r.task.args[0], r.result) for r in results) == [(v, v * v) for v in range(8)]
+    assert all(r.exception == '' for r in results)
+    assert all(r.time >= 0.0 for r in results)
+
+
+def test_imap_tasks_empty():
+    assert list(schedule.imap_tasks(_square, [], 2)) == []
+
+
+def test_imap_tasks_largest_first():
+    tasks = [schedule.Task(v, (v,)) for v in range(8)]
+    # A single process completes the tasks in the order that they are submitted.
+    results = list(schedule.imap_tasks(_square, tasks, 1))
+    assert [r.task.size for r in results] == list(reversed(range(8)))
+
+
+def test_imap_tasks_exception():
+    tasks = [schedule.Task(v, (v,)) for v in range(6)]
+    results = {r.task.args[0]: r for r in schedule.imap_tasks(_fail_on_three, tasks, 2)}
+    assert len(results) == 6
+    assert results[3].result is None
+    assert results[3].exception == 'ValueError: Three'
+    assert [results[v].result for v in (0, 1, 2, 4, 5)] == [0, 1, 2, 4, 5]
+
+
+def test_imap_tasks_timeout():
+    tasks = [schedule.Task(0, (0.0,)), schedule.Task(1, (10.0,))]
+    t_start = time.perf_counter()
+    results = {r.task.args[0]: r for r in schedule.imap_tasks(_sleep, tasks, 2, timeout=0.25)}
+    assert time.perf_counter() - t_start < 5.0
+    assert results[0.0].exception == ''
+    assert results[10.0].result is None
+    assert results[10.0].exception == 'ExceptionScheduleTimeout: Task exceeded time limit of 0.25 (s)'
+
+
+def test_imap_tasks_memory_limit():
+    memory_limit = psutil.Process().memory_info().vms + 256 * 1024**2
+    tasks = [schedule.Task(1, (1024,)), schedule.Task(2, (1024**3,))]
+    results = {r.task.args[0]: r for r in schedule.imap_tasks(_allocate, tasks, 2, memory_limit=memory_limit)}
+    assert results[1024].result == 1024
+    assert results[1024**3].result is None
+    assert results[1024**3].exception.startswith('MemoryError')
+
+
+def test_add_schedule_to_argument_parser():
+    parser = argparse.ArgumentParser()
+    schedule.add_schedule_to_argument_parser(parser)
+    args = parser.parse_args(['--task-memory=512', '--task-timeout=60'])
+    assert schedule.memory_limit_from_args(args) == 512 * 1024**2
+    assert args.task_timeout == 60.0
@@ -97,3 +97,86 @@ def test_get_errors(file_in, file_size, expected_errors):
     # print(result)
     assert result == expected_errors
 
+
+
+def tif_encode(by: bytes, block_size: int, first_block_size: int = 80) -> bytes:
+    """Returns the bytes with TIF markers. The first block is first_block_size bytes (an RP66V1 Storage Unit Label) then
+    blocks of block_size bytes. This is followed by the two trailing TIF markers."""
+    blocks = [by[:first_block_size]] + [
+        by[i:i + block_size] for i in range(first_block_size, len(by), block_size)
+    ]
+    ret = bytearray()
+    prev = 0
+    for block in blocks:
+        tell = len(ret)
+        ret += DeTif.TIFS_STRUCT.pack(0, prev, tell + DeTif.TIF_TRIPLET_NUM_BYTES + len(block)) + block
+        prev = tell
+    for _i in range(2):
+        tell = len(ret)
+        ret += DeTif.TIFS_STRUCT.pack(1, prev, tell + DeTif.TIF_TRIPLET_NUM_BYTES)
+        prev = tell
+    return bytes(ret)
+
+
+@pytest.mark.parametrize('block_size', (1, 3, 16, 1024))
+def test_tif_encode(block_size):
+    by = bytes(range(256))
+    file_out = io.BytesIO()
+    DeTif.strip_tif(io.BytesIO(tif_encode(by, block_size)), file_out)
+    assert file_out.getvalue() == by
+
+
+@pytest.mark.parametrize(
+    'file_in, expected',
+    (
+        (io.BytesIO(TIF_EMPTY_FILE), b''),
+        (io.BytesIO(TIF_EIGHT_BYTES_FILE), b'\x01\x02\x03\x04\x05\x06\x07\x08'),
+        (io.BytesIO(tif_encode(bytes(range(256)), 7, 1)), bytes(range(256))),
+        # Truncated last block.
+        (io.BytesIO(tif_encode(bytes(range(256)), 100)[:-24 - 10]), bytes(range(246))),
+    )
+)
+def test_tif_stream_read(file_in, expected):
+    tif_stream = DeTif.TifStream(file_in)
+    assert tif_stream.size == len(expected)
+    assert tif_stream.read() == expected
+    assert tif_stream.tell() == len(expected)
+    assert tif_stream.read() == b''
+
+
+@pytest.mark.parametrize('block_size', (1, 7, 16, 100))
+def test_tif_stream_seek_read(block_size):
+    by = bytes(range(256))
+    tif_stream = DeTif.TifStream(io.BytesIO(tif_encode(by, block_size)))
+    for position in (0, 1, 79, 80, 81, 127, 250, 256, 300):
+        for length in (0, 1, 2, 16, 200):
+            assert tif_stream.seek(position) == position
+            assert tif_stream.read(length) == by[position:position + length]
+            assert tif_stream.tell() == min(position + length, max(position, len(by)))
+
+
+def test_tif_stream_seek_whence():
+    tif_stream = DeTif.TifStream(io.BytesIO(TIF_EIGHT_BYTES_FILE))
+    assert tif_stream.seek(-2, io.SEEK_END) == 6
+    assert tif_stream.read(1) == b'\x07'
+    assert tif_stream.seek(-3, io.SEEK_CUR) == 4
+    assert tif_stream.read() == b'\x05\x06\x07\x08'
+    with pytest.raises(ValueError):
+        tif_stream.seek(-1)
+
+
+def test_tif_stream_readinto():
+    tif_stream = DeTif.TifStream(io.BytesIO(TIF_EIGHT_BYTES_FILE))
+    buffer = bytearray(16)
+    assert tif_stream.readinto(buffer) == 8
+    assert buffer == b'\x01\x02\x03\x04\x05\x06\x07\x08' + b'\x00' * 8
+    assert tif_stream.readable()
+    assert tif_stream.seekable()
+    assert not tif_stream.writable()
+
+
+def test_tif_stream_raises_negative_block():
+    by = DeTif.TIFS_STRUCT.pack(0, 0, 12) + DeTif.TIFS_STRUCT.pack(1, 0, 16)
+    with pytest.raises(DeTif.DeTifExceptionRead) as err:
+        DeTif.TifStream(io.BytesIO(by))
+    assert err.value.args[0].startswith('TIF marker suggests negative block size: ')
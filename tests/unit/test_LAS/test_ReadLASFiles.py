@@ -0,0 +1,78 @@
+import pytest
+
+from TotalDepth.LAS import ReadLASFiles
+
+
+LAS_FILE = """~VERSION INFORMATION
+ VERS.                        2.0: CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.                         NO: ONE LINE PER DEPTH STEP
+~WELL INFORMATION
+ STRT.F                 1700.0000: START DEPTH
+ STOP.F                 1701.0000: STOP DEPTH
+ STEP.F                    0.5000: STEP LENGTH
+ NULL.                  -999.2500: NO VALUE
+~CURVE INFORMATION
+ DEPT.F                          : 1 Depth
+ GR  .GAPI           45 310 01 00: 2 Gamma Ray
+~Parameter Information
+ EKB .F                 1206.0000: Kelly bushing
+~A  DEPT        GR
+ 1700.0000  -999.2500
+ 1700.5000    40.7909
+ 1701.0000  -999.2500
+"""
+
+# The array section has no curve section to describe it.
+LAS_FILE_ERROR = """~VERSION INFORMATION
+ VERS.                        2.0: CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.                         NO: ONE LINE PER DEPTH STEP
+~A
+ 1700.0000  -999.2500
+"""
+
+
+def test_summarise_las_file(tmpdir):
+    path = tmpdir.join('a.las')
+    path.write(LAS_FILE, ensure=True)
+    summary = ReadLASFiles.summariseLASFile(path.strpath)
+    assert summary.error == ''
+    assert summary.sectTypes == 'VWCPA'
+    assert summary.curves == (('DEPT', 'F'), ('GR', 'GAPI'))
+    assert ('P', 'EKB', 'F', 'Kelly bushing') in summary.sectLines
+    assert (summary.numFrames, summary.numDataPoints) == (3, 6)
+    assert summary.xRange == (1700.0, 1701.0)
+    assert summary.nullCounts == (0, 2)
+
+
+def test_summarise_las_file_header_only(tmpdir):
+    path = tmpdir.join('a.las')
+    path.write(LAS_FILE, ensure=True)
+    summary = ReadLASFiles.summariseLASFile(path.strpath, headerOnly=True)
+    assert summary.error == ''
+    assert summary.sectTypes == 'VWCPA'
+    assert summary.curves == (('DEPT', 'F'), ('GR', 'GAPI'))
+    assert (summary.numFrames, summary.xRange, summary.nullCounts) == (-1, None, ())
+
+
+def test_summarise_las_file_error(tmpdir):
+    path = tmpdir.join('a.las')
+    path.write(LAS_FILE_ERROR, ensure=True)
+    summary = ReadLASFiles.summariseLASFile(path.strpath)
+    assert summary.error != ''
+    assert not summary.critical
+
+
+@pytest.mark.parametrize('jobs', (-1, 0, 2))
+@pytest.mark.parametrize('header_only', (False, True))
+def test_read_las_files(tmpdir, jobs, header_only):
+    for i in range(4):
+        tmpdir.join(f'{i}.las').write(LAS_FILE, ensure=True)
+    tmpdir.join('error.las').write(LAS_FILE_ERROR, ensure=True)
+    reader = ReadLASFiles.ReadLASFiles(str(tmpdir), jobs, header_only)
+    assert (reader._cntrs['file'], reader._cntrs['erro'], reader._cntrs['crit']) == (5, 1, 0)
+    assert reader._cntrs['fram'] == (0 if header_only else 12)
+    assert reader._cntrs['null'] == (0 if header_only else 8)
+    assert dict(reader._wsdMnemCount) == {'STRT': 4, 'STOP': 4, 'STEP': 4, 'NULL': 4, 'EKB': 4}
+    assert sorted(reader._curveDescMap.keys()) == ['DEPT', 'GR']
+    assert reader._curveDescMap['GR'] == {'Gamma Ray': 4}
+    assert 'Files OK:          4' in reader.results()
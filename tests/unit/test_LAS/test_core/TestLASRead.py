@@ -404,7 +404,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         myLsA = LASRead.LASSectionArray('A', False, myLsC)
         myLsA.finalise()
         self.assertEqual('A', myLsA.type)
-        self.assertEqual([], myLsA._members)
+        self.assertEqual([], myLsA.array.tolist())
         self.assertFalse(myLsA._wrap)
         self.assertEqual(
             [
@@ -435,7 +435,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         myLsA.finalise()
         self.assertEqual('A', myLsA.type)
 #        print()
-#        pprint.pprint(myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
         exp = [
             [1700.0, -999.25, -999.25, -999.25, -999.25],
             [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
@@ -446,7 +446,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
             [1703.0, 52.4264, 0.029, 0.0229, 17.8425],
             [1703.5, 61.1144, 0.0199, 0.0383, 13.2042],
         ]
-        self.assertEqual(exp, myLsA._members)
+        self.assertEqual(exp, myLsA.array.tolist())
 #        print()
 #        print(list(myLsA.keys()))
         self.assertEqual(
@@ -480,7 +480,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         myLsA.finalise()
         self.assertEqual('A', myLsA.type)
 #        print()
-#        pprint.pprint(myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
         exp = [
             [1700.0, -999.25, -999.25, -999.25, -999.25],
             [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
@@ -491,7 +491,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
             [1703.0, 52.4264, 0.029, 0.0229, 17.8425],
             [1703.5, 61.1144, 0.0199, 0.0383, 13.2042],
         ]
-        self.assertEqual(exp, myLsA._members)
+        self.assertEqual(exp, myLsA.array.tolist())
 #        print()
 #        print(list(myLsA.keys()))
         self.assertEqual(
@@ -533,7 +533,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         myLsA.finalise()
         self.assertEqual('A', myLsA.type)
 #        print()
-#        pprint.pprint(myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
         exp = [
             [1700.0, -999.25, -999.25, -999.25, -999.25],
             [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
@@ -544,7 +544,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
             [1703.0, 52.4264, 0.029, 0.0229, 17.8425],
             [1703.5, 61.1144, 0.0199, 0.0383, 13.2042],
         ]
-        self.assertEqual(exp, myLsA._members)
+        self.assertEqual(exp, myLsA.array.tolist())
 #        print()
 #        print(list(myLsA.keys()))
         self.assertEqual(
@@ -570,7 +570,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         myLsA.finalise()
         self.assertEqual('A', myLsA.type)
 #        print()
-#        pprint.pprint(myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
         exp = [
             [1700.0, -999.25, -999.25, -999.25, -999.25],
             [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
@@ -581,7 +581,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
             [1703.0, 52.4264, 0.029, 0.0229, 17.8425],
             [1703.5, 61.1144, 0.0199, 0.0383, 13.2042],
         ]
-        self.assertEqual(exp, myLsA._members)
+        self.assertEqual(exp, myLsA.array.tolist())
 #        print()
 #        print(list(myLsA.keys()))
         self.assertEqual(
@@ -624,7 +624,7 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         for i, l in enumerate(myStr.split('\n')):
             myLsA.addMemberLine(i, l)
         myLsA.finalise()
-        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, -999.25]], myLsA._members)
+        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, -999.25]], myLsA.array.tolist())
         
     def test_12(self):
         """TestLASReadLASSectionArray.test_12(): Populate with array, with wrap +1 fails when missing one value, single line."""
@@ -641,8 +641,8 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         except LASRead.ExceptionLASReadSectionArray:
             pass
 #        print()
-#        pprint.pprint(myLsA._members)
-        self.assertEqual([], myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
+        self.assertEqual([], myLsA.array.tolist())
         
     def test_13(self):
         """TestLASReadLASSectionArray.test_13(): Populate with array, with wrap +1 fails when missing one value at EOF, multi line."""
@@ -662,8 +662,8 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         except LASRead.ExceptionLASReadSectionArray:
             pass
 #        print()
-#        pprint.pprint(myLsA._members)
-        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, -999.25]], myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
+        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, -999.25]], myLsA.array.tolist())
         
     def test_14(self):
         """TestLASReadLASSectionArray.test_14(): Populate with array, with wrap +1 fails when missing one value in middle, multi line."""
@@ -683,8 +683,8 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         except LASRead.ExceptionLASReadSectionArray:
             pass
 #        print()
-#        pprint.pprint(myLsA._members)
-        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, 1700.5]], myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
+        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, 1700.5]], myLsA.array.tolist())
         
     def test_15(self):
         """TestLASReadLASSectionArray.test_15(): Populate with array, with wrap +1 fails when too many values, multi line."""
@@ -702,9 +702,105 @@ class TestLASReadLASSectionArray(unittest.TestCase):
         except LASRead.ExceptionLASReadSectionArray:
             pass
 #        print()
-#        pprint.pprint(myLsA._members)
-        self.assertEqual([], myLsA._members)
+#        pprint.pprint(myLsA.array.tolist())
+        self.assertEqual([], myLsA.array.tolist())
         
+    def test_20(self):
+        """TestLASReadLASSectionArray.test_20(): Bulk lines, no wrap, with comments and invalid tokens reported by line number."""
+        myLsC = self._retSimpleCurveSection()
+        myLsA = LASRead.LASSectionArray('A', False, myLsC)
+        myStr = """ 1700.0000  -999.2500  -999.2500  -999.2500  -999.2500
+# Comment
+ 1700.5000    40.7909     ******     0.0417    25.9985
+
+ 1701.0000    44.0165     0.0347     0.0333    xxxxxx
+"""
+        myLsA.addMemberLines(10, myStr)
+        myLsA.finalise()
+        self.assertEqual(3, len(myLsA))
+        self.assertEqual(
+            [
+                [1700.0, -999.25, -999.25, -999.25, -999.25],
+                [1700.5, 40.7909, -999.25, 0.0417, 25.9985],
+                [1701.0, 44.0165, 0.0347, 0.0333, -999.25],
+            ],
+            myLsA.array.tolist(),
+        )
+        self.assertEqual([(12, '******'), (14, 'xxxxxx')], myLsA.invalidTokens)
+        self.assertEqual([1700.5, 40.7909, -999.25, 0.0417, 25.9985], myLsA[1].tolist())
+        self.assertEqual([1700.0, 1700.5, 1701.0], sorted(myLsA.keys()))
+
+    def test_21(self):
+        """TestLASReadLASSectionArray.test_21(): Bulk lines in several blocks, with wrap."""
+        myLsC = self._retSimpleCurveSection()
+        myLsA = LASRead.LASSectionArray('A', True, myLsC)
+        myLsA.addMemberLines(0, """ 1700.0000
+ -999.2500  -999.2500
+ -999.2500  -999.2500
+ 1700.5000
+""")
+        myLsA.addMemberLines(4, """ 40.7909     0.0218     0.0417    25.9985
+""")
+        myLsA.finalise()
+        self.assertEqual(
+            [
+                [1700.0, -999.25, -999.25, -999.25, -999.25],
+                [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
+            ],
+            myLsA.array.tolist(),
+        )
+        self.assertEqual((2, 5), myLsA.array.shape)
+
+    def test_22(self):
+        """TestLASReadLASSectionArray.test_22(): Bulk lines, no wrap, short lines are padded with null, long lines truncated."""
+        myLsC = self._retSimpleCurveSection()
+        myLsA = LASRead.LASSectionArray('A', False, myLsC, null=-1.0)
+        myLsA.addMemberLines(0, """ 1700.0000  40.7909
+ 1700.5000    40.7909     0.0218     0.0417    25.9985  1.0
+""")
+        myLsA.finalise()
+        self.assertEqual(
+            [
+                [1700.0, 40.7909, -1.0, -1.0, -1.0],
+                [1700.5, 40.7909, 0.0218, 0.0417, 25.9985],
+            ],
+            myLsA.array.tolist(),
+        )
+
+    def test_22_00(self):
+        """TestLASReadLASSectionArray.test_22_00(): Bulk lines, no wrap, invalid tokens of numeric characters are replaced by null and reported by line number."""
+        myLsC = self._retSimpleCurveSection()
+        myLsA = LASRead.LASSectionArray('A', False, myLsC)
+        myLsA.addMemberLines(10, """ 1700.0000  1.0  2.0  3.0  4.0
+ 1700.5000  --5  .  1.2.3  4.0
+ 1701.0000  1e  +-  3.0  4.0
+""")
+        myLsA.finalise()
+        self.assertEqual(
+            [
+                [1700.0, 1.0, 2.0, 3.0, 4.0],
+                [1700.5, -999.25, -999.25, -999.25, 4.0],
+                [1701.0, -999.25, -999.25, 3.0, 4.0],
+            ],
+            myLsA.array.tolist(),
+        )
+        self.assertEqual([(11, '--5'), (11, '.'), (11, '1.2.3'), (12, '1e'), (12, '+-')], myLsA.invalidTokens)
+
+    def test_23(self):
+        """TestLASReadLASSectionArray.test_23(): Bulk lines, with wrap, fails with the line number of more than one index value."""
+        myLsC = self._retSimpleCurveSection()
+        myLsA = LASRead.LASSectionArray('A', True, myLsC)
+        myLsA.addMemberLines(100, """ 1700.0000
+ -999.2500  -999.2500  -999.2500  -999.2500
+ 1700.5000  40.7909
+""")
+        try:
+            myLsA.finalise()
+            self.fail('LASRead.ExceptionLASReadSectionArray not raised.')
+        except LASRead.ExceptionLASReadSectionArray as err:
+            self.assertEqual('Line [102] More than one [2] index values.', str(err))
+        self.assertEqual([[1700.0, -999.25, -999.25, -999.25, -999.25]], myLsA.array.tolist())
+
 class TestLASRead(unittest.TestCase):
     """Tests high level functionality of the LASRead module."""
     def setUp(self):
@@ -1771,6 +1867,69 @@ Some other stuff that shouldn't be here.
             self.assertTrue(myLf.hasOutpMnem(Mnem.Mnem(m)))
         self.assertFalse(myLf.hasOutpMnem(Mnem.Mnem('WTF')))        
 
+    def _retWrappedFile(self, numFrames):
+        """Returns a wrapped LAS file with the given number of frames."""
+        lines = ["""~VERSION INFORMATION
+ VERS.                        2.0: CWLS LOG ASCII STANDARD - VERSION 2.0
+ WRAP.                        YES: MULTIPLE LINES PER DEPTH STEP
+~WELL INFORMATION
+ STRT.F                 1700.0000: START DEPTH
+ STOP.F                 3700.0000: STOP DEPTH
+ STEP.F                    0.5000: STEP LENGTH
+ NULL.                  -999.2500: NO VALUE
+~CURVE INFORMATION
+ DEPT.F                          : 
+ GR  .GAPI           45 310 01 00: 
+ DPHI.V/V            45 890 00 00: 
+ NPHI.V/V            42 890 00 00: 
+ ILD .OHMM           05 120 00 00: 
+~A  DEPT        GR        DPHI       NPHI      ILD
+"""]
+        for f in range(numFrames):
+            lines.append(' {:.4f}\n {:.4f} {:.4f}\n {:.4f} {:.4f}\n'.format(1700.0 + f * 0.5, f, f + 0.25, f + 0.5, f + 0.75))
+        return ''.join(lines)
+
+    def test_40(self):
+        """TestLASRead.test_40(): Tests wrapped file read in several blocks."""
+        myArrayReadSize = LASRead.ARRAY_READ_SIZE
+        LASRead.ARRAY_READ_SIZE = 100
+        try:
+            myLf = LASRead.LASRead(io.StringIO(self._retWrappedFile(50)), 'MyID')
+        finally:
+            LASRead.ARRAY_READ_SIZE = myArrayReadSize
+        self.assertEqual(50, myLf.numFrames())
+        self.assertEqual(50*5, myLf.numDataPoints())
+        self.assertEqual([1700.0 + f * 0.5 for f in range(50)], myLf['A'].array[:, 0].tolist())
+        self.assertEqual([f + 0.75 for f in range(50)], myLf['A'].array[:, 4].tolist())
+        x, v = myLf.outpPointArrays(Mnem.Mnem('DPHI'))
+        self.assertEqual([f + 0.25 for f in range(50)], v.tolist())
+        self.assertEqual(list(zip(x.tolist(), v.tolist())), list(myLf.genOutpPoints(Mnem.Mnem('DPHI'))))
+
+    def test_41(self):
+        """TestLASRead.test_41(): Tests invalid tokens are replaced by the NULL value of the well section."""
+        myFi = io.StringIO(self._retWrappedFile(2).replace('-999.2500: NO VALUE', '-1.0: NO VALUE').replace('1.7500', 'xx'))
+        myLf = LASRead.LASRead(myFi, 'MyID')
+        self.assertEqual([[1700.5, 1.0, 1.25, 1.5, -1.0]], myLf['A'].array[1:].tolist())
+        self.assertEqual([(21, 'xx')], myLf['A'].invalidTokens)
+
+    def test_42(self):
+        """TestLASRead.test_42(): Tests fail with the line number of a section after the array section."""
+        myFi = io.StringIO(self._retWrappedFile(2) + '~O\n')
+        try:
+            LASRead.LASRead(myFi, 'MyID')
+            self.fail('LASRead.ExceptionLASRead not raised.')
+        except LASRead.ExceptionLASRead as err:
+            self.assertEqual('Line: 22. Found section header line "~O\n" after array section', str(err))
+
+    def test_43(self):
+        """TestLASRead.test_43(): Tests header only read stops at the array section."""
+        myFi = io.StringIO(self._retWrappedFile(2) + 'Never read\n')
+        myLf = LASRead.LASRead(myFi, 'MyID', headerOnly=True)
+        self.assertEqual(['V', 'W', 'C', 'A'], [s.type for s in myLf.genSects()])
+        self.assertEqual(0, myLf.numFrames())
+        self.assertEqual(['DEPT', 'GR', 'DPHI', 'NPHI', 'ILD'], myLf.curveMnems(ordered=True))
+        self.assertEqual(' 1700.0000\n', myFi.readline())
+
 class Special(unittest.TestCase):
     """Special tests."""
     pass
@@ -1326,6 +1326,84 @@ class TestFrameSet_setFrameBytes(BaseTestClasses.TestBaseFile):
         myFs = FrameSet.FrameSet(self._dfsr, slice(1))
         self.assertRaises(FrameSet.ExceptionFrameSet, myFs.setFrameBytes, b'\x00\x00\x00\x00\x00', 0, 0, 0)
 
+class TestFrameSet_setFrameBytesBulk(BaseTestClasses.TestBaseFile):
+    """Tests FrameSet setFrameBytesBulk() against setFrameBytes()."""
+    def setUp(self):
+        """Set up, uses the same DFSR as TestFrameSet_setFrameBytes."""
+        TestFrameSet_setFrameBytes.setUp(self)
+        # Frame 0 and frame 1
+        self._frameBytes = [
+            b'\x44\x4C\x80\x00' * 6 \
+            + b'\x00\x00\x00\x01\x00\x02\x00\x03\x00\x04\x00\x05\x00\x06\x00\x07' \
+            + b'\x00\x00\x01\x00\x00\x00\x01\x01',
+            b'\xBB\xB3\x80\x00' * 6 \
+            + b'\xff\xff\xff\xfe\xff\xfd\xff\xfc\xff\xfb\xff\xfa\xff\xf9\xff\xf8' \
+            + b'\xff\xff\xff\xff\x00\x00\x00\x00',
+        ]
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def testSetUpTearDown(self):
+        """TestFrameSet_setFrameBytesBulk: Tests setUp() and tearDown()."""
+        pass
+
+    def _retExpected(self, chFrom, chTo):
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        myOfsFrom = sum([c.lisSize for c in myFs._catS[:chFrom]])
+        myOfsTo = sum([c.lisSize for c in myFs._catS[:chTo+1]])
+        for f, by in enumerate(self._frameBytes):
+            myFs.setFrameBytes(by[myOfsFrom:myOfsTo], f, chFrom, chTo)
+        return myFs, myOfsFrom, myOfsTo
+
+    def test_00(self):
+        """TestFrameSet_setFrameBytesBulk.test_00(): setFrameBytesBulk() all channels."""
+        myFsExp, _ofsFrom, _ofsTo = self._retExpected(0, 4)
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        self.assertTrue(myFs.canSetFrameBytesBulk)
+        myFs.setFrameBytesBulk(b''.join(self._frameBytes), 0, 2, 0, 4)
+        self.assertTrue((myFsExp.frames == myFs.frames).all())
+        self.assertEqual([-153.0] * 6 + [-1., -2., -3., -4., -5., -6., -7., -8.] + [-1., 0.], list(myFs.frame(1)))
+
+    def test_01(self):
+        """TestFrameSet_setFrameBytesBulk.test_01(): setFrameBytesBulk() partial channels with a stride."""
+        myFsExp, myOfsFrom, myOfsTo = self._retExpected(1, 3)
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        # Concatenate the whole frames and read from the first channel's offset with the stride of a whole frame
+        by = b''.join(self._frameBytes)[myOfsFrom:48 + myOfsTo]
+        myFs.setFrameBytesBulk(by, 0, 2, 1, 3, stride=48)
+        self.assertTrue((myFsExp.frames[:, 1:14] == myFs.frames[:, 1:14]).all())
+
+    def test_02(self):
+        """TestFrameSet_setFrameBytesBulk.test_02(): setFrameBytesBulk() at a frame offset."""
+        myFs = FrameSet.FrameSet(self._dfsr, slice(3))
+        myFs.setFrameBytesBulk(b''.join(self._frameBytes), 1, 2, 0, 4)
+        myFsExp, _ofsFrom, _ofsTo = self._retExpected(0, 4)
+        self.assertTrue((myFsExp.frames == myFs.frames[1:]).all())
+
+    def test_03(self):
+        """TestFrameSet_setFrameBytesBulk.test_03(): setFrameBytesBulk() zero frames."""
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        myFs.setFrameBytesBulk(b'', 0, 0, 0, 4)
+
+    def test_04(self):
+        """TestFrameSet_setFrameBytesBulk.test_04(): setFrameBytesBulk() fails on channel None."""
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        self.assertRaises(FrameSet.ExceptionFrameSet, myFs.setFrameBytesBulk, b'', 0, 1, None, 4)
+
+    def test_05(self):
+        """TestFrameSet_setFrameBytesBulk.test_05(): setFrameBytesBulk() fails on buffer under-run and over-run."""
+        myFs = FrameSet.FrameSet(self._dfsr, slice(2))
+        by = b''.join(self._frameBytes)
+        self.assertRaises(FrameSet.ExceptionFrameSet, myFs.setFrameBytesBulk, by[:-1], 0, 2, 0, 4)
+        self.assertRaises(FrameSet.ExceptionFrameSet, myFs.setFrameBytesBulk, by + b'\x00', 0, 2, 0, 4)
+
+    def test_06(self):
+        """TestFrameSet_setFrameBytesBulk.test_06(): setFrameBytesBulk() fails on too many frames."""
+        myFs = FrameSet.FrameSet(self._dfsr, slice(1))
+        self.assertRaises(FrameSet.ExceptionFrameSet, myFs.setFrameBytesBulk, b''.join(self._frameBytes), 0, 2, 0, 4)
+
 class TestFrameSet_setFrameBytes_Indirect(BaseTestClasses.TestBaseFile):
     """Tests FrameSet"""
     def setUp(self):
@@ -3480,6 +3558,115 @@ class TestFrameSetgenChScPoints(BaseTestClasses.TestBaseLogPass):
             [v for v in myFs.genChScPoints(0, 0)],
         )
 
+class TestFrameSetchScPointArrays(BaseTestClasses.TestBaseLogPass):
+    """Test the FrameSet chScPointArrays() against genChScPoints()."""
+    def setUp(self):
+        """Set up."""
+        pass
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def testSetUpTearDown(self):
+        """TestFrameSetchScPointArrays: Tests setUp() and tearDown()."""
+        pass
+    
+    def test_00(self):
+        """TestFrameSetchScPointArrays.test_00(): 8 frames of 5 channels, using chScPointArrays()."""
+        numCh = 5
+        numFr = 8
+        myFile = self._createFileDFSROnly(numCh, 1, 1)
+        myDfsr = LogiRec.LrDFSRRead(myFile)
+        myFs = FrameSet.FrameSet(myDfsr, slice(numFr))
+        v = 0.0
+        # Load the FrameSet
+        for f in range(numFr):
+            fBy = bytearray()
+            for ch in range(numCh):
+                fBy.extend(RepCode.writeBytes68(v))
+                v += 1.0
+            myFs.setFrameBytes(by=fBy, fr=f, chFrom=0, chTo=numCh-1)
+        for ch in range(-numCh, numCh):
+            x, vals = myFs.chScPointArrays(ch, 0)
+            self.assertEqual(list(myFs.genChScPoints(ch, 0)), list(zip(x.tolist(), vals.tolist())))
+        self.assertRaises(IndexError, myFs.chScPointArrays, 5, 0)
+
+    def test_01(self):
+        """TestFrameSetchScPointArrays.test_01(): DEPT+1 channel with 4 samples, chScPointArrays() returns None for multiple values."""
+        numCh = 2
+        numSa = 4
+        numFr = 8
+        myFile = self._createFileDFSROnly(numCh, numSa, 1)
+        myDfsr = LogiRec.LrDFSRRead(myFile)
+        myFs = FrameSet.FrameSet(myDfsr, slice(numFr))
+        v = 0.0
+        dep = 1000.0
+        # Load the FrameSet
+        for f in range(numFr):
+            fBy = bytearray(RepCode.writeBytes68(dep))
+            dep -= 0.5
+            for s in range(numSa):
+                fBy.extend(RepCode.writeBytes68(v))
+                v += 1.0
+            myFs.setFrameBytes(by=fBy, fr=f, chFrom=0, chTo=numCh-1)
+        x, vals = myFs.chScPointArrays(0, 0)
+        self.assertEqual(list(myFs.genChScPoints(0, 0)), list(zip(x.tolist(), vals.tolist())))
+        self.assertTrue(myFs.chScPointArrays(1, 0) is None)
+
+    def test_02(self):
+        """TestFrameSetchScPointArrays.test_02(): indirect DEPT, 4 frames of Dipmeter 243, only slow channels as arrays."""
+        xAxisRc = 73
+        myB = (
+            bytes([64, 0])
+            # EB 4, up/down value 1 (up)
+            + bytes([4, 1, 66, 1])
+            # EB 8, Frame spacing
+            + bytes([8, 1, 73])+RepCode.writeBytes(480, 73)
+            # EB 9, Frame spacing units
+            + bytes([9, 4, 65])+b'.1IN'
+            # EB 13, recording mode 1
+            + bytes([13, 1, 66, 1])
+            # EB 14, X axis units
+            + bytes([14, 4, 65])+b'.1IN'
+            # EB 15, indirect Rep Code 73
+            + bytes([15, 1, 66, xAxisRc])
+            # EB 0 terminates read
+            + bytes([0, 1, 66, 0])
+        )
+        # Sensor 0
+        myB += (
+            # Mnemonic  Service ID  Serv ord No    Units   API 45,310,01,1       File No: 256
+            b"RHDT" + b'ServID' + b'ServOrdN'+ b'    ' + b'\x02\xb3\x60\x3b' + bytes([1, 0])
+            # chLen LIS bytes      Pad      samples      Rep code        Process indicators
+            + self._twoBytes(90) + b'000' + bytes([1,])+ bytes([234,]) + bytes([0, 1, 2, 3, 4])
+        )
+        numFr = 4
+        myFile = self._retFileFromBytes(self._retSinglePr(myB))
+        myDfsr = LogiRec.LrDFSRRead(myFile)
+        myFs = FrameSet.FrameSet(myDfsr, slice(numFr))
+        dep = 1000 * 120 # 1000 feet at 0.1 inch
+        for f in range(numFr):
+            fBy = bytearray()
+            fBy.extend(list(range(5))*16+list(range(5,15,1)))
+            myFs.setFrameBytes(by=fBy, fr=f, chFrom=0, chTo=0)
+            myFs.setIndirectX(f, dep)
+            dep -= 480
+        for sc in range(5):
+            self.assertTrue(myFs.chScPointArrays(0, sc) is None)
+        for sc in range(5, 15):
+            x, vals = myFs.chScPointArrays(0, sc)
+            self.assertEqual(list(myFs.genChScPoints(0, sc)), list(zip(x.tolist(), vals.tolist())))
+
+    def test_03(self):
+        """TestFrameSetchScPointArrays.test_03(): No frames gives empty arrays."""
+        myFile = self._createFileDFSROnly(2, 1, 1)
+        myDfsr = LogiRec.LrDFSRRead(myFile)
+        myFs = FrameSet.FrameSet(myDfsr, slice(0))
+        x, vals = myFs.chScPointArrays(1, 0)
+        self.assertEqual(0, len(x))
+        self.assertEqual(0, len(vals))
+
 class TestFrameSetgenAll(BaseTestClasses.TestBaseLogPass):
     """Test the FrameSet genAll()."""
     def setUp(self):
@@ -4717,11 +4904,13 @@ def unitTest(theVerbosity=2):
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_offsetTree))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_setFrameBytes))
+#    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_setFrameBytesBulk))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_setFrameBytes_Indirect))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetAccumulate))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetgenChScValues))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetgenChScPoints_LowLevel))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetgenChScPoints))
+#    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetchScPointArrays))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSetgenAll))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_Perf_Ctor))
 #    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameSet_Perf_Load))
@@ -1442,6 +1442,21 @@ class TestLogPass_UpDirect_Dipmeter(BaseTestClasses.TestBaseLogPass):
         self.assertEqual(numFrames, self._lp.frameSet.numFrames)
         self.assertEqual(91, self._lp.frameSet.valuesPerFrame)
 
+    def test_32(self):
+        """TestLogPass_UpDirect_Dipmeter.test_32(): hasFrameSetChX() for the same, fewer or other channels and X."""
+        myXstart = EngVal.EngVal(9999.0, b'FEET')
+        myXstop = EngVal.EngVal(9980.0, b'FEET')
+        self.assertFalse(self._lp.hasFrameSetChX(None, myXstart, myXstop, frStep=3))
+        self._lp.setFrameSetChX(self._file, theChS=[Mnem.Mnem(b'DEPT')], Xstart=myXstart, Xstop=myXstop, frStep=3)
+        self.assertTrue(self._lp.hasFrameSetChX([Mnem.Mnem(b'DEPT')], myXstart, myXstop, frStep=3))
+        self.assertFalse(self._lp.hasFrameSetChX([Mnem.Mnem(b'FC0 ')], myXstart, myXstop, frStep=3))
+        self.assertFalse(self._lp.hasFrameSetChX(None, myXstart, myXstop, frStep=3))
+        self._lp.setFrameSetChX(self._file, theChS=None, Xstart=myXstart, Xstop=myXstop, frStep=3)
+        self.assertTrue(self._lp.hasFrameSetChX(None, myXstart, myXstop, frStep=3))
+        self.assertTrue(self._lp.hasFrameSetChX([Mnem.Mnem(b'DEPT'), Mnem.Mnem(b'FC0 ')], myXstart, myXstop, frStep=3))
+        self.assertFalse(self._lp.hasFrameSetChX(None, myXstart, myXstop, frStep=1))
+        self.assertFalse(self._lp.hasFrameSetChX(None, myXstart, EngVal.EngVal(9990.0, b'FEET'), frStep=3))
+
 class TestLogPass_UpIndirect(BaseTestClasses.TestBaseLogPass):
     """Tests LogPass"""
     def setUp(self):
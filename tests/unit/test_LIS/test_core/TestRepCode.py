@@ -33,6 +33,9 @@ import logging
 import random
 import io
 import math
+import warnings
+
+import numpy
 
 # Generic methods, these choose between Python and Cython
 from TotalDepth.LIS.core import RepCode
@@ -2004,6 +2007,212 @@ class TestRepCodeIndirect(BaseTestClasses.TestRepCodeBase):
         myFile = File.FileRead(theFile=myBy, theFileId='MyFile', keepGoing=True)
         self.assertRaises(RepCode.ExceptionRepCodeUnknown, RepCode.readRepCode, 0, myFile)
 
+class TestRepCodeFromArray(BaseTestClasses.TestRepCodeBase):
+    """Tests numpy array conversion of Rep Codes against the scalar conversions."""
+    def setUp(self):
+        """Set up."""
+        random.seed(1)
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def test_00(self):
+        """TestRepCodeFromArray.test_00(): tests setUp() and tearDown()."""
+        pass
+
+    def _checkAgainstScalar(self, theRc, theScalarFn):
+        myDtype = RepCode.NUMPY_WORD_DTYPE_MAP[theRc]
+        myByS = [
+            bytes([random.getrandbits(8) for _b in range(myDtype.itemsize)]) for _i in range(1000)
+        ] + [
+            b'\x00' * myDtype.itemsize,
+            b'\xff' * myDtype.itemsize,
+            b'\x80' + b'\x00' * (myDtype.itemsize - 1),
+            b'\x7f' + b'\xff' * (myDtype.itemsize - 1),
+        ]
+        myArray = RepCode.fromArray(theRc, numpy.frombuffer(b''.join(myByS), dtype=myDtype))
+        self.assertEqual(myArray.dtype, numpy.float64)
+        self.assertEqual(len(myArray), len(myByS))
+        for by, v in zip(myByS, myArray):
+            self.assertEqual(theScalarFn(by), v)
+
+    def test_49(self):
+        """TestRepCodeFromArray.test_49(): fromArray() Rep Code 49."""
+        self._checkAgainstScalar(49, RepCode.readBytes49)
+
+    def test_50(self):
+        """TestRepCodeFromArray.test_50(): fromArray() Rep Code 50."""
+        self._checkAgainstScalar(50, RepCode.readBytes50)
+
+    def test_56(self):
+        """TestRepCodeFromArray.test_56(): fromArray() Rep Code 56."""
+        self._checkAgainstScalar(56, RepCode.readBytes56)
+
+    def test_66(self):
+        """TestRepCodeFromArray.test_66(): fromArray() Rep Code 66."""
+        self._checkAgainstScalar(66, RepCode.readBytes66)
+
+    def test_68(self):
+        """TestRepCodeFromArray.test_68(): fromArray() Rep Code 68."""
+        self._checkAgainstScalar(68, RepCode.readBytes68)
+
+    def test_70(self):
+        """TestRepCodeFromArray.test_70(): fromArray() Rep Code 70, against the Python reference."""
+        self._checkAgainstScalar(70, lambda by: pRepCode.from70(pRepCode.STRUCT_RC_70.unpack(by)[0]))
+
+    def test_73(self):
+        """TestRepCodeFromArray.test_73(): fromArray() Rep Code 73."""
+        self._checkAgainstScalar(73, RepCode.readBytes73)
+
+    def test_77(self):
+        """TestRepCodeFromArray.test_77(): fromArray() Rep Code 77."""
+        self._checkAgainstScalar(77, RepCode.readBytes77)
+
+    def test_79(self):
+        """TestRepCodeFromArray.test_79(): fromArray() Rep Code 79."""
+        self._checkAgainstScalar(79, RepCode.readBytes79)
+
+    def test_values(self):
+        """TestRepCodeFromArray.test_values(): fromArray() known values."""
+        self.assertEqual(
+            [153.0, -153.0],
+            list(RepCode.fromArray(68, numpy.frombuffer(b'\x44\x4C\x80\x00\xBB\xB3\x80\x00', dtype='>u4')))
+        )
+        self.assertEqual(
+            [153.0, -153.0],
+            list(RepCode.fromArray(49, numpy.frombuffer(b'\x4C\x88\xB3\x88', dtype='>i2')))
+        )
+
+    def test_has_array_converter(self):
+        """TestRepCodeFromArray.test_has_array_converter(): hasArrayConverter()."""
+        for rc in (49, 50, 56, 66, 68, 70, 73, 77, 79, 130, 234):
+            self.assertTrue(RepCode.hasArrayConverter(rc))
+        self.assertFalse(RepCode.hasArrayConverter(65))
+
+    def test_raises(self):
+        """TestRepCodeFromArray.test_raises(): fromArray() unknown Rep Code."""
+        self.assertRaises(RepCode.ExceptionRepCodeUnknown, RepCode.fromArray, 65, numpy.zeros(4, dtype='u1'))
+
+class TestRepCodeBytesArray(BaseTestClasses.TestRepCodeBase):
+    """Tests readBytesArray() and writeBytesArray() of the Cython code against the Python reference."""
+    READ_REP_CODES = (49, 50, 56, 66, 68, 70, 73, 77, 79, 130, 234)
+    # Rep Code and range of values to encode
+    WRITE_REP_CODES = (
+        (56, -128.9, 127.9),
+        (66, 0.0, 255.9),
+        (68, -1e12, 1e12),
+        (73, -2147483648.9, 2147483647.9),
+        (77, -0.9, 255.9),
+        (79, -32768.9, 32767.9),
+    )
+    def setUp(self):
+        """Set up."""
+        random.seed(1)
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def test_00(self):
+        """TestRepCodeBytesArray.test_00(): tests setUp() and tearDown()."""
+        pass
+
+    def test_01(self):
+        """TestRepCodeBytesArray.test_01(): readBytesArray() Cython against Python reference with strides."""
+        myCount = 1000
+        for rc in self.READ_REP_CODES:
+            wordLen = RepCode.wordLength(rc)
+            for stride in (wordLen, wordLen + 3):
+                by = bytes([random.getrandbits(8) for _b in range(myCount * stride)])
+                myP = numpy.zeros(myCount)
+                myC = numpy.zeros(myCount)
+                pRepCode.readBytesArray(rc, by, myCount, stride, myP)
+                cRepCode.readBytesArray(rc, by, myCount, stride, myC)
+                self.assertTrue(numpy.array_equal(myP, myC), 'Rep Code {:d} stride {:d}'.format(rc, stride))
+
+    def test_02(self):
+        """TestRepCodeBytesArray.test_02(): readBytesArray() into a column of a 2D array."""
+        myArray = numpy.zeros((3, 2))
+        RepCode.readBytesArray(68, b'\x44\x4C\x80\x00\x00\xBB\xB3\x80\x00\x00\x44\x4C\x80\x00', 3, 5, myArray[:, 1])
+        self.assertEqual([[0.0, 153.0], [0.0, -153.0], [0.0, 153.0]], myArray.tolist())
+
+    def test_03(self):
+        """TestRepCodeBytesArray.test_03(): writeBytesArray() Cython against Python reference with strides."""
+        myCount = 1000
+        for rc, minVal, maxVal in self.WRITE_REP_CODES:
+            wordLen = RepCode.wordLength(rc)
+            myValues = numpy.array([random.uniform(minVal, maxVal) for _i in range(myCount)])
+            for stride in (wordLen, wordLen + 3):
+                myP = bytearray(b'\xff' * (myCount * stride))
+                myC = bytearray(b'\xff' * (myCount * stride))
+                pRepCode.writeBytesArray(rc, myValues, myCount, stride, myP)
+                cRepCode.writeBytesArray(rc, myValues, myCount, stride, myC)
+                self.assertEqual(myP, myC, 'Rep Code {:d} stride {:d}'.format(rc, stride))
+
+    def test_04(self):
+        """TestRepCodeBytesArray.test_04(): writeBytesArray() Rep Code 68 against the scalar to68() including overflow and underflow."""
+        myValues = numpy.array(
+            [random.uniform(-1e6, 1e6) for _i in range(1000)] \
+            + [0.0, 153.0, -153.0, 1e-40, -1e-40, 1e-50, -1e-50, 1e40, -1e40,]
+        )
+        for mod in (pRepCode, cRepCode):
+            by = bytearray(4 * len(myValues))
+            mod.writeBytesArray(68, myValues, len(myValues), 4, by)
+            for i, v in enumerate(myValues):
+                self.assertEqual(RepCode.writeBytes68(v), by[4*i:4*i+4])
+
+    def test_05(self):
+        """TestRepCodeBytesArray.test_05(): writeBytes() with a numpy array."""
+        self.assertEqual(
+            b'\x44\x4C\x80\x00\xBB\xB3\x80\x00',
+            RepCode.writeBytes(numpy.array([153.0, -153.0]), 68),
+        )
+        self.assertEqual(b'\x00\x00\x00\x01\xff\xff\xff\xfe', RepCode.writeBytes(numpy.array([1, -2]), 73))
+        self.assertEqual(b'', RepCode.writeBytes(numpy.array([]), 68))
+
+    def test_06(self):
+        """TestRepCodeBytesArray.test_06(): to68Array() does not warn on overflow of large values."""
+        myValues = numpy.array([1e300, -1e300, 1e-300, 153.0])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            myWords = pRepCode.to68Array(myValues)
+        self.assertEqual([pRepCode.to68(v) for v in myValues], myWords.tolist())
+
+    def test_07(self):
+        """TestRepCodeBytesArray.test_07(): to68Array() raises on NaN as to68() does."""
+        self.assertRaises(ValueError, pRepCode.to68, numpy.nan)
+        self.assertRaises(RepCode.ExceptionRepCode, pRepCode.to68Array, numpy.array([153.0, numpy.nan]))
+
+    def test_10(self):
+        """TestRepCodeBytesArray.test_10(): readBytesArray() raises."""
+        for mod in (pRepCode, cRepCode):
+            # Unknown Rep Code
+            self.assertRaises(RepCode.ExceptionRepCodeUnknown, mod.readBytesArray, 65, b'\x00' * 8, 2, 4, numpy.zeros(2))
+            # Buffer too short
+            self.assertRaises(RepCode.ExceptionRepCode, mod.readBytesArray, 68, b'\x00' * 7, 2, 4, numpy.zeros(2))
+            # Output too short
+            self.assertRaises(RepCode.ExceptionRepCode, mod.readBytesArray, 68, b'\x00' * 8, 2, 4, numpy.zeros(1))
+            # Stride too small
+            self.assertRaises(RepCode.ExceptionRepCode, mod.readBytesArray, 68, b'\x00' * 8, 2, 3, numpy.zeros(2))
+
+    def test_11(self):
+        """TestRepCodeBytesArray.test_11(): writeBytesArray() raises."""
+        for mod in (pRepCode, cRepCode):
+            # No encoder
+            self.assertRaises(RepCode.ExceptionRepCodeUnknown, mod.writeBytesArray, 49, numpy.zeros(2), 2, 2, bytearray(4))
+            # Buffer too short
+            self.assertRaises(RepCode.ExceptionRepCode, mod.writeBytesArray, 68, numpy.zeros(2), 2, 4, bytearray(7))
+            # Out of range, nothing is written
+            by = bytearray(4)
+            self.assertRaises(RepCode.ExceptionRepCode, mod.writeBytesArray, 79, numpy.array([1.0, 32768.0]), 2, 2, by)
+            self.assertEqual(bytearray(4), by)
+            self.assertRaises(RepCode.ExceptionRepCode, mod.writeBytesArray, 66, numpy.array([numpy.nan]), 1, 1, by)
+            # NaN, nothing is written
+            by = bytearray(8)
+            self.assertRaises(RepCode.ExceptionRepCode, mod.writeBytesArray, 68, numpy.array([153.0, numpy.nan]), 2, 4, by)
+            self.assertEqual(bytearray(8), by)
+
 class Special(unittest.TestCase):
     """Special tests."""
     pass
@@ -2037,6 +2246,8 @@ def unitTest(theVerbosity=2):
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRepCodeFrom79Time))
     # Misc. tests
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRepCodeIndirect))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRepCodeFromArray))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRepCodeBytesArray))
     #
     myResult = unittest.TextTestRunner(verbosity=theVerbosity).run(suite)
     return (myResult.testsRun, len(myResult.errors), len(myResult.failures))
@@ -326,6 +326,42 @@ class TestRleType01(unittest.TestCase):
         self.assertEqual(0, myR.first())
         self.assertEqual(1920, myR.last())
 
+    def _retRleVariable(self):
+        """Returns a RLEType01 with variable frames per Logical Record, as test_05()."""
+        myR = Rle.RLEType01(b'FEET')
+        for i, v in enumerate(range(0, 2048, 128)):
+            if i % 6*128 == 0:
+                myR.add(v, 2, 4.2*i)
+            else:
+                myR.add(v, 1, 4.2*i)
+        return myR
+
+    def test_06(self):
+        """TestRleType01.test_06(): tellLrForFrames() matches tellLrForFrame() for each frame."""
+        myR = self._retRleVariable()
+        self.assertEqual(myR.totalFrames(), 19)
+        for mySl in (None, slice(0, 19, 1), slice(3, 17, 1), slice(1, 19, 2), slice(0, 19, 7), slice(18, 19, 1)):
+            myExpected = {}
+            myFrSl = mySl or slice(0, 19, 1)
+            for fNum in range(myFrSl.start, myFrSl.stop, myFrSl.step):
+                lrSeek, fOffs = myR.tellLrForFrame(fNum)
+                myExpected.setdefault(lrSeek, []).append(fOffs)
+            myResult = myR.tellLrForFrames(mySl)
+            self.assertEqual(myExpected, {k : list(v) for k, v in myResult.items()})
+
+    def test_07(self):
+        """TestRleType01.test_07(): tellLrForFrames() values, empty and out of range."""
+        myR = self._retRleVariable()
+        myResult = myR.tellLrForFrames(slice(0, 3, 1))
+        self.assertEqual([0, 128], sorted(myResult.keys()))
+        self.assertEqual([0, 1], list(myResult[0]))
+        self.assertEqual([0], list(myResult[128]))
+        self.assertEqual({}, myR.tellLrForFrames(slice(4, 4, 1)))
+        self.assertEqual({}, Rle.RLEType01(b'FEET').tellLrForFrames())
+        self.assertRaises(IndexError, myR.tellLrForFrames, slice(0, 20, 1))
+        self.assertRaises(IndexError, myR.tellLrForFrames, slice(-1, 2, 1))
+        self.assertRaises(IndexError, Rle.RLEType01(b'FEET').tellLrForFrame, 0)
+
 class TestRleType01XAxis(unittest.TestCase):
     """Tests ..."""
     def setUp(self):
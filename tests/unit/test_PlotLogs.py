@@ -0,0 +1,98 @@
+import argparse
+import functools
+import os
+
+import pytest
+
+from TotalDepth import PlotLogs
+from TotalDepth.LIS.core import EngVal, File, FileIndexer
+from TotalDepth.util.plot import Plot
+
+
+EXAMPLE_LIS_FILE = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, 'example_data', 'LIS', 'data', 'DILLSON-1_WELL_LOGS_FILE-037.LIS'
+)
+
+
+@pytest.mark.parametrize('jobs', (-1, 0, 1, 2, 8))
+def test_render_plots(jobs):
+    fns = [functools.partial(pow, 2, n) for n in range(5)]
+    result = PlotLogs.renderPlots(fns, jobs)
+    assert [r[0] for r in result] == [1, 2, 4, 8, 16]
+    assert all(r[1] >= 0.0 for r in result)
+
+
+def test_render_plots_empty():
+    assert PlotLogs.renderPlots([], 2) == []
+
+
+def test_render_plots_serial_without_fork(monkeypatch):
+    monkeypatch.setattr(PlotLogs.multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    assert not PlotLogs._canRenderConcurrently()
+    # The functions are called in this process.
+    result = PlotLogs.renderPlots([os.getpid, os.getpid], 2)
+    assert [r[0] for r in result] == [os.getpid(), os.getpid()]
+
+
+def test_render_plots_concurrent():
+    if not PlotLogs._canRenderConcurrently():  # pragma: no cover
+        pytest.skip('Can not fork.')
+    result = PlotLogs.renderPlots([os.getpid, os.getpid], 2)
+    assert os.getpid() not in [r[0] for r in result]
+
+
+def test_plot_log_info_add_plot_result_time():
+    plot_log_info = PlotLogs.PlotLogInfo()
+    for plot_time in (1.25, 0.5):
+        plot_log_info.addPlotResult(
+            'in', 'out.svg', 0, 'Film', 200,
+            EngVal.EngVal(1000.0, b'FEET'), EngVal.EngVal(1100.0, b'FEET'), [], 10, theTime=plot_time
+        )
+    assert plot_log_info.plotTime == 1.75
+    assert 'Plot time=1.750 (S)' in str(plot_log_info)
+    assert plot_log_info._plotS[0][3].time == '1.250'
+
+
+def _plot_log_passes(path_in, path_out, plot_jobs):
+    opts = argparse.Namespace(
+        recurse=False, keepGoing=True, LgFormat=['Porosity_GR_3Track', 'Resistivity_3Track_Logrithmic.xml'],
+        apiHeader=False, LgFormat_min=0, scale=0, dpi=0, plotJobs=plot_jobs,
+    )
+    return PlotLogs.PlotLogPasses(path_in, path_out, opts).plotLogInfo
+
+
+def test_plot_log_passes_opts_without_dpi_plot_jobs(tmpdir):
+    # Callers may build their own opts without the dpi and plotJobs options.
+    opts = argparse.Namespace(
+        recurse=False, keepGoing=True, LgFormat=['Porosity_GR_3Track'], apiHeader=False, LgFormat_min=0, scale=0,
+    )
+    plot_log_passes = PlotLogs.PlotLogPasses(EXAMPLE_LIS_FILE, os.path.join(tmpdir, 'out'), opts)
+    assert (plot_log_passes._dpi, plot_log_passes._plotJobs) == (0, 1)
+    assert plot_log_passes.plotLogInfo.plotCntr == 1
+
+
+def test_plot_load_frame_set_bytes():
+    lis_file = File.FileRead(EXAMPLE_LIS_FILE, theFileId=EXAMPLE_LIS_FILE, keepGoing=True)
+    plot = Plot.PlotReadXML('Porosity_GR_3Track')
+    log_pass = [
+        v.logPass for v in FileIndexer.FileIndex(lis_file).genLogPasses()
+        if plot.hasDataToPlotLIS(v.logPass, 'Porosity_GR_3Track')
+    ][0]
+    args = (lis_file, log_pass, log_pass.xAxisFirstEngVal, log_pass.xAxisLastEngVal, 'Porosity_GR_3Track')
+    num_bytes = plot._loadFrameSet(*args)
+    assert num_bytes > 0
+    assert num_bytes == log_pass.numBytes
+    # Already loaded so nothing is read.
+    assert plot._loadFrameSet(*args) == 0
+
+
+def test_plot_log_passes_plot_jobs(tmpdir):
+    serial = _plot_log_passes(EXAMPLE_LIS_FILE, os.path.join(tmpdir, 'serial', 'out'), 1)
+    concurrent = _plot_log_passes(EXAMPLE_LIS_FILE, os.path.join(tmpdir, 'concurrent', 'out'), 2)
+    assert serial.plotCntr == concurrent.plotCntr == 2
+    assert serial.curvePoints == concurrent.curvePoints
+    for s, c in zip(serial._plotS, concurrent._plotS):
+        assert s[:3] == c[:3]
+        assert s[3].curves == c[3].curves
+        with open(s[3].outPath) as s_file, open(c[3].outPath) as c_file:
+            assert s_file.read() == c_file.read()
@@ -66,6 +66,17 @@ class TestGenBigFirst(unittest.TestCase):
             pass
             # print('{:8d}: {:s}'.format(os.path.getsize(v), v))
 
+    def test_02(self):
+        """TestGenBigFirst.test_02(): Biggest files first, then by name."""
+        myDir = os.path.dirname(__file__)
+        myNameS = list(DirWalk.gen_big_first(myDir))
+        mySizeS = [os.path.getsize(os.path.join(myDir, n)) for n in myNameS]
+        self.assertEqual(sorted(mySizeS, reverse=True), mySizeS)
+        self.assertEqual(
+            sorted(n for n in os.listdir(myDir) if os.path.isfile(os.path.join(myDir, n))),
+            sorted(myNameS),
+        )
+
 class TestDirWalk(unittest.TestCase):
     """Tests ..."""
     def setUp(self):
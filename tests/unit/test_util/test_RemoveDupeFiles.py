@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from TotalDepth.util import RemoveDupeFiles
+
+
+def _make_tree(tmpdir) -> None:
+    # Same size and same ends as a.bin but differs in the middle.
+    tmpdir.join('a.bin').write_binary(b'A' * 100 + b'x' + b'A' * 100, ensure=True)
+    tmpdir.join('b.bin').write_binary(b'A' * 100 + b'y' + b'A' * 100, ensure=True)
+    tmpdir.join('sub/c.bin').write_binary(b'A' * 100 + b'x' + b'A' * 100, ensure=True)
+    tmpdir.join('small.txt').write_binary(b'small', ensure=True)
+    tmpdir.join('sub/small.txt').write_binary(b'small', ensure=True)
+    tmpdir.join('sub/other.txt').write_binary(b'other', ensure=True)
+    tmpdir.join('unique.txt').write_binary(b'unique size', ensure=True)
+    tmpdir.join('.hidden').write_binary(b'small', ensure=True)
+
+
+@pytest.mark.parametrize('partial_size', (1, 8, 1024))
+@pytest.mark.parametrize('jobs', (0, 1, 4))
+def test_find_dupes(tmpdir, partial_size, jobs):
+    _make_tree(tmpdir)
+    result = RemoveDupeFiles.find_dupes(str(tmpdir), partial_size, jobs)
+    assert sorted((os.path.relpath(d, tmpdir), os.path.relpath(o, tmpdir)) for d, o in result) == [
+        ('sub/c.bin', 'a.bin'),
+        ('sub/small.txt', 'small.txt'),
+    ]
+
+
+def test_partial_hash():
+    assert RemoveDupeFiles.partial_hash(__file__, os.path.getsize(__file__), 1024**2) \
+           == RemoveDupeFiles.full_hash(__file__)
+    assert RemoveDupeFiles.partial_hash(__file__, os.path.getsize(__file__), 8) \
+           != RemoveDupeFiles.full_hash(__file__)
+
+
+@pytest.mark.parametrize('nervous, expected_files', ((True, 8), (False, 6)))
+def test_remove_dupes(tmpdir, nervous, expected_files):
+    _make_tree(tmpdir)
+    assert RemoveDupeFiles.remove_dupes(str(tmpdir), nervous, 8) == (2, 206)
+    assert sum(len(files) for _root, _dirs, files in os.walk(tmpdir)) == expected_files
+
+
+def test_hash_database(tmpdir):
+    _make_tree(tmpdir.join('tree'))
+    db_path = os.path.join(tmpdir, 'hashes.db')
+    with RemoveDupeFiles.HashDatabase(db_path) as hash_db:
+        result = RemoveDupeFiles.find_dupes(os.path.join(tmpdir, 'tree'), 8, hash_db=hash_db)
+        assert (hash_db.hits, hash_db.misses) == (0, 9)
+    with RemoveDupeFiles.HashDatabase(db_path) as hash_db:
+        assert RemoveDupeFiles.find_dupes(os.path.join(tmpdir, 'tree'), 8, hash_db=hash_db) == result
+        assert (hash_db.hits, hash_db.misses) == (9, 0)
+        assert str(hash_db) == f'<HashDatabase {db_path} hits: 9 misses: 0>'
+
+
+def test_hash_database_changed_file(tmpdir):
+    _make_tree(tmpdir.join('tree'))
+    db_path = os.path.join(tmpdir, 'hashes.db')
+    with RemoveDupeFiles.HashDatabase(db_path) as hash_db:
+        RemoveDupeFiles.find_dupes(os.path.join(tmpdir, 'tree'), 8, hash_db=hash_db)
+    path = tmpdir.join('tree', 'b.bin')
+    path.write_binary(b'A' * 100 + b'x' + b'A' * 100, ensure=True)
+    os.utime(path, ns=(0, 0))
+    with RemoveDupeFiles.HashDatabase(db_path) as hash_db:
+        result = RemoveDupeFiles.find_dupes(os.path.join(tmpdir, 'tree'), 8, hash_db=hash_db)
+        assert (hash_db.hits, hash_db.misses) == (7, 2)
+    assert sorted(os.path.basename(d) for d, _o in result) == ['b.bin', 'c.bin', 'small.txt']
+
+
+def test_remove_dupes_hash_database(tmpdir):
+    _make_tree(tmpdir.join('tree'))
+    with RemoveDupeFiles.HashDatabase(os.path.join(tmpdir, 'hashes.db')) as hash_db:
+        assert RemoveDupeFiles.remove_dupes(os.path.join(tmpdir, 'tree'), False, 8, hash_db=hash_db) == (2, 206)
+        assert RemoveDupeFiles.remove_dupes(os.path.join(tmpdir, 'tree'), False, 8, hash_db=hash_db) == (0, 0)
@@ -0,0 +1,57 @@
+import zipfile
+
+import TotalDepth.util.archive
+import TotalDepth.util.bin_file_type
+
+import pytest
+
+
+@pytest.mark.parametrize('jobs', (1, 2))
+def test_explore_tree(tmpdir, jobs):
+    with zipfile.ZipFile(tmpdir.join('a.zip').strpath, 'w') as z_archive:
+        z_archive.writestr('a.pdf', b'%PDF-')
+    tmpdir.join('b.pdf').write_binary(b'%PDF-')
+    result = TotalDepth.util.archive.explore_tree(tmpdir.strpath, recurse=False, jobs=jobs)
+    assert [type(v) for v in result] == [TotalDepth.util.archive.FileZip, TotalDepth.util.archive.FileOnDisc]
+    assert [v.bin_type for v in result] == ['ZIP', 'PDF']
+
+
+def test_explore_tree_reads_each_file_once(tmpdir, monkeypatch):
+    with zipfile.ZipFile(tmpdir.join('a.zip').strpath, 'w') as z_archive:
+        z_archive.writestr('a.pdf', b'%PDF-')
+    tmpdir.join('b.pdf').write_binary(b'%PDF-')
+    classified = []
+    classify_path = TotalDepth.util.bin_file_type.classify_path
+
+    def _classify_path(path, num_bytes=32):
+        classified.append(path)
+        return classify_path(path, num_bytes)
+
+    def _is_zipfile(path):
+        raise AssertionError(f'zipfile.is_zipfile({path}) opens the file again.')
+
+    monkeypatch.setattr(TotalDepth.util.bin_file_type, 'classify_path', _classify_path)
+    monkeypatch.setattr(zipfile, 'is_zipfile', _is_zipfile)
+    result = TotalDepth.util.archive.explore_tree(tmpdir.strpath, recurse=False, jobs=1)
+    assert len(result) == 2
+    assert classified == [tmpdir.join('a.zip').strpath, tmpdir.join('b.pdf').strpath]
+
+
+def test_explore_tree_zip_fallback(tmpdir):
+    # Empty, the head is b'PK\x05\x06'
+    zipfile.ZipFile(tmpdir.join('a.zip').strpath, 'w').close()
+    # Self-extracting, the ZIP follows an executable stub
+    z_path = tmpdir.join('b.zip').strpath
+    with zipfile.ZipFile(z_path, 'w') as z_archive:
+        z_archive.writestr('a.pdf', b'%PDF-')
+    with open(z_path, 'rb') as fobj:
+        tmpdir.join('b.exe').write_binary(b'MZ' + b'\x00' * 126 + fobj.read())
+    tmpdir.join('c.txt').write_binary(b'Not a ZIP\n')
+    result = TotalDepth.util.archive.explore_tree(tmpdir.strpath, recurse=False, jobs=1)
+    assert [(v.path, type(v)) for v in result] == [
+        (tmpdir.join('a.zip').strpath, TotalDepth.util.archive.FileZip),
+        (tmpdir.join('b.exe').strpath, TotalDepth.util.archive.FileZip),
+        (z_path, TotalDepth.util.archive.FileZip),
+        (tmpdir.join('c.txt').strpath, TotalDepth.util.archive.FileOnDisc),
+    ]
+    assert [v.bin_type for v in result] == ['ASCII', '', 'ZIP', 'ASCII']
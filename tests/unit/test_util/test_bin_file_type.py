@@ -707,6 +707,107 @@ def test_binary_file_type_from_bytes(fobj: io.BytesIO, expected: str):
     assert result == expected
 
 
+LAS_V20_BYTES = b'\n'.join(
+    [
+        b'~VERSION INFORMATION',
+        b' VERS.                 2.0:   CWLS LOG ASCII STANDARD -VERSION 2.0',
+        b' WRAP.                  NO:   ONE LINE PER DEPTH STEP',
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    'by, expected',
+    (
+        (LAS_V20_BYTES, 0),
+        (LAS_V20_BYTES.replace(b'2.0', b'1.2'), 5),
+        # Not LAS even though the first line is truncated.
+        (b'\x00' * 8, 1),
+        (b'# Comment\n  ~A', 1),
+        # Can not decide.
+        (b'', TotalDepth.util.bin_file_type.RESULT_NEEDS_MORE_BYTES),
+        (b'\n' * 8, TotalDepth.util.bin_file_type.RESULT_NEEDS_MORE_BYTES),
+        (b'# Comment\n~', TotalDepth.util.bin_file_type.RESULT_NEEDS_MORE_BYTES),
+        (b'~VERSION INFORMATION', TotalDepth.util.bin_file_type.RESULT_NEEDS_MORE_BYTES),
+        (b'~VERSION INFORMATION\n VERS.  2.0', TotalDepth.util.bin_file_type.RESULT_NEEDS_MORE_BYTES),
+    )
+)
+def test__las_bytes(by: bytes, expected: int):
+    result = TotalDepth.util.bin_file_type._las_bytes(by, b'2.0')
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    'by, expected',
+    (
+        (b'\x40' * 3200, 0),
+        (b'\x40' * 3199, 1),
+        (b'\x40' * 3199 + b'\x00', 1),
+        (b'\xc1' * 3200 + b'\x00', 0),
+    )
+)
+def test__segy_bytes(by: bytes, expected: int):
+    assert TotalDepth.util.bin_file_type._segy_bytes(by) == expected
+    assert TotalDepth.util.bin_file_type._segy(io.BytesIO(by)) == expected
+
+
+@pytest.mark.parametrize(
+    'by, expected',
+    (
+        (b'', 'ASCII'),
+        (b'%PDF-', 'PDF'),
+        (LAS_V20_BYTES, 'LAS2.0'),
+        # Only the first two lines, the second is not terminated.
+        (b'\n'.join(LAS_V20_BYTES.split(b'\n')[:2]), 'LAS2.0'),
+        # LAS beyond the head.
+        (b'\n' * TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES + LAS_V20_BYTES, 'LAS2.0'),
+        (b'#' * TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES + b'\n' + LAS_V20_BYTES, 'LAS2.0'),
+    )
+)
+def test_binary_file_type_from_head(by: bytes, expected: str):
+    fobj = io.BytesIO(by)
+    assert TotalDepth.util.bin_file_type.binary_file_type(fobj) == expected
+    assert fobj.tell() == 0
+    head = by[:TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES]
+    assert TotalDepth.util.bin_file_type.binary_file_type_from_head(head, fobj) == expected
+
+
+@pytest.mark.parametrize(
+    'by',
+    (
+        b'\n'.join(LAS_V20_BYTES.split(b'\n')[:2]),
+        b'\n' * TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES + LAS_V20_BYTES,
+    )
+)
+def test_binary_file_type_from_head_no_file(by: bytes):
+    head = by[:TotalDepth.util.bin_file_type.HEAD_LEN_REQUIRED_BYTES]
+    # Without the file the LAS test can not be decided.
+    assert TotalDepth.util.bin_file_type.binary_file_type_from_head(head) == 'ASCII'
+
+
+@pytest.mark.parametrize('jobs', (0, 1, 4))
+def test_classify_paths(tmpdir, jobs):
+    contents = [b'%PDF-', LAS_V20_BYTES, b'\n' * 5000 + LAS_V20_BYTES, b'', b'\xff' * 64]
+    paths = []
+    for i, content in enumerate(contents):
+        path = tmpdir.join(f'{i}.bin')
+        path.write_binary(content)
+        paths.append(path.strpath)
+    paths.append(tmpdir.join('missing.bin').strpath)
+    result = TotalDepth.util.bin_file_type.classify_paths(paths, jobs, num_bytes=4)
+    assert [v.path for v in result] == paths
+    assert [v.bin_type for v in result] == ['PDF', 'LAS2.0', 'LAS2.0', 'ASCII', '', '']
+    assert [v.size for v in result] == [len(v) for v in contents] + [0]
+    assert [v.head for v in result] == [v[:4] for v in contents] + [b'']
+
+
+def test_classify_path_num_bytes(tmpdir):
+    path = tmpdir.join('a.bin')
+    path.write_binary(b'\x40' * 5000)
+    result = TotalDepth.util.bin_file_type.classify_path(path.strpath, num_bytes=4500)
+    assert result == TotalDepth.util.bin_file_type.FileClassification(path.strpath, 5000, 'SEGY', b'\x40' * 4500)
+
+
 
 # TIF encoded RP66V1:
 # Storage Unit Label is from 0xC to 0xC + 80 = 92 (0x5c)
@@ -33,6 +33,8 @@ import math
 import random
 import pprint
 
+import numpy
+
 from TotalDepth.LIS.core import RepCode
 from TotalDepth.LIS.core import LogiRec
 from TotalDepth.LIS.core import Mnem
@@ -328,6 +330,41 @@ class TestLineTrans(unittest.TestCase):
         """TestLineTrans.test_40_03(): Linear identity transformation, wrapPos(), physical 8->0, logical scale 64->0 raises ExceptionLineTransBase."""
         self.assertRaises(PRESCfg.ExceptionLineTransBase, PRESCfg.LineTransLin, 8.0, 0.0, 64.0, 0.0, backup=PRESCfg.BACKUP_ONCE)
 
+    def _checkWrapPosArray(self, theT, theVals):
+        """Checks that wrapPosArray() and offScaleArray() are identical to wrapPos() and offScale()."""
+        w, p, valid = theT.wrapPosArray(numpy.array(theVals, dtype=numpy.float64))
+        offS = theT.offScaleArray(w)
+        for i, v in enumerate(theVals):
+            try:
+                expW, expP = theT.wrapPos(v)
+            except PRESCfg.ExceptionLineTransBaseMath:
+                self.assertFalse(valid[i])
+            else:
+                self.assertTrue(valid[i])
+                self.assertEqual(expW, w[i])
+                self.assertEqual(expP, p[i])
+                self.assertEqual(theT.offScale(expW), offS[i])
+
+    def test_50_00(self):
+        """TestLineTrans.test_50_00(): Base class wrapPosArray() raises NotImplementedError."""
+        myT = PRESCfg.LineTransBase(0.0, 100.0, 200.0, 1000.0, PRESCfg.BACKUP_ALL)
+        self.assertRaises(NotImplementedError, myT.wrapPosArray, numpy.zeros(4))
+
+    def test_50_01(self):
+        """TestLineTrans.test_50_01(): Linear wrapPosArray() and offScaleArray() match wrapPos() and offScale()."""
+        myVals = [-1e6, -128.0, -64.0, -1.0, 0.0, 17.3, 64.0, 128.0, 192.0, 1e6] \
+            + [random.uniform(-1000.0, 1000.0) for i in range(100)]
+        for bu in (PRESCfg.BACKUP_NONE, PRESCfg.BACKUP_ONCE, PRESCfg.BACKUP_ALL, PRESCfg.BACKUP_LEFT):
+            self._checkWrapPosArray(PRESCfg.LineTransLin(0.0, 100.0, 40.0, 440.0, bu), myVals)
+            self._checkWrapPosArray(PRESCfg.LineTransLin(0.0, 2.4, 0.6, 0.0, bu), myVals)
+
+    def test_50_02(self):
+        """TestLineTrans.test_50_02(): Log10 wrapPosArray() and offScaleArray() match wrapPos() and offScale()."""
+        myVals = [-1.0, 0.0, 1e-9, 0.2, 2.0, 20.0, 200.0, 2000.0, 1e9] \
+            + [random.uniform(0.0, 5000.0) for i in range(100)]
+        for bu in (PRESCfg.BACKUP_NONE, PRESCfg.BACKUP_ONCE, PRESCfg.BACKUP_ALL, PRESCfg.BACKUP_LEFT):
+            self._checkWrapPosArray(PRESCfg.LineTransLog10(0.0, 2.4, 0.2, 2000.0, bu), myVals)
+
 class TestPRESRead(BaseTestClasses.TestBaseFile):
     """Tests ..."""
     def setUp(self):
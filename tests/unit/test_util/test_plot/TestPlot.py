@@ -33,6 +33,8 @@ import logging
 import pprint
 import io
 import random
+
+import numpy
 #import collections
 try:
     import xml.etree.cElementTree as etree
@@ -627,6 +629,64 @@ class TestPlotRoll(unittest.TestCase):
         except Plot.ExceptionTotalDepthPlotRoll:
             pass
 
+class TestPlotDecimate(unittest.TestCase):
+    """Tests Plot decimation of curves to the minimum/maximum per pixel."""
+    def setUp(self):
+        """Set up."""
+        pass
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def test_00(self):
+        """TestPlotDecimate.test_00(): Tests setUp() and tearDown()."""
+        pass
+
+    def test_01(self):
+        """TestPlotDecimate.test_01(): DPI that is not a number or is negative raises."""
+        self.assertRaises(Plot.ExceptionTotalDepthLISPlot, Plot.Plot, None, None, 0, '96')
+        self.assertRaises(Plot.ExceptionTotalDepthLISPlot, Plot.Plot, None, None, 0, -1)
+
+    def test_02(self):
+        """TestPlotDecimate.test_02(): No decimation if DPI is zero or there are few points."""
+        myPlot = Plot.Plot(None, None)
+        self.assertEqual(list(range(16)), myPlot._retDecimatedIndexes(numpy.arange(16.0), numpy.zeros(16)).tolist())
+        myPlot = Plot.Plot(None, None, theDpi=96)
+        self.assertEqual(list(range(4)), myPlot._retDecimatedIndexes(numpy.arange(4.0), numpy.zeros(4)).tolist())
+        # One point per pixel
+        self.assertEqual(list(range(16)), myPlot._retDecimatedIndexes(numpy.zeros(16), numpy.arange(16.0)).tolist())
+
+    def test_03(self):
+        """TestPlotDecimate.test_03(): Decimation keeps the first, last, minimum and maximum point in each pixel."""
+        # At 96 DPI a pixel is one view box unit
+        myPlot = Plot.Plot(None, None, theDpi=96)
+        myTracS = numpy.array([5.0, 3.0, 9.0, 1.0, 6.0, 4.0, 2.0, 8.0, 7.0, 5.0, 0.0, 3.0])
+        myDepthS = numpy.array([0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 1.0, 1.2, 1.4, 1.6, 1.8, 2.5])
+        self.assertEqual(
+            [0, 2, 3, 5, 6, 7, 10, 11],
+            myPlot._retDecimatedIndexes(myTracS, myDepthS).tolist(),
+        )
+        # At 48 DPI a pixel is two view box units
+        myPlot = Plot.Plot(None, None, theDpi=48)
+        self.assertEqual(
+            [0, 2, 10, 11],
+            myPlot._retDecimatedIndexes(myTracS, myDepthS).tolist(),
+        )
+
+    def test_04(self):
+        """TestPlotDecimate.test_04(): Decimation of a large number of points preserves the envelope."""
+        myPlot = Plot.Plot(None, None, theDpi=100)
+        myDepthS = numpy.linspace(0.0, 960.0, 100000)
+        myTracS = numpy.sin(myDepthS) * 100.0 + numpy.cos(myDepthS * 37.0)
+        myIdx = myPlot._retDecimatedIndexes(myTracS, myDepthS)
+        self.assertTrue(len(myIdx) < len(myDepthS) // 10)
+        self.assertEqual(0, myIdx[0])
+        self.assertEqual(len(myDepthS) - 1, myIdx[-1])
+        self.assertTrue(numpy.all(numpy.diff(myIdx) > 0))
+        self.assertEqual(myTracS.min(), myTracS[myIdx].min())
+        self.assertEqual(myTracS.max(), myTracS[myIdx].max())
+
 class TestPlotBase(BaseTestClasses.TestBaseFile):
     pass
 
@@ -1756,9 +1816,8 @@ class TestPlotLowLevel_wrap(TestPlotBase_00):
         self.assertEqual(expResult, myPts)
 
 
-@pytest.mark.slow
-class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
-    """Tests plotting a LIS file."""
+class TestPlotReadLIS_SingleSinCurveBase(TestPlotBase_00):
+    """Base class for plotting a single sine curve."""
     def retPresBytes_TEST(self):
         """Returns the PRES logical record with curves from output TEST on various scales and tracks."""
         return bytes(
@@ -1821,10 +1880,13 @@ class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
                 + b'ED\x04\x00REDGMV  ' + RepCode.writeBytes(2.5, 68)
             )
 
-    def retFileAndFileIndex_ShortTEST(self):
+    def retFileAndFileIndex_ShortTEST(self, numFrames=201, theChVals=None):
         """Returns a File and a FileIndexer.FileIndex of DEPt plus a single curve.
         Log is 100 ft, 0.5 ft spacing. SP is a sine curve -80 to 20 mV with a
-        wavelength of 20 feet. i.e. 5 waves."""
+        wavelength of 20 feet. i.e. 5 waves.
+        theChVals, if given, is the LisGen value generator of the curve."""
+        if theChVals is None:
+            theChVals = LisGen.ChValsSin(fOffs=0, waveLen=160.0, mid=0.0, amp=40.0, numSa=1, noise=None)
         logging.info('TestPlotBase_00.retFileAndFileIndex_ShortTEST():')
         myEbs = LogiRec.EntryBlockSet()
         myEbs.setEntryBlock(LogiRec.EntryBlock(LogiRec.EB_TYPE_FRAME_SIZE, 1, 66, 4))
@@ -1842,7 +1904,7 @@ class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
                         b'TEST', b'ServID', b'ServOrdN', b'MV  ',
                         45310011, 256, 4, 1, 68
                     ),
-                    LisGen.ChValsSin(fOffs=0, waveLen=160.0, mid=0.0, amp=40.0, numSa=1, noise=None),
+                    theChVals,
 #                    LisGen.ChValsSpecialSeqSqRoot(fOffs=0, waveLen=20.0, mid=-80.0, amp=100.0, numSa=1, noise=None),
                 ),
             ],
@@ -1857,7 +1919,6 @@ class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
         myData.extend(self.retPrS(myLpGen.lrBytesDFSR()))
         logging.info('TestPlotBase_00.retFileAndFileIndex_ShortTEST(): creating frames...')
         framesPerLr = 8
-        numFrames = 201
         for fNum in range(0, numFrames, framesPerLr):
             myData.extend(self.retPrS(myLpGen.lrBytes(fNum, framesPerLr)))
         myData.extend(LisGen.retSinglePr(LisGen.FileHeadTailDefault.lrBytesFileTail))
@@ -1868,7 +1929,33 @@ class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
         myFileIndex = FileIndexer.FileIndex(myFile)
         logging.info('TestPlotBase_00.retFileAndFileIndex_ShortTEST(): returning File and FileIndex.')
         return myFile, myFileIndex
-        
+
+    def _retSvgVectorise(self, theFpOut, theXStart, theXStop, theVectorise, theDpi=0):
+        """Plots the log pass from theXStart to theXStop with or without VECTORISE_CURVE_PLOTS at theDpi and
+        returns the SVG text."""
+        try:
+            Plot.VECTORISE_CURVE_PLOTS = theVectorise
+            self._prl._dpi = theDpi
+            for anIlp in self._lisFileIndex.genLogPasses():
+                self._prl.plotLogPassLIS(
+                    self._lisFile,
+                    anIlp.logPass,
+                    EngVal.EngVal(theXStart, b'FEET'),
+                    EngVal.EngVal(theXStop, b'FEET'),
+                    Mnem.Mnem(b'2   '),
+                    theFpOut,
+                    frameStep=1,
+                    title='')
+        finally:
+            Plot.VECTORISE_CURVE_PLOTS = True
+            self._prl._dpi = 0
+        with open(theFpOut) as f:
+            return f.read()
+
+
+@pytest.mark.slow
+class TestPlotReadLIS_SingleSinCurve(TestPlotReadLIS_SingleSinCurveBase):
+    """Tests plotting a LIS file."""
     def setUp(self):
         """Set up."""
         myByFilm = self.retFilmBytes()
@@ -1910,6 +1997,175 @@ class TestPlotReadLIS_SingleSinCurve(TestPlotBase_00):
             sys.stderr.write('\n')
             sys.stderr.flush()
 
+    def test_02(self):
+        """TestPlotReadLIS_SingleSinCurve.test_02(): SVG with VECTORISE_CURVE_PLOTS is identical to that without."""
+        myFpOut = TestPlotShared.outPath('SingleSinCurve_Vectorise.svg')
+        mySvgS = [self._retSvgVectorise(myFpOut, 1000.0, 900.0, aFlag) for aFlag in (False, True)]
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_03(self):
+        """TestPlotReadLIS_SingleSinCurve.test_03(): SVG decimated at 5 DPI is smaller and the same with or without VECTORISE_CURVE_PLOTS."""
+        myFpOut = TestPlotShared.outPath('SingleSinCurve_Decimate.svg')
+        mySvgS = [
+            self._retSvgVectorise(myFpOut, 1000.0, 900.0, aFlag, aDpi) for aDpi, aFlag in ((0, True), (5, False), (5, True))
+        ]
+        self.assertTrue(len(mySvgS[1]) < len(mySvgS[0]))
+        self.assertEqual(mySvgS[0].count('<polyline'), mySvgS[1].count('<polyline'))
+        self.assertEqual(mySvgS[1], mySvgS[2])
+
+
+class TestPlotReadLIS_SingleSinCurveShort(TestPlotReadLIS_SingleSinCurveBase):
+    """Tests plotting a short sine curve with and without VECTORISE_CURVE_PLOTS, this is fast enough to always run."""
+    def setUp(self):
+        """Set up."""
+        self._prl = Plot.PlotReadLIS(
+            LogiRec.LrTableRead(self._retFileSinglePr(self.retFilmBytes())),
+            LogiRec.LrTableRead(self._retFileSinglePr(self.retPresBytes_TEST())),
+        )
+        self._lisFile, self._lisFileIndex = self.retFileAndFileIndex_ShortTEST(numFrames=41)
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def test_00(self):
+        """TestPlotReadLIS_SingleSinCurveShort.test_00(): Tests setUp() and tearDown()."""
+        pass
+
+    def test_01(self):
+        """TestPlotReadLIS_SingleSinCurveShort.test_01(): SVG with VECTORISE_CURVE_PLOTS is identical to that without."""
+        myFpOut = TestPlotShared.outPath('SingleSinCurveShort_Vectorise.svg')
+        mySvgS = [self._retSvgVectorise(myFpOut, 1000.0, 980.0, aFlag) for aFlag in (False, True)]
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_02(self):
+        """TestPlotReadLIS_SingleSinCurveShort.test_02(): SVG decimated at 5 DPI is the same with or without VECTORISE_CURVE_PLOTS."""
+        myFpOut = TestPlotShared.outPath('SingleSinCurveShort_Decimate.svg')
+        mySvgS = [self._retSvgVectorise(myFpOut, 1000.0, 980.0, aFlag, 5) for aFlag in (False, True)]
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+
+class ChValsSinNull(LisGen.ChValsSin):
+    """sin() value for the channel except for the given frames which have the absent value."""
+    def __init__(self, nullFrames, **kwargs):
+        super().__init__(**kwargs)
+        self._nullFrames = set(nullFrames)
+
+    def val(self, f, s=0):
+        if f in self._nullFrames:
+            return -999.25
+        return super().val(f, s)
+
+
+class TestPlotReadLIS_NullOffScale(TestPlotReadLIS_SingleSinCurveBase):
+    """Tests plotting a short sine curve with runs of absent values and off scale values with and without
+    VECTORISE_CURVE_PLOTS."""
+    def retPresBytes_OffScale(self):
+        """Returns the PRES logical record with curves from output TEST that go off scale with no backup, that
+        backup once and that wrap."""
+        return bytes(
+            b'"\x00'
+            + b'IA\x04\x00TYPE    PRES'
+            # No backup so only the centre half of the sine curve is on scale.
+            + b'\x00A\x04\x00MNEM    NB  '
+                + b'EA\x04\x00OUTP    TEST'
+                + b'EA\x04\x00STAT    ALLO'
+                + b'EA\x04\x00TRAC    T1  '
+                + b'EA\x04\x00CODI    LLIN'
+                + b'EA\x04\x00DEST    2   '
+                + b'EA\x04\x00MODE    NB  '
+                + b'ED\x04\x00FILT    ' + RepCode.writeBytes(0.5, 68)
+                + b'ED\x04\x00LEDGMV  ' + RepCode.writeBytes(-20.0, 68)
+                + b'ED\x04\x00REDGMV  ' + RepCode.writeBytes(20.0, 68)
+            # Backup once so the peaks are off scale.
+            + b'\x00A\x04\x00MNEM    SHIF'
+                + b'EA\x04\x00OUTP    TEST'
+                + b'EA\x04\x00STAT    ALLO'
+                + b'EA\x04\x00TRAC    T2  '
+                + b'EA\x04\x00CODI    HDAS'
+                + b'EA\x04\x00DEST    2   '
+                + b'EA\x04\x00MODE    SHIF'
+                + b'ED\x04\x00FILT    ' + RepCode.writeBytes(0.5, 68)
+                + b'ED\x04\x00LEDGMV  ' + RepCode.writeBytes(-5.0, 68)
+                + b'ED\x04\x00REDGMV  ' + RepCode.writeBytes(5.0, 68)
+            # Wraps many times.
+            + b'\x00A\x04\x00MNEM    WRAP'
+                + b'EA\x04\x00OUTP    TEST'
+                + b'EA\x04\x00STAT    ALLO'
+                + b'EA\x04\x00TRAC    T3  '
+                + b'EA\x04\x00CODI    LSPO'
+                + b'EA\x04\x00DEST    2   '
+                + b'EA\x04\x00MODE    WRAP'
+                + b'ED\x04\x00FILT    ' + RepCode.writeBytes(0.5, 68)
+                + b'ED\x04\x00LEDGMV  ' + RepCode.writeBytes(-2.5, 68)
+                + b'ED\x04\x00REDGMV  ' + RepCode.writeBytes(2.5, 68)
+            )
+
+    def setUp(self):
+        """Set up."""
+        self._prl = Plot.PlotReadLIS(
+            LogiRec.LrTableRead(self._retFileSinglePr(self.retFilmBytes())),
+            LogiRec.LrTableRead(self._retFileSinglePr(self.retPresBytes_OffScale())),
+        )
+
+    def tearDown(self):
+        """Tear down."""
+        pass
+
+    def _retSvgS(self, theNullFrames, theFileName):
+        """Plots 41 frames with absent values at theNullFrames with and without VECTORISE_CURVE_PLOTS and returns
+        the two SVG texts."""
+        self._lisFile, self._lisFileIndex = self.retFileAndFileIndex_ShortTEST(
+            numFrames=41,
+            theChVals=ChValsSinNull(theNullFrames, fOffs=0, waveLen=40.0, mid=0.0, amp=40.0, numSa=1, noise=None),
+        )
+        myFpOut = TestPlotShared.outPath(theFileName)
+        return [self._retSvgVectorise(myFpOut, 1000.0, 980.0, aFlag) for aFlag in (False, True)]
+
+    def test_00(self):
+        """TestPlotReadLIS_NullOffScale.test_00(): Tests setUp() and tearDown()."""
+        pass
+
+    def test_01(self):
+        """TestPlotReadLIS_NullOffScale.test_01(): No absent values but off scale values, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS([], 'NullOffScale_None.svg')
+        # The off scale values break the curves into many polylines.
+        self.assertTrue(mySvgS[0].count('<polyline') > 6)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_02(self):
+        """TestPlotReadLIS_NullOffScale.test_02(): Leading absent values, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS(range(5), 'NullOffScale_Leading.svg')
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_03(self):
+        """TestPlotReadLIS_NullOffScale.test_03(): Trailing absent values, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS(range(36, 41), 'NullOffScale_Trailing.svg')
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_04(self):
+        """TestPlotReadLIS_NullOffScale.test_04(): Internal absent values, single and in runs, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS([3, 10, 11, 12, 13, 14, 20, 27, 28], 'NullOffScale_Internal.svg')
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_05(self):
+        """TestPlotReadLIS_NullOffScale.test_05(): Leading, trailing and internal absent values, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS([0, 1, 7, 8, 19, 39, 40], 'NullOffScale_Mixed.svg')
+        self.assertTrue(mySvgS[0].count('<polyline') > 0)
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
+    def test_06(self):
+        """TestPlotReadLIS_NullOffScale.test_06(): All values absent, SVG is identical with or without VECTORISE_CURVE_PLOTS."""
+        mySvgS = self._retSvgS(range(41), 'NullOffScale_AllNull.svg')
+        self.assertEqual(0, mySvgS[0].count('<polyline'))
+        self.assertEqual(mySvgS[0], mySvgS[1])
+
 
 @pytest.mark.slow
 class TestPlotReadLIS_SingleSquareCurveLowFreq(TestPlotBase_00):
@@ -4359,6 +4615,7 @@ def unitTest(theVerbosity=2):
     suite = unittest.TestLoader().loadTestsFromTestCase(Special)
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotRollStatic))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotRoll))
+    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotDecimate))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotLowLevelCurvePlotScale))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotLowLevelCurvePlotScaleXML))
     suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPlotLowLevel_wrap))
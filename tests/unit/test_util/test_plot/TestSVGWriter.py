@@ -31,6 +31,8 @@ import time
 import logging
 import io
 
+import numpy
+
 from TotalDepth.util import XmlWrite
 from TotalDepth.util.plot import SVGWriter, Coord
 
@@ -382,6 +384,22 @@ class TestSVGWriter(unittest.TestCase):
 </svg>
 """)
 
+    def test_08(self):
+        """TestSVGlWriter.test_08(): pointArraysToTxt() is the same as pointsToTxt() and can be mixed with Coord.Pt()."""
+        xS = numpy.array([0.0, 0.04, 0.05, 0.06, -12.25, 1.0e6])
+        yS = numpy.array([1.0, 2.15, -0.04, 3.99, 7.0, -1.0e-6])
+        myPtS = [Coord.Pt(Coord.baseUnitsDim(x), Coord.baseUnitsDim(y)) for x, y in zip(xS.tolist(), yS.tolist())]
+        self.assertEqual(
+            '0.0,1.0 0.0,2.1 0.1,-0.0 0.1,4.0 -12.2,7.0 1000000.0,-0.0',
+            SVGWriter.pointsToTxt(myPtS),
+        )
+        self.assertEqual(SVGWriter.pointsToTxt(myPtS), SVGWriter.pointArraysToTxt(xS, yS))
+        self.assertEqual(
+            SVGWriter.pointsToTxt(myPtS),
+            SVGWriter.pointsToTxt(myPtS[:2] + [SVGWriter.pointArraysToTxt(xS[2:5], yS[2:5])] + myPtS[5:]),
+        )
+        self.assertEqual('', SVGWriter.pointArraysToTxt(xS[:0], yS[:0]))
+
 class NullClass(unittest.TestCase):
     pass
 